@@ -5,6 +5,8 @@ Input form component for candidate info and transcript.
 import streamlit as st
 from typing import Optional, Dict, Any
 
+from src.graph.pipelines import PIPELINES, DEFAULT_PIPELINE
+
 
 def render_input_form() -> Optional[Dict[str, Any]]:
     """
@@ -68,6 +70,16 @@ The candidate should demonstrate clear evidence of operating at Senior PM level,
             if rubric:
                 st.caption(f"Characters: {len(rubric):,}")
 
+            st.markdown("---")
+
+            pipeline = st.selectbox(
+                "Pipeline",
+                list(PIPELINES),
+                index=list(PIPELINES).index(DEFAULT_PIPELINE),
+                format_func=lambda name: f"{name} - {PIPELINES[name]['description']}",
+                key="pipeline"
+            )
+
         with col2:
             st.markdown("### 📄 Interview Transcript")
 
@@ -118,7 +130,8 @@ The candidate should demonstrate clear evidence of operating at Senior PM level,
                         'level_expectations': level_expectations
                     },
                     'rubric': rubric,
-                    'transcript': transcript
+                    'transcript': transcript,
+                    'pipeline': pipeline
                 }
             else:
                 st.error("Please fill in all required fields (*)")
@@ -7,7 +7,7 @@ import os
 import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from src.prompts.manager import PromptManager
+from src.prompts.manager import PromptManager, PromptVersionConflict
 
 
 def render_prompt_editor():
@@ -96,6 +96,7 @@ def render_prompt_editor():
             if st.button("💾 Save as New Version", use_container_width=True):
                 st.session_state.show_save_dialog = True
                 st.session_state.current_prompt_content = prompt_content
+                st.session_state.prompt_revision = pm.get_revision()
 
         with col2_2:
             if st.button("🔄 Set as Active", use_container_width=True):
@@ -136,7 +137,8 @@ def render_prompt_editor():
                                     prompt_type=prompt_key,
                                     content=st.session_state.current_prompt_content,
                                     notes=version_notes,
-                                    set_active=set_active
+                                    set_active=set_active,
+                                    expected_revision=st.session_state.get('prompt_revision')
                                 )
 
                                 st.success(f"✓ Saved as v{new_version}")
@@ -144,6 +146,9 @@ def render_prompt_editor():
                                 if 'current_prompt_content' in st.session_state:
                                     del st.session_state.current_prompt_content
                                 st.rerun()
+                            except PromptVersionConflict:
+                                st.error("Prompts were changed by someone else since you opened this dialog. "
+                                         "Cancel and reopen it to save against the latest versions.")
                             except Exception as e:
                                 st.error(f"Error saving: {str(e)}")
 
@@ -28,8 +28,9 @@ from components.results_display import render_results
 from components.history import render_history
 
 # Import graph
-from src.graph.graph import evaluation_graph
+from src.graph.pipelines import get_pipeline_graph
 from src.graph.state import create_initial_state
+from src.graph.nodes import pin_prompt_versions
 
 
 # Initialize session state
@@ -82,8 +83,11 @@ with tab1:
         initial_state = create_initial_state(
             rubric=form_data['rubric'],
             transcript=form_data['transcript'],
-            candidate_info=form_data['candidate_info']
+            candidate_info=form_data['candidate_info'],
+            pipeline=form_data['pipeline'],
+            prompt_versions=pin_prompt_versions()
         )
+        evaluation_graph = get_pipeline_graph(form_data['pipeline'], durable=False)
 
         # Run graph with 4-step progress tracking
         with st.spinner("Running evaluation... This takes ~2-3 minutes"):
@@ -103,23 +107,21 @@ with tab1:
                     import time
                     start_time = time.time()
 
-                    for chunk in evaluation_graph.stream(initial_state, stream_mode="updates"):
-                        # chunk is a dict with node_name as key
+                    for mode, chunk in evaluation_graph.stream(initial_state, stream_mode=["updates", "values"]):
+                        # "values" chunks carry the state merged by the graph's reducers
+                        if mode == "values":
+                            current_state = chunk
+                            if chunk.get("decision"):
+                                result = current_state
+                            continue
+
+                        # "updates" chunks are a dict with node_name as key
                         for node_name, node_output in chunk.items():
                             elapsed = time.time() - start_time
 
                             with log_container:
                                 st.info(f"[{elapsed:.1f}s] Processing: {node_name}")
 
-                            # Merge updates into current state
-                            for key, value in node_output.items():
-                                if key in current_state:
-                                    if isinstance(value, dict) and isinstance(current_state[key], dict):
-                                        # Merge dictionaries (for metadata)
-                                        current_state[key] = {**current_state[key], **value}
-                                    else:
-                                        current_state[key] = value
-
                             # Update progress based on node
                             if node_name == "primary_evaluator":
                                 progress_bar.progress(33, text="Primary evaluation complete (1/3)")
@@ -154,8 +156,6 @@ with tab1:
                                 with log_container:
                                     st.success(f"✓ Decision Agent: {tokens.get('decision_input', 0):,} input tokens → {tokens.get('decision_output', 0):,} output tokens")
 
-                                result = current_state
-
                                 with st.expander("Final Decision", expanded=True):
                                     st.markdown(node_output.get("decision", ""))
 
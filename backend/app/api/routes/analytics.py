@@ -0,0 +1,99 @@
+"""Analytics endpoints served from precomputed rollups."""
+
+from datetime import date
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, Query
+
+from ...services.analytics import get_analytics
+
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+GroupBy = Literal["day", "prompt_version", "target_level"]
+
+
+def _rollups(
+    metric: str,
+    group_by: str,
+    day_from: Optional[date],
+    day_to: Optional[date],
+    prompt_version: Optional[str],
+    target_level: Optional[str]
+) -> Dict[str, Any]:
+    """Buckets of a rollup metric with the query's filters."""
+    buckets = getattr(get_analytics(), metric)(
+        group_by,
+        day_from=day_from.isoformat() if day_from else None,
+        day_to=day_to.isoformat() if day_to else None,
+        prompt_version=prompt_version,
+        target_level=target_level
+    )
+    return {"group_by": group_by, "buckets": buckets}
+
+
+@router.get("/decisions")
+async def get_decision_mix(
+    group_by: GroupBy = Query("day", description="Bucket dimension to report per value"),
+    day_from: Optional[date] = Query(None, description="First completion day (inclusive)"),
+    day_to: Optional[date] = Query(None, description="Last completion day (inclusive)"),
+    prompt_version: Optional[str] = Query(None, description='e.g. "challenge_agent:3,decision_agent:4,primary_agent:3"'),
+    target_level: Optional[str] = Query(None, description="Candidate target level")
+) -> Dict[str, Any]:
+    """Get the decision mix of completed evaluations.
+
+    Returns:
+        Per group_by value: evaluations, average overall score and the count
+        of each decision label
+    """
+    return _rollups("decisions", group_by, day_from, day_to, prompt_version, target_level)
+
+
+@router.get("/scores")
+async def get_scores(
+    group_by: GroupBy = Query("day", description="Bucket dimension to report per value"),
+    day_from: Optional[date] = Query(None, description="First completion day (inclusive)"),
+    day_to: Optional[date] = Query(None, description="Last completion day (inclusive)"),
+    prompt_version: Optional[str] = Query(None, description="Prompt versions label"),
+    target_level: Optional[str] = Query(None, description="Candidate target level")
+) -> Dict[str, Any]:
+    """Get average scores of completed evaluations.
+
+    Returns:
+        Per group_by value: average overall score and the average calibrated
+        score of each rubric criterion
+    """
+    return _rollups("scores", group_by, day_from, day_to, prompt_version, target_level)
+
+
+@router.get("/cost")
+async def get_cost(
+    group_by: GroupBy = Query("day", description="Bucket dimension to report per value"),
+    day_from: Optional[date] = Query(None, description="First completion day (inclusive)"),
+    day_to: Optional[date] = Query(None, description="Last completion day (inclusive)"),
+    prompt_version: Optional[str] = Query(None, description="Prompt versions label"),
+    target_level: Optional[str] = Query(None, description="Candidate target level")
+) -> Dict[str, Any]:
+    """Get cost and token usage of completed evaluations.
+
+    Returns:
+        Per group_by value: total and per-evaluation cost (USD) and tokens
+    """
+    return _rollups("cost", group_by, day_from, day_to, prompt_version, target_level)
+
+
+@router.get("/latency")
+async def get_latency(
+    group_by: GroupBy = Query("day", description="Bucket dimension to report per value"),
+    day_from: Optional[date] = Query(None, description="First completion day (inclusive)"),
+    day_to: Optional[date] = Query(None, description="Last completion day (inclusive)"),
+    prompt_version: Optional[str] = Query(None, description="Prompt versions label"),
+    target_level: Optional[str] = Query(None, description="Candidate target level")
+) -> Dict[str, Any]:
+    """Get latency of completed evaluations.
+
+    Returns:
+        Per group_by value: average evaluation duration and, per agent, its
+        average duration and tokens
+    """
+    return _rollups("latency", group_by, day_from, day_to, prompt_version, target_level)
@@ -1,43 +1,135 @@
 """REST API endpoints for evaluations."""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
-from typing import List
+import math
+from datetime import datetime
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from typing import List, Literal, Optional
 
 from ...models.requests import CreateEvaluationRequest
 from ...models.responses import (
     EvaluationResponse,
     EvaluationListResponse,
-    EvaluationListItem
+    EvaluationListItem,
+    EvaluationSearchResponse
 )
-from ...services.evaluation_service import evaluation_service
+from ...services.evaluation_service import evaluation_service, IdempotencyKeyConflict, InvalidCursorError
+from ...services.job_queue import QueueFullError
+from ...services.search_index import InvalidSearchQueryError
+
+from src.utils.blob_store import BlobStoreFullError
 
 
 router = APIRouter(prefix="/evaluations", tags=["evaluations"])
 
 
+def queue_full_exception(error: QueueFullError) -> HTTPException:
+    """429 response telling the client when to retry."""
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(math.ceil(error.retry_after))}
+    )
+
+
+def _stored_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """Format a query datetime like stored created_at values (naive local ISO)."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
 @router.post("/", response_model=EvaluationResponse, status_code=202)
 async def create_evaluation(
     request: CreateEvaluationRequest,
-    background_tasks: BackgroundTasks
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    force: bool = Query(False, description="Start a new evaluation even if a duplicate is in flight")
 ):
-    """Create a new evaluation and start processing.
+    """Create a new evaluation and queue it for processing.
 
     This endpoint:
     1. Validates the evaluation request
-    2. Creates a unique evaluation ID
-    3. Starts the LangGraph evaluation in the background
-    4. Returns immediately with the evaluation ID and WebSocket URL
+    2. Returns the existing evaluation (200, deduplicated=true) for a repeated
+       Idempotency-Key, or for the same inputs while that evaluation is queued,
+       running or recently completed (unless force=true)
+    3. Otherwise creates a unique evaluation ID and queues the LangGraph
+       evaluation for the next free worker
+    4. Returns immediately with the evaluation ID, queue position and WebSocket URL
 
     The client should connect to the WebSocket URL to receive real-time progress updates.
 
     Args:
         request: Evaluation request with candidate info, rubric, and transcript
-        background_tasks: FastAPI background tasks handler
+        response: Response, to report 200 for a deduplicated submission
+        idempotency_key: Idempotency-Key header identifying the submission
+        force: Skip input-fingerprint deduplication
 
     Returns:
-        EvaluationResponse with ID, status, and WebSocket URL
+        EvaluationResponse with ID, status, queue position, and WebSocket URL
+
+    Raises:
+        HTTPException: 422 if the Idempotency-Key was used for a different
+            submission, 429 with Retry-After if the queue is full, 503 if a
+            memory-only blob store is full
+    """
+    try:
+        evaluation = await evaluation_service.create_evaluation(request, idempotency_key, force)
+    except IdempotencyKeyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+    except BlobStoreFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    if evaluation.deduplicated:
+        response.status_code = 200
+    return evaluation
+
+
+@router.get("/search", response_model=EvaluationSearchResponse)
+async def search_evaluations(
+    q: str = Query(..., min_length=1, max_length=500, description='Words and "quoted phrases" to match'),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+    status: Optional[Literal["pending", "processing", "completed", "failed", "cancelling", "cancelled"]] = Query(None),
+    created_from: Optional[datetime] = Query(None, description="Created at or after"),
+    created_to: Optional[datetime] = Query(None, description="Created before")
+):
+    """Search evaluations by candidate name, level, decision and rationale.
+
+    Every word and "quoted phrase" of q must match; results are ranked by
+    relevance, with matches on the candidate's name weighted highest.
+
+    Args:
+        q: Search query
+        limit: Maximum number of results to return (1-100)
+        offset: Number of results to skip
+        status: Only evaluations with this status
+        created_from: Only evaluations created at or after this time
+        created_to: Only evaluations created before this time
+
+    Returns:
+        EvaluationSearchResponse with the page and the number of matches
+
+    Raises:
+        HTTPException: 422 if q has no searchable words
     """
-    return await evaluation_service.create_evaluation(request, background_tasks)
+    try:
+        results, total = await evaluation_service.search_evaluations(
+            q,
+            limit,
+            offset,
+            status=status,
+            created_from=_stored_timestamp(created_from),
+            created_to=_stored_timestamp(created_to)
+        )
+    except InvalidSearchQueryError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return EvaluationSearchResponse(results=results, total=total, limit=limit, offset=offset)
 
 
 @router.get("/{evaluation_id}", response_model=EvaluationResponse)
@@ -47,6 +139,7 @@ async def get_evaluation(evaluation_id: str):
     This endpoint returns:
     - Current status (pending, processing, completed, failed)
     - Progress percentage (0-100)
+    - Queue position and estimated start time (while pending)
     - Results (if completed)
     - Error message (if failed)
 
@@ -70,25 +163,119 @@ async def get_evaluation(evaluation_id: str):
     return evaluation
 
 
+@router.post("/{evaluation_id}/resume", response_model=EvaluationResponse, status_code=202)
+async def resume_evaluation(evaluation_id: str):
+    """Resume a failed or interrupted evaluation from its last checkpoint.
+
+    Agent stages that already completed are reused, so only the remaining
+    nodes are run (and paid for) again.
+
+    Args:
+        evaluation_id: Unique identifier for the evaluation
+
+    Returns:
+        EvaluationResponse with ID, status, and WebSocket URL
+
+    Raises:
+        HTTPException: 404 if no checkpoint exists, 409 if running or completed,
+            429 if the queue is full
+    """
+    try:
+        evaluation = await evaluation_service.resume_evaluation(evaluation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+
+    if not evaluation:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No checkpoint found for evaluation {evaluation_id}"
+        )
+
+    return evaluation
+
+
+@router.post("/{evaluation_id}/cancel", response_model=EvaluationResponse, status_code=202)
+async def cancel_evaluation(evaluation_id: str):
+    """Cancel a queued or running evaluation.
+
+    A queued evaluation is cancelled immediately. A running one is reported as
+    "cancelling" until it stops before its next node (its in-flight LLM request
+    is aborted); a "cancelled" WebSocket event then reports the tokens spent.
+
+    Args:
+        evaluation_id: Unique identifier for the evaluation
+
+    Returns:
+        EvaluationResponse with the cancelled or cancelling status
+
+    Raises:
+        HTTPException: 404 if evaluation not found, 409 if it is not queued or running
+    """
+    try:
+        evaluation = await evaluation_service.cancel_evaluation(evaluation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if not evaluation:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Evaluation {evaluation_id} not found"
+        )
+
+    return evaluation
+
+
 @router.get("/", response_model=EvaluationListResponse)
 async def list_evaluations(
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
-    offset: int = Query(0, ge=0, description="Number of results to skip")
+    offset: int = Query(0, ge=0, description="Number of results to skip (unfiltered listings only)"),
+    after: Optional[str] = Query(None, max_length=512, description="next_cursor of the previous page"),
+    status: Optional[Literal["pending", "processing", "completed", "failed", "cancelling", "cancelled"]] = Query(None),
+    candidate: Optional[str] = Query(None, max_length=200, description="Candidate name (case-insensitive)"),
+    created_from: Optional[datetime] = Query(None, description="Created at or after"),
+    created_to: Optional[datetime] = Query(None, description="Created before")
 ):
-    """List all evaluations with pagination.
+    """List evaluations, newest first.
+
+    Follow next_cursor with ?after= to page through the results; filters
+    apply to every page of a listing.
 
     Args:
         limit: Maximum number of results to return (1-100)
-        offset: Number of results to skip for pagination
+        offset: Number of results to skip (legacy; not combinable with after or filters)
+        after: Cursor from the previous page
+        status: Only evaluations with this status
+        candidate: Only evaluations of this candidate
+        created_from: Only evaluations created at or after this time
+        created_to: Only evaluations created before this time
 
     Returns:
-        EvaluationListResponse with list of evaluations and total count
+        EvaluationListResponse with the page, the total count (unfiltered
+        listings) and the next page's cursor
     """
-    items, total = await evaluation_service.list_evaluations(limit, offset)
+    filtered = any(value is not None for value in (after, status, candidate, created_from, created_to))
+    if offset and filtered:
+        raise HTTPException(status_code=422, detail="offset cannot be combined with after or filters")
+
+    try:
+        items, total, next_cursor = await evaluation_service.list_evaluations(
+            limit,
+            offset,
+            after=after,
+            status=status,
+            candidate=candidate,
+            created_from=_stored_timestamp(created_from),
+            created_to=_stored_timestamp(created_to)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return EvaluationListResponse(
         evaluations=items,
         total=total,
         limit=limit,
-        offset=offset
+        offset=offset,
+        next_cursor=next_cursor
     )
@@ -0,0 +1,22 @@
+"""Job queue metrics endpoint."""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from ...services.evaluation_service import evaluation_service
+
+
+router = APIRouter(prefix="/queue", tags=["queue"])
+
+
+@router.get("/")
+async def get_queue_stats() -> Dict[str, Any]:
+    """Get job queue statistics.
+
+    Returns:
+        Workers, waiting/running counts and average job duration, with a
+        per-tenant breakdown (share weight, waiting jobs per priority class,
+        running and finished counts)
+    """
+    return evaluation_service.queue_stats()
@@ -0,0 +1,22 @@
+"""Storage metrics endpoint."""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from ...services.evaluation_service import evaluation_service
+
+
+router = APIRouter(prefix="/storage", tags=["storage"])
+
+
+@router.get("/")
+async def get_storage_stats() -> Dict[str, Any]:
+    """Get storage statistics.
+
+    Returns:
+        Stored evaluations per status and evictions per status, with blob
+        store usage under "blobs" (memory and raw vs stored bytes, compression
+        ratio, time spent compressing and decompressing)
+    """
+    return await evaluation_service.storage_stats()
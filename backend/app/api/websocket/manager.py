@@ -2,11 +2,13 @@
 
 import json
 import logging
-from typing import Dict, Set
+from typing import Dict, Optional, Set
 from fastapi import WebSocket
 from datetime import datetime
 import asyncio
 
+from ...services.event_bus import RedisEventBus, create_event_bus
+
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +16,28 @@ logger = logging.getLogger(__name__)
 class WebSocketManager:
     """Manages WebSocket connections for real-time evaluation updates."""
 
-    def __init__(self):
-        """Initialize the WebSocket manager."""
+    def __init__(self, event_bus: Optional[RedisEventBus] = None):
+        """Initialize the WebSocket manager.
+
+        Args:
+            event_bus: Bus sharing events with the other API workers, or None
+                to deliver them to this worker's clients only
+        """
         # Map evaluation_id to set of connected WebSocket clients
         self.connections: Dict[str, Set[WebSocket]] = {}
         # Lock for thread-safe connection management
         self._lock = asyncio.Lock()
+        self.event_bus = event_bus
+
+    async def start(self):
+        """Start receiving events published by other workers."""
+        if self.event_bus:
+            await self.event_bus.start(self.deliver)
+
+    async def stop(self):
+        """Stop receiving events from other workers."""
+        if self.event_bus:
+            await self.event_bus.stop()
 
     async def connect(self, websocket: WebSocket, evaluation_id: str):
         """Accept a new WebSocket connection.
@@ -64,10 +82,24 @@ class WebSocketManager:
     async def broadcast(self, evaluation_id: str, message: dict):
         """Broadcast a message to all connected clients for an evaluation.
 
+        With an event bus, the message goes to the clients of every worker.
+
         Args:
             evaluation_id: ID of the evaluation
             message: Message data to broadcast
         """
+        if self.event_bus:
+            await self.event_bus.publish(evaluation_id, message)
+        else:
+            await self.deliver(evaluation_id, message)
+
+    async def deliver(self, evaluation_id: str, message: dict):
+        """Send a message to this worker's clients for an evaluation.
+
+        Args:
+            evaluation_id: ID of the evaluation
+            message: Message data to send
+        """
         # Get copy of connections with lock
         async with self._lock:
             if evaluation_id not in self.connections:
@@ -94,7 +126,7 @@ class WebSocketManager:
         Args:
             evaluation_id: ID of the evaluation
         """
-        await self.broadcast(evaluation_id, {
+        await self.deliver(evaluation_id, {
             "type": "heartbeat",
             "timestamp": datetime.now().isoformat()
         })
@@ -112,4 +144,4 @@ class WebSocketManager:
 
 
 # Global instance (singleton pattern)
-websocket_manager = WebSocketManager()
+websocket_manager = WebSocketManager(create_event_bus())
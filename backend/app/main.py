@@ -10,10 +10,14 @@ from dotenv import load_dotenv
 env_path = Path(__file__).parent.parent.parent / '.env'
 load_dotenv(env_path)
 
-from .api.routes import evaluations, health
+from .api.routes import evaluations, health, queue, storage, analytics
 from .api.websocket import evaluation_stream
 from .api.websocket.manager import websocket_manager
 from .services.evaluation_service import evaluation_service
+from .services.storage_service import storage_expiry
+
+from src.graph.checkpoint import config as graph_config
+from src.graph.pipelines import precompile_pipelines
 
 
 # Load environment variables
@@ -51,6 +55,9 @@ evaluation_service.set_websocket_manager(websocket_manager)
 # Include REST API routers
 app.include_router(health.router, prefix="/api/v1")
 app.include_router(evaluations.router, prefix="/api/v1")
+app.include_router(queue.router, prefix="/api/v1")
+app.include_router(storage.router, prefix="/api/v1")
+app.include_router(analytics.router, prefix="/api/v1")
 
 # Include WebSocket router
 app.include_router(evaluation_stream.router)
@@ -63,11 +70,32 @@ async def startup_event():
     print("API docs: http://localhost:8000/docs")
     print("WebSocket: ws://localhost:8000/ws/evaluations/{evaluation_id}")
 
+    # Compile every pipeline variant once, before the first request needs it
+    precompile_pipelines()
+
+    # Receive evaluation events published by the other API workers
+    await websocket_manager.start()
+
+    # Start the evaluation workers
+    await evaluation_service.start()
+
+    # Continue evaluations that were interrupted by the last shutdown
+    if graph_config["checkpoint"].get("resume_on_startup", True):
+        resumed = await evaluation_service.resume_incomplete_evaluations()
+        if resumed:
+            print(f"Resumed {resumed} interrupted evaluation(s)")
+
+    # Evict stored evaluations whose TTL has passed
+    await storage_expiry.start()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Run on application shutdown."""
     print("Interview Agent API shutting down")
+    await storage_expiry.stop()
+    await evaluation_service.stop()
+    await websocket_manager.stop()
 
 
 @app.get("/")
@@ -9,6 +9,9 @@ class BaseWebSocketEvent(BaseModel):
 
     type: str
     timestamp: str
+    version: Optional[int] = Field(
+        None, description="Per-evaluation event number (not set on connected/heartbeat)"
+    )
 
 
 class ConnectedEvent(BaseWebSocketEvent):
@@ -31,6 +34,17 @@ class NodeStartedEvent(BaseWebSocketEvent):
     type: Literal["node_started"] = "node_started"
     node: Literal["primary_evaluator", "challenge_agent", "decision_agent"]
     progress_percentage: int = Field(..., ge=0, le=100)
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until the evaluation completes")
+
+
+class ProgressEvent(BaseWebSocketEvent):
+    """Event sent (throttled) while a node streams its output."""
+
+    type: Literal["progress"] = "progress"
+    node: Literal["primary_evaluator", "challenge_agent", "decision_agent"]
+    progress_percentage: int = Field(..., ge=0, le=100)
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until the evaluation completes")
+    output_tokens: int = Field(..., description="Output tokens the node has streamed so far")
 
 
 class NodeCompletedEvent(BaseWebSocketEvent):
@@ -39,16 +53,19 @@ class NodeCompletedEvent(BaseWebSocketEvent):
     type: Literal["node_completed"] = "node_completed"
     node: Literal["primary_evaluator", "challenge_agent", "decision_agent"]
     progress_percentage: int = Field(..., ge=0, le=100)
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until the evaluation completes")
     output_preview: Optional[str] = Field(None, description="First 200 chars of output")
     tokens: Optional[Dict[str, int]] = Field(None, description="Token usage for this node")
 
 
 class EvaluationCompletedEvent(BaseWebSocketEvent):
-    """Event sent when evaluation completes successfully."""
+    """Event sent when evaluation completes successfully.
+
+    The result is not included; fetch it once via GET /api/v1/evaluations/{id}.
+    """
 
     type: Literal["evaluation_completed"] = "evaluation_completed"
     evaluation_id: str
-    result: Dict[str, Any]
 
 
 class ErrorEvent(BaseWebSocketEvent):
@@ -59,6 +76,14 @@ class ErrorEvent(BaseWebSocketEvent):
     node: Optional[str] = None
 
 
+class CancelledEvent(BaseWebSocketEvent):
+    """Event sent when an evaluation has been cancelled."""
+
+    type: Literal["cancelled"] = "cancelled"
+    evaluation_id: str
+    tokens: Optional[Dict[str, Any]] = Field(None, description="Tokens spent before cancellation")
+
+
 class HeartbeatEvent(BaseWebSocketEvent):
     """Event sent periodically to keep connection alive."""
 
@@ -70,8 +95,10 @@ WebSocketEvent = (
     ConnectedEvent
     | EvaluationStartedEvent
     | NodeStartedEvent
+    | ProgressEvent
     | NodeCompletedEvent
     | EvaluationCompletedEvent
     | ErrorEvent
+    | CancelledEvent
     | HeartbeatEvent
 )
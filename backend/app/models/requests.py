@@ -1,9 +1,16 @@
 """Request models for the Interview Agent API."""
 
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 
+# Pipeline variants registered in src/graph/pipelines.py
+PipelineName = Literal["full", "lite", "chunked", "per-criterion"]
+
+# Priority classes of the job queue (backend/app/services/job_queue.py)
+PriorityClass = Literal["interactive", "batch"]
+
+
 class CandidateInfo(BaseModel):
     """Candidate information for evaluation."""
 
@@ -20,6 +27,21 @@ class CreateEvaluationRequest(BaseModel):
     candidate_info: CandidateInfo = Field(..., description="Candidate information")
     rubric: str = Field(..., min_length=50, description="Natural language evaluation criteria")
     transcript: str = Field(..., min_length=100, description="Interview transcript")
+    pipeline: PipelineName = Field(
+        "full",
+        description="Pipeline variant: full, lite (no challenge round), chunked (long transcripts) or per-criterion"
+    )
+    priority: PriorityClass = Field(
+        "interactive",
+        description="interactive runs always start before batch runs"
+    )
+    tenant: str = Field(
+        "default",
+        min_length=1,
+        max_length=64,
+        pattern=r"^[A-Za-z0-9_.-]+$",
+        description="Team or tenant; queued work is shared fairly between tenants"
+    )
 
     class Config:
         json_schema_extra = {
@@ -32,6 +54,9 @@ class CreateEvaluationRequest(BaseModel):
                     "level_expectations": "Expected to demonstrate strategic thinking, cross-team influence, and execution at scale."
                 },
                 "rubric": "## Strategic Thinking\n- Demonstrates long-term vision beyond immediate roadmap\n\n## Leadership\n- Evidence of influencing without authority",
-                "transcript": "[Detailed interview transcript content...]"
+                "transcript": "[Detailed interview transcript content...]",
+                "pipeline": "full",
+                "priority": "interactive",
+                "tenant": "recruiting-emea"
             }
         }
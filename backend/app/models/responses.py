@@ -36,6 +36,11 @@ class EvaluationMetadata(BaseModel):
     execution_time_seconds: float = 0.0
     cost_usd: float = 0.0
     model_version: str = "gpt-4o"
+    pipeline: str = "full"
+    prompt_versions: Dict[str, Dict[str, str]] = Field(
+        default_factory=dict,
+        description="Prompt version and content sha256 per agent, pinned at submission"
+    )
 
 
 class EvaluationResult(BaseModel):
@@ -43,7 +48,7 @@ class EvaluationResult(BaseModel):
 
     candidate_info: CandidateInfo
     primary_evaluation: str
-    challenges: str
+    challenges: Optional[str] = None  # None for the "lite" pipeline
     final_evaluation: str
     decision: str
     metadata: EvaluationMetadata
@@ -53,14 +58,29 @@ class EvaluationResponse(BaseModel):
     """Response for evaluation endpoints."""
 
     evaluation_id: str = Field(..., description="Unique evaluation identifier")
-    status: Literal["pending", "processing", "completed", "failed"] = Field(..., description="Current status")
+    status: Literal["pending", "processing", "completed", "failed", "cancelling", "cancelled"] = Field(
+        ..., description="Current status"
+    )
     current_step: Optional[Literal["primary_evaluator", "challenge_agent", "decision_agent"]] = None
     progress_percentage: int = Field(0, ge=0, le=100, description="Progress percentage (0-100)")
+    priority: Optional[str] = Field(None, description="Priority class the evaluation was queued with")
+    tenant: Optional[str] = Field(None, description="Tenant the evaluation is scheduled under")
+    queue_position: Optional[int] = Field(None, description="1-based position while pending in the job queue")
+    eta_seconds: Optional[float] = Field(
+        None, description="Estimated seconds until a pending evaluation starts or a running one completes"
+    )
     result: Optional[EvaluationResult] = None
     error: Optional[str] = None
+    tokens_used: Optional[Dict[str, Any]] = Field(
+        None, description="Tokens spent by a cancelled run (estimated for an aborted LLM request)"
+    )
+    version: int = Field(0, description="Version of the last WebSocket event applied to this state")
     created_at: str = Field(..., description="ISO timestamp when evaluation was created")
     completed_at: Optional[str] = None
     websocket_url: Optional[str] = None
+    deduplicated: bool = Field(
+        False, description="True when the submission was attached to an existing evaluation"
+    )
 
     class Config:
         json_schema_extra = {
@@ -69,6 +89,8 @@ class EvaluationResponse(BaseModel):
                 "status": "processing",
                 "current_step": "challenge_agent",
                 "progress_percentage": 50,
+                "queue_position": None,
+                "eta_seconds": None,
                 "result": None,
                 "error": None,
                 "created_at": "2026-01-06T10:30:00Z",
@@ -83,7 +105,7 @@ class EvaluationListItem(BaseModel):
 
     evaluation_id: str
     candidate_name: str
-    status: Literal["pending", "processing", "completed", "failed"]
+    status: Literal["pending", "processing", "completed", "failed", "cancelling", "cancelled"]
     created_at: str
     completed_at: Optional[str] = None
 
@@ -92,7 +114,23 @@ class EvaluationListResponse(BaseModel):
     """Response for listing evaluations."""
 
     evaluations: list[EvaluationListItem]
-    total: int
+    total: Optional[int] = Field(None, description="Total number of evaluations (omitted for filtered listings)")
+    limit: int
+    offset: int
+    next_cursor: Optional[str] = Field(None, description="Pass as ?after= to fetch the next page")
+
+
+class EvaluationSearchItem(EvaluationListItem):
+    """Search result: an evaluation summary and its relevance."""
+
+    score: float = Field(..., description="Relevance (BM25), higher is better")
+
+
+class EvaluationSearchResponse(BaseModel):
+    """Response for searching evaluations."""
+
+    results: list[EvaluationSearchItem]
+    total: int = Field(..., description="Number of matching evaluations")
     limit: int
     offset: int
 
@@ -0,0 +1,445 @@
+"""Precomputed analytics rollups of completed evaluations.
+
+Dashboards chart the decision mix, average scores per criterion, cost per
+evaluation and latency per agent over time. Instead of scanning stored
+results on every request, each evaluation is folded into rollup tables once,
+when it completes, keyed by bucket: (day, prompt version, target level). A
+dashboard query only sums the buckets in its range, a few hundred rows at
+most, so it is answered in well under a millisecond. The rollups live in a
+small SQLite database shared by the API workers on a host; backfill existing
+evaluations with backend/backfill_analytics.py.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.graph.checkpoint import BASE_DIR, config
+from src.utils.blob_store import get_blob_store
+from src.utils.decision_parser import parse_criterion_scores, parse_decision
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recorded (
+    evaluation_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS rollup_totals (
+    day TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    target_level TEXT NOT NULL,
+    evaluations INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    cost_usd REAL NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    execution_seconds REAL NOT NULL,
+    PRIMARY KEY (day, prompt_version, target_level)
+);
+CREATE TABLE IF NOT EXISTS rollup_decisions (
+    day TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    target_level TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    evaluations INTEGER NOT NULL,
+    PRIMARY KEY (day, prompt_version, target_level, decision)
+);
+CREATE TABLE IF NOT EXISTS rollup_criteria (
+    day TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    target_level TEXT NOT NULL,
+    criterion TEXT NOT NULL,
+    scored INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    PRIMARY KEY (day, prompt_version, target_level, criterion)
+);
+CREATE TABLE IF NOT EXISTS rollup_agents (
+    day TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    target_level TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    PRIMARY KEY (day, prompt_version, target_level, agent)
+);
+"""
+
+# Bucket columns an analytics query can group by
+GROUP_BY = ("day", "prompt_version", "target_level")
+
+# Agents in pipeline order: (node, key of its token counts and completion timestamp)
+AGENTS = (
+    ("primary_evaluator", "primary"),
+    ("challenge_agent", "challenge"),
+    ("decision_agent", "decision")
+)
+
+UNSPECIFIED = "unspecified"
+
+
+def prompt_version_label(prompt_versions: Optional[Dict[str, Dict[str, str]]]) -> str:
+    """Bucket label of the prompt versions an evaluation ran with.
+
+    Returns:
+        e.g. "challenge_agent:3,decision_agent:4,primary_agent:3", or
+        "unspecified" for evaluations that did not pin their prompts
+    """
+    if not prompt_versions:
+        return UNSPECIFIED
+    return ",".join(f"{agent}:{pin.get('version')}" for agent, pin in sorted(prompt_versions.items()))
+
+
+def evaluation_facts(eval_data: dict) -> Optional[Dict[str, Any]]:
+    """Everything the rollups record about a completed evaluation.
+
+    Args:
+        eval_data: Full stored evaluation (with input and result)
+
+    Returns:
+        Facts dict, None if the evaluation is not completed
+    """
+    result = eval_data.get("result")
+    if eval_data.get("status") != "completed" or not result:
+        return None
+
+    metadata = result.get("metadata") or {}
+    tokens = metadata.get("tokens") or {}
+    timestamps = metadata.get("timestamps") or {}
+    try:
+        decision_text = get_blob_store().resolve(result.get("decision"))
+    except KeyError as e:
+        logger.warning(f"Decision of {eval_data['evaluation_id']} not found, not scored: {e}")
+        decision_text = None
+    parsed = parse_decision(decision_text)
+    candidate_info = (eval_data.get("input") or {}).get("candidate_info") or {}
+
+    # Each agent ran from the previous agent's completion (or the start) to its own
+    agents = {}
+    previous = timestamps.get("start")
+    for agent, key in AGENTS:
+        finished = timestamps.get(key)
+        if finished is None:
+            continue  # Skipped by the pipeline (e.g. no challenge in "lite")
+        seconds = None
+        if previous is not None:
+            seconds = max((datetime.fromisoformat(finished) - datetime.fromisoformat(previous)).total_seconds(), 0.0)
+        agents[agent] = {
+            "seconds": seconds or 0.0,
+            "input_tokens": tokens.get(f"{key}_input", 0),
+            "output_tokens": tokens.get(f"{key}_output", 0)
+        }
+        previous = finished
+
+    return {
+        "evaluation_id": eval_data["evaluation_id"],
+        "bucket": (
+            (eval_data.get("completed_at") or eval_data["created_at"])[:10],
+            prompt_version_label(metadata.get("prompt_versions")),
+            candidate_info.get("target_level") or UNSPECIFIED
+        ),
+        "decision": parsed["decision"],
+        "overall_score": parsed["overall_score"],
+        "criteria": parse_criterion_scores(decision_text),
+        "cost_usd": metadata.get("total_cost_usd", 0.0),
+        "input_tokens": tokens.get("total_input", 0),
+        "output_tokens": tokens.get("total_output", 0),
+        "execution_seconds": metadata.get("execution_time_seconds", 0.0),
+        "agents": agents
+    }
+
+
+class AnalyticsRollups:
+    """Rollup tables of completed evaluations per (day, prompt version, target level)."""
+
+    def __init__(self, path: str):
+        """Open (and create if needed) the rollup database.
+
+        Args:
+            path: SQLite database path (":memory:" for tests)
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def record(self, facts: Dict[str, Any]) -> bool:
+        """Fold a completed evaluation into the rollups.
+
+        Each evaluation is counted once, however often it is recorded (a
+        re-run after resume, a backfill over already recorded evaluations).
+
+        Args:
+            facts: Facts from evaluation_facts()
+
+        Returns:
+            True if recorded, False if the evaluation was already counted
+        """
+        bucket = facts["bucket"]
+        score = facts["overall_score"]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute(
+                    "INSERT INTO recorded (evaluation_id) VALUES (?) ON CONFLICT DO NOTHING",
+                    (facts["evaluation_id"],)
+                ).rowcount == 0:
+                    self._conn.execute("ROLLBACK")
+                    return False
+
+                self._conn.execute(
+                    """
+                    INSERT INTO rollup_totals VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (day, prompt_version, target_level) DO UPDATE SET
+                        evaluations = evaluations + 1,
+                        scored = scored + excluded.scored,
+                        score_sum = score_sum + excluded.score_sum,
+                        cost_usd = cost_usd + excluded.cost_usd,
+                        input_tokens = input_tokens + excluded.input_tokens,
+                        output_tokens = output_tokens + excluded.output_tokens,
+                        execution_seconds = execution_seconds + excluded.execution_seconds
+                    """,
+                    (
+                        *bucket, int(score is not None), score or 0.0, facts["cost_usd"],
+                        facts["input_tokens"], facts["output_tokens"], facts["execution_seconds"]
+                    )
+                )
+                self._conn.execute(
+                    "INSERT INTO rollup_decisions VALUES (?, ?, ?, ?, 1) "
+                    "ON CONFLICT (day, prompt_version, target_level, decision) "
+                    "DO UPDATE SET evaluations = evaluations + 1",
+                    (*bucket, facts["decision"])
+                )
+                for criterion, criterion_score in facts["criteria"].items():
+                    self._conn.execute(
+                        "INSERT INTO rollup_criteria VALUES (?, ?, ?, ?, 1, ?) "
+                        "ON CONFLICT (day, prompt_version, target_level, criterion) "
+                        "DO UPDATE SET scored = scored + 1, score_sum = score_sum + excluded.score_sum",
+                        (*bucket, criterion, criterion_score)
+                    )
+                for agent, run in facts["agents"].items():
+                    self._conn.execute(
+                        """
+                        INSERT INTO rollup_agents VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+                        ON CONFLICT (day, prompt_version, target_level, agent) DO UPDATE SET
+                            runs = runs + 1,
+                            seconds = seconds + excluded.seconds,
+                            input_tokens = input_tokens + excluded.input_tokens,
+                            output_tokens = output_tokens + excluded.output_tokens
+                        """,
+                        (*bucket, agent, run["seconds"], run["input_tokens"], run["output_tokens"])
+                    )
+                self._conn.execute("COMMIT")
+                return True
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        """Drop every rollup (before a full backfill)."""
+        with self._lock:
+            self._conn.executescript(
+                "BEGIN IMMEDIATE; DELETE FROM recorded; DELETE FROM rollup_totals; DELETE FROM rollup_decisions; "
+                "DELETE FROM rollup_criteria; DELETE FROM rollup_agents; COMMIT;"
+            )
+
+    def _query(
+        self,
+        table: str,
+        columns: str,
+        group_by: str,
+        filters: Dict[str, Optional[str]],
+        detail: Optional[str] = None
+    ) -> List[sqlite3.Row]:
+        """Sum a rollup table's buckets per group_by value (and detail column).
+
+        Args:
+            table: Rollup table
+            columns: Aggregate expressions to select
+            group_by: Bucket column to group by (see GROUP_BY)
+            filters: day_from / day_to (inclusive ISO dates), prompt_version, target_level
+            detail: Second grouping column (decision, criterion or agent)
+
+        Returns:
+            Rows with "key" (and detail) plus the aggregates, ordered by key
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"Cannot group analytics by {group_by}")
+        conditions, params = [], []
+        for column, operator, value in (
+            ("day", ">=", filters.get("day_from")),
+            ("day", "<=", filters.get("day_to")),
+            ("prompt_version", "=", filters.get("prompt_version")),
+            ("target_level", "=", filters.get("target_level"))
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        keys = f"{group_by} AS key" + (f", {detail}" if detail else "")
+        groups = group_by + (f", {detail}" if detail else "")
+
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {keys}, {columns} FROM {table} {where} GROUP BY {groups} ORDER BY {groups}",
+                params
+            ).fetchall()
+
+    def decisions(self, group_by: str = "day", **filters) -> List[Dict[str, Any]]:
+        """Decision mix and average overall score per group.
+
+        Returns:
+            [{"key", "evaluations", "average_score", "decisions": {label: count}}]
+        """
+        buckets = {
+            row["key"]: {
+                "key": row["key"],
+                "evaluations": row["evaluations"],
+                "average_score": _average(row["score_sum"], row["scored"]),
+                "decisions": {}
+            }
+            for row in self._query(
+                "rollup_totals", "SUM(evaluations) AS evaluations, SUM(score_sum) AS score_sum, SUM(scored) AS scored",
+                group_by, filters
+            )
+        }
+        for row in self._query("rollup_decisions", "SUM(evaluations) AS evaluations", group_by, filters, "decision"):
+            buckets[row["key"]]["decisions"][row["decision"]] = row["evaluations"]
+        return list(buckets.values())
+
+    def scores(self, group_by: str = "day", **filters) -> List[Dict[str, Any]]:
+        """Average overall score and average score per criterion per group.
+
+        Returns:
+            [{"key", "evaluations", "average_score", "criteria": {name: {"average_score", "scored"}}}]
+        """
+        buckets = {
+            row["key"]: {
+                "key": row["key"],
+                "evaluations": row["evaluations"],
+                "average_score": _average(row["score_sum"], row["scored"]),
+                "criteria": {}
+            }
+            for row in self._query(
+                "rollup_totals", "SUM(evaluations) AS evaluations, SUM(score_sum) AS score_sum, SUM(scored) AS scored",
+                group_by, filters
+            )
+        }
+        for row in self._query(
+            "rollup_criteria", "SUM(score_sum) AS score_sum, SUM(scored) AS scored", group_by, filters, "criterion"
+        ):
+            buckets[row["key"]]["criteria"][row["criterion"]] = {
+                "average_score": _average(row["score_sum"], row["scored"]),
+                "scored": row["scored"]
+            }
+        return list(buckets.values())
+
+    def cost(self, group_by: str = "day", **filters) -> List[Dict[str, Any]]:
+        """Cost and tokens, in total and per evaluation, per group.
+
+        Returns:
+            [{"key", "evaluations", "cost_usd", "cost_per_evaluation_usd",
+              "input_tokens", "output_tokens", "tokens_per_evaluation"}]
+        """
+        return [
+            {
+                "key": row["key"],
+                "evaluations": row["evaluations"],
+                "cost_usd": round(row["cost_usd"], 4),
+                "cost_per_evaluation_usd": _average(row["cost_usd"], row["evaluations"], 4),
+                "input_tokens": row["input_tokens"],
+                "output_tokens": row["output_tokens"],
+                "tokens_per_evaluation": _average(row["input_tokens"] + row["output_tokens"], row["evaluations"], 0)
+            }
+            for row in self._query(
+                "rollup_totals",
+                "SUM(evaluations) AS evaluations, SUM(cost_usd) AS cost_usd, "
+                "SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens",
+                group_by, filters
+            )
+        ]
+
+    def latency(self, group_by: str = "day", **filters) -> List[Dict[str, Any]]:
+        """Average evaluation duration and per-agent latency and tokens per group.
+
+        Returns:
+            [{"key", "evaluations", "average_seconds",
+              "agents": {agent: {"runs", "average_seconds", "average_input_tokens", "average_output_tokens"}}}]
+        """
+        buckets = {
+            row["key"]: {
+                "key": row["key"],
+                "evaluations": row["evaluations"],
+                "average_seconds": _average(row["execution_seconds"], row["evaluations"]),
+                "agents": {}
+            }
+            for row in self._query(
+                "rollup_totals", "SUM(evaluations) AS evaluations, SUM(execution_seconds) AS execution_seconds",
+                group_by, filters
+            )
+        }
+        for row in self._query(
+            "rollup_agents",
+            "SUM(runs) AS runs, SUM(seconds) AS seconds, SUM(input_tokens) AS input_tokens, "
+            "SUM(output_tokens) AS output_tokens",
+            group_by, filters, "agent"
+        ):
+            buckets[row["key"]]["agents"][row["agent"]] = {
+                "runs": row["runs"],
+                "average_seconds": _average(row["seconds"], row["runs"]),
+                "average_input_tokens": _average(row["input_tokens"], row["runs"], 0),
+                "average_output_tokens": _average(row["output_tokens"], row["runs"], 0)
+            }
+        return list(buckets.values())
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+
+def _average(total: float, count: int, digits: int = 2) -> Optional[float]:
+    return round(total / count, digits) if count else None
+
+
+_analytics: Optional[AnalyticsRollups] = None
+_analytics_lock = threading.Lock()
+
+
+def get_analytics() -> AnalyticsRollups:
+    """Get the process-wide rollups configured from config.yaml.
+
+    EVALUATION_ANALYTICS_DB overrides analytics.path; relative paths are
+    resolved against the project root.
+    """
+    global _analytics
+    with _analytics_lock:
+        if _analytics is None:
+            path = os.getenv("EVALUATION_ANALYTICS_DB") or config["analytics"]["path"]
+            if path != ":memory:" and not os.path.isabs(path):
+                path = os.path.join(BASE_DIR, path)
+            _analytics = AnalyticsRollups(path)
+        return _analytics
+
+
+def record_evaluation(eval_data: dict) -> bool:
+    """Fold a completed evaluation into the process-wide rollups.
+
+    Args:
+        eval_data: Full stored evaluation (with input and result)
+
+    Returns:
+        True if recorded, False if not completed or already counted
+    """
+    facts = evaluation_facts(eval_data)
+    return facts is not None and get_analytics().record(facts)
@@ -0,0 +1,114 @@
+"""Execution of one queued evaluation, shared by API workers and backend/worker.py."""
+
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..utils.graph_executor import GraphExecutor
+
+from src.utils.cancellation import CancelToken, EvaluationCancelled
+
+
+async def run_evaluation_job(
+    evaluation_id: str,
+    payload: Dict[str, Any],
+    emit_event: Callable[[str, dict], Awaitable[None]],
+    update_evaluation: Callable[[str, dict], Awaitable[None]],
+    cancel_token: Optional[CancelToken] = None
+) -> Tuple[str, Optional[str]]:
+    """Run the evaluation graph for a job and report its status.
+
+    Args:
+        evaluation_id: Unique identifier for the evaluation
+        payload: Job payload with "input" (stored evaluation inputs) and
+            "resume" (continue from the last checkpoint)
+        emit_event: Coroutine broadcasting a WebSocket event
+        update_evaluation: Coroutine merging fields into the stored evaluation
+        cancel_token: Token that stops the run when cancelled
+
+    Returns:
+        Tuple of (final status, error message): "completed", "failed" or "cancelled"
+    """
+    try:
+        # Update status to processing
+        await update_evaluation(evaluation_id, {"status": "processing"})
+
+        # Create graph executor with event emitter
+        executor = GraphExecutor(event_emitter=emit_event)
+
+        # Execute the graph (this will use your existing LangGraph from src/graph/graph.py)
+        start_time = datetime.now()
+        if payload.get("resume"):
+            final_state = await executor.execute_graph(
+                evaluation_id, resume=True, cancel_token=cancel_token
+            )
+        else:
+            inputs = payload["input"]
+            final_state = await executor.execute_graph(
+                evaluation_id=evaluation_id,
+                rubric=inputs["rubric"],
+                transcript=inputs["transcript"],
+                candidate_info=inputs["candidate_info"],
+                pipeline=inputs.get("pipeline", "full"),
+                prompt_versions=inputs.get("prompt_versions"),
+                cancel_token=cancel_token
+            )
+        end_time = datetime.now()
+        execution_time = (end_time - start_time).total_seconds()
+
+        # Update final state with execution time
+        if "metadata" in final_state:
+            final_state["metadata"]["execution_time_seconds"] = execution_time
+
+        # Store completed evaluation
+        await update_evaluation(evaluation_id, {
+            "status": "completed",
+            "progress_percentage": 100,
+            "result": final_state,
+            "completed_at": end_time.isoformat()
+        })
+
+        # Subscribers fetch the stored result once through the REST API
+        await emit_event(
+            evaluation_id,
+            {
+                "type": "evaluation_completed",
+                "evaluation_id": evaluation_id,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+        return "completed", None
+
+    except EvaluationCancelled:
+        # Record what the run spent before it was stopped
+        tokens = cancel_token.usage() if cancel_token else None
+        await update_evaluation(evaluation_id, {
+            "status": "cancelled",
+            "tokens_used": tokens,
+            "completed_at": datetime.now().isoformat()
+        })
+        await emit_event(
+            evaluation_id,
+            {
+                "type": "cancelled",
+                "evaluation_id": evaluation_id,
+                "tokens": tokens,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+        return "cancelled", None
+
+    except Exception as e:
+        # Handle errors
+        error_message = str(e)
+        await update_evaluation(evaluation_id, {"status": "failed", "error": error_message})
+
+        # Emit error event via WebSocket
+        await emit_event(
+            evaluation_id,
+            {
+                "type": "error",
+                "error": error_message,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+        return "failed", error_message
@@ -2,24 +2,156 @@
 
 import uuid
 import asyncio
-from datetime import datetime
-from typing import Optional, Callable
-from fastapi import BackgroundTasks
+import base64
+import binascii
+import hashlib
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Callable, Tuple
 
 from ..models.requests import CreateEvaluationRequest
-from ..models.responses import EvaluationResponse, EvaluationListItem
+from ..models.responses import EvaluationResponse, EvaluationListItem, EvaluationSearchItem
 from ..utils.graph_executor import GraphExecutor
+from .analytics import record_evaluation
 from .storage_service import storage
+from .job_queue import DEFAULT_TENANT, create_job_queue
+from .search_index import parse_query
+from .evaluation_jobs import run_evaluation_job
+
+from src.graph.pipelines import get_pipeline_graph, get_graph_for_evaluation
+from src.graph.checkpoint import config, list_incomplete_evaluations, thread_config
+from src.graph.nodes import pin_prompt_versions
+from src.utils.blob_store import find_refs, get_blob_store
+from src.utils.cancellation import CancelToken
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds a submission claim in shared storage lasts if its worker dies
+SUBMISSION_CLAIM_SECONDS = 30
+
+# Seconds between attempts to take a submission claim held by another request
+SUBMISSION_CLAIM_POLL_SECONDS = 0.05
+
+
+class IdempotencyKeyConflict(Exception):
+    """Raised when an Idempotency-Key is reused for a different submission."""
+
+
+class InvalidCursorError(Exception):
+    """Raised when a listing cursor was not issued by list_evaluations."""
+
+
+def encode_cursor(created_at: str, evaluation_id: str) -> str:
+    """Opaque listing cursor pointing after an evaluation."""
+    raw = json.dumps([created_at, evaluation_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Listing key (created_at, evaluation_id) of a cursor from encode_cursor.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+    if not (isinstance(key, list) and len(key) == 2 and all(isinstance(part, str) for part in key)):
+        raise InvalidCursorError(f"Invalid cursor: {cursor}")
+    return key[0], key[1]
+
+
+def list_item_fields(eval_data: dict) -> dict:
+    """Fields of an EvaluationListItem for a stored evaluation or summary."""
+    # Persistent stores list summaries with the name but without the input
+    candidate_info = (eval_data.get("input") or {}).get("candidate_info", {})
+    return {
+        "evaluation_id": eval_data["evaluation_id"],
+        "candidate_name": eval_data.get("candidate_name") or candidate_info.get("name", "Unknown"),
+        "status": eval_data["status"],
+        "created_at": eval_data["created_at"],
+        "completed_at": eval_data.get("completed_at")
+    }
+
+
+def submission_fingerprint(request: CreateEvaluationRequest, prompt_versions: dict) -> str:
+    """Fingerprint of everything that determines an evaluation's result.
+
+    Args:
+        request: Evaluation request data
+        prompt_versions: Prompt snapshot pinned for the submission
+
+    Returns:
+        Hex SHA-256 over candidate info, rubric, transcript, pinned prompt
+        versions and pipeline variant
+    """
+    canonical = json.dumps(
+        {
+            "candidate_info": request.candidate_info.model_dump(),
+            "rubric": hashlib.sha256(request.rubric.encode("utf-8")).hexdigest(),
+            "transcript": hashlib.sha256(request.transcript.encode("utf-8")).hexdigest(),
+            "prompt_versions": prompt_versions,
+            "pipeline": request.pipeline
+        },
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def evaluation_from_checkpoint(evaluation_id: str, values: dict) -> dict:
+    """Rebuild a stored evaluation's inputs from its checkpointed graph state.
+
+    Args:
+        evaluation_id: Unique identifier for the evaluation
+        values: Checkpointed graph state
+
+    Returns:
+        Evaluation data without status fields
+    """
+    return {
+        "evaluation_id": evaluation_id,
+        "created_at": values["metadata"]["timestamps"]["start"],
+        "input": {
+            "candidate_info": dict(values["candidate_info"]),
+            "rubric": values["rubric"],
+            "transcript": values["transcript"],
+            "pipeline": values["metadata"].get("pipeline", "full"),
+            "prompt_versions": values["metadata"].get("prompt_versions", {})
+        },
+        "result": None
+    }
 
 
 class EvaluationService:
     """Service for managing evaluations and executing the LangGraph workflow."""
 
     def __init__(self):
-        """Initialize the evaluation service."""
+        """Initialize the evaluation service.
+
+        Raises:
+            ValueError: If storage shared by every API worker is configured
+                with the in-process queue, whose workers would each re-queue
+                the same pending evaluations on startup
+        """
         self.storage = storage
+        self.blob_store = get_blob_store()
+        # Evaluations run on a bounded worker pool instead of one task each
+        self.job_queue = create_job_queue()
+        if self.storage.shared and not self.job_queue.external_workers:
+            raise ValueError(
+                "Shared evaluation storage (redis) needs job_queue.backend 'sqlite' "
+                "with out-of-process workers"
+            )
         # WebSocket manager will be injected later
         self.websocket_manager: Optional[Callable] = None
+        # Serializes the duplicate check with the save of a new submission
+        # (within this process; see _submission_claim)
+        self._submit_lock = asyncio.Lock()
 
     def set_websocket_manager(self, manager: Callable):
         """Set the WebSocket manager for event broadcasting.
@@ -29,127 +161,464 @@ class EvaluationService:
         """
         self.websocket_manager = manager
 
+    async def start(self):
+        """Start the evaluation workers, or the relay from out-of-process workers."""
+        if self.job_queue.external_workers:
+            await self.job_queue.start_relay(self._apply_relayed)
+        else:
+            await self.job_queue.start(self._run_job)
+
+    async def stop(self):
+        """Stop the evaluation workers (or the relay)."""
+        await self.job_queue.stop()
+
     async def create_evaluation(
         self,
         request: CreateEvaluationRequest,
-        background_tasks: BackgroundTasks
+        idempotency_key: Optional[str] = None,
+        force: bool = False
     ) -> EvaluationResponse:
-        """Create a new evaluation and start processing.
+        """Create a new evaluation and queue it for processing.
+
+        A submission whose fingerprint (see submission_fingerprint) matches an
+        evaluation of the same tenant and priority class that is still queued
+        or running, or that completed within
+        deduplication.completed_window_minutes, is attached to that evaluation
+        instead of starting a new one. A repeated Idempotency-Key always
+        returns the evaluation created with it.
 
         Args:
             request: Evaluation request data
-            background_tasks: FastAPI background tasks handler
+            idempotency_key: Client-supplied key identifying this submission
+            force: Start a new evaluation even if a duplicate exists
 
         Returns:
-            Initial evaluation response with ID and status
-        """
-        # Generate unique ID
-        evaluation_id = str(uuid.uuid4())
-
-        # Store initial state
-        initial_data = {
-            "evaluation_id": evaluation_id,
-            "status": "pending",
-            "progress_percentage": 0,
-            "created_at": datetime.now().isoformat(),
-            "input": {
-                "candidate_info": request.candidate_info.model_dump(),
-                "rubric": request.rubric,
-                "transcript": request.transcript
-            },
-            "result": None,
-            "error": None
-        }
-        await self.storage.save(evaluation_id, initial_data)
-
-        # Start background task for execution
-        background_tasks.add_task(
-            self._execute_evaluation_background,
-            evaluation_id,
-            request
-        )
+            Evaluation response with ID, status and queue position;
+            deduplicated is set when an existing evaluation was returned
+
+        Raises:
+            IdempotencyKeyConflict: If the key was used for a different submission
+            QueueFullError: If the job queue is at its maximum depth
+        """
+        # Prompts are pinned now so edits made while queued don't apply
+        prompt_versions = await asyncio.to_thread(pin_prompt_versions)
+        # Fingerprints are scoped by tenant and priority class so a submission
+        # never attaches to another team's evaluation or queues behind its priority
+        fingerprint = f"{request.tenant}:{request.priority}:{submission_fingerprint(request, prompt_versions)}"
+        # Keys are scoped by tenant so teams cannot collide
+        scoped_key = f"{request.tenant}:{idempotency_key}" if idempotency_key else None
+
+        async with self._submission_claim(fingerprint, scoped_key):
+            existing = await self._find_duplicate(fingerprint, scoped_key, force)
+            if existing:
+                logger.info(f"Submission attached to evaluation {existing['evaluation_id']}")
+                response = await self.get_evaluation(existing["evaluation_id"])
+                return response.model_copy(update={
+                    "deduplicated": True,
+                    "websocket_url": f"ws://localhost:8000/ws/evaluations/{existing['evaluation_id']}"
+                })
+
+            # Reject before doing any work when the queue is already full
+            self.job_queue.check_capacity()
+
+            # Large texts are stored once in the blob store and referenced from
+            # storage and graph state; they are only put for a new evaluation,
+            # so attached or conflicting submissions leave no unowned blobs
+            rubric_ref = await asyncio.to_thread(self.blob_store.put, request.rubric)
+            transcript_ref = await asyncio.to_thread(self.blob_store.put, request.transcript)
+
+            # Generate unique ID
+            evaluation_id = str(uuid.uuid4())
+            # The evaluation owns its texts until it is deleted or expires
+            await asyncio.to_thread(self.blob_store.acquire, evaluation_id, [rubric_ref, transcript_ref])
+
+            # Store initial state
+            initial_data = {
+                "evaluation_id": evaluation_id,
+                "status": "pending",
+                "progress_percentage": 0,
+                "created_at": datetime.now().isoformat(),
+                "priority": request.priority,
+                "tenant": request.tenant,
+                "fingerprint": fingerprint,
+                "idempotency_key": scoped_key,
+                "input": {
+                    "candidate_info": request.candidate_info.model_dump(),
+                    "rubric": rubric_ref,
+                    "transcript": transcript_ref,
+                    "pipeline": request.pipeline,
+                    "prompt_versions": prompt_versions
+                },
+                "result": None,
+                "error": None
+            }
+            await self.storage.save(evaluation_id, initial_data)
+
+            # Queue for execution (the queue may have filled up meanwhile)
+            try:
+                position = await self.job_queue.submit(
+                    evaluation_id,
+                    {"resume": False, "input": initial_data["input"]},
+                    priority=request.priority,
+                    tenant=request.tenant
+                )
+            except Exception:
+                await self.storage.delete(evaluation_id)
+                await asyncio.to_thread(self.blob_store.release, evaluation_id)
+                raise
 
         # Return response
         return EvaluationResponse(
             evaluation_id=evaluation_id,
             status="pending",
             progress_percentage=0,
+            priority=request.priority,
+            tenant=request.tenant,
+            queue_position=position,
+            eta_seconds=self.job_queue.eta_seconds(evaluation_id),
             created_at=initial_data["created_at"],
             websocket_url=f"ws://localhost:8000/ws/evaluations/{evaluation_id}"
         )
 
-    async def _execute_evaluation_background(
+    @asynccontextmanager
+    async def _submission_claim(self, fingerprint: str, scoped_key: Optional[str]):
+        """Serialize the duplicate check and save of submissions that could attach.
+
+        With storage shared by every API worker, the fingerprint and
+        Idempotency-Key are claimed in the store itself, so identical
+        submissions to different workers cannot both miss each other;
+        otherwise the process lock is enough.
+
+        Args:
+            fingerprint: Tenant- and priority-scoped submission fingerprint
+            scoped_key: Tenant-scoped Idempotency-Key, if any
+        """
+        if not self.storage.shared:
+            async with self._submit_lock:
+                yield
+            return
+
+        names = [f"fingerprint:{fingerprint}"]
+        if scoped_key:
+            names.append(f"idempotency:{scoped_key}")
+        token = uuid.uuid4().hex
+        while not await self.storage.claim(names, token, SUBMISSION_CLAIM_SECONDS):
+            await asyncio.sleep(SUBMISSION_CLAIM_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            await self.storage.release_claim(names, token)
+
+    async def _find_duplicate(
         self,
-        evaluation_id: str,
-        request: CreateEvaluationRequest
-    ):
-        """Background task to execute the evaluation graph.
+        fingerprint: str,
+        scoped_key: Optional[str],
+        force: bool
+    ) -> Optional[dict]:
+        """Find the evaluation a submission should attach to.
+
+        Args:
+            fingerprint: Tenant- and priority-scoped submission fingerprint
+            scoped_key: Tenant-scoped Idempotency-Key, if any
+            force: Skip fingerprint deduplication
+
+        Returns:
+            Existing evaluation data, or None to create a new evaluation
+
+        Raises:
+            IdempotencyKeyConflict: If the key was used for a different submission
+        """
+        if scoped_key:
+            existing = await self.storage.find_by_idempotency_key(scoped_key)
+            if existing:
+                if existing.get("fingerprint") != fingerprint:
+                    raise IdempotencyKeyConflict(
+                        "Idempotency-Key was already used for a different submission"
+                    )
+                return existing
+
+        dedup_config = config["deduplication"]
+        if force or not dedup_config["enabled"]:
+            return None
+
+        existing = await self.storage.find_by_fingerprint(fingerprint)
+        if not existing:
+            return None
+        if existing["status"] in ("pending", "processing"):
+            return existing
+        if existing["status"] == "completed" and existing.get("completed_at"):
+            window = timedelta(minutes=dedup_config["completed_window_minutes"])
+            if datetime.now() - datetime.fromisoformat(existing["completed_at"]) <= window:
+                return existing
+        return None
+
+    async def resume_evaluation(self, evaluation_id: str) -> Optional[EvaluationResponse]:
+        """Resume a failed or interrupted evaluation from its last checkpoint.
+
+        Nodes that already completed are not run again.
 
         Args:
             evaluation_id: Unique identifier for the evaluation
-            request: Evaluation request data
+
+        Returns:
+            Evaluation response, or None if no checkpoint exists
+
+        Raises:
+            ValueError: If the evaluation is still running or already finished
+            QueueFullError: If the job queue is at its maximum depth
         """
-        try:
-            # Update status to processing
-            eval_data = await self.storage.get(evaluation_id)
-            if eval_data:
-                eval_data["status"] = "processing"
-                await self.storage.save(evaluation_id, eval_data)
-
-            # Create graph executor with event emitter
-            executor = GraphExecutor(event_emitter=self._emit_websocket_event)
-
-            # Execute the graph (this will use your existing LangGraph from src/graph/graph.py)
-            start_time = datetime.now()
-            final_state = await executor.execute_graph(
-                evaluation_id=evaluation_id,
-                rubric=request.rubric,
-                transcript=request.transcript,
-                candidate_info=request.candidate_info.model_dump()
-            )
-            end_time = datetime.now()
-            execution_time = (end_time - start_time).total_seconds()
+        eval_data = await self.storage.get(evaluation_id)
+        if eval_data and eval_data["status"] in ("pending", "processing", "cancelling"):
+            raise ValueError(f"Evaluation {evaluation_id} is already running")
+
+        graph = await asyncio.to_thread(get_graph_for_evaluation, evaluation_id)
+        snapshot = await asyncio.to_thread(graph.get_state, thread_config(evaluation_id))
+        if not snapshot.values:
+            return None
+        if not snapshot.next:
+            raise ValueError(f"Evaluation {evaluation_id} has already completed")
+
+        self.job_queue.check_capacity()
+        eval_data = await self._mark_resumed(evaluation_id, eval_data, snapshot.values)
+        position = await self._submit_resumed(evaluation_id, eval_data)
+
+        return EvaluationResponse(
+            evaluation_id=evaluation_id,
+            status=eval_data["status"],
+            progress_percentage=eval_data.get("progress_percentage", 0),
+            priority=eval_data["priority"],
+            tenant=eval_data["tenant"],
+            queue_position=position,
+            eta_seconds=self.job_queue.eta_seconds(evaluation_id),
+            created_at=eval_data["created_at"],
+            websocket_url=f"ws://localhost:8000/ws/evaluations/{evaluation_id}"
+        )
+
+    async def cancel_evaluation(self, evaluation_id: str) -> Optional[EvaluationResponse]:
+        """Cancel a queued or running evaluation.
+
+        A queued evaluation is removed from the queue. A running one stops
+        before its next node and its in-flight LLM request is aborted; it is
+        marked cancelled (with the tokens it spent) once the run has stopped.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            Evaluation response, or None if the evaluation does not exist
 
-            # Update final state with execution time
-            if "metadata" in final_state:
-                final_state["metadata"]["execution_time_seconds"] = execution_time
+        Raises:
+            ValueError: If the evaluation is not queued or running
+        """
+        eval_data = await self.storage.get_status(evaluation_id)
+        if not eval_data:
+            return None
+        if eval_data["status"] not in ("pending", "processing", "cancelling"):
+            raise ValueError(f"Evaluation {evaluation_id} is already {eval_data['status']}")
+
+        outcome = self.job_queue.cancel(evaluation_id)
+        if outcome is None:
+            raise ValueError(f"Evaluation {evaluation_id} is not running")
+
+        if outcome == "cancelled":
+            # Never started, so nothing was spent
+            tokens = {"input": 0, "output": 0, "calls": 0, "estimated": False, "total": 0}
+            await self._update_evaluation(evaluation_id, {
+                "status": "cancelled",
+                "tokens_used": tokens,
+                "completed_at": datetime.now().isoformat()
+            })
+            await self._emit_websocket_event(evaluation_id, {
+                "type": "cancelled",
+                "evaluation_id": evaluation_id,
+                "tokens": tokens,
+                "timestamp": datetime.now().isoformat()
+            })
+        else:
+            await self._update_evaluation(evaluation_id, {"status": "cancelling"})
+
+        return await self.get_evaluation(evaluation_id)
+
+    async def resume_incomplete_evaluations(self) -> int:
+        """Resume evaluations interrupted by a process restart.
+
+        Runs whose last node failed are left alone; they can be resumed
+        explicitly through resume_evaluation. Evaluations a persistent store
+        still records as queued or running without an interrupted checkpoint
+        (they had not started, or finished their graph just before the restart)
+        are queued again. With out-of-process workers nothing is done here:
+        interrupted jobs stay in the durable queue and are redelivered when
+        their lease expires.
+
+        Returns:
+            Number of evaluations resumed
+        """
+        if self.job_queue.external_workers:
+            return 0
+
+        checkpointer = get_pipeline_graph("full").checkpointer
+        incomplete = await asyncio.to_thread(
+            list_incomplete_evaluations, checkpointer, get_graph_for_evaluation
+        )
 
-            # Store completed evaluation
+        for item in incomplete:
+            evaluation_id = item["evaluation_id"]
             eval_data = await self.storage.get(evaluation_id)
-            if eval_data:
-                eval_data["status"] = "completed"
-                eval_data["progress_percentage"] = 100
-                eval_data["result"] = final_state
-                eval_data["completed_at"] = end_time.isoformat()
-                await self.storage.save(evaluation_id, eval_data)
-
-        except Exception as e:
-            # Handle errors
-            error_message = str(e)
+            eval_data = await self._mark_resumed(evaluation_id, eval_data, item["values"])
+            logger.info(f"Resuming evaluation {evaluation_id} at {item['next']}")
+            await self._submit_resumed(evaluation_id, eval_data)
+
+        resumed = {item["evaluation_id"] for item in incomplete}
+        stranded = [
+            summary for summary in await self.storage.list_by_status(("pending", "processing", "cancelling"))
+            if summary["evaluation_id"] not in resumed
+        ]
+        for summary in stranded:
+            evaluation_id = summary["evaluation_id"]
+            if summary["status"] == "cancelling":
+                await self._update_evaluation(evaluation_id, {
+                    "status": "cancelled",
+                    "completed_at": datetime.now().isoformat()
+                })
+                continue
+
             eval_data = await self.storage.get(evaluation_id)
-            if eval_data:
-                eval_data["status"] = "failed"
-                eval_data["error"] = error_message
-                await self.storage.save(evaluation_id, eval_data)
-
-            # Emit error event via WebSocket
-            if self.websocket_manager:
-                await self._emit_websocket_event(
-                    evaluation_id,
-                    {
-                        "type": "error",
-                        "error": error_message,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                )
+            graph = await asyncio.to_thread(get_graph_for_evaluation, evaluation_id)
+            snapshot = await asyncio.to_thread(graph.get_state, thread_config(evaluation_id))
+            await self._update_evaluation(evaluation_id, {"status": "pending", "error": None})
+            logger.info(f"Re-queueing evaluation {evaluation_id}")
+            await self.job_queue.submit(
+                evaluation_id,
+                # A finished graph only needs its result recorded
+                {"resume": bool(snapshot.values), "input": eval_data["input"]},
+                enforce_limit=False,
+                priority=eval_data.get("priority", "interactive"),
+                tenant=eval_data.get("tenant", DEFAULT_TENANT)
+            )
+
+        return len(incomplete) + len(stranded)
+
+    async def _submit_resumed(self, evaluation_id: str, eval_data: dict) -> int:
+        """Queue a resumed evaluation in its original priority class and tenant.
+
+        Resumed work is not subject to admission control.
+
+        Returns:
+            1-based queue position
+        """
+        return await self.job_queue.submit(
+            evaluation_id,
+            {"resume": True, "input": eval_data["input"]},
+            enforce_limit=False,
+            priority=eval_data["priority"],
+            tenant=eval_data["tenant"]
+        )
+
+    async def _mark_resumed(
+        self,
+        evaluation_id: str,
+        eval_data: Optional[dict],
+        values: dict
+    ) -> dict:
+        """Reset a stored evaluation to pending, rebuilding it from the checkpoint if needed.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            eval_data: Stored evaluation data, None if lost in a restart
+            values: Checkpointed graph state
+
+        Returns:
+            Updated evaluation data
+        """
+        if eval_data:
+            # Stored records are snapshots; save a modified copy
+            eval_data = dict(eval_data)
+        else:
+            eval_data = evaluation_from_checkpoint(evaluation_id, values)
+
+        eval_data["status"] = "pending"
+        eval_data["error"] = None
+        eval_data.setdefault("progress_percentage", 0)
+        eval_data.setdefault("priority", "interactive")
+        eval_data.setdefault("tenant", DEFAULT_TENANT)
+        await asyncio.to_thread(self.blob_store.acquire, evaluation_id, find_refs(eval_data))
+        await self.storage.save(evaluation_id, eval_data)
+        return eval_data
+
+    async def _run_job(self, evaluation_id: str, payload: dict, cancel_token: CancelToken) -> str:
+        """Run a queued evaluation inside the API process.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            payload: Job payload (see run_evaluation_job)
+            cancel_token: Token tripped by cancel_evaluation
+
+        Returns:
+            Final status: "completed", "failed" or "cancelled"
+        """
+        status, _ = await run_evaluation_job(
+            evaluation_id, payload, self._emit_websocket_event, self._update_evaluation, cancel_token
+        )
+        return status
+
+    async def _update_evaluation(self, evaluation_id: str, fields: dict):
+        """Merge fields into a stored evaluation, if it still exists.
+
+        The evaluation takes ownership of the blobs the fields reference. A
+        completed evaluation is also folded into the analytics rollups.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            fields: Fields to set
+        """
+        # Owned before they are stored, so no concurrent release deletes them
+        refs = find_refs(fields)
+        if refs:
+            await asyncio.to_thread(self.blob_store.acquire, evaluation_id, refs)
+        eval_data = await self.storage.update(evaluation_id, fields)
+        if eval_data is None and refs:
+            # Deleted (expired) meanwhile
+            await asyncio.to_thread(self.blob_store.release, evaluation_id)
+        if eval_data and fields.get("status") == "completed":
+            try:
+                eval_data = await self.storage.get(evaluation_id)
+                if eval_data:
+                    await asyncio.to_thread(record_evaluation, eval_data)
+            except Exception as e:
+                logger.error(f"Failed to record analytics for {evaluation_id}: {e}")
+
+    async def _apply_relayed(self, evaluation_id: str, kind: str, data: dict):
+        """Apply a status update or WebSocket event relayed by an out-of-process worker.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            kind: "update" (stored evaluation fields) or "event" (WebSocket event)
+            data: Update fields or event data
+        """
+        if kind == "update":
+            await self._update_evaluation(evaluation_id, data)
+        else:
+            await self._emit_websocket_event(evaluation_id, data)
 
     async def _emit_websocket_event(self, evaluation_id: str, event_data: dict):
         """Emit WebSocket event to connected clients.
 
+        Each event gets the evaluation's next version number, which is also
+        reported by get_evaluation, so clients can skip events emitted before
+        a state they fetched. Progress carried by the event is stored, so the
+        REST status reports the same numbers as the stream.
+
         Args:
             evaluation_id: ID of the evaluation
             event_data: Event data to broadcast
         """
+        fields = {field: event_data[field] for field in ("progress_percentage", "eta_seconds") if field in event_data}
+        if event_data.get("node"):
+            fields["current_step"] = event_data["node"]
+        eval_data = await self.storage.update(evaluation_id, fields, increment="version")
+        if eval_data:
+            event_data = {**event_data, "version": eval_data["version"]}
+
         if self.websocket_manager:
             await self.websocket_manager.broadcast(evaluation_id, event_data)
 
@@ -162,49 +631,143 @@ class EvaluationService:
         Returns:
             Evaluation response if found, None otherwise
         """
-        eval_data = await self.storage.get(evaluation_id)
+        # Only completed evaluations need the (large) stored result
+        eval_data = await self.storage.get_status(evaluation_id)
+        if eval_data and eval_data["status"] == "completed":
+            eval_data = await self.storage.get(evaluation_id)
         if not eval_data:
             return None
 
+        # Stored results hold blob references; resolve the texts the response returns
+        result = eval_data.get("result")
+        if result:
+            result = await asyncio.to_thread(
+                self.blob_store.resolve_fields, result, GraphExecutor.RESPONSE_TEXT_FIELDS
+            )
+
+        # Queued evaluations report the queue's ETA, running ones the ETA of
+        # their last progress event
+        running = eval_data["status"] == "processing"
+        eta_seconds = self.job_queue.eta_seconds(evaluation_id)
+        if running:
+            eta_seconds = eval_data.get("eta_seconds")
+
         return EvaluationResponse(
             evaluation_id=eval_data["evaluation_id"],
             status=eval_data["status"],
+            current_step=eval_data.get("current_step") if running else None,
             progress_percentage=eval_data.get("progress_percentage", 0),
-            result=eval_data.get("result"),
+            priority=eval_data.get("priority"),
+            tenant=eval_data.get("tenant"),
+            queue_position=self.job_queue.position(evaluation_id),
+            eta_seconds=eta_seconds,
+            result=result,
             error=eval_data.get("error"),
+            tokens_used=eval_data.get("tokens_used"),
+            version=eval_data.get("version", 0),
             created_at=eval_data["created_at"],
             completed_at=eval_data.get("completed_at")
         )
 
+    def queue_stats(self) -> dict:
+        """Job queue statistics, overall and per tenant."""
+        return self.job_queue.stats()
+
+    async def storage_stats(self) -> dict:
+        """Evaluation store and blob store statistics."""
+        return {**await self.storage.get_stats(), "blobs": get_blob_store().stats()}
+
     async def list_evaluations(
         self,
         limit: int = 20,
-        offset: int = 0
-    ) -> tuple[list[EvaluationListItem], int]:
-        """List all evaluations with pagination.
+        offset: int = 0,
+        after: Optional[str] = None,
+        status: Optional[str] = None,
+        candidate: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> tuple[list[EvaluationListItem], Optional[int], Optional[str]]:
+        """List evaluations, newest first.
+
+        Pages are fetched from the cursor with the storage's ordered indexes;
+        offset pagination is kept for existing clients and only applies to
+        unfiltered listings.
 
         Args:
             limit: Maximum number of results
-            offset: Number of results to skip
+            offset: Number of results to skip (without cursor or filters)
+            after: Cursor from the previous page's next_cursor
+            status: Only evaluations with this status
+            candidate: Only evaluations of this candidate (case-insensitive)
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
 
         Returns:
-            Tuple of (evaluation list, total count)
-        """
-        all_evals, total = await self.storage.list_all(limit, offset)
-
-        items = []
-        for eval_data in all_evals:
-            candidate_info = eval_data.get("input", {}).get("candidate_info", {})
-            items.append(
-                EvaluationListItem(
-                    evaluation_id=eval_data["evaluation_id"],
-                    candidate_name=candidate_info.get("name", "Unknown"),
-                    status=eval_data["status"],
-                    created_at=eval_data["created_at"],
-                    completed_at=eval_data.get("completed_at")
-                )
+            Tuple of (evaluation list, total count or None when filtered,
+            cursor of the next page or None on the last page)
+
+        Raises:
+            InvalidCursorError: If after is not a cursor from a previous page
+        """
+        filtered = any(value is not None for value in (status, candidate, created_from, created_to))
+        if offset and after is None and not filtered:
+            all_evals, total = await self.storage.list_all(limit, offset)
+            has_more = offset + len(all_evals) < total
+        else:
+            all_evals, has_more = await self.storage.list_page(
+                limit,
+                after=decode_cursor(after) if after is not None else None,
+                status=status,
+                candidate=candidate,
+                created_from=created_from,
+                created_to=created_to
             )
+            total = None if filtered else await self.storage.count()
+
+        items = [EvaluationListItem(**list_item_fields(eval_data)) for eval_data in all_evals]
+
+        next_cursor = None
+        if has_more and all_evals:
+            next_cursor = encode_cursor(all_evals[-1]["created_at"], all_evals[-1]["evaluation_id"])
+        return items, total, next_cursor
+
+    async def search_evaluations(
+        self,
+        q: str,
+        limit: int = 20,
+        offset: int = 0,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> tuple[list[EvaluationSearchItem], int]:
+        """Full-text search over candidate names, levels, decisions and rationales.
 
+        Args:
+            q: Words and "quoted phrases", all of which must match
+            limit: Maximum number of results
+            offset: Number of results to skip
+            status: Only evaluations with this status
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of (results best match first, number of matches)
+
+        Raises:
+            InvalidSearchQueryError: If q has no searchable words
+        """
+        matches, total = await self.storage.search(
+            parse_query(q),
+            limit,
+            offset,
+            status=status,
+            created_from=created_from,
+            created_to=created_to
+        )
+        items = [
+            EvaluationSearchItem(**list_item_fields(eval_data), score=round(score, 4))
+            for eval_data, score in matches
+        ]
         return items, total
 
 
@@ -0,0 +1,116 @@
+"""Fan-out of WebSocket events across API workers.
+
+A client's WebSocket lands on one worker while its evaluation may run (or be
+relayed) on another. With events.backend "redis", WebSocketManager publishes
+every evaluation event on a Redis channel and each worker forwards the events
+it receives to its own connected clients.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from src.graph.checkpoint import config
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.client import PubSub
+
+
+logger = logging.getLogger(__name__)
+
+
+class RedisEventBus:
+    """Evaluation events published on "<prefix>events:<evaluation_id>" channels."""
+
+    def __init__(self, client: "Redis", key_prefix: str = "interview:"):
+        """Initialize the bus.
+
+        Args:
+            client: redis.asyncio client created with decode_responses=True
+            key_prefix: Prefix of every channel
+        """
+        self.client = client
+        self.channel_prefix = f"{key_prefix}events:"
+        self._pubsub: Optional["PubSub"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def publish(self, evaluation_id: str, message: dict):
+        """Send an event to the subscribers of every worker (this one included)."""
+        await self.client.publish(self.channel_prefix + evaluation_id, json.dumps(message))
+
+    async def start(self, deliver: Callable[[str, dict], Awaitable[None]]):
+        """Start forwarding published events.
+
+        Args:
+            deliver: Coroutine called as deliver(evaluation_id, message) for
+                each event published by any worker
+        """
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.psubscribe(f"{self.channel_prefix}*")
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._listen(self._pubsub, self._stopping, deliver))
+
+    async def _listen(
+        self,
+        pubsub: "PubSub",
+        stopping: asyncio.Event,
+        deliver: Callable[[str, dict], Awaitable[None]]
+    ):
+        # Runs until stop() sets the event: redis-py can swallow a task
+        # cancellation while it waits for a message
+        while not stopping.is_set():
+            try:
+                message = await pubsub.get_message(timeout=1.0)
+            except Exception as e:
+                if stopping.is_set():
+                    break  # stop() closed the connection
+                logger.error(f"Event subscription failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "pmessage":
+                continue
+            try:
+                await deliver(message["channel"][len(self.channel_prefix):], json.loads(message["data"]))
+            except Exception as e:
+                logger.error(f"Failed to deliver event from {message['channel']}: {e}")
+
+    async def stop(self, timeout: float = 5.0):
+        """Stop forwarding events.
+
+        Args:
+            timeout: Seconds to wait for the listener before abandoning it
+        """
+        if self._stopping:
+            self._stopping.set()
+            self._stopping = None
+        # Closing the connection first wakes a listener waiting for a message
+        if self._pubsub:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._task:
+            done, _ = await asyncio.wait({self._task}, timeout=timeout)
+            if not done:
+                logger.warning("Event listener did not stop in time, cancelling it")
+                self._task.cancel()
+            self._task = None
+
+
+def create_event_bus() -> Optional[RedisEventBus]:
+    """Create the event bus from config.yaml (events section).
+
+    events.backend selects "local" (events only reach clients connected to
+    the worker that emits them; no bus) or "redis". EVALUATION_EVENTS_BACKEND
+    overrides the config.
+    """
+    backend = os.getenv("EVALUATION_EVENTS_BACKEND") or config["events"].get("backend", "local")
+    if backend == "redis":
+        from .redis_client import get_redis_client, redis_key_prefix
+
+        return RedisEventBus(get_redis_client(), redis_key_prefix())
+    if backend != "local":
+        raise ValueError(f"Unknown events backend: {backend}")
+    return None
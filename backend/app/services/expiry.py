@@ -0,0 +1,129 @@
+"""Time-to-live expiry of stored evaluations.
+
+An evaluation expires a configurable number of hours after it reached its
+current status, so a long queue wait does not shorten the life of a finished
+result, and statuses without a TTL (evaluations still queued or running)
+never expire. The stores keep their evaluations ordered by that time per
+status; ExpiryTask evicts the expired ones in small batches from a background
+task, and releases what else the evicted evaluations hold (checkpoint
+threads, blobs).
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    from .sqlite_storage import SqliteStorageService
+    from .storage_service import StorageService
+
+
+logger = logging.getLogger(__name__)
+
+
+EVALUATION_STATUSES = ("pending", "processing", "completed", "failed", "cancelling", "cancelled")
+
+
+class ExpiryPolicy:
+    """Time-to-live of evaluations per status."""
+
+    def __init__(self, ttl_hours: Optional[float] = 24, ttl_hours_by_status: Optional[Dict[str, Optional[float]]] = None):
+        """Initialize the policy.
+
+        Args:
+            ttl_hours: Hours an evaluation is kept after reaching its status
+                (None keeps it forever)
+            ttl_hours_by_status: Per-status overrides of ttl_hours; None values
+                keep evaluations in that status forever
+        """
+        self.ttl_hours = ttl_hours
+        self.ttl_hours_by_status = dict(ttl_hours_by_status or {})
+
+    def ttl(self, status: str) -> Optional[timedelta]:
+        """Time-to-live of evaluations in a status, None if they never expire."""
+        hours = self.ttl_hours_by_status.get(status, self.ttl_hours)
+        return None if hours is None else timedelta(hours=hours)
+
+    def cutoffs(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """ISO time before which evaluations reaching each expiring status have expired."""
+        now = now or datetime.now()
+        cutoffs = {}
+        for status in {*EVALUATION_STATUSES, *self.ttl_hours_by_status}:
+            ttl = self.ttl(status)
+            if ttl is not None:
+                cutoffs[status] = (now - ttl).isoformat()
+        return cutoffs
+
+
+class ExpiryTask:
+    """Background task evicting expired evaluations in small batches.
+
+    Each batch holds the store's lock (or write transaction) only briefly, so
+    requests interleave with a large sweep.
+    """
+
+    def __init__(
+        self,
+        storage: Union["StorageService", "SqliteStorageService"],
+        interval_seconds: float = 60,
+        batch_size: int = 100,
+        release: Optional[Callable[[List[str]], None]] = None
+    ):
+        """Initialize the task.
+
+        Args:
+            storage: Evaluation store to sweep
+            interval_seconds: Time between sweeps
+            batch_size: Maximum evaluations evicted per batch
+            release: Called in a thread with the IDs of each evicted batch to
+                free what else they hold
+        """
+        self.storage = storage
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.release = release
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start sweeping in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop sweeping."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def sweep(self) -> Dict[str, int]:
+        """Evict every expired evaluation, one batch at a time.
+
+        Returns:
+            Number of evaluations evicted per status
+        """
+        evicted: Dict[str, int] = {}
+        while True:
+            batch = await self.storage.cleanup_expired(self.batch_size)
+            evaluation_ids = [evaluation_id for ids in batch.values() for evaluation_id in ids]
+            for status, ids in batch.items():
+                evicted[status] = evicted.get(status, 0) + len(ids)
+            if evaluation_ids and self.release:
+                await asyncio.to_thread(self.release, evaluation_ids)
+            if len(evaluation_ids) < self.batch_size:
+                break
+            # Let waiting requests take the lock between batches
+            await asyncio.sleep(0)
+
+        if evicted:
+            breakdown = ", ".join(f"{status}: {count}" for status, count in sorted(evicted.items()))
+            logger.info(f"Expired {sum(evicted.values())} evaluation(s) ({breakdown})")
+        return evicted
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Evaluation expiry sweep failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,338 @@
+"""Bounded job queue that runs evaluations on a fixed number of workers."""
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from src.graph.checkpoint import BASE_DIR, config
+from src.utils.cancellation import CancelToken
+
+if TYPE_CHECKING:
+    from .persistent_queue import SqliteJobQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+# Priority classes, highest first; a class is only served when every class
+# before it has no waiting jobs
+PRIORITY_CLASSES = ("interactive", "batch")
+
+DEFAULT_TENANT = "default"
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at its maximum depth."""
+
+    def __init__(self, max_depth: int, retry_after: float):
+        super().__init__(f"Evaluation queue is full ({max_depth} waiting)")
+        self.retry_after = retry_after
+
+
+class FairShare:
+    """Weighted fair queuing tags (start-time fair queuing) per tenant.
+
+    Each job gets a virtual start tag max(V, tenant's last finish) and a
+    finish tag start + 1 / weight; serving jobs in finish-tag order gives every
+    tenant with waiting work a share of starts proportional to its weight, no
+    matter how many jobs it queued. V advances to the start tag of the job
+    last served, so idle tenants don't bank credit.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, default_weight: float = 1.0):
+        """Initialize the weights.
+
+        Args:
+            weights: Share weight per tenant
+            default_weight: Weight of tenants not listed in weights
+        """
+        self.weights = weights or {}
+        self.default_weight = default_weight
+
+    def weight(self, tenant: str) -> float:
+        """Share weight of a tenant."""
+        return float(self.weights.get(tenant, self.default_weight))
+
+    def tags(self, virtual_time: float, last_finish: float, tenant: str) -> Tuple[float, float]:
+        """Start and finish tags for a new job of a tenant.
+
+        Args:
+            virtual_time: Start tag of the job last served in the priority class
+            last_finish: Finish tag of the tenant's previous job in the class
+
+        Returns:
+            Tuple of (start tag, finish tag)
+        """
+        start = max(virtual_time, last_finish)
+        return start, start + 1.0 / self.weight(tenant)
+
+
+class JobQueue:
+    """Priority and fair-share queue of evaluation jobs served by async workers.
+
+    Interactive jobs always start before batch jobs; within a priority class,
+    tenants share the workers by weighted fair queuing (see FairShare), so one
+    tenant's burst cannot starve the others. Admission is bounded by max_depth
+    so a burst of submissions is rejected instead of stampeding the LLM quota.
+    Queue position and an ETA based on a moving average of job durations are
+    available for every waiting job.
+    """
+
+    # Jobs are run by workers inside the API process
+    external_workers = False
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_depth: int = 100,
+        default_job_seconds: float = 120.0,
+        fair_share: Optional[FairShare] = None
+    ):
+        """Initialize the queue.
+
+        Args:
+            workers: Number of jobs run concurrently
+            max_depth: Maximum number of waiting jobs before submissions are rejected
+            default_job_seconds: Job duration assumed until real durations are known
+            fair_share: Tenant weights (every tenant weighs 1 by default)
+        """
+        self.workers = workers
+        self.max_depth = max_depth
+        self.fair_share = fair_share or FairShare()
+        # Heap of (priority rank, finish tag, seq, start tag, job_id, tenant, payload)
+        self._waiting: List[Tuple[int, float, int, float, str, str, Dict[str, Any]]] = []
+        self._seq = 0
+        self._virtual_time: Dict[int, float] = defaultdict(float)
+        self._last_finish: Dict[Tuple[int, str], float] = defaultdict(float)
+        # job_id -> (started, tenant)
+        self._running: Dict[str, Tuple[float, str]] = {}
+        # Cancel tokens of running jobs
+        self._cancel_tokens: Dict[str, CancelToken] = {}
+        self._wakeup = asyncio.Condition()
+        self._worker_tasks: list[asyncio.Task] = []
+        self._handler: Optional[Callable[..., Awaitable[Optional[str]]]] = None
+        self._avg_job_seconds = default_job_seconds
+        self._stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self._tenant_stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        )
+
+    async def start(self, handler: Callable[..., Awaitable[Optional[str]]]):
+        """Start the workers.
+
+        Args:
+            handler: Coroutine function called as handler(job_id, payload, cancel_token),
+                returning the job's final status ("completed", "failed" or
+                "cancelled"; None counts as completed)
+        """
+        self._handler = handler
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Cancel the workers; waiting jobs stay unprocessed."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def check_capacity(self):
+        """Raise QueueFullError if a new job would be rejected."""
+        if len(self._waiting) >= self.max_depth:
+            self._stats["rejected"] += 1
+            raise QueueFullError(self.max_depth, self.retry_after())
+
+    def retry_after(self) -> float:
+        """Seconds until a waiting slot is likely to free up."""
+        return max(1.0, self._avg_job_seconds / self.workers)
+
+    async def submit(
+        self,
+        job_id: str,
+        payload: Optional[dict] = None,
+        enforce_limit: bool = True,
+        priority: str = "interactive",
+        tenant: str = DEFAULT_TENANT
+    ) -> int:
+        """Queue a job.
+
+        Args:
+            job_id: Evaluation ID
+            payload: Job payload passed to the handler
+            enforce_limit: Reject the job when the queue is full (off for
+                internal work such as resuming after a restart)
+            priority: Priority class (see PRIORITY_CLASSES)
+            tenant: Team or tenant the job's workers are shared by
+
+        Returns:
+            1-based queue position
+
+        Raises:
+            QueueFullError: If the queue is at max_depth
+        """
+        if enforce_limit:
+            self.check_capacity()
+
+        rank = PRIORITY_CLASSES.index(priority)
+        start, finish = self.fair_share.tags(
+            self._virtual_time[rank], self._last_finish[(rank, tenant)], tenant
+        )
+        self._last_finish[(rank, tenant)] = finish
+        self._seq += 1
+        entry = (rank, finish, self._seq, start, job_id, tenant, payload or {})
+        heapq.heappush(self._waiting, entry)
+
+        self._stats["submitted"] += 1
+        self._tenant_stats[tenant]["submitted"] += 1
+        async with self._wakeup:
+            self._wakeup.notify()
+        return self.position(job_id)
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a waiting or running job.
+
+        Args:
+            job_id: Evaluation ID
+
+        Returns:
+            "cancelled" if the job was removed before starting, "cancelling"
+            if a running job was signalled to stop, None if the job is unknown
+        """
+        for index, entry in enumerate(self._waiting):
+            if entry[4] == job_id:
+                self._waiting.pop(index)
+                heapq.heapify(self._waiting)
+                self._stats["cancelled"] += 1
+                self._tenant_stats[entry[5]]["cancelled"] += 1
+                return "cancelled"
+
+        cancel_token = self._cancel_tokens.get(job_id)
+        if cancel_token:
+            cancel_token.cancel()
+            return "cancelling"
+        return None
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a waiting job, or None if it is not waiting.
+
+        Positions can move back when higher-priority or under-served tenants'
+        jobs arrive.
+        """
+        for entry in self._waiting:
+            if entry[4] == job_id:
+                return 1 + sum(1 for other in self._waiting if other[:3] < entry[:3])
+        return None
+
+    def eta_seconds(self, job_id: str) -> Optional[float]:
+        """Estimated seconds until a waiting job starts, or None if it is not waiting."""
+        position = self.position(job_id)
+        if position is None:
+            return None
+
+        # Jobs ahead start in waves of `workers`; the first wave waits for the
+        # earliest running job to finish
+        now = time.time()
+        remaining = [
+            max(0.0, self._avg_job_seconds - (now - started))
+            for started, _ in self._running.values()
+        ]
+        first_slot = min(remaining) if len(remaining) >= self.workers else 0.0
+        waves_ahead = (position - 1) // self.workers
+        return round(first_slot + waves_ahead * self._avg_job_seconds, 1)
+
+    async def _worker(self, index: int):
+        """Run jobs one at a time until cancelled."""
+        while True:
+            async with self._wakeup:
+                await self._wakeup.wait_for(lambda: bool(self._waiting))
+                rank, _, _, start, job_id, tenant, payload = heapq.heappop(self._waiting)
+                self._virtual_time[rank] = start
+
+            started = time.time()
+            self._running[job_id] = (started, tenant)
+            self._cancel_tokens[job_id] = CancelToken()
+            try:
+                status = await self._handler(job_id, payload, self._cancel_tokens[job_id]) or "completed"
+            except Exception as e:
+                status = "failed"
+                logger.error(f"Worker {index} job {job_id} failed: {e}")
+            finally:
+                del self._running[job_id]
+                del self._cancel_tokens[job_id]
+                # Exponential moving average of job durations for ETAs
+                self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * (time.time() - started)
+            # Failed and cancelled runs are reported by the handler, not raised
+            self._stats[status] += 1
+            self._tenant_stats[tenant][status] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue statistics, overall and per tenant."""
+        tenants = {
+            tenant: {**counts, "weight": self.fair_share.weight(tenant), "waiting": {}, "running": 0}
+            for tenant, counts in self._tenant_stats.items()
+        }
+        for rank, _, _, _, _, tenant, _ in self._waiting:
+            waiting = tenants[tenant]["waiting"]
+            waiting[PRIORITY_CLASSES[rank]] = waiting.get(PRIORITY_CLASSES[rank], 0) + 1
+        for _, tenant in self._running.values():
+            tenants[tenant]["running"] += 1
+
+        return {
+            **self._stats,
+            "workers": self.workers,
+            "max_depth": self.max_depth,
+            "waiting": len(self._waiting),
+            "running": len(self._running),
+            "avg_job_seconds": round(self._avg_job_seconds, 1),
+            "tenants": tenants
+        }
+
+
+def create_job_queue() -> Union[JobQueue, "SqliteJobQueue"]:
+    """Create the job queue from config.yaml (job_queue section).
+
+    job_queue.backend selects "memory" (workers in the API process) or
+    "sqlite" (durable queue served by backend/worker.py). EVALUATION_QUEUE_BACKEND,
+    EVALUATION_QUEUE_DB, EVALUATION_WORKERS and EVALUATION_QUEUE_MAX_DEPTH
+    override the config.
+    """
+    queue_config = config["job_queue"]
+    fair_share = FairShare(
+        weights=queue_config.get("tenant_weights"),
+        default_weight=queue_config.get("default_tenant_weight", 1.0)
+    )
+    workers = int(os.getenv("EVALUATION_WORKERS") or queue_config["workers"])
+    max_depth = int(os.getenv("EVALUATION_QUEUE_MAX_DEPTH") or queue_config["max_depth"])
+    backend = os.getenv("EVALUATION_QUEUE_BACKEND") or queue_config.get("backend", "memory")
+
+    if backend == "sqlite":
+        from .persistent_queue import SqliteJobQueue
+
+        path = os.getenv("EVALUATION_QUEUE_DB") or queue_config["path"]
+        if path != ":memory:" and not os.path.isabs(path):
+            path = os.path.join(BASE_DIR, path)
+        return SqliteJobQueue(
+            path,
+            workers=workers,
+            max_depth=max_depth,
+            default_job_seconds=queue_config["default_job_seconds"],
+            lease_seconds=queue_config["lease_seconds"],
+            max_attempts=queue_config["max_attempts"],
+            poll_seconds=queue_config["poll_seconds"],
+            fair_share=fair_share,
+            finished_job_hours=queue_config.get("finished_job_hours", 24)
+        )
+    if backend != "memory":
+        raise ValueError(f"Unknown job queue backend: {backend}")
+
+    return JobQueue(
+        workers=workers,
+        max_depth=max_depth,
+        default_job_seconds=queue_config["default_job_seconds"],
+        fair_share=fair_share
+    )
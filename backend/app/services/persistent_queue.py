@@ -0,0 +1,602 @@
+"""Durable SQLite job queue shared by the API process and backend/worker.py.
+
+The API enqueues jobs; worker processes lease them with a visibility timeout
+and extend the lease while they run. Jobs are leased in priority class order
+and, within a class, in weighted-fair order across tenants (see FairShare). A job whose worker dies is leased again
+once its lease expires and continues from its graph checkpoint. Workers relay
+status updates and WebSocket events back through a table that the API process
+drains; with several API workers, the one holding the relay lease drains it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from .job_queue import DEFAULT_TENANT, PRIORITY_CLASSES, FairShare, QueueFullError
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    evaluation_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL,
+    leased_by TEXT,
+    lease_expires_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    error TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    tenant TEXT NOT NULL DEFAULT 'default',
+    vstart REAL NOT NULL DEFAULT 0,
+    vfinish REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_evaluation ON jobs (evaluation_id);
+
+-- Fair-share state: each tenant's last finish tag per priority class, and the
+-- class virtual time under the empty tenant
+CREATE TABLE IF NOT EXISTS fair_share (
+    priority INTEGER NOT NULL,
+    tenant TEXT NOT NULL,
+    tag REAL NOT NULL,
+    PRIMARY KEY (priority, tenant)
+);
+
+CREATE TABLE IF NOT EXISTS relay_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    evaluation_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+
+-- The API worker currently draining relay_events
+CREATE TABLE IF NOT EXISTS relay_lease (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+# An API worker takes over the relay when its owner has not renewed it this long
+RELAY_LEASE_SECONDS = 10.0
+
+# Seconds between purges of finished jobs by the relay owner
+PURGE_INTERVAL_SECONDS = 60.0
+
+
+class SqliteJobQueue:
+    """Job queue in a SQLite file, leased by out-of-process workers.
+
+    Exposes the same admission, position and ETA methods as JobQueue for the
+    API side, plus lease/heartbeat/complete/fail/publish for workers.
+    """
+
+    # Jobs are run by backend/worker.py, not by the API process
+    external_workers = True
+
+    def __init__(
+        self,
+        path: str,
+        workers: int = 2,
+        max_depth: int = 100,
+        default_job_seconds: float = 120.0,
+        lease_seconds: float = 300.0,
+        max_attempts: int = 3,
+        poll_seconds: float = 0.5,
+        fair_share: Optional[FairShare] = None,
+        finished_job_hours: Optional[float] = 24
+    ):
+        """Open (and create if needed) the queue database.
+
+        Args:
+            path: SQLite database path
+            workers: Worker processes expected to serve the queue (for ETAs)
+            max_depth: Maximum number of waiting jobs before submissions are rejected
+            default_job_seconds: Job duration assumed until real durations are known
+            lease_seconds: Visibility timeout; a job is redelivered if its worker
+                stops extending the lease for this long
+            max_attempts: Deliveries before a job whose worker keeps dying is failed
+            poll_seconds: Idle wait between checks for new jobs and relay events
+            fair_share: Tenant weights (every tenant weighs 1 by default)
+            finished_job_hours: Hours done, failed and cancelled jobs are kept
+                (None keeps them forever)
+        """
+        self.path = path
+        self.workers = workers
+        self.max_depth = max_depth
+        self.default_job_seconds = default_job_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.fair_share = fair_share or FairShare()
+        self.finished_job_hours = finished_job_hours
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._lock = threading.Lock()
+        self._relay_task: Optional[asyncio.Task] = None
+        self._relay_owner = uuid.uuid4().hex
+
+    def _migrate(self):
+        """Add the scheduling columns to queues created before they existed."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in (
+            ("priority", "INTEGER NOT NULL DEFAULT 0"),
+            ("tenant", "TEXT NOT NULL DEFAULT 'default'"),
+            ("vstart", "REAL NOT NULL DEFAULT 0"),
+            ("vfinish", "REAL NOT NULL DEFAULT 0"),
+        ):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        self._conn.execute("DROP INDEX IF EXISTS idx_jobs_status")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_schedule ON jobs (status, priority, vfinish, id)"
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction (serialized across processes)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a read query."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ------------------------------------------------------------------
+    # API side
+    # ------------------------------------------------------------------
+
+    def depth(self) -> int:
+        """Number of waiting jobs."""
+        return self._query("SELECT COUNT(*) FROM jobs WHERE status = 'queued'")[0][0]
+
+    def check_capacity(self):
+        """Raise QueueFullError if a new job would be rejected."""
+        if self.depth() >= self.max_depth:
+            raise QueueFullError(self.max_depth, self.retry_after())
+
+    def avg_job_seconds(self) -> float:
+        """Average duration of the most recent finished jobs."""
+        rows = self._query(
+            "SELECT AVG(finished_at - started_at) FROM ("
+            "  SELECT finished_at, started_at FROM jobs WHERE status = 'done'"
+            "  ORDER BY id DESC LIMIT 20)"
+        )
+        return rows[0][0] or self.default_job_seconds
+
+    def retry_after(self) -> float:
+        """Seconds until a waiting slot is likely to free up."""
+        return max(1.0, self.avg_job_seconds() / self.workers)
+
+    async def submit(
+        self,
+        job_id: str,
+        payload: Optional[dict] = None,
+        enforce_limit: bool = True,
+        priority: str = "interactive",
+        tenant: str = DEFAULT_TENANT
+    ) -> int:
+        """Queue a job.
+
+        Args:
+            job_id: Evaluation ID
+            payload: Job payload (must carry the evaluation inputs, since
+                workers cannot read the API's storage)
+            enforce_limit: Reject the job when the queue is full
+            priority: Priority class (see PRIORITY_CLASSES)
+            tenant: Team or tenant the job's workers are shared by
+
+        Returns:
+            1-based queue position
+
+        Raises:
+            QueueFullError: If the queue is at max_depth
+        """
+        rank = PRIORITY_CLASSES.index(priority)
+
+        def insert() -> bool:
+            # Depth check, tagging and insert share one transaction so
+            # concurrent API processes cannot overshoot max_depth
+            with self._transaction() as conn:
+                depth = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if enforce_limit and depth >= self.max_depth:
+                    return False
+
+                virtual_time, last_finish = (
+                    self._fair_share_tag(conn, rank, key) for key in ("", tenant)
+                )
+                start, finish = self.fair_share.tags(virtual_time, last_finish, tenant)
+                self._set_fair_share_tag(conn, rank, tenant, finish)
+                conn.execute(
+                    "INSERT INTO jobs (evaluation_id, payload, enqueued_at, priority, tenant, vstart, vfinish) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, json.dumps(payload or {}), time.time(), rank, tenant, start, finish)
+                )
+                return True
+
+        if not await asyncio.to_thread(insert):
+            raise QueueFullError(self.max_depth, self.retry_after())
+        return self.position(job_id)
+
+    @staticmethod
+    def _fair_share_tag(conn: sqlite3.Connection, rank: int, tenant: str) -> float:
+        row = conn.execute(
+            "SELECT tag FROM fair_share WHERE priority = ? AND tenant = ?", (rank, tenant)
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    @staticmethod
+    def _set_fair_share_tag(conn: sqlite3.Connection, rank: int, tenant: str, tag: float):
+        conn.execute(
+            "INSERT INTO fair_share (priority, tenant, tag) VALUES (?, ?, ?) "
+            "ON CONFLICT (priority, tenant) DO UPDATE SET tag = excluded.tag",
+            (rank, tenant, tag)
+        )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """Cancel a waiting or running job.
+
+        A running job is flagged "cancelling"; its worker notices within
+        poll_seconds and stops the run.
+
+        Args:
+            job_id: Evaluation ID
+
+        Returns:
+            "cancelled" if the job was removed before starting, "cancelling"
+            if a running job was signalled to stop, None if the job is unknown
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+                "WHERE evaluation_id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+            if cursor.rowcount:
+                return "cancelled"
+
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'cancelling' WHERE evaluation_id = ? AND status = 'leased'",
+                (job_id,)
+            )
+            return "cancelling" if cursor.rowcount else None
+
+    def position(self, job_id: str) -> Optional[int]:
+        """1-based position of a waiting job, or None if it is not waiting.
+
+        Positions can move back when higher-priority or under-served tenants'
+        jobs arrive.
+        """
+        rows = self._query(
+            "SELECT COUNT(*) FROM jobs AS other, ("
+            "  SELECT priority, vfinish, id FROM jobs WHERE evaluation_id = ? AND status = 'queued'"
+            "  ORDER BY id DESC LIMIT 1) AS job "
+            "WHERE other.status = 'queued' "
+            "AND (other.priority, other.vfinish, other.id) <= (job.priority, job.vfinish, job.id)",
+            (job_id,)
+        )
+        return rows[0][0] or None
+
+    def eta_seconds(self, job_id: str) -> Optional[float]:
+        """Estimated seconds until a waiting job starts, or None if it is not waiting."""
+        position = self.position(job_id)
+        if position is None:
+            return None
+
+        avg_job_seconds = self.avg_job_seconds()
+        now = time.time()
+        remaining = [
+            max(0.0, avg_job_seconds - (now - row[0]))
+            for row in self._query("SELECT started_at FROM jobs WHERE status IN ('leased', 'cancelling')")
+        ]
+        first_slot = min(remaining) if len(remaining) >= self.workers else 0.0
+        waves_ahead = (position - 1) // self.workers
+        return round(first_slot + waves_ahead * avg_job_seconds, 1)
+
+    async def start_relay(self, apply: Callable[[str, str, dict], Awaitable[None]]):
+        """Start applying worker updates and events in the API process.
+
+        Args:
+            apply: Coroutine called as apply(evaluation_id, kind, data) for each
+                relayed "update" (stored evaluation fields) or "event" (WebSocket)
+        """
+        self._relay_task = asyncio.create_task(self._relay(apply))
+
+    async def _relay(self, apply: Callable[[str, str, dict], Awaitable[None]]):
+        """Drain the relay table; waits poll_seconds only when it is empty.
+
+        Only the API worker holding the relay lease drains, so each update and
+        event is applied once and in order however many API workers run. The
+        lease is renewed before each row, together with deleting the rows
+        applied so far, so a slow batch never outlives it. The lease holder
+        also purges finished jobs every PURGE_INTERVAL_SECONDS.
+        """
+        purged_at = 0.0
+        while True:
+            if not await asyncio.to_thread(self._claim_relay):
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            if time.time() - purged_at >= PURGE_INTERVAL_SECONDS:
+                purged_at = time.time()
+                purged = await asyncio.to_thread(self.purge_finished)
+                if purged:
+                    logger.info(f"Purged {purged} finished jobs")
+
+            rows = await asyncio.to_thread(
+                self._query,
+                "SELECT seq, evaluation_id, kind, data FROM relay_events ORDER BY seq LIMIT 100"
+            )
+            if not rows:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+
+            for index, row in enumerate(rows):
+                # Another API worker took over: it applies the rest
+                if index and not await asyncio.to_thread(self._claim_relay, row["seq"]):
+                    break
+                try:
+                    await apply(row["evaluation_id"], row["kind"], json.loads(row["data"]))
+                except Exception as e:
+                    logger.error(f"Relay of {row['kind']} for {row['evaluation_id']} failed: {e}")
+            else:
+                await asyncio.to_thread(self._delete_relayed, rows[-1]["seq"])
+
+    def _claim_relay(self, applied_before: Optional[int] = None) -> bool:
+        """Take or renew the relay lease; False while another API worker holds it.
+
+        Args:
+            applied_before: Relay rows below this seq have been applied and are
+                deleted if the lease is still held
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO relay_lease (id, owner, expires_at) VALUES (1, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE relay_lease.owner = excluded.owner OR relay_lease.expires_at < ?
+                """,
+                (self._relay_owner, now + RELAY_LEASE_SECONDS, now)
+            )
+            held = conn.execute("SELECT owner FROM relay_lease").fetchone()[0] == self._relay_owner
+            if held and applied_before is not None:
+                conn.execute("DELETE FROM relay_events WHERE seq < ?", (applied_before,))
+            return held
+
+    def _delete_relayed(self, up_to_seq: int):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM relay_events WHERE seq <= ?", (up_to_seq,))
+
+    async def stop(self):
+        """Stop the relay."""
+        if self._relay_task:
+            self._relay_task.cancel()
+            await asyncio.gather(self._relay_task, return_exceptions=True)
+            self._relay_task = None
+            # Hand the relay to another API worker right away
+            await asyncio.to_thread(self._release_relay)
+
+    def _release_relay(self):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM relay_lease WHERE owner = ?", (self._relay_owner,))
+
+    def purge_finished(self) -> int:
+        """Delete done, failed and cancelled jobs older than finished_job_hours.
+
+        Returns:
+            Number of jobs deleted
+        """
+        if self.finished_job_hours is None:
+            return 0
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND finished_at < ?",
+                (time.time() - self.finished_job_hours * 3600,)
+            )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue statistics, overall and per tenant.
+
+        Finished jobs are counted while they are kept (see finished_job_hours).
+        """
+        counts = {row[0]: row[1] for row in self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status")}
+
+        tenants: Dict[str, Dict[str, Any]] = {}
+        status_names = {"done": "completed", "failed": "failed", "cancelled": "cancelled"}
+        for tenant, rank, status, count in self._query(
+            "SELECT tenant, priority, status, COUNT(*) FROM jobs GROUP BY tenant, priority, status"
+        ):
+            entry = tenants.setdefault(tenant, {
+                "submitted": 0, "completed": 0, "failed": 0, "cancelled": 0,
+                "weight": self.fair_share.weight(tenant), "waiting": {}, "running": 0
+            })
+            entry["submitted"] += count
+            if status == "queued":
+                entry["waiting"][PRIORITY_CLASSES[rank]] = count
+            elif status in ("leased", "cancelling"):
+                entry["running"] += count
+            else:
+                entry[status_names[status]] += count
+
+        return {
+            "workers": self.workers,
+            "max_depth": self.max_depth,
+            "waiting": counts.get("queued", 0),
+            "running": counts.get("leased", 0),
+            "completed": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "cancelled": counts.get("cancelled", 0),
+            "avg_job_seconds": round(self.avg_job_seconds(), 1),
+            "tenants": tenants
+        }
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the next waiting (or abandoned) job in scheduling order.
+
+        Jobs whose lease expired max_attempts times are failed instead of
+        being delivered again; abandoned jobs flagged for cancellation are
+        marked cancelled.
+
+        Args:
+            worker_id: Identifier of the leasing worker
+
+        Returns:
+            Job dict (id, evaluation_id, payload, attempts) or None if idle
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            abandoned = conn.execute(
+                "SELECT id, evaluation_id, attempts FROM jobs "
+                "WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            ).fetchall()
+            for row in abandoned:
+                error = f"Worker stopped responding {row['attempts']} times"
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                    (now, error, row["id"])
+                )
+                self._insert_relay(conn, row["evaluation_id"], "update", {"status": "failed", "error": error})
+
+            abandoned = conn.execute(
+                "SELECT id, evaluation_id FROM jobs WHERE status = 'cancelling' AND lease_expires_at < ?",
+                (now,)
+            ).fetchall()
+            for row in abandoned:
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                    (now, row["id"])
+                )
+                self._insert_relay(conn, row["evaluation_id"], "update", {"status": "cancelled"})
+
+            # Abandoned jobs first (they already had their turn), then by
+            # priority class and fair-share finish tag
+            row = conn.execute(
+                "SELECT id, evaluation_id, payload, attempts, priority, vstart FROM jobs "
+                "WHERE status = 'leased' AND lease_expires_at < ? "
+                "ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    "SELECT id, evaluation_id, payload, attempts, priority, vstart FROM jobs "
+                    "WHERE status = 'queued' ORDER BY priority, vfinish, id LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                self._set_fair_share_tag(conn, row["priority"], "", row["vstart"])
+
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', leased_by = ?, lease_expires_at = ?, "
+                "started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row["id"])
+            )
+
+        return {
+            "id": row["id"],
+            "evaluation_id": row["evaluation_id"],
+            "payload": json.loads(row["payload"]),
+            "attempts": row["attempts"] + 1
+        }
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """Extend a lease. Returns False if the worker no longer holds it."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? "
+                "WHERE id = ? AND leased_by = ? AND status IN ('leased', 'cancelling')",
+                (time.time() + self.lease_seconds, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker_id: str):
+        """Mark a leased job as done."""
+        self._finish(job_id, worker_id, "done", None)
+
+    def cancel_requested(self, job_id: int) -> bool:
+        """Whether the API asked for a leased job to be cancelled."""
+        rows = self._query("SELECT status FROM jobs WHERE id = ?", (job_id,))
+        return bool(rows) and rows[0][0] == "cancelling"
+
+    def cancelled(self, job_id: int, worker_id: str):
+        """Mark a leased job as cancelled."""
+        self._finish(job_id, worker_id, "cancelled", None)
+
+    def fail(self, job_id: int, worker_id: str, error: str):
+        """Mark a leased job as failed (it is not retried)."""
+        self._finish(job_id, worker_id, "failed", error)
+
+    def _finish(self, job_id: int, worker_id: str, status: str, error: Optional[str]):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ? AND leased_by = ?",
+                (status, time.time(), error, job_id, worker_id)
+            )
+
+    def publish(
+        self,
+        evaluation_id: str,
+        kind: str,
+        data: dict,
+        job_id: Optional[int] = None,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """Relay an "update" or "event" for an evaluation to the API process.
+
+        Args:
+            evaluation_id: Evaluation the update or event belongs to
+            kind: "update" or "event"
+            data: Stored evaluation fields or WebSocket event
+            job_id: Leased job publishing it; with worker_id, the write is
+                dropped once the worker no longer holds the lease
+            worker_id: Worker holding the lease
+
+        Returns:
+            Whether the update or event was relayed
+        """
+        with self._transaction() as conn:
+            if job_id is not None and not conn.execute(
+                "SELECT 1 FROM jobs WHERE id = ? AND leased_by = ? AND status IN ('leased', 'cancelling')",
+                (job_id, worker_id)
+            ).fetchone():
+                return False
+            self._insert_relay(conn, evaluation_id, kind, data)
+            return True
+
+    @staticmethod
+    def _insert_relay(conn: sqlite3.Connection, evaluation_id: str, kind: str, data: dict):
+        conn.execute(
+            "INSERT INTO relay_events (evaluation_id, kind, data) VALUES (?, ?, ?)",
+            (evaluation_id, kind, json.dumps(data, default=str))
+        )
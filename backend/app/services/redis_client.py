@@ -0,0 +1,40 @@
+"""Shared Redis connection for state kept across API workers.
+
+Requires the optional redis package (pip install redis). Anything speaking
+the Redis protocol works, including a local redis-server or, in tests,
+fakeredis.
+"""
+
+import os
+from typing import TYPE_CHECKING, Optional
+
+from src.graph.checkpoint import config
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+_client: Optional["Redis"] = None
+
+
+def get_redis_client() -> "Redis":
+    """Get the process-wide Redis client (redis.url in config.yaml, REDIS_URL overrides).
+
+    Raises:
+        RuntimeError: If the redis package is not installed
+    """
+    global _client
+    if _client is None:
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("The redis backends need the redis package: pip install redis") from e
+
+        url = os.getenv("REDIS_URL") or config["redis"]["url"]
+        _client = Redis.from_url(url, decode_responses=True)
+    return _client
+
+
+def redis_key_prefix() -> str:
+    """Prefix of every key and channel this application uses."""
+    return config["redis"].get("key_prefix", "interview:")
@@ -0,0 +1,640 @@
+"""Redis-backed evaluation storage shared by every API worker.
+
+Implements the StorageService interface on any server speaking the Redis
+protocol, so gunicorn workers (on one host or several) see the same
+evaluations. Each evaluation is a JSON summary string plus a hash holding the
+large "input" and "result" documents, which only get() loads. Listings use
+lexicographically ordered sorted sets of "<created_at>\\0<evaluation_id>"
+members (overall, per status and per candidate), and expiry uses one sorted
+set per status scored by the time an evaluation reached it. Full-text search
+keeps one sorted set of postings per word. Writes are optimistic
+transactions (WATCH/MULTI/EXEC) on the evaluation's summary key, so
+concurrent updates from different workers are never lost.
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+
+from .expiry import EVALUATION_STATUSES, ExpiryPolicy
+from .search_index import SearchQuery, contains_phrases, idf, phrase_text, search_document, term_scores
+from .sqlite_storage import PAYLOAD_FIELDS, _candidate_name
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+# Separates created_at and evaluation_id in listing members; sorts before any
+# other character, so members order like (created_at, evaluation_id) tuples
+SEPARATOR = "\0"
+
+# Listing members fetched per round trip while filtering a page
+SCAN_CHUNK = 100
+
+# Seconds a search's intersected postings are kept if the worker dies mid-search
+SEARCH_RESULTS_TTL = 60
+
+
+def _member(created_at: str, evaluation_id: str) -> str:
+    return f"{created_at}{SEPARATOR}{evaluation_id}"
+
+
+class RedisStorageService:
+    """Evaluation storage in Redis (same async interface as StorageService).
+
+    Summaries returned by get_status, find_by_*, list_all, list_page and
+    list_by_status carry every field except "input" and "result"; get()
+    returns the full evaluation.
+    """
+
+    # Every API worker sees (and may re-queue) every evaluation
+    shared = True
+
+    def __init__(
+        self,
+        client: "Redis",
+        key_prefix: str = "interview:",
+        ttl_hours: Optional[float] = 24,
+        ttl_hours_by_status: Optional[Dict[str, Optional[float]]] = None
+    ):
+        """Initialize the store.
+
+        Args:
+            client: redis.asyncio client created with decode_responses=True
+            key_prefix: Prefix of every key
+            ttl_hours: Hours an evaluation is kept after reaching its status
+            ttl_hours_by_status: Per-status overrides (None never expires)
+        """
+        self.client = client
+        self.key_prefix = key_prefix
+        self._expiry = ExpiryPolicy(ttl_hours, ttl_hours_by_status)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def _key(self, *parts: str) -> str:
+        return self.key_prefix + ":".join(parts)
+
+    def _summary_key(self, evaluation_id: str) -> str:
+        return self._key("evaluation", evaluation_id)
+
+    def _payload_key(self, evaluation_id: str) -> str:
+        return self._key("payload", evaluation_id)
+
+    def _search_key(self, evaluation_id: str) -> str:
+        """Indexed words and phrase text of an evaluation's search document."""
+        return self._key("search", "document", evaluation_id)
+
+    def _postings_key(self, term: str) -> str:
+        return self._key("search", "term", term)
+
+    def _index_keys(self, summary: dict) -> List[str]:
+        """Listing sorted sets an evaluation belongs to."""
+        return [
+            self._key("index", "created"),
+            self._key("index", "status", summary.get("status", "")),
+            self._key("index", "candidate", (summary.get("candidate_name") or "").casefold())
+        ]
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _queue_write(self, pipe, evaluation_id: str, old: Optional[dict], new: dict, payloads: Dict[str, Any]):
+        """Queue the commands that replace old with new in the transaction."""
+        pipe.set(self._summary_key(evaluation_id), json.dumps(new))
+        if payloads:
+            pipe.hset(self._payload_key(evaluation_id), mapping={
+                field: json.dumps(value) for field, value in payloads.items()
+            })
+
+        member = _member(new.get("created_at", ""), evaluation_id)
+        if old is not None:
+            old_member = _member(old.get("created_at", ""), evaluation_id)
+            for key in self._index_keys(old):
+                pipe.zrem(key, old_member)
+        for key in self._index_keys(new):
+            pipe.zadd(key, {member: 0})
+
+        for key in self._lookup_keys(new):
+            pipe.set(key, evaluation_id)
+
+        # TTLs count from the time an evaluation reached its status
+        if old is None or old.get("status") != new.get("status"):
+            if old is not None:
+                pipe.zrem(self._key("expiry", old.get("status", "")), evaluation_id)
+            if self._expiry.ttl(new.get("status", "")) is not None:
+                pipe.zadd(self._key("expiry", new.get("status", "")), {evaluation_id: datetime.now().timestamp()})
+
+    def _queue_search(self, pipe, evaluation_id: str, old_terms: List[str], document: Dict[str, str]):
+        """Queue the commands that re-index an evaluation's search document."""
+        scores = term_scores(document)
+        for term in set(old_terms) - set(scores):
+            pipe.zrem(self._postings_key(term), evaluation_id)
+        for term, score in scores.items():
+            pipe.zadd(self._postings_key(term), {evaluation_id: score})
+        pipe.set(self._search_key(evaluation_id), json.dumps({"terms": list(scores), "text": phrase_text(document)}))
+
+    def _lookup_keys(self, summary: dict) -> List[str]:
+        """Deduplication keys pointing at an evaluation."""
+        return [
+            self._key(kind, summary[field])
+            for field, kind in (("fingerprint", "fingerprint"), ("idempotency_key", "idempotency"))
+            if summary.get(field)
+        ]
+
+    def _queue_delete(self, pipe, evaluation_id: str, summary: dict, lookup_keys: List[str], terms: List[str]):
+        """Queue the commands that remove an evaluation in the transaction."""
+        pipe.delete(
+            self._summary_key(evaluation_id), self._payload_key(evaluation_id), self._search_key(evaluation_id),
+            *lookup_keys
+        )
+        for term in terms:
+            pipe.zrem(self._postings_key(term), evaluation_id)
+        member = _member(summary.get("created_at", ""), evaluation_id)
+        for key in self._index_keys(summary):
+            pipe.zrem(key, member)
+        pipe.zrem(self._key("expiry", summary.get("status", "")), evaluation_id)
+
+    async def _indexed_terms(self, pipe, evaluation_id: str) -> List[str]:
+        """Words an evaluation is currently indexed under (read on a watching pipeline)."""
+        raw = await pipe.get(self._search_key(evaluation_id))
+        return json.loads(raw)["terms"] if raw else []
+
+    async def _transact(
+        self,
+        evaluation_id: str,
+        change: Callable[[Optional[dict]], Optional[Tuple[dict, Dict[str, Any]]]],
+        document: Optional[Dict[str, str]] = None
+    ) -> Tuple[Optional[dict], Optional[dict]]:
+        """Apply change to an evaluation's summary atomically, retrying on conflicts.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            change: Called with the current summary (None if missing); returns
+                (new summary, payload fields to set), or None to write nothing
+            document: New search document to index with the change
+
+        Returns:
+            Tuple of (previous summary, new summary or None if nothing was written)
+        """
+        key = self._summary_key(evaluation_id)
+        while True:
+            async with self.client.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key, self._search_key(evaluation_id))
+                    raw = await pipe.get(key)
+                    old = json.loads(raw) if raw else None
+                    changed = change(old)
+                    if changed is None:
+                        await pipe.unwatch()
+                        return old, None
+                    new, payloads = changed
+                    old_terms = await self._indexed_terms(pipe, evaluation_id) if document is not None else []
+                    pipe.multi()
+                    self._queue_write(pipe, evaluation_id, old, new, payloads)
+                    if document is not None:
+                        self._queue_search(pipe, evaluation_id, old_terms, document)
+                    await pipe.execute()
+                    return old, new
+                except WatchError:
+                    continue
+
+    async def save(self, evaluation_id: str, data: dict) -> None:
+        """Save or replace evaluation data.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            data: Evaluation data to store
+        """
+        data["last_updated"] = datetime.now().isoformat()
+        summary = {key: value for key, value in data.items() if key not in PAYLOAD_FIELDS}
+        summary.update({"evaluation_id": evaluation_id, "candidate_name": _candidate_name(data)})
+        payloads = {field: data.get(field) for field in PAYLOAD_FIELDS}
+        document = await asyncio.to_thread(search_document, data.get("input"), data.get("result"))
+
+        await self._transact(evaluation_id, lambda old: (summary, payloads), document)
+
+    async def update(
+        self,
+        evaluation_id: str,
+        fields: dict,
+        increment: Optional[str] = None
+    ) -> Optional[dict]:
+        """Merge fields into a stored evaluation in one transaction.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            fields: Fields to set
+            increment: Counter field to increment
+
+        Returns:
+            Updated evaluation summary, None if the evaluation does not exist
+        """
+        def change(old: Optional[dict]):
+            if old is None:
+                return None
+            new = {**old, **{key: value for key, value in fields.items() if key not in PAYLOAD_FIELDS}}
+            if increment:
+                new[increment] = old.get(increment, 0) + 1
+            new["last_updated"] = datetime.now().isoformat()
+            return new, {key: value for key, value in fields.items() if key in PAYLOAD_FIELDS}
+
+        document = None
+        if any(field in fields for field in PAYLOAD_FIELDS):
+            payloads = {field: fields[field] for field in PAYLOAD_FIELDS if field in fields}
+            missing = [field for field in PAYLOAD_FIELDS if field not in fields]
+            for field, raw in zip(missing, await self.client.hmget(self._payload_key(evaluation_id), missing)):
+                payloads[field] = json.loads(raw) if raw else None
+            document = await asyncio.to_thread(search_document, payloads["input"], payloads["result"])
+
+        _, new = await self._transact(evaluation_id, change, document)
+        return new
+
+    async def delete(self, evaluation_id: str) -> bool:
+        """Delete an evaluation by ID.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            True if deleted, False if not found
+        """
+        return await self._delete_if(evaluation_id, lambda summary: True)
+
+    async def _delete_if(self, evaluation_id: str, condition: Callable[[dict], bool]) -> bool:
+        """Delete an evaluation if its current summary satisfies condition."""
+        key = self._summary_key(evaluation_id)
+        while True:
+            async with self.client.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key, self._search_key(evaluation_id))
+                    raw = await pipe.get(key)
+                    if raw is None or not condition(json.loads(raw)):
+                        await pipe.unwatch()
+                        return False
+                    summary = json.loads(raw)
+
+                    # Keep lookups a newer evaluation has taken over (e.g. a forced resubmission)
+                    lookup_keys = self._lookup_keys(summary)
+                    if lookup_keys:
+                        await pipe.watch(*lookup_keys)
+                    lookup_keys = [
+                        lookup_key for lookup_key in lookup_keys if await pipe.get(lookup_key) == evaluation_id
+                    ]
+
+                    terms = await self._indexed_terms(pipe, evaluation_id)
+
+                    pipe.multi()
+                    self._queue_delete(pipe, evaluation_id, summary, lookup_keys, terms)
+                    await pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+
+    # ------------------------------------------------------------------
+    # Submission claims
+    # ------------------------------------------------------------------
+
+    async def claim(self, names: Iterable[str], token: str, ttl_seconds: float) -> bool:
+        """Claim names for token across workers, all or none.
+
+        Each name is a SET NX key that expires after ttl_seconds, so a claim
+        left by a crashed worker does not block others for long. Names are
+        claimed in sorted order and a partial claim is given back, so two
+        workers never hold each other's halves.
+
+        Returns:
+            True if every name was claimed
+        """
+        claimed = []
+        for name in sorted(set(names)):
+            if not await self.client.set(self._key("claim", name), token, nx=True, px=int(ttl_seconds * 1000)):
+                await self.release_claim(claimed, token)
+                return False
+            claimed.append(name)
+        return True
+
+    async def release_claim(self, names: Iterable[str], token: str):
+        """Give back the names token still holds (an expired claim may have been taken over)."""
+        for name in names:
+            key = self._key("claim", name)
+            async with self.client.pipeline(transaction=True) as pipe:
+                try:
+                    await pipe.watch(key)
+                    if await pipe.get(key) != token:
+                        await pipe.unwatch()
+                        continue
+                    pipe.multi()
+                    pipe.delete(key)
+                    await pipe.execute()
+                except WatchError:
+                    # Changed meanwhile, so no longer ours
+                    pass
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def _summaries(self, evaluation_ids: List[str]) -> List[dict]:
+        """Summaries of the given evaluations, skipping any deleted meanwhile."""
+        if not evaluation_ids:
+            return []
+        raws = await self.client.mget([self._summary_key(evaluation_id) for evaluation_id in evaluation_ids])
+        return [json.loads(raw) for raw in raws if raw is not None]
+
+    async def get(self, evaluation_id: str) -> Optional[dict]:
+        """Retrieve full evaluation data (including input and result) by ID.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            Evaluation data if found, None otherwise
+        """
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(self._summary_key(evaluation_id))
+            pipe.hgetall(self._payload_key(evaluation_id))
+            raw, payloads = await pipe.execute()
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        data.update({field: None for field in PAYLOAD_FIELDS})
+        data.update({field: json.loads(value) for field, value in payloads.items()})
+        return data
+
+    async def get_status(self, evaluation_id: str) -> Optional[dict]:
+        """Retrieve an evaluation's summary (without input and result).
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            Evaluation summary if found, None otherwise
+        """
+        raw = await self.client.get(self._summary_key(evaluation_id))
+        return json.loads(raw) if raw else None
+
+    async def _find(self, kind: str, value: str) -> Optional[dict]:
+        evaluation_id = await self.client.get(self._key(kind, value))
+        return await self.get_status(evaluation_id) if evaluation_id else None
+
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[dict]:
+        """Retrieve the latest evaluation submitted with an input fingerprint.
+
+        Args:
+            fingerprint: Submission fingerprint
+
+        Returns:
+            Evaluation summary if found, None otherwise
+        """
+        return await self._find("fingerprint", fingerprint)
+
+    async def find_by_idempotency_key(self, key: str) -> Optional[dict]:
+        """Retrieve the evaluation created with an idempotency key.
+
+        Args:
+            key: Idempotency key (scoped by the caller)
+
+        Returns:
+            Evaluation summary if found, None otherwise
+        """
+        return await self._find("idempotency", key)
+
+    async def list_all(self, limit: int = 20, offset: int = 0) -> Tuple[List[dict], int]:
+        """List evaluation summaries, newest first, with pagination.
+
+        Args:
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+
+        Returns:
+            Tuple of (evaluation summaries, total count)
+        """
+        index = self._key("index", "created")
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zcard(index)
+            pipe.zrevrangebylex(index, "+", "-", start=offset, num=limit)
+            total, members = await pipe.execute()
+        return await self._summaries([member.split(SEPARATOR, 1)[1] for member in members]), total
+
+    async def list_page(
+        self,
+        limit: int = 20,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        candidate: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Tuple[List[dict], bool]:
+        """List evaluation summaries newest first, continuing after a listing key.
+
+        Walks the smallest applicable listing set from the cursor, so a page
+        costs O(log n + limit) plus any entries skipped for a second filter.
+
+        Args:
+            limit: Maximum number of results to return
+            after: (created_at, evaluation_id) of the last item of the previous page
+            status: Only evaluations with this status
+            candidate: Only evaluations of this candidate (case-insensitive)
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of (evaluation summaries, whether more results follow)
+        """
+        indexes = [self._key("index", "created")]
+        if status is not None:
+            indexes.append(self._key("index", "status", status))
+        if candidate is not None:
+            indexes.append(self._key("index", "candidate", candidate.casefold()))
+        async with self.client.pipeline(transaction=False) as pipe:
+            for index in indexes:
+                pipe.zcard(index)
+            sizes = await pipe.execute()
+        index = min(zip(sizes, indexes))[1]
+
+        upper = min(
+            (bound for bound in (_member(*after) if after else None, created_to) if bound is not None),
+            default=None
+        )
+        maximum = f"({upper}" if upper is not None else "+"
+        minimum = f"[{created_from}" if created_from is not None else "-"
+
+        page: List[dict] = []
+        offset = 0
+        while True:
+            members = await self.client.zrevrangebylex(index, maximum, minimum, start=offset, num=SCAN_CHUNK)
+            offset += len(members)
+            for summary in await self._summaries([member.split(SEPARATOR, 1)[1] for member in members]):
+                if status is not None and summary.get("status") != status:
+                    continue
+                if candidate is not None and (summary.get("candidate_name") or "").casefold() != candidate.casefold():
+                    continue
+                if len(page) == limit:
+                    return page, True
+                page.append(summary)
+            if len(members) < SCAN_CHUNK:
+                return page, False
+
+    async def count(self) -> int:
+        """Number of stored evaluations."""
+        return await self.client.zcard(self._key("index", "created"))
+
+    async def search(
+        self,
+        query: SearchQuery,
+        limit: int = 20,
+        offset: int = 0,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Tuple[List[Tuple[dict, float]], int]:
+        """Full-text search, best match first.
+
+        The server intersects the query words' postings (ZINTERSTORE weighted
+        by each word's idf), so only evaluations containing every word are
+        transferred, and only the page itself when there are no phrases or
+        filters to check.
+
+        Args:
+            query: Parsed search query
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            status: Only evaluations with this status
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of ([(evaluation summary, score)], number of matches)
+        """
+        postings = [self._postings_key(term) for term in query.required_terms()]
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zcard(self._key("index", "created"))
+            for key in postings:
+                pipe.zcard(key)
+            documents, *frequencies = await pipe.execute()
+        if not all(frequencies):
+            return [], 0
+
+        results = self._key("search", "results", uuid.uuid4().hex)
+        weights = {key: idf(documents, frequency) for key, frequency in zip(postings, frequencies)}
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.zinterstore(results, weights)
+                pipe.expire(results, SEARCH_RESULTS_TTL)
+                total, _ = await pipe.execute()
+
+            if not query.phrases and all(value is None for value in (status, created_from, created_to)):
+                ranked = await self.client.zrevrange(results, offset, offset + limit - 1, withscores=True)
+                summaries = {
+                    summary["evaluation_id"]: summary
+                    for summary in await self._summaries([evaluation_id for evaluation_id, _ in ranked])
+                }
+                return [
+                    (summaries[evaluation_id], score) for evaluation_id, score in ranked if evaluation_id in summaries
+                ], total
+
+            page: List[Tuple[dict, float]] = []
+            matches = 0
+            for start in range(0, total, SCAN_CHUNK):
+                ranked = await self.client.zrevrange(results, start, start + SCAN_CHUNK - 1, withscores=True)
+                ids = [evaluation_id for evaluation_id, _ in ranked]
+                async with self.client.pipeline(transaction=False) as pipe:
+                    pipe.mget([self._summary_key(evaluation_id) for evaluation_id in ids])
+                    pipe.mget([self._search_key(evaluation_id) for evaluation_id in ids])
+                    raw_summaries, raw_documents = await pipe.execute()
+                for (_, score), raw, raw_document in zip(ranked, raw_summaries, raw_documents):
+                    if raw is None or raw_document is None:
+                        continue
+                    summary = json.loads(raw)
+                    created_at = summary.get("created_at", "")
+                    if (
+                        (status is not None and summary.get("status") != status)
+                        or (created_from is not None and created_at < created_from)
+                        or (created_to is not None and created_at >= created_to)
+                        or (query.phrases and not contains_phrases(json.loads(raw_document)["text"], query.phrases))
+                    ):
+                        continue
+                    if offset <= matches < offset + limit:
+                        page.append((summary, score))
+                    matches += 1
+            return page, matches
+        finally:
+            await self.client.delete(results)
+
+    async def list_by_status(self, statuses: Iterable[str]) -> List[dict]:
+        """List summaries of the evaluations in any of the given statuses, oldest first.
+
+        Args:
+            statuses: Statuses to match
+
+        Returns:
+            Evaluation summaries
+        """
+        members: List[str] = []
+        for status in set(statuses):
+            members.extend(await self.client.zrangebylex(self._key("index", "status", status), "-", "+"))
+        return await self._summaries([member.split(SEPARATOR, 1)[1] for member in sorted(members)])
+
+    # ------------------------------------------------------------------
+    # Expiry and statistics
+    # ------------------------------------------------------------------
+
+    async def cleanup_expired(self, limit: Optional[int] = None) -> Dict[str, List[str]]:
+        """Remove evaluations whose status TTL has passed, oldest first.
+
+        Args:
+            limit: Maximum number of evaluations to remove (None for all)
+
+        Returns:
+            IDs of the evaluations deleted, per status
+        """
+        deleted: Dict[str, List[str]] = {}
+        remaining = limit
+        for status, cutoff in self._expiry.cutoffs().items():
+            if remaining == 0:
+                break
+            key = self._key("expiry", status)
+            cutoff_score = f"({datetime.fromisoformat(cutoff).timestamp()}"
+            if remaining is None:
+                evaluation_ids = await self.client.zrangebyscore(key, "-inf", cutoff_score)
+            else:
+                evaluation_ids = await self.client.zrangebyscore(key, "-inf", cutoff_score, start=0, num=remaining)
+
+            for evaluation_id in evaluation_ids:
+                # Another worker may have changed or removed it meanwhile
+                if await self._delete_if(evaluation_id, lambda summary: summary.get("status") == status):
+                    deleted.setdefault(status, []).append(evaluation_id)
+                else:
+                    await self.client.zrem(key, evaluation_id)
+            if remaining is not None:
+                remaining -= len(evaluation_ids)
+
+        for status, evaluation_ids in deleted.items():
+            await self.client.hincrby(self._key("evicted"), status, len(evaluation_ids))
+        return deleted
+
+    async def get_stats(self) -> dict:
+        """Get storage statistics.
+
+        Returns:
+            Dictionary with storage stats
+        """
+        async with self.client.pipeline(transaction=False) as pipe:
+            for status in EVALUATION_STATUSES:
+                pipe.zcard(self._key("index", "status", status))
+            pipe.hgetall(self._key("evicted"))
+            *counts, evicted = await pipe.execute()
+
+        status_counts = {status: count for status, count in zip(EVALUATION_STATUSES, counts) if count}
+        return {
+            "total_evaluations": sum(status_counts.values()),
+            "status_counts": status_counts,
+            "evicted": {status: int(count) for status, count in evicted.items()}
+        }
@@ -0,0 +1,224 @@
+"""Full-text search over stored evaluations.
+
+Each evaluation is indexed as a small document: the candidate's name, their
+current and target levels, the decision label and the decision agent's
+rationale. Queries are words and "quoted phrases", all of which must match.
+The stores maintain their index on every write of an evaluation's input or
+result: the in-memory store with InvertedIndex, SQLite with an FTS5 table and
+Redis with one sorted set of postings per term. Results are ranked by BM25
+with per-field weights, so a match on the candidate's name ranks above the
+same word in a rationale.
+"""
+
+import heapq
+import logging
+import math
+import re
+import unicodedata
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.blob_store import get_blob_store
+from src.utils.decision_parser import parse_decision
+
+
+logger = logging.getLogger(__name__)
+
+
+# Indexed fields and their weight in the ranking
+FIELD_WEIGHTS = {
+    "candidate": 4.0,
+    "level": 2.0,
+    "decision": 3.0,
+    "rationale": 1.0
+}
+SEARCH_FIELDS = tuple(FIELD_WEIGHTS)
+
+# BM25 term-frequency saturation; field lengths are not normalized (b = 0)
+# since rationales are of similar length
+K1 = 1.2
+
+# Words: runs of letters and digits, like SQLite's unicode61 tokenizer
+_WORD = re.compile(r"[^\W_]+")
+_PHRASE = re.compile(r'"([^"]*)"')
+
+
+class InvalidSearchQueryError(Exception):
+    """Raised when a search query contains no searchable words."""
+
+
+class SearchQuery(NamedTuple):
+    """Parsed search query: every term and every phrase must match."""
+
+    terms: Tuple[str, ...]
+    phrases: Tuple[Tuple[str, ...], ...]
+
+    def required_terms(self) -> List[str]:
+        """Every distinct word of the query, phrase words included."""
+        return list(dict.fromkeys([*self.terms, *(term for phrase in self.phrases for term in phrase)]))
+
+    def fts5(self) -> str:
+        """The query in SQLite FTS5 syntax."""
+        return " ".join(f'"{" ".join(words)}"' for words in (*((term,) for term in self.terms), *self.phrases))
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Case- and accent-folded words of a text."""
+    if not text:
+        return []
+    folded = text.casefold()
+    if not folded.isascii():
+        decomposed = unicodedata.normalize("NFKD", folded)
+        folded = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _WORD.findall(folded)
+
+
+def parse_query(q: str) -> SearchQuery:
+    """Parse a search query.
+
+    Args:
+        q: Words and "quoted phrases"
+
+    Returns:
+        Parsed query
+
+    Raises:
+        InvalidSearchQueryError: If the query has no words
+    """
+    terms, phrases = tokenize(_PHRASE.sub(" ", q)), []
+    for match in _PHRASE.findall(q):
+        words = tuple(tokenize(match))
+        if len(words) == 1:
+            terms.extend(words)  # A quoted word is a plain word
+        elif words:
+            phrases.append(words)
+    query = SearchQuery(tuple(dict.fromkeys(terms)), tuple(dict.fromkeys(phrases)))
+    if not query.terms and not query.phrases:
+        raise InvalidSearchQueryError(f"No searchable words in query: {q!r}")
+    return query
+
+
+def search_document(input_data: Optional[dict], result: Optional[dict]) -> Dict[str, str]:
+    """Text of each indexed field of an evaluation.
+
+    Args:
+        input_data: Stored evaluation input
+        result: Stored evaluation result (texts may be blob references)
+
+    Returns:
+        Field texts keyed like FIELD_WEIGHTS
+    """
+    candidate_info = (input_data or {}).get("candidate_info") or {}
+    rationale = ""
+    if result:
+        try:
+            rationale = get_blob_store().resolve(result.get("decision") or result.get("final_evaluation")) or ""
+        except KeyError as e:
+            logger.warning(f"Rationale not indexed: {e}")
+    decision = parse_decision(rationale)["decision"] if rationale else "UNKNOWN"
+    return {
+        "candidate": candidate_info.get("name") or "",
+        "level": " ".join(filter(None, (candidate_info.get("current_level"), candidate_info.get("target_level")))),
+        "decision": "" if decision == "UNKNOWN" else decision,
+        "rationale": rationale
+    }
+
+
+def term_scores(document: Dict[str, str]) -> Dict[str, float]:
+    """BM25 term-frequency component of each word of a document.
+
+    Returns:
+        Saturated, field-weighted frequency per word; a query's score is the
+        sum over its words of idf(word) times this value
+    """
+    frequencies: Dict[str, float] = {}
+    for field, text in document.items():
+        for term in tokenize(text):
+            frequencies[term] = frequencies.get(term, 0.0) + FIELD_WEIGHTS[field]
+    return {term: frequency * (K1 + 1) / (frequency + K1) for term, frequency in frequencies.items()}
+
+
+def phrase_text(document: Dict[str, str]) -> str:
+    """Tokenized document for phrase matching (phrases never span fields)."""
+    return "\n".join(" ".join(tokenize(text)) for text in document.values())
+
+
+def contains_phrases(text: str, phrases: Tuple[Tuple[str, ...], ...]) -> bool:
+    """Whether a phrase_text() contains every phrase."""
+    lines = [f" {line} " for line in text.split("\n")]
+    return all(any(f" {' '.join(phrase)} " in line for line in lines) for phrase in phrases)
+
+
+def idf(documents: int, matching: int) -> float:
+    """BM25 inverse document frequency of a word found in `matching` of `documents`."""
+    return math.log(1 + (documents - matching + 0.5) / (matching + 0.5))
+
+
+class InvertedIndex:
+    """In-process inverted index of evaluation documents."""
+
+    def __init__(self):
+        # Postings: word -> {evaluation_id: term score}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        # Indexed words and phrase text per evaluation
+        self._documents: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, evaluation_id: str, document: Dict[str, str]):
+        """Index (or re-index) an evaluation's document."""
+        self.remove(evaluation_id)
+        scores = term_scores(document)
+        for term, score in scores.items():
+            self._postings.setdefault(term, {})[evaluation_id] = score
+        self._documents[evaluation_id] = (tuple(scores), phrase_text(document))
+
+    def remove(self, evaluation_id: str):
+        """Drop an evaluation from the index."""
+        indexed = self._documents.pop(evaluation_id, None)
+        if indexed is None:
+            return
+        for term in indexed[0]:
+            postings = self._postings[term]
+            del postings[evaluation_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(
+        self,
+        query: SearchQuery,
+        limit: int,
+        offset: int = 0,
+        accept: Optional[Callable[[str], bool]] = None
+    ) -> Tuple[List[Tuple[str, float]], int]:
+        """Rank the evaluations matching a query.
+
+        Intersects the postings starting from the rarest word, so the cost
+        follows how many evaluations contain that word, not the index size.
+
+        Args:
+            query: Parsed query
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            accept: Filter applied to each matching evaluation_id
+
+        Returns:
+            Tuple of ([(evaluation_id, score)] best first, number of matches)
+        """
+        postings = [self._postings.get(term, {}) for term in query.required_terms()]
+        postings.sort(key=len)
+        weights = [idf(len(self._documents), len(entries)) for entries in postings]
+
+        matches = []
+        for evaluation_id in postings[0]:
+            if not all(evaluation_id in entries for entries in postings[1:]):
+                continue
+            if query.phrases and not contains_phrases(self._documents[evaluation_id][1], query.phrases):
+                continue
+            if accept is not None and not accept(evaluation_id):
+                continue
+            score = sum(weight * entries[evaluation_id] for weight, entries in zip(weights, postings))
+            matches.append((score, evaluation_id))
+
+        best = heapq.nlargest(offset + limit, matches)
+        return [(evaluation_id, score) for score, evaluation_id in best[offset:]], len(matches)
@@ -0,0 +1,636 @@
+"""SQLite-backed evaluation storage shared across restarts and processes.
+
+Implements the StorageService interface on a SQLite database in WAL mode.
+Small, frequently read fields (status, progress, timestamps) live in the
+indexed evaluations table; the large "input" and "result" documents live in
+evaluation_payloads and are only loaded by get(), so status reads, listings
+and deduplication lookups never deserialize them. All writes go through one
+dedicated connection; reads use a pool of connections that WAL lets run
+alongside the writer.
+"""
+
+import asyncio
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .expiry import ExpiryPolicy
+from .search_index import FIELD_WEIGHTS, SEARCH_FIELDS, SearchQuery, search_document
+
+
+# Fields stored in evaluation_payloads instead of the summary row
+PAYLOAD_FIELDS = ("input", "result")
+
+# Schema migrations; PRAGMA user_version records how many have been applied
+MIGRATIONS = [
+    """
+    CREATE TABLE evaluations (
+        evaluation_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        candidate_name TEXT,
+        fingerprint TEXT,
+        idempotency_key TEXT,
+        last_updated TEXT NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX idx_evaluations_created ON evaluations (created_at);
+    CREATE INDEX idx_evaluations_status ON evaluations (status, created_at);
+    CREATE INDEX idx_evaluations_candidate ON evaluations (candidate_name COLLATE NOCASE);
+    CREATE INDEX idx_evaluations_fingerprint ON evaluations (fingerprint, created_at);
+    CREATE INDEX idx_evaluations_idempotency ON evaluations (idempotency_key);
+
+    CREATE TABLE evaluation_payloads (
+        evaluation_id TEXT NOT NULL,
+        field TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (evaluation_id, field)
+    );
+    """,
+    # Keyset pagination: every listing index ends in (created_at, evaluation_id)
+    """
+    DROP INDEX idx_evaluations_created;
+    DROP INDEX idx_evaluations_status;
+    DROP INDEX idx_evaluations_candidate;
+    CREATE INDEX idx_evaluations_created ON evaluations (created_at, evaluation_id);
+    CREATE INDEX idx_evaluations_status ON evaluations (status, created_at, evaluation_id);
+    CREATE INDEX idx_evaluations_candidate ON evaluations (candidate_name COLLATE NOCASE, created_at, evaluation_id);
+    """,
+    # Per-status TTLs count from the time an evaluation reached its status
+    """
+    ALTER TABLE evaluations ADD COLUMN status_changed_at TEXT;
+    UPDATE evaluations SET status_changed_at = last_updated;
+    CREATE INDEX idx_evaluations_expiry ON evaluations (status, status_changed_at);
+    """,
+    # Full-text search; FTS rows are keyed by a stable integer id per evaluation
+    """
+    CREATE TABLE evaluation_search_ids (
+        search_rowid INTEGER PRIMARY KEY,
+        evaluation_id TEXT NOT NULL UNIQUE
+    );
+    CREATE VIRTUAL TABLE evaluation_search USING fts5(
+        candidate, level, decision, rationale,
+        tokenize = 'unicode61 remove_diacritics 2'
+    );
+    """
+]
+
+# Migration that added the search index; older databases are indexed on open
+SEARCH_MIGRATION = 4
+
+
+def _candidate_name(data: dict) -> Optional[str]:
+    """Candidate name of an evaluation, from its input."""
+    return ((data.get("input") or {}).get("candidate_info") or {}).get("name")
+
+
+class SqliteStorageService:
+    """Evaluation storage in a SQLite file (same async interface as StorageService).
+
+    Summaries returned by get_status, find_by_*, list_all, list_page and list_by_status
+    carry every field except "input" and "result"; get() returns the full
+    evaluation.
+    """
+
+    # A local file that API workers on other hosts never see
+    shared = False
+
+    def __init__(
+        self,
+        path: str,
+        ttl_hours: Optional[float] = 24,
+        ttl_hours_by_status: Optional[Dict[str, Optional[float]]] = None,
+        read_connections: int = 4
+    ):
+        """Open (and create or migrate if needed) the storage database.
+
+        Args:
+            path: SQLite database path
+            ttl_hours: Hours an evaluation is kept after reaching its status
+            ttl_hours_by_status: Per-status overrides (None never expires)
+            read_connections: Size of the read connection pool
+        """
+        self.path = path
+        self._expiry = ExpiryPolicy(ttl_hours, ttl_hours_by_status)
+        self._evicted: Dict[str, int] = {}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._write_lock = threading.Lock()
+        if 0 < self._migrate() < SEARCH_MIGRATION:
+            self._index_existing()
+
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(read_connections):
+            reader = self._connect()
+            reader.execute("PRAGMA query_only=ON")
+            self._readers.put(reader)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _migrate(self) -> int:
+        """Apply the schema migrations this database has not seen yet.
+
+        Returns:
+            Schema version before migrating (0 for a new database)
+        """
+        version = self._writer.execute("PRAGMA user_version").fetchone()[0]
+        for index, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            self._writer.executescript(f"BEGIN IMMEDIATE; {script}; PRAGMA user_version = {index}; COMMIT;")
+        return version
+
+    def _index_existing(self):
+        """Add the evaluations stored before the search index existed to it."""
+        with self._transaction() as conn:
+            evaluation_ids = [row[0] for row in conn.execute("SELECT evaluation_id FROM evaluations")]
+            for evaluation_id in evaluation_ids:
+                payloads = self._read_payloads(conn, evaluation_id, PAYLOAD_FIELDS)
+                self._write_search(conn, evaluation_id, search_document(payloads["input"], payloads["result"]))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction on the writer connection."""
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+                self._writer.execute("COMMIT")
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the read pool."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    # ------------------------------------------------------------------
+    # Row mapping
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> dict:
+        return {
+            **json.loads(row["data"]),
+            "evaluation_id": row["evaluation_id"],
+            "status": row["status"],
+            "created_at": row["created_at"],
+            "candidate_name": row["candidate_name"],
+            "last_updated": row["last_updated"]
+        }
+
+    @staticmethod
+    def _write_summary(conn: sqlite3.Connection, evaluation_id: str, summary: dict, status_changed_at: str):
+        small = {
+            key: value for key, value in summary.items()
+            if key not in PAYLOAD_FIELDS and key not in ("evaluation_id", "status", "created_at", "candidate_name", "last_updated")
+        }
+        conn.execute(
+            """
+            INSERT INTO evaluations (evaluation_id, status, created_at, candidate_name,
+                                     fingerprint, idempotency_key, last_updated, status_changed_at, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (evaluation_id) DO UPDATE SET
+                status = excluded.status,
+                created_at = excluded.created_at,
+                candidate_name = excluded.candidate_name,
+                fingerprint = excluded.fingerprint,
+                idempotency_key = excluded.idempotency_key,
+                last_updated = excluded.last_updated,
+                status_changed_at = excluded.status_changed_at,
+                data = excluded.data
+            """,
+            (
+                evaluation_id, summary.get("status", "pending"), summary.get("created_at", ""),
+                summary.get("candidate_name"), summary.get("fingerprint"),
+                summary.get("idempotency_key"), summary["last_updated"], status_changed_at,
+                json.dumps(small)
+            )
+        )
+
+    @staticmethod
+    def _write_payloads(conn: sqlite3.Connection, evaluation_id: str, fields: Dict[str, Any]):
+        for field, value in fields.items():
+            conn.execute(
+                "INSERT INTO evaluation_payloads (evaluation_id, field, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (evaluation_id, field) DO UPDATE SET data = excluded.data",
+                (evaluation_id, field, json.dumps(value))
+            )
+
+    @staticmethod
+    def _read_payloads(conn: sqlite3.Connection, evaluation_id: str, fields: Iterable[str]) -> Dict[str, Any]:
+        fields = list(fields)
+        data: Dict[str, Any] = {field: None for field in fields}
+        placeholders = ", ".join("?" for _ in fields)
+        for payload in conn.execute(
+            f"SELECT field, data FROM evaluation_payloads WHERE evaluation_id = ? AND field IN ({placeholders})",
+            (evaluation_id, *fields)
+        ):
+            data[payload["field"]] = json.loads(payload["data"])
+        return data
+
+    @staticmethod
+    def _write_search(conn: sqlite3.Connection, evaluation_id: str, document: Dict[str, str]):
+        row = conn.execute(
+            "SELECT search_rowid FROM evaluation_search_ids WHERE evaluation_id = ?", (evaluation_id,)
+        ).fetchone()
+        if row is None:
+            search_rowid = conn.execute(
+                "INSERT INTO evaluation_search_ids (evaluation_id) VALUES (?)", (evaluation_id,)
+            ).lastrowid
+        else:
+            search_rowid = row[0]
+            conn.execute("DELETE FROM evaluation_search WHERE rowid = ?", (search_rowid,))
+        conn.execute(
+            f"INSERT INTO evaluation_search (rowid, {', '.join(SEARCH_FIELDS)}) VALUES (?, ?, ?, ?, ?)",
+            (search_rowid, *(document[field] for field in SEARCH_FIELDS))
+        )
+
+    def _find_one(self, where: str, params: tuple) -> Optional[dict]:
+        with self._reader() as conn:
+            row = conn.execute(f"SELECT * FROM evaluations WHERE {where} LIMIT 1", params).fetchone()
+        return self._summary(row) if row else None
+
+    # ------------------------------------------------------------------
+    # StorageService interface
+    # ------------------------------------------------------------------
+
+    async def save(self, evaluation_id: str, data: dict) -> None:
+        """Save or replace evaluation data.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            data: Evaluation data to store
+        """
+        data["last_updated"] = datetime.now().isoformat()
+
+        def write():
+            summary = {**data, "candidate_name": _candidate_name(data)}
+            document = search_document(data.get("input"), data.get("result"))
+            with self._transaction() as conn:
+                self._write_summary(conn, evaluation_id, summary, data["last_updated"])
+                self._write_payloads(conn, evaluation_id, {field: data.get(field) for field in PAYLOAD_FIELDS})
+                self._write_search(conn, evaluation_id, document)
+
+        await asyncio.to_thread(write)
+
+    async def update(
+        self,
+        evaluation_id: str,
+        fields: dict,
+        increment: Optional[str] = None
+    ) -> Optional[dict]:
+        """Merge fields into a stored evaluation in one transaction.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            fields: Fields to set
+            increment: Counter field to increment
+
+        Returns:
+            Updated evaluation summary, None if the evaluation does not exist
+        """
+        def write() -> Optional[dict]:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT * FROM evaluations WHERE evaluation_id = ?", (evaluation_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                summary = self._summary(row)
+                summary.update({key: value for key, value in fields.items() if key not in PAYLOAD_FIELDS})
+                if increment:
+                    summary[increment] = summary.get(increment, 0) + 1
+                summary["last_updated"] = datetime.now().isoformat()
+                status_changed_at = (
+                    row["status_changed_at"] if summary["status"] == row["status"] else summary["last_updated"]
+                )
+                self._write_summary(conn, evaluation_id, summary, status_changed_at)
+                payloads = {key: value for key, value in fields.items() if key in PAYLOAD_FIELDS}
+                self._write_payloads(conn, evaluation_id, payloads)
+                if payloads:
+                    payloads.update(self._read_payloads(
+                        conn, evaluation_id, [field for field in PAYLOAD_FIELDS if field not in payloads]
+                    ))
+                    self._write_search(conn, evaluation_id, search_document(payloads["input"], payloads["result"]))
+                return summary
+
+        return await asyncio.to_thread(write)
+
+    async def get(self, evaluation_id: str) -> Optional[dict]:
+        """Retrieve full evaluation data (including input and result) by ID.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            Evaluation data if found, None otherwise
+        """
+        def read() -> Optional[dict]:
+            with self._reader() as conn:
+                row = conn.execute(
+                    "SELECT * FROM evaluations WHERE evaluation_id = ?", (evaluation_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                return {**self._summary(row), **self._read_payloads(conn, evaluation_id, PAYLOAD_FIELDS)}
+
+        return await asyncio.to_thread(read)
+
+    async def get_status(self, evaluation_id: str) -> Optional[dict]:
+        """Retrieve an evaluation's summary (without input and result).
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            Evaluation summary if found, None otherwise
+        """
+        return await asyncio.to_thread(self._find_one, "evaluation_id = ?", (evaluation_id,))
+
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[dict]:
+        """Retrieve the latest evaluation submitted with an input fingerprint.
+
+        Args:
+            fingerprint: Submission fingerprint
+
+        Returns:
+            Evaluation summary if found, None otherwise
+        """
+        return await asyncio.to_thread(
+            self._find_one, "fingerprint = ? ORDER BY created_at DESC", (fingerprint,)
+        )
+
+    async def find_by_idempotency_key(self, key: str) -> Optional[dict]:
+        """Retrieve the evaluation created with an idempotency key.
+
+        Args:
+            key: Idempotency key (scoped by the caller)
+
+        Returns:
+            Evaluation summary if found, None otherwise
+        """
+        return await asyncio.to_thread(
+            self._find_one, "idempotency_key = ? ORDER BY created_at DESC", (key,)
+        )
+
+    async def list_all(self, limit: int = 20, offset: int = 0) -> Tuple[List[dict], int]:
+        """List evaluation summaries, newest first, with pagination.
+
+        Args:
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+
+        Returns:
+            Tuple of (evaluation summaries, total count)
+        """
+        def read():
+            with self._reader() as conn:
+                total = conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+                rows = conn.execute(
+                    "SELECT * FROM evaluations ORDER BY created_at DESC, evaluation_id DESC LIMIT ? OFFSET ?",
+                    (limit, offset)
+                ).fetchall()
+            return [self._summary(row) for row in rows], total
+
+        return await asyncio.to_thread(read)
+
+    async def list_page(
+        self,
+        limit: int = 20,
+        after: Optional[Tuple[str, str]] = None,
+        status: Optional[str] = None,
+        candidate: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Tuple[List[dict], bool]:
+        """List evaluation summaries newest first, continuing after a listing key.
+
+        A keyset query on the (created_at, evaluation_id) indexes, so a page
+        costs the same wherever it is in the listing.
+
+        Args:
+            limit: Maximum number of results to return
+            after: (created_at, evaluation_id) of the last item of the previous page
+            status: Only evaluations with this status
+            candidate: Only evaluations of this candidate (case-insensitive)
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of (evaluation summaries, whether more results follow)
+        """
+        conditions, params = [], []
+        if after is not None:
+            conditions.append("(created_at, evaluation_id) < (?, ?)")
+            params.extend(after)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if candidate is not None:
+            conditions.append("candidate_name = ? COLLATE NOCASE")
+            params.append(candidate)
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            conditions.append("created_at < ?")
+            params.append(created_to)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        def read():
+            with self._reader() as conn:
+                rows = conn.execute(
+                    f"SELECT * FROM evaluations {where} "
+                    f"ORDER BY created_at DESC, evaluation_id DESC LIMIT ?",
+                    (*params, limit + 1)
+                ).fetchall()
+            return [self._summary(row) for row in rows[:limit]], len(rows) > limit
+
+        return await asyncio.to_thread(read)
+
+    async def count(self) -> int:
+        """Number of stored evaluations."""
+        def read() -> int:
+            with self._reader() as conn:
+                return conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+        return await asyncio.to_thread(read)
+
+    async def search(
+        self,
+        query: SearchQuery,
+        limit: int = 20,
+        offset: int = 0,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Tuple[List[Tuple[dict, float]], int]:
+        """Full-text search of the evaluation_search FTS5 index, best match first.
+
+        Args:
+            query: Parsed search query
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            status: Only evaluations with this status
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of ([(evaluation summary, score)], number of matches)
+        """
+        conditions, params = ["evaluation_search MATCH ?"], [query.fts5()]
+        if status is not None:
+            conditions.append("e.status = ?")
+            params.append(status)
+        if created_from is not None:
+            conditions.append("e.created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            conditions.append("e.created_at < ?")
+            params.append(created_to)
+        matches = (
+            "FROM evaluation_search "
+            "JOIN evaluation_search_ids s ON s.search_rowid = evaluation_search.rowid "
+            "JOIN evaluations e ON e.evaluation_id = s.evaluation_id "
+            f"WHERE {' AND '.join(conditions)}"
+        )
+        weights = ", ".join(str(FIELD_WEIGHTS[field]) for field in SEARCH_FIELDS)
+
+        def read():
+            with self._reader() as conn:
+                total = conn.execute(f"SELECT COUNT(*) {matches}", params).fetchone()[0]
+                rows = conn.execute(
+                    f"SELECT e.*, bm25(evaluation_search, {weights}) AS rank {matches} "
+                    f"ORDER BY rank, e.evaluation_id DESC LIMIT ? OFFSET ?",
+                    (*params, limit, offset)
+                ).fetchall()
+            # bm25() is lower for better matches
+            return [(self._summary(row), -row["rank"]) for row in rows], total
+
+        return await asyncio.to_thread(read)
+
+    async def list_by_status(self, statuses: Iterable[str]) -> List[dict]:
+        """List summaries of the evaluations in any of the given statuses, oldest first.
+
+        Args:
+            statuses: Statuses to match
+
+        Returns:
+            Evaluation summaries
+        """
+        statuses = list(statuses)
+
+        def read():
+            placeholders = ", ".join("?" for _ in statuses)
+            with self._reader() as conn:
+                rows = conn.execute(
+                    f"SELECT * FROM evaluations WHERE status IN ({placeholders}) ORDER BY created_at",
+                    statuses
+                ).fetchall()
+            return [self._summary(row) for row in rows]
+
+        return await asyncio.to_thread(read)
+
+    def _delete(self, conn: sqlite3.Connection, where: str, params: tuple) -> int:
+        ids = f"SELECT evaluation_id FROM evaluations WHERE {where}"
+        conn.execute(f"DELETE FROM evaluation_payloads WHERE evaluation_id IN ({ids})", params)
+        conn.execute(
+            f"DELETE FROM evaluation_search WHERE rowid IN "
+            f"(SELECT search_rowid FROM evaluation_search_ids WHERE evaluation_id IN ({ids}))",
+            params
+        )
+        conn.execute(f"DELETE FROM evaluation_search_ids WHERE evaluation_id IN ({ids})", params)
+        return conn.execute(f"DELETE FROM evaluations WHERE {where}", params).rowcount
+
+    async def delete(self, evaluation_id: str) -> bool:
+        """Delete an evaluation by ID.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            True if deleted, False if not found
+        """
+        def write() -> bool:
+            with self._transaction() as conn:
+                return self._delete(conn, "evaluation_id = ?", (evaluation_id,)) > 0
+
+        return await asyncio.to_thread(write)
+
+    async def cleanup_expired(self, limit: Optional[int] = None) -> Dict[str, List[str]]:
+        """Remove evaluations whose status TTL has passed, oldest first.
+
+        Each status is a range scan of idx_evaluations_expiry, so a batch only
+        reads the rows it deletes.
+
+        Args:
+            limit: Maximum number of evaluations to remove (None for all)
+
+        Returns:
+            IDs of the evaluations deleted, per status
+        """
+        cutoffs = self._expiry.cutoffs()
+
+        def write() -> Dict[str, List[str]]:
+            deleted: Dict[str, List[str]] = {}
+            remaining = -1 if limit is None else limit  # LIMIT -1: no limit
+            with self._transaction() as conn:
+                for status, cutoff in cutoffs.items():
+                    if remaining == 0:
+                        break
+                    ids = [row[0] for row in conn.execute(
+                        "SELECT evaluation_id FROM evaluations WHERE status = ? AND status_changed_at < ? "
+                        "ORDER BY status_changed_at LIMIT ?",
+                        (status, cutoff, remaining)
+                    )]
+                    if not ids:
+                        continue
+                    placeholders = ", ".join("?" for _ in ids)
+                    self._delete(conn, f"evaluation_id IN ({placeholders})", tuple(ids))
+                    deleted[status] = ids
+                    remaining -= len(ids)
+
+                for status, evaluation_ids in deleted.items():
+                    self._evicted[status] = self._evicted.get(status, 0) + len(evaluation_ids)
+            return deleted
+
+        return await asyncio.to_thread(write)
+
+    async def get_stats(self) -> dict:
+        """Get storage statistics.
+
+        Returns:
+            Dictionary with storage stats
+        """
+        def read():
+            with self._reader() as conn:
+                rows = conn.execute("SELECT status, COUNT(*) FROM evaluations GROUP BY status").fetchall()
+            status_counts = {row[0]: row[1] for row in rows}
+            return {
+                "total_evaluations": sum(status_counts.values()),
+                "status_counts": status_counts,
+                "evicted": dict(self._evicted)
+            }
+
+        return await asyncio.to_thread(read)
+
+    def close(self):
+        """Close every connection."""
+        self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
@@ -1,26 +1,71 @@
-"""In-memory storage service for evaluations."""
+"""Storage services for evaluations (in-memory, or SQLite via create_storage)."""
 
-from typing import Dict, Optional
-from datetime import datetime, timedelta
-import asyncio
+import os
+from typing import Dict, Iterable, List, Optional, Tuple, Union, TYPE_CHECKING
+from datetime import datetime
+import heapq
+
+from sortedcontainers import SortedList
+
+from src.graph.checkpoint import BASE_DIR, config
+from src.graph.pipelines import get_pipeline_graph
+from src.utils.blob_store import get_blob_store
+
+from .expiry import ExpiryPolicy, ExpiryTask
+from .search_index import InvertedIndex, SearchQuery, search_document
+from .sqlite_storage import PAYLOAD_FIELDS, _candidate_name
+
+if TYPE_CHECKING:
+    from .redis_storage import RedisStorageService
+    from .sqlite_storage import SqliteStorageService
+
+
+# Listing order key: (created_at, evaluation_id), listed newest first
+ListKey = Tuple[str, str]
 
 
 class StorageService:
     """Simple in-memory storage for evaluation data.
 
-    In production, this should be replaced with Redis or a database.
-    Thread-safe using asyncio.Lock for concurrent access.
+    Contents are lost on restart and not shared between processes; see
+    SqliteStorageService for the persistent implementation.
+
+    The store belongs to the event loop and takes no locks. Stored records
+    are copy-on-write: save() and update() install a new dict instead of
+    modifying the stored one, so a record returned by a read is a consistent
+    snapshot that later writes never change (callers must not modify it).
+    Every write, including its index maintenance, runs without awaiting, so
+    readers never see it half done and writes never wait on each other.
     """
 
-    def __init__(self, ttl_hours: int = 24):
+    # Only the owning API process sees the store
+    shared = False
+
+    def __init__(self, ttl_hours: Optional[float] = 24, ttl_hours_by_status: Optional[Dict[str, Optional[float]]] = None):
         """Initialize storage with optional TTL for cleanup.
 
         Args:
-            ttl_hours: Time-to-live in hours for stored evaluations
+            ttl_hours: Hours an evaluation is kept after reaching its status
+            ttl_hours_by_status: Per-status overrides (None never expires)
         """
         self._storage: Dict[str, dict] = {}
-        self._lock = asyncio.Lock()
-        self._ttl_hours = ttl_hours
+        # Secondary indexes for submission deduplication
+        self._fingerprints: Dict[str, str] = {}
+        self._idempotency_keys: Dict[str, str] = {}
+        # Ordered listing indexes (see ListKey), overall and per status and
+        # per candidate name (case-insensitive)
+        self._by_created = SortedList()
+        self._by_status: Dict[str, SortedList] = {}
+        self._by_candidate: Dict[str, SortedList] = {}
+        self._list_entries: Dict[str, Tuple[ListKey, str, str]] = {}
+        # Full-text index of candidate, levels, decision and rationale
+        self._search = InvertedIndex()
+        # Expiry min-heaps of (status reached at, evaluation_id) per status;
+        # entries left behind by a later status change are skipped lazily
+        self._expiry = ExpiryPolicy(ttl_hours, ttl_hours_by_status)
+        self._expiry_heaps: Dict[str, List[Tuple[str, str]]] = {}
+        self._status_since: Dict[str, Tuple[str, str]] = {}
+        self._evicted: Dict[str, int] = {}
 
     async def save(self, evaluation_id: str, data: dict) -> None:
         """Save or update evaluation data.
@@ -29,9 +74,45 @@ class StorageService:
             evaluation_id: Unique identifier for the evaluation
             data: Evaluation data to store
         """
-        async with self._lock:
-            data["last_updated"] = datetime.now().isoformat()
-            self._storage[evaluation_id] = data
+        data["last_updated"] = datetime.now().isoformat()
+        self._storage[evaluation_id] = dict(data)
+        if data.get("fingerprint"):
+            self._fingerprints[data["fingerprint"]] = evaluation_id
+        if data.get("idempotency_key"):
+            self._idempotency_keys[data["idempotency_key"]] = evaluation_id
+        self._index_listing(evaluation_id)
+        self._search.add(evaluation_id, search_document(data.get("input"), data.get("result")))
+        self._schedule_expiry(evaluation_id, data["last_updated"])
+
+    async def update(
+        self,
+        evaluation_id: str,
+        fields: dict,
+        increment: Optional[str] = None
+    ) -> Optional[dict]:
+        """Merge fields into a stored evaluation atomically.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+            fields: Fields to set
+            increment: Counter field to increment
+
+        Returns:
+            Updated evaluation data, None if the evaluation does not exist
+        """
+        current = self._storage.get(evaluation_id)
+        if current is None:
+            return None
+        data = {**current, **fields, "last_updated": datetime.now().isoformat()}
+        if increment:
+            data[increment] = current.get(increment, 0) + 1
+        self._storage[evaluation_id] = data
+        self._index_listing(evaluation_id)
+        if any(field in fields for field in PAYLOAD_FIELDS):
+            self._search.add(evaluation_id, search_document(data.get("input"), data.get("result")))
+        if self._status_since[evaluation_id][0] != data.get("status"):
+            self._schedule_expiry(evaluation_id, data["last_updated"])
+        return data
 
     async def get(self, evaluation_id: str) -> Optional[dict]:
         """Retrieve evaluation data by ID.
@@ -42,11 +123,92 @@ class StorageService:
         Returns:
             Evaluation data if found, None otherwise
         """
-        async with self._lock:
-            return self._storage.get(evaluation_id)
+        return self._storage.get(evaluation_id)
+
+    async def get_status(self, evaluation_id: str) -> Optional[dict]:
+        """Retrieve an evaluation for a status check.
+
+        Persistent stores leave out the large input and result fields here;
+        use get() when they are needed.
+
+        Args:
+            evaluation_id: Unique identifier for the evaluation
+
+        Returns:
+            Evaluation data if found, None otherwise
+        """
+        return await self.get(evaluation_id)
+
+    async def find_by_fingerprint(self, fingerprint: str) -> Optional[dict]:
+        """Retrieve the latest evaluation submitted with an input fingerprint.
+
+        Args:
+            fingerprint: Submission fingerprint
+
+        Returns:
+            Evaluation data if found, None otherwise
+        """
+        evaluation_id = self._fingerprints.get(fingerprint)
+        return self._storage.get(evaluation_id) if evaluation_id else None
+
+    async def find_by_idempotency_key(self, key: str) -> Optional[dict]:
+        """Retrieve the evaluation created with an idempotency key.
+
+        Args:
+            key: Idempotency key (scoped by the caller)
+
+        Returns:
+            Evaluation data if found, None otherwise
+        """
+        evaluation_id = self._idempotency_keys.get(key)
+        return self._storage.get(evaluation_id) if evaluation_id else None
+
+    def _unindex(self, evaluation_id: str):
+        """Drop an evaluation from the secondary indexes."""
+        data = self._storage[evaluation_id]
+        for index, field in ((self._fingerprints, "fingerprint"), (self._idempotency_keys, "idempotency_key")):
+            if index.get(data.get(field)) == evaluation_id:
+                del index[data[field]]
+        self._unindex_listing(evaluation_id)
+        self._search.remove(evaluation_id)
+        self._status_since.pop(evaluation_id, None)
+
+    def _schedule_expiry(self, evaluation_id: str, since: str):
+        """Start an evaluation's TTL for its current status."""
+        status = self._storage[evaluation_id].get("status", "")
+        self._status_since[evaluation_id] = (status, since)
+        if self._expiry.ttl(status) is not None:
+            heapq.heappush(self._expiry_heaps.setdefault(status, []), (since, evaluation_id))
+
+    def _index_listing(self, evaluation_id: str):
+        """Add or move an evaluation in the listing indexes."""
+        data = self._storage[evaluation_id]
+        key = (data.get("created_at", ""), evaluation_id)
+        status = data.get("status", "")
+        candidate = (_candidate_name(data) or "").casefold()
+        if self._list_entries.get(evaluation_id) == (key, status, candidate):
+            return
+
+        self._unindex_listing(evaluation_id)
+        self._list_entries[evaluation_id] = (key, status, candidate)
+        self._by_created.add(key)
+        self._by_status.setdefault(status, SortedList()).add(key)
+        self._by_candidate.setdefault(candidate, SortedList()).add(key)
+
+    def _unindex_listing(self, evaluation_id: str):
+        """Drop an evaluation from the listing indexes."""
+        entry = self._list_entries.pop(evaluation_id, None)
+        if entry is None:
+            return
+        key, status, candidate = entry
+        self._by_created.remove(key)
+        for index, value in ((self._by_status, status), (self._by_candidate, candidate)):
+            index[value].remove(key)
+            if not index[value]:
+                del index[value]
 
     async def list_all(self, limit: int = 20, offset: int = 0) -> tuple[list[dict], int]:
-        """List all evaluations with pagination.
+        """List all evaluations with pagination, newest first.
 
         Args:
             limit: Maximum number of results to return
@@ -55,16 +217,111 @@ class StorageService:
         Returns:
             Tuple of (evaluation list, total count)
         """
-        async with self._lock:
-            all_evals = list(self._storage.values())
-            # Sort by created_at descending
-            all_evals.sort(
-                key=lambda x: x.get("created_at", ""),
-                reverse=True
+        total = len(self._by_created)
+        # Positional slice of the sorted index, O(log n + limit)
+        keys = self._by_created[max(total - offset - limit, 0):max(total - offset, 0)]
+        return [self._storage[key[1]] for key in reversed(keys)], total
+
+    async def list_page(
+        self,
+        limit: int = 20,
+        after: Optional[ListKey] = None,
+        status: Optional[str] = None,
+        candidate: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Tuple[List[dict], bool]:
+        """List evaluations newest first, continuing after a listing key.
+
+        Walks the most selective listing index from the cursor, so a page
+        costs O(log n + limit) plus any entries skipped for a second filter.
+
+        Args:
+            limit: Maximum number of results to return
+            after: (created_at, evaluation_id) of the last item of the previous page
+            status: Only evaluations with this status
+            candidate: Only evaluations of this candidate (case-insensitive)
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of (evaluation list, whether more results follow)
+        """
+        upper = min(
+            (bound for bound in (after, (created_to,) if created_to else None) if bound),
+            default=None
+        )
+        lower = (created_from,) if created_from else None
+
+        index = self._by_created
+        if status is not None:
+            index = min(index, self._by_status.get(status, SortedList()), key=len)
+        if candidate is not None:
+            index = min(index, self._by_candidate.get(candidate.casefold(), SortedList()), key=len)
+
+        page = []
+        for key in index.irange(lower, upper, inclusive=(True, False), reverse=True):
+            _, key_status, key_candidate = self._list_entries[key[1]]
+            if status is not None and key_status != status:
+                continue
+            if candidate is not None and key_candidate != candidate.casefold():
+                continue
+            if len(page) == limit:
+                return page, True
+            page.append(self._storage[key[1]])
+        return page, False
+
+    async def count(self) -> int:
+        """Number of stored evaluations."""
+        return len(self._storage)
+
+    async def search(
+        self,
+        query: SearchQuery,
+        limit: int = 20,
+        offset: int = 0,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> Tuple[List[Tuple[dict, float]], int]:
+        """Full-text search, best match first.
+
+        Args:
+            query: Parsed search query
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+            status: Only evaluations with this status
+            created_from: Only evaluations created at or after this ISO timestamp
+            created_to: Only evaluations created before this ISO timestamp
+
+        Returns:
+            Tuple of ([(evaluation data, score)], number of matches)
+        """
+        def accept(evaluation_id: str) -> bool:
+            (created_at, _), entry_status, _ = self._list_entries[evaluation_id]
+            return (
+                (status is None or entry_status == status)
+                and (created_from is None or created_at >= created_from)
+                and (created_to is None or created_at < created_to)
             )
-            total = len(all_evals)
-            paginated = all_evals[offset:offset + limit]
-            return paginated, total
+
+        filtered = any(value is not None for value in (status, created_from, created_to))
+        ranked, total = self._search.search(query, limit, offset, accept if filtered else None)
+        return [(self._storage[evaluation_id], score) for evaluation_id, score in ranked], total
+
+    async def list_by_status(self, statuses: Iterable[str]) -> List[dict]:
+        """List the evaluations in any of the given statuses, oldest first.
+
+        Args:
+            statuses: Statuses to match
+
+        Returns:
+            Evaluation data list
+        """
+        keys = SortedList()
+        for status in set(statuses):
+            keys.update(self._by_status.get(status, ()))
+        return [self._storage[key[1]] for key in keys]
 
     async def delete(self, evaluation_id: str) -> bool:
         """Delete an evaluation by ID.
@@ -75,38 +332,42 @@ class StorageService:
         Returns:
             True if deleted, False if not found
         """
-        async with self._lock:
-            if evaluation_id in self._storage:
-                del self._storage[evaluation_id]
-                return True
-            return False
+        if evaluation_id in self._storage:
+            self._unindex(evaluation_id)
+            del self._storage[evaluation_id]
+            return True
+        return False
+
+    async def cleanup_expired(self, limit: Optional[int] = None) -> Dict[str, List[str]]:
+        """Remove evaluations whose status TTL has passed, oldest first.
 
-    async def cleanup_expired(self) -> int:
-        """Remove evaluations older than TTL.
+        Only the expired heap entries are visited, so a batch costs
+        O(limit * log n) however many evaluations are stored.
+
+        Args:
+            limit: Maximum number of evaluations to remove (None for all)
 
         Returns:
-            Number of evaluations deleted
+            IDs of the evaluations deleted, per status
         """
-        cutoff_time = datetime.now() - timedelta(hours=self._ttl_hours)
-        deleted_count = 0
-
-        async with self._lock:
-            expired_ids = []
-            for eval_id, data in self._storage.items():
-                created_at_str = data.get("created_at")
-                if created_at_str:
-                    try:
-                        created_at = datetime.fromisoformat(created_at_str.replace("Z", "+00:00"))
-                        if created_at < cutoff_time:
-                            expired_ids.append(eval_id)
-                    except (ValueError, AttributeError):
-                        pass
-
-            for eval_id in expired_ids:
-                del self._storage[eval_id]
-                deleted_count += 1
-
-        return deleted_count
+        deleted: Dict[str, List[str]] = {}
+        remaining = limit
+
+        for status, cutoff in self._expiry.cutoffs().items():
+            heap = self._expiry_heaps.get(status, [])
+            while heap and heap[0][0] < cutoff and remaining != 0:
+                entry = heapq.heappop(heap)
+                if self._status_since.get(entry[1]) != (status, entry[0]):
+                    continue  # Status changed (or deleted) since this entry
+                self._unindex(entry[1])
+                del self._storage[entry[1]]
+                deleted.setdefault(status, []).append(entry[1])
+                if remaining is not None:
+                    remaining -= 1
+
+        for status, evaluation_ids in deleted.items():
+            self._evicted[status] = self._evicted.get(status, 0) + len(evaluation_ids)
+        return deleted
 
     async def get_stats(self) -> dict:
         """Get storage statistics.
@@ -114,17 +375,75 @@ class StorageService:
         Returns:
             Dictionary with storage stats
         """
-        async with self._lock:
-            status_counts = {}
-            for data in self._storage.values():
-                status = data.get("status", "unknown")
-                status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = {status or "unknown": len(keys) for status, keys in self._by_status.items()}
+        return {
+            "total_evaluations": len(self._storage),
+            "status_counts": status_counts,
+            "evicted": dict(self._evicted)
+        }
+
 
-            return {
-                "total_evaluations": len(self._storage),
-                "status_counts": status_counts
-            }
+def create_storage() -> Union[StorageService, "SqliteStorageService", "RedisStorageService"]:
+    """Create the evaluation store from config.yaml (evaluation_storage section).
+
+    evaluation_storage.backend selects "memory" (lost on restart), "sqlite"
+    (persistent, shared with other processes on this host) or "redis" (shared
+    with every API worker, see the redis section). EVALUATION_STORAGE_BACKEND
+    and EVALUATION_STORAGE_DB override the config.
+    """
+    storage_config = config["evaluation_storage"]
+    backend = os.getenv("EVALUATION_STORAGE_BACKEND") or storage_config.get("backend", "memory")
+
+    if backend == "sqlite":
+        from .sqlite_storage import SqliteStorageService
+
+        path = os.getenv("EVALUATION_STORAGE_DB") or storage_config["path"]
+        if not os.path.isabs(path):
+            path = os.path.join(BASE_DIR, path)
+        return SqliteStorageService(
+            path,
+            ttl_hours=storage_config["ttl_hours"],
+            ttl_hours_by_status=storage_config.get("ttl_hours_by_status"),
+            read_connections=storage_config["read_connections"]
+        )
+    if backend == "redis":
+        from .redis_client import get_redis_client, redis_key_prefix
+        from .redis_storage import RedisStorageService
+
+        return RedisStorageService(
+            get_redis_client(),
+            key_prefix=redis_key_prefix(),
+            ttl_hours=storage_config["ttl_hours"],
+            ttl_hours_by_status=storage_config.get("ttl_hours_by_status")
+        )
+    if backend != "memory":
+        raise ValueError(f"Unknown evaluation storage backend: {backend}")
+
+    return StorageService(
+        ttl_hours=storage_config["ttl_hours"],
+        ttl_hours_by_status=storage_config.get("ttl_hours_by_status")
+    )
+
+
+def release_evaluations(evaluation_ids: List[str]):
+    """Delete the checkpoint threads of evicted evaluations and release their blobs.
+
+    Args:
+        evaluation_ids: Evaluations removed from the store
+    """
+    # Every pipeline shares one checkpointer, keyed by evaluation ID
+    checkpointer = get_pipeline_graph("full").checkpointer
+    blob_store = get_blob_store()
+    for evaluation_id in evaluation_ids:
+        checkpointer.delete_thread(evaluation_id)
+        blob_store.release(evaluation_id)
 
 
-# Global instance (singleton pattern)
-storage = StorageService()
+# Global instances (singleton pattern)
+storage = create_storage()
+storage_expiry = ExpiryTask(
+    storage,
+    interval_seconds=config["evaluation_storage"]["expiry"]["interval_seconds"],
+    batch_size=config["evaluation_storage"]["expiry"]["batch_size"],
+    release=release_evaluations
+)
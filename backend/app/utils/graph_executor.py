@@ -10,8 +10,14 @@ from typing import Callable, Optional, Dict, Any
 # Add parent directories to path to import from src/
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../.."))
 
-from src.graph.graph import evaluation_graph
-from src.graph.state import create_initial_state, EvaluationState
+from src.graph.pipelines import get_pipeline_graph, get_graph_for_evaluation, progress_map
+from src.graph.checkpoint import config as app_config, thread_config
+from src.graph.state import create_initial_state
+from src.utils.blob_store import get_blob_store
+from src.utils.cancellation import CancelToken, EvaluationCancelled, cancellation_scope
+from src.utils.token_stream import token_listener_scope
+
+from .progress import RunProgress, get_agent_stats
 
 
 logger = logging.getLogger(__name__)
@@ -20,11 +26,26 @@ logger = logging.getLogger(__name__)
 class GraphExecutor:
     """Executes the evaluation graph with progress hooks for WebSocket streaming."""
 
-    # Map node names to progress percentages
-    PROGRESS_MAP = {
-        "primary_evaluator": {"started": 0, "completed": 33},
-        "challenge_agent": {"started": 33, "completed": 67},
-        "decision_agent": {"started": 67, "completed": 100}
+    # Prefix of each node's token counts in metadata["tokens"]
+    TOKEN_PREFIX = {
+        "primary_evaluator": "primary",
+        "challenge_agent": "challenge",
+        "decision_agent": "decision"
+    }
+
+    # Agent output fields returned to clients, stored as blob references
+    RESPONSE_TEXT_FIELDS = ("primary_evaluation", "challenges", "final_evaluation", "decision")
+
+    # Reported node for tasks that run as part of another node's step
+    TASK_NODE = {
+        "primary_evaluator_part": "primary_evaluator"
+    }
+
+    # State field holding each node's output text
+    OUTPUT_FIELD = {
+        "primary_evaluator": "primary_evaluation",
+        "challenge_agent": "challenges",
+        "decision_agent": "decision"
     }
 
     def __init__(self, event_emitter: Optional[Callable[[str, dict], None]] = None):
@@ -54,180 +75,211 @@ class GraphExecutor:
     async def execute_graph(
         self,
         evaluation_id: str,
-        rubric: str,
-        transcript: str,
-        candidate_info: dict
+        rubric: Optional[str] = None,
+        transcript: Optional[str] = None,
+        candidate_info: Optional[dict] = None,
+        pipeline: str = "full",
+        prompt_versions: Optional[dict] = None,
+        resume: bool = False,
+        cancel_token: Optional[CancelToken] = None
     ) -> Dict[str, Any]:
         """Execute the evaluation graph with progress streaming.
 
+        Runs are checkpointed under the evaluation ID, so a resumed run skips
+        every node that already completed. Events carry only what each node
+        produced; the caller announces completion once the result is stored.
+        While a node streams its output, throttled progress events report the
+        percentage and ETA derived from its output tokens (see RunProgress).
+
         Args:
             evaluation_id: Unique identifier for this evaluation
-            rubric: Natural language evaluation criteria
-            transcript: Interview transcript
-            candidate_info: Candidate information dict
+            rubric: Evaluation criteria or blob reference (not needed when resuming)
+            transcript: Interview transcript or blob reference (not needed when resuming)
+            candidate_info: Candidate information dict (not needed when resuming)
+            pipeline: Pipeline variant to run (resumed runs keep their original one)
+            prompt_versions: Prompt snapshot pinned at submission (resumed runs keep theirs)
+            resume: Continue from the last checkpoint instead of starting over
+            cancel_token: Token that stops the run between nodes and aborts
+                in-flight LLM requests when cancelled
 
         Returns:
-            Final evaluation state as dictionary
+            Final evaluation state, with large texts as blob references
 
         Raises:
+            ValueError: If resume is requested but no checkpoint exists
+            EvaluationCancelled: If cancel_token was cancelled
             Exception: If graph execution fails
         """
-        # Create initial state using existing function
-        initial_state = create_initial_state(
-            rubric=rubric,
-            transcript=transcript,
-            candidate_info=candidate_info
+        config = thread_config(evaluation_id)
+
+        completed_nodes = []
+        if resume:
+            graph = get_graph_for_evaluation(evaluation_id)
+            snapshot = graph.get_state(config)
+            if not snapshot.values:
+                raise ValueError(f"No checkpoint found for evaluation {evaluation_id}")
+            # Streaming None continues from the saved checkpoint
+            graph_input = None
+            pipeline = snapshot.values["metadata"].get("pipeline", "full")
+            completed_nodes = [
+                node for node, field in self.OUTPUT_FIELD.items() if snapshot.values.get(field)
+            ]
+        else:
+            # Create initial state using existing function
+            graph = get_pipeline_graph(pipeline)
+            graph_input = create_initial_state(
+                rubric=rubric,
+                transcript=transcript,
+                candidate_info=candidate_info,
+                pipeline=pipeline,
+                prompt_versions=prompt_versions
+            )
+
+        # Progress percentages for the nodes this pipeline reports, advanced
+        # within each node by its streamed output tokens
+        progress_by_node = progress_map(pipeline)
+        agent_stats = get_agent_stats()
+        progress = RunProgress(
+            progress_by_node,
+            await asyncio.to_thread(agent_stats.expected, progress_by_node),
+            min_report_interval=1.0 / app_config["progress"]["events_per_second"]
         )
+        for node_name in completed_nodes:
+            if node_name in progress_by_node:
+                progress.complete_node(node_name)
 
         # Emit evaluation started event
         await self.emit_event(evaluation_id, "evaluation_started")
 
-        # Async queue for event communication
-        event_queue = asyncio.Queue()
+        # The graph thread pushes events straight onto the event loop; the
+        # loop side simply awaits them, with no polling timer.
+        loop = asyncio.get_running_loop()
+        event_queue: asyncio.Queue = asyncio.Queue()
 
-        def run_graph_in_thread(loop):
-            """Synchronous function to run graph in thread pool."""
-            current_state = dict(initial_state)
+        def push_event(event):
+            """Deliver an event to the event loop from the graph thread."""
+            loop.call_soon_threadsafe(event_queue.put_nowait, event)
+
+        def on_output_tokens(count: int):
+            """Count tokens streamed by a node thread, reporting at a throttled rate."""
+            if progress.add_tokens(count):
+                push_event(("progress", progress.report()))
 
-            def put_event_sync(event):
-                """Put event into async queue from sync context."""
-                asyncio.run_coroutine_threadsafe(event_queue.put(event), loop)
+        def run_graph_in_thread():
+            """Synchronous function to run graph in thread pool."""
+            started_nodes = set()
 
             try:
-                # Stream through the graph (blocking operation)
-                for chunk in evaluation_graph.stream(initial_state, stream_mode="updates"):
-                    for node_name, node_output in chunk.items():
-                        # Signal node started
-                        if node_name in self.PROGRESS_MAP:
-                            progress = self.PROGRESS_MAP[node_name]["started"]
-                            put_event_sync(("node_started", node_name, progress))
-
-                        # Merge node output into current state
-                        for key, value in node_output.items():
-                            if isinstance(value, dict) and isinstance(current_state.get(key), dict):
-                                current_state[key] = {**current_state[key], **value}
-                            else:
-                                current_state[key] = value
-
-                        # Signal node completed with current state snapshot
-                        if node_name in self.PROGRESS_MAP:
-                            progress = self.PROGRESS_MAP[node_name]["completed"]
-                            # Create a deep copy of state for this event
-                            state_snapshot = {
-                                "metadata": current_state.get("metadata", {}),
-                                "primary_evaluation": current_state.get("primary_evaluation", ""),
-                                "challenges": current_state.get("challenges", ""),
-                                "final_evaluation": current_state.get("final_evaluation", ""),
-                                "decision": current_state.get("decision", "")
-                            }
-                            put_event_sync(("node_completed", node_name, progress, state_snapshot))
+                # Nodes run under the cancel token; LLM calls abort when it
+                # trips and stream their output tokens to the progress tracker
+                with cancellation_scope(cancel_token), token_listener_scope(on_output_tokens):
+                    for mode, chunk in graph.stream(graph_input, config, stream_mode=["tasks", "updates"]):
+                        # Stop between nodes once the run is cancelled
+                        if cancel_token:
+                            cancel_token.raise_if_cancelled()
+                        if mode == "tasks":
+                            # Start events carry the task input, finish events its result
+                            if "input" not in chunk:
+                                continue
+                            node_name = self.TASK_NODE.get(chunk["name"], chunk["name"])
+                            if node_name in progress_by_node and node_name not in started_nodes:
+                                started_nodes.add(node_name)
+                                progress.start_node(node_name)
+                                push_event(("node_started", node_name, progress.report()))
+                            continue
+
+                        for node_name, node_output in chunk.items():
+                            if node_name in progress_by_node:
+                                observed = progress.complete_node(node_name)
+                                push_event(("node_completed", node_name, progress.report(), node_output, observed))
+
+                # Read the merged final state once from the checkpoint, keeping
+                # only references to the large texts
+                final_state = get_blob_store().put_fields(
+                    dict(graph.get_state(config).values),
+                    self.RESPONSE_TEXT_FIELDS
+                )
 
                 # Signal completion
-                put_event_sync(("completed", current_state))
-                return current_state
+                push_event(("completed",))
+                return final_state
 
-            except Exception as e:
-                put_event_sync(("error", str(e)))
+            except BaseException:
+                # Wake the loop; the exception itself is re-raised by the task
+                push_event(("failed",))
                 raise
 
-        # Get current event loop
-        loop = asyncio.get_event_loop()
-
         # Start graph execution in thread pool
-        graph_task = asyncio.create_task(asyncio.to_thread(run_graph_in_thread, loop))
+        graph_task = asyncio.create_task(asyncio.to_thread(run_graph_in_thread))
 
-        # Process events from queue while graph runs
-        final_state = None
         try:
+            # The graph thread always ends with a "completed" or "failed" event
             while True:
-                # Check for events with timeout (non-blocking async)
-                try:
-                    event = await asyncio.wait_for(event_queue.get(), timeout=0.5)
-
-                    if event[0] == "node_started":
-                        _, node_name, progress = event
-                        await self.emit_event(
-                            evaluation_id,
-                            "node_started",
-                            node=node_name,
-                            progress_percentage=progress
+                event = await event_queue.get()
+
+                if event[0] == "node_started":
+                    _, node_name, report = event
+                    await self.emit_event(
+                        evaluation_id,
+                        "node_started",
+                        node=node_name,
+                        progress_percentage=report["progress_percentage"],
+                        eta_seconds=report["eta_seconds"]
+                    )
+
+                elif event[0] == "progress":
+                    _, report = event
+                    await self.emit_event(evaluation_id, "progress", **report)
+
+                elif event[0] == "node_completed":
+                    _, node_name, report, node_output, observed = event
+
+                    # Extract token info from the node's metadata delta
+                    tokens = None
+                    token_data = (node_output.get("metadata") or {}).get("tokens")
+                    if token_data:
+                        prefix = self.TOKEN_PREFIX[node_name]
+                        tokens = {
+                            "input": token_data.get(f"{prefix}_input", 0),
+                            "output": token_data.get(f"{prefix}_output", 0)
+                        }
+
+                    # Get output preview
+                    output_preview = None
+                    output = node_output.get(self.OUTPUT_FIELD[node_name])
+                    if output:
+                        output_preview = output[:200]
+
+                    await self.emit_event(
+                        evaluation_id,
+                        "node_completed",
+                        node=node_name,
+                        progress_percentage=report["progress_percentage"],
+                        eta_seconds=report["eta_seconds"],
+                        output_preview=output_preview,
+                        tokens=tokens
+                    )
+
+                    # Feed the agent's averages; non-streamed calls report
+                    # their output through the token metadata instead
+                    if observed:
+                        streamed, seconds = observed
+                        await asyncio.to_thread(
+                            agent_stats.record,
+                            node_name,
+                            streamed or (tokens or {}).get("output", 0),
+                            seconds
                         )
 
-                    elif event[0] == "node_completed":
-                        _, node_name, progress, state_snapshot = event
-
-                        # Extract token info
-                        tokens = None
-                        if state_snapshot.get("metadata", {}).get("tokens"):
-                            token_data = state_snapshot["metadata"]["tokens"]
-                            tokens = {
-                                "input": token_data.get(f"{node_name}_input", 0),
-                                "output": token_data.get(f"{node_name}_output", 0)
-                            }
-
-                        # Get output preview
-                        output_preview = None
-                        if node_name == "primary_evaluator" and state_snapshot.get("primary_evaluation"):
-                            output_preview = state_snapshot["primary_evaluation"][:200]
-                        elif node_name == "challenge_agent" and state_snapshot.get("challenges"):
-                            output_preview = state_snapshot["challenges"][:200]
-                        elif node_name == "decision_agent" and state_snapshot.get("decision"):
-                            output_preview = state_snapshot["decision"][:200]
-
-                        await self.emit_event(
-                            evaluation_id,
-                            "node_completed",
-                            node=node_name,
-                            progress_percentage=progress,
-                            output_preview=output_preview,
-                            tokens=tokens
-                        )
+                elif event[0] in ("completed", "failed"):
+                    break
 
-                    elif event[0] == "completed":
-                        final_state = event[1]
-                        await self.emit_event(
-                            evaluation_id,
-                            "evaluation_completed",
-                            result=final_state
-                        )
-                        break
-
-                    elif event[0] == "error":
-                        error_msg = event[1]
-                        await self.emit_event(
-                            evaluation_id,
-                            "error",
-                            error=error_msg
-                        )
-                        break
-
-                except asyncio.TimeoutError:
-                    # No event in queue, check if task is done
-                    if graph_task.done():
-                        # Task finished, get result or exception
-                        try:
-                            final_state = await graph_task
-                            if final_state and event_queue.empty():
-                                # Task completed but no completion event received
-                                logger.warning("Graph completed but no completion event received")
-                                await self.emit_event(
-                                    evaluation_id,
-                                    "evaluation_completed",
-                                    result=final_state
-                                )
-                        except Exception as e:
-                            logger.error(f"Graph execution failed: {e}")
-                            # Exception already put in queue, will be processed
-                        break
-                    # Continue polling
-
-            # Wait for graph task to complete
-            if not graph_task.done():
-                final_state = await graph_task
-            elif final_state is None:
-                final_state = await graph_task
-
-            return final_state
+            # Returns the final state, or raises the graph's exception
+            return await graph_task
+
+        except EvaluationCancelled:
+            logger.info(f"Evaluation {evaluation_id} cancelled")
+            raise
 
         except Exception as e:
             logger.error(f"Graph executor error: {e}")
@@ -0,0 +1,237 @@
+"""Token-driven progress and ETAs for running evaluations.
+
+Within a node, progress follows the output tokens streamed so far against that
+agent's historical average output, so long agent calls move the progress bar.
+ETAs combine the running node's token rate with the historical durations of
+the nodes still to run. The averages live in a small SQLite database shared by
+the API process and backend/worker.py.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.graph.checkpoint import BASE_DIR, config
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS agent_stats (
+    node TEXT PRIMARY KEY,
+    output_tokens REAL NOT NULL,
+    seconds REAL NOT NULL,
+    runs INTEGER NOT NULL
+);
+"""
+
+# Share of a node's progress span that streamed tokens alone can reach; the
+# rest is reported when the node completes
+MAX_NODE_FRACTION = 0.95
+
+
+class AgentStats:
+    """Moving averages of each agent's output tokens and duration."""
+
+    def __init__(
+        self,
+        path: str,
+        history_weight: float = 0.2,
+        default_output_tokens: float = 1500.0,
+        default_seconds: float = 60.0
+    ):
+        """Open (and create if needed) the statistics database.
+
+        Args:
+            path: SQLite database path (":memory:" for tests)
+            history_weight: Weight of the newest run in the moving averages
+            default_output_tokens: Expected output of an agent without history
+            default_seconds: Expected duration of an agent without history
+        """
+        self.path = path
+        self.history_weight = history_weight
+        self.default_output_tokens = default_output_tokens
+        self.default_seconds = default_seconds
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def expected(self, nodes: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """Expected (output tokens, seconds) of each node.
+
+        Args:
+            nodes: Node names
+
+        Returns:
+            Dict of node name to its averages, or the defaults without history
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT node, output_tokens, seconds FROM agent_stats").fetchall()
+        averages = {node: (output_tokens, seconds) for node, output_tokens, seconds in rows}
+        return {
+            node: averages.get(node, (self.default_output_tokens, self.default_seconds))
+            for node in nodes
+        }
+
+    def record(self, node: str, output_tokens: float, seconds: float):
+        """Fold a completed node run into its averages.
+
+        Args:
+            node: Node name
+            output_tokens: Output tokens the node produced
+            seconds: Time the node took
+        """
+        weight = self.history_weight
+        with self._lock:
+            # One statement, so concurrent workers cannot lose an update
+            self._conn.execute(
+                """
+                INSERT INTO agent_stats (node, output_tokens, seconds, runs) VALUES (?, ?, ?, 1)
+                ON CONFLICT (node) DO UPDATE SET
+                    output_tokens = output_tokens + ? * (excluded.output_tokens - output_tokens),
+                    seconds = seconds + ? * (excluded.seconds - seconds),
+                    runs = runs + 1
+                """,
+                (node, output_tokens, seconds, weight, weight)
+            )
+
+
+class RunProgress:
+    """Progress percentage and ETA of one run, fed by streamed output tokens.
+
+    Node transitions and token counts arrive from the graph threads; report()
+    can be called from any thread.
+    """
+
+    def __init__(
+        self,
+        progress_by_node: Dict[str, Dict[str, int]],
+        expected: Dict[str, Tuple[float, float]],
+        min_report_interval: float = 0.5
+    ):
+        """Initialize progress for a run.
+
+        Args:
+            progress_by_node: Start/end percentage of each node (see progress_map)
+            expected: Expected (output tokens, seconds) of each node (see AgentStats)
+            min_report_interval: Minimum seconds between token-driven reports
+        """
+        self.progress_by_node = progress_by_node
+        self.expected = expected
+        self.min_report_interval = min_report_interval
+
+        self._lock = threading.Lock()
+        self._started = set()
+        self._completed = set()
+        self._node: Optional[str] = None
+        self._node_started_at = 0.0
+        self._tokens = 0
+        self._percentage = 0
+        self._last_report = 0.0
+
+    def start_node(self, node: str):
+        """Mark a node as running; its streamed tokens count from now."""
+        with self._lock:
+            self._started.add(node)
+            self._node = node
+            self._node_started_at = time.monotonic()
+            self._tokens = 0
+
+    def complete_node(self, node: str) -> Optional[Tuple[int, float]]:
+        """Mark a node as completed.
+
+        Returns:
+            (output tokens streamed, seconds) of the node's run, or None if it
+            was not started in this run (e.g. restored from a checkpoint)
+        """
+        with self._lock:
+            self._completed.add(node)
+            if node != self._node:
+                return None
+            self._node = None
+            return self._tokens, time.monotonic() - self._node_started_at
+
+    def add_tokens(self, count: int) -> bool:
+        """Count output tokens streamed by the running node.
+
+        Returns:
+            True if a progress report is due (reports are throttled to one
+            per min_report_interval)
+        """
+        with self._lock:
+            self._tokens += count
+            now = time.monotonic()
+            if self._node is None or now - self._last_report < self.min_report_interval:
+                return False
+            self._last_report = now
+            return True
+
+    def report(self) -> Dict[str, object]:
+        """Current node, progress percentage, ETA and streamed output tokens."""
+        with self._lock:
+            percentage = max(
+                [self.progress_by_node[node]["completed"] for node in self._completed] or [0]
+            )
+            eta = sum(
+                self.expected[node][1] for node in self.progress_by_node
+                if node not in self._started and node not in self._completed
+            )
+
+            if self._node is not None:
+                span = self.progress_by_node[self._node]
+                expected_tokens, expected_seconds = self.expected[self._node]
+                fraction = min(self._tokens / max(expected_tokens, 1.0), MAX_NODE_FRACTION)
+                percentage = max(
+                    percentage,
+                    span["started"] + int((span["completed"] - span["started"]) * fraction)
+                )
+
+                # Blend the node's historical duration with the time left at
+                # its current token rate, trusting the rate more as it streams
+                elapsed = time.monotonic() - self._node_started_at
+                remaining = max(expected_seconds - elapsed, 0.0)
+                if self._tokens:
+                    weight = min(self._tokens / max(expected_tokens, 1.0), 1.0)
+                    at_rate = max(expected_tokens - self._tokens, 0) * elapsed / self._tokens
+                    remaining = (1 - weight) * remaining + weight * at_rate
+                eta += remaining
+
+            # Never move backwards (a resumed node may stream fewer tokens)
+            self._percentage = max(self._percentage, percentage)
+            return {
+                "node": self._node,
+                "progress_percentage": self._percentage,
+                "eta_seconds": round(eta, 1),
+                "output_tokens": self._tokens
+            }
+
+
+_agent_stats: Optional[AgentStats] = None
+_agent_stats_lock = threading.Lock()
+
+
+def get_agent_stats() -> AgentStats:
+    """Get the process-wide agent statistics configured from config.yaml.
+
+    EVALUATION_PROGRESS_DB overrides progress.stats_path; relative paths are
+    resolved against the project root.
+    """
+    global _agent_stats
+    with _agent_stats_lock:
+        if _agent_stats is None:
+            progress_config = config["progress"]
+            path = os.getenv("EVALUATION_PROGRESS_DB") or progress_config["stats_path"]
+            if path != ":memory:" and not os.path.isabs(path):
+                path = os.path.join(BASE_DIR, path)
+
+            _agent_stats = AgentStats(
+                path,
+                history_weight=progress_config["history_weight"],
+                default_output_tokens=progress_config["default_output_tokens"],
+                default_seconds=progress_config["default_seconds"]
+            )
+        return _agent_stats
@@ -0,0 +1,77 @@
+"""Fold the completed evaluations already in the store into the analytics rollups.
+
+Evaluations are recorded in the rollups as they complete. For evaluations that
+completed before the rollups existed (or after restoring a store), backfill
+them:
+
+    cd backend
+    python backfill_analytics.py [--rebuild] [--dry-run]
+
+Evaluations already recorded are skipped, so the backfill can be re-run
+safely. --rebuild drops the rollups first and recounts every evaluation.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load .env from the project root and make src/ importable
+ROOT_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(ROOT_DIR / ".env")
+sys.path.append(str(ROOT_DIR))
+
+from app.services.analytics import evaluation_facts, get_analytics
+from app.services.storage_service import StorageService, storage
+
+
+logger = logging.getLogger("backfill_analytics")
+
+
+async def backfill(rebuild: bool = False, dry_run: bool = False) -> int:
+    """Record every completed evaluation missing from the rollups.
+
+    Args:
+        rebuild: Drop the rollups first
+        dry_run: Only report how many evaluations would be recorded
+
+    Returns:
+        Number of evaluations recorded
+    """
+    if isinstance(storage, StorageService):
+        raise SystemExit("evaluation_storage.backend must be 'sqlite' or 'redis' to backfill")
+    analytics = get_analytics()
+    if rebuild and not dry_run:
+        await asyncio.to_thread(analytics.clear)
+
+    recorded = 0
+    for summary in await storage.list_by_status(["completed"]):
+        eval_data = await storage.get(summary["evaluation_id"])
+        facts = await asyncio.to_thread(evaluation_facts, eval_data) if eval_data else None
+        if facts is None:
+            logger.warning(f"Skipping {summary['evaluation_id']}: no result")
+            continue
+        if dry_run:
+            recorded += 1
+        elif await asyncio.to_thread(analytics.record, facts):
+            recorded += 1
+
+    return recorded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the analytics rollups from the evaluation store")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the rollups and recount every evaluation")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the completed evaluations")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s")
+    recorded = asyncio.run(backfill(args.rebuild, args.dry_run))
+    logger.info(f"{recorded} evaluation(s) {'completed' if args.dry_run else 'recorded'}")
+
+
+if __name__ == "__main__":
+    main()
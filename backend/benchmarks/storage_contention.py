@@ -0,0 +1,141 @@
+"""Status-poll latency of the in-memory evaluation store under contention.
+
+Many frontend pollers read single evaluations while progress writers, listing
+requests and stats calls run alongside them. The same workload is run against
+the current StorageService and against GlobalLockStorage, a reproduction of
+the store before it was reworked: one asyncio.Lock around every call, listings
+that copy and sort every evaluation, and stats that scan them all.
+
+    cd backend
+    python benchmarks/storage_contention.py [--evaluations 20000] [--pollers 200] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Make the backend and src/ importable
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+sys.path.append(str(BACKEND_DIR.parent))
+
+from app.services.storage_service import StorageService
+
+
+class GlobalLockStorage:
+    """The store before the rework: every call holds one global lock."""
+
+    def __init__(self):
+        self._storage: Dict[str, dict] = {}
+        self._lock = asyncio.Lock()
+
+    async def save(self, evaluation_id: str, data: dict) -> None:
+        async with self._lock:
+            self._storage[evaluation_id] = data
+
+    async def get_status(self, evaluation_id: str) -> Optional[dict]:
+        async with self._lock:
+            return self._storage.get(evaluation_id)
+
+    async def update(self, evaluation_id: str, fields: dict, increment: Optional[str] = None) -> Optional[dict]:
+        async with self._lock:
+            data = self._storage.get(evaluation_id)
+            if data is not None:
+                data.update(fields)
+            return data
+
+    async def list_all(self, limit: int = 20, offset: int = 0):
+        async with self._lock:
+            all_evals = list(self._storage.values())
+            all_evals.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            return all_evals[offset:offset + limit], len(all_evals)
+
+    async def get_stats(self) -> dict:
+        async with self._lock:
+            status_counts: Dict[str, int] = {}
+            for data in self._storage.values():
+                status_counts[data["status"]] = status_counts.get(data["status"], 0) + 1
+            return {"total_evaluations": len(self._storage), "status_counts": status_counts}
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    samples = sorted(samples)
+    return samples[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+async def run_workload(storage, evaluations: int, pollers: int, writers: int, listers: int, seconds: float) -> dict:
+    """Run the mixed workload and measure the pollers.
+
+    Returns:
+        Poll count, polls per second and poll latency percentiles (ms)
+    """
+    ids = [f"eval-{index:06d}" for index in range(evaluations)]
+    for index, evaluation_id in enumerate(ids):
+        await storage.save(evaluation_id, {
+            "evaluation_id": evaluation_id,
+            "status": random.choice(("completed", "failed", "processing")),
+            "created_at": f"2026-01-01T00:00:00.{index:06d}",
+            "input": {"candidate_info": {"name": f"Candidate {index % 500}"}},
+            "progress_percentage": 0
+        })
+
+    deadline = time.perf_counter() + seconds
+    latencies: List[float] = []
+
+    async def poller():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            # Yield as a request handler would, then read one evaluation
+            await asyncio.sleep(0)
+            await storage.get_status(random.choice(ids))
+            latencies.append(time.perf_counter() - started)
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            await storage.update(random.choice(ids), {"progress_percentage": random.randint(0, 100)}, increment="version")
+            await asyncio.sleep(0)
+
+    async def lister():
+        while time.perf_counter() < deadline:
+            await storage.list_all(limit=20)
+            await storage.get_stats()
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        *(poller() for _ in range(pollers)),
+        *(writer() for _ in range(writers)),
+        *(lister() for _ in range(listers))
+    )
+    return {
+        "polls": len(latencies),
+        "polls_per_second": round(len(latencies) / seconds),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark status polls against concurrent writes and listings")
+    parser.add_argument("--evaluations", type=int, default=20000, help="Stored evaluations")
+    parser.add_argument("--pollers", type=int, default=200, help="Concurrent status pollers")
+    parser.add_argument("--writers", type=int, default=20, help="Concurrent progress writers")
+    parser.add_argument("--listers", type=int, default=4, help="Concurrent listing/stats clients")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration per store")
+    args = parser.parse_args()
+
+    for name, storage in (("global lock (before)", GlobalLockStorage()), ("StorageService", StorageService())):
+        random.seed(0)
+        result = asyncio.run(run_workload(
+            storage, args.evaluations, args.pollers, args.writers, args.listers, args.seconds
+        ))
+        print(f"{name:>22}: " + ", ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Import checkpointed evaluations into the configured evaluation store.
+
+Under the in-memory store, evaluation records were lost on every restart, but
+each run's graph state survives in the checkpoint database. After switching
+evaluation_storage.backend to "sqlite", rebuild the records the store does not
+have yet:
+
+    cd backend
+    python migrate_storage.py [--dry-run]
+
+Finished runs are imported as completed, with their result. Unfinished runs
+are imported as failed, so they can be resumed via
+POST /api/v1/evaluations/{id}/resume.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load .env from the project root and make src/ importable
+ROOT_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(ROOT_DIR / ".env")
+sys.path.append(str(ROOT_DIR))
+
+from app.services.evaluation_service import evaluation_from_checkpoint
+from app.services.job_queue import DEFAULT_TENANT
+from app.services.storage_service import StorageService, storage
+from app.utils.graph_executor import GraphExecutor
+
+from src.graph.checkpoint import list_thread_ids, thread_config
+from src.graph.pipelines import get_graph_for_evaluation, get_pipeline_graph
+from src.utils.blob_store import find_refs, get_blob_store
+
+
+logger = logging.getLogger("migrate_storage")
+
+
+def _checkpointed_evaluation(evaluation_id: str) -> dict:
+    """Build the stored record of a checkpointed evaluation."""
+    snapshot = get_graph_for_evaluation(evaluation_id).get_state(thread_config(evaluation_id))
+    values = snapshot.values
+    eval_data = {
+        **evaluation_from_checkpoint(evaluation_id, values),
+        "priority": "interactive",
+        "tenant": DEFAULT_TENANT,
+        "error": None
+    }
+
+    if snapshot.next:
+        eval_data.update({
+            "status": "failed",
+            "progress_percentage": 0,
+            "error": "Interrupted before the evaluation store was persistent; resume to continue"
+        })
+    else:
+        timestamps = values["metadata"].get("timestamps", {})
+        eval_data.update({
+            "status": "completed",
+            "progress_percentage": 100,
+            "result": get_blob_store().put_fields(dict(values), GraphExecutor.RESPONSE_TEXT_FIELDS),
+            "completed_at": timestamps.get("decision") or timestamps["start"]
+        })
+    return eval_data
+
+
+async def migrate(dry_run: bool = False) -> int:
+    """Import every checkpointed evaluation missing from the store.
+
+    Args:
+        dry_run: Only report what would be imported
+
+    Returns:
+        Number of evaluations imported
+    """
+    if isinstance(storage, StorageService):
+        raise SystemExit("evaluation_storage.backend must be 'sqlite' to migrate")
+    checkpointer = get_pipeline_graph("full").checkpointer
+
+    imported = 0
+    for evaluation_id in await asyncio.to_thread(list_thread_ids, checkpointer):
+        if await storage.get_status(evaluation_id):
+            continue
+
+        eval_data = await asyncio.to_thread(_checkpointed_evaluation, evaluation_id)
+        logger.info(f"{'Would import' if dry_run else 'Importing'} {evaluation_id} ({eval_data['status']})")
+        if not dry_run:
+            await asyncio.to_thread(get_blob_store().acquire, evaluation_id, find_refs(eval_data))
+            await storage.save(evaluation_id, eval_data)
+        imported += 1
+
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import checkpointed evaluations into the evaluation store")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the evaluations to import")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s")
+    imported = asyncio.run(migrate(args.dry_run))
+    logger.info(f"{imported} evaluation(s) {'to import' if args.dry_run else 'imported'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Run evaluation workers for the SQLite job queue.
+
+Start the API with job_queue.backend set to "sqlite" (or
+EVALUATION_QUEUE_BACKEND=sqlite), then one or more workers:
+
+    cd backend
+    python worker.py --processes 2
+
+Workers lease jobs from the queue database, run the evaluation graph and relay
+status updates and WebSocket events back to the API process.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load .env from the project root and make src/ importable
+ROOT_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(ROOT_DIR / ".env")
+sys.path.append(str(ROOT_DIR))
+
+from app.services.job_queue import create_job_queue
+from app.services.evaluation_jobs import run_evaluation_job
+
+from src.graph.checkpoint import config, thread_config
+from src.graph.pipelines import get_graph_for_evaluation, precompile_pipelines
+from src.utils.cancellation import CancelToken
+
+
+logger = logging.getLogger("worker")
+
+
+async def _heartbeat(queue, job_id: int, worker_id: str, cancel_token: CancelToken):
+    """Extend a job's lease until cancelled; stop the run if the lease is lost.
+
+    The job was redelivered to another worker (or failed) meanwhile, so this
+    run must not go on alongside the new one.
+    """
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if not await asyncio.to_thread(queue.heartbeat, job_id, worker_id):
+            logger.warning(f"{worker_id} lost the lease on job {job_id}, stopping its run")
+            cancel_token.cancel()
+            return
+
+
+async def _watch_cancellation(queue, job_id: int, cancel_token: CancelToken):
+    """Trip the cancel token once the API flags the job for cancellation."""
+    while not cancel_token.cancelled:
+        await asyncio.sleep(queue.poll_seconds)
+        if await asyncio.to_thread(queue.cancel_requested, job_id):
+            cancel_token.cancel()
+
+
+def _has_checkpoint(evaluation_id: str) -> bool:
+    """Whether the evaluation's graph thread has checkpointed state."""
+    graph = get_graph_for_evaluation(evaluation_id)
+    return bool(graph.get_state(thread_config(evaluation_id)).values)
+
+
+async def process_job(queue, job: dict, worker_id: str):
+    """Run one leased job and record its outcome.
+
+    Args:
+        queue: SqliteJobQueue the job was leased from
+        job: Leased job (see SqliteJobQueue.lease)
+        worker_id: Identifier of this worker
+    """
+    evaluation_id = job["evaluation_id"]
+    payload = dict(job["payload"])
+
+    # A redelivered job (its previous worker died) continues from its checkpoint
+    if job["attempts"] > 1 and not payload.get("resume"):
+        payload["resume"] = await asyncio.to_thread(_has_checkpoint, evaluation_id)
+
+    # Writes are dropped once another worker holds the job's lease
+    async def emit_event(evaluation_id: str, event: dict):
+        await asyncio.to_thread(queue.publish, evaluation_id, "event", event, job["id"], worker_id)
+
+    async def update_evaluation(evaluation_id: str, fields: dict):
+        await asyncio.to_thread(queue.publish, evaluation_id, "update", fields, job["id"], worker_id)
+
+    logger.info(f"{worker_id} running {evaluation_id} (attempt {job['attempts']})")
+    cancel_token = CancelToken()
+    heartbeat = asyncio.create_task(_heartbeat(queue, job["id"], worker_id, cancel_token))
+    watchers = [heartbeat, asyncio.create_task(_watch_cancellation(queue, job["id"], cancel_token))]
+    try:
+        status, error = await run_evaluation_job(
+            evaluation_id, payload, emit_event, update_evaluation, cancel_token
+        )
+    finally:
+        lease_lost = heartbeat.done()
+        for watcher in watchers:
+            watcher.cancel()
+
+    if lease_lost:
+        # The job's outcome is recorded by whichever worker holds it now
+        logger.info(f"{worker_id} stopped {evaluation_id} after losing its lease ({status})")
+    elif status == "completed":
+        await asyncio.to_thread(queue.complete, job["id"], worker_id)
+    elif status == "cancelled":
+        await asyncio.to_thread(queue.cancelled, job["id"], worker_id)
+        logger.info(f"{worker_id} cancelled {evaluation_id}")
+    else:
+        await asyncio.to_thread(queue.fail, job["id"], worker_id, error)
+        logger.error(f"{worker_id} job for {evaluation_id} failed: {error}")
+
+
+async def worker_loop(worker_id: str):
+    """Lease and run jobs until the process is stopped."""
+    queue = create_job_queue()
+    if not queue.external_workers:
+        raise SystemExit("job_queue.backend must be 'sqlite' to run external workers")
+
+    precompile_pipelines()
+    logger.info(f"{worker_id} polling {queue.path}")
+
+    while True:
+        job = await asyncio.to_thread(queue.lease, worker_id)
+        if job is None:
+            await asyncio.sleep(queue.poll_seconds)
+            continue
+        await process_job(queue, job, worker_id)
+
+
+def run_worker():
+    """Entry point of one worker process."""
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s")
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        asyncio.run(worker_loop(worker_id))
+    except KeyboardInterrupt:
+        # The lease expires and another worker resumes the job from its checkpoint
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run evaluation workers for the SQLite job queue")
+    parser.add_argument(
+        "--processes", type=int,
+        default=int(os.getenv("EVALUATION_WORKERS") or config["job_queue"]["workers"]),
+        help="Number of worker processes (default: job_queue.workers / EVALUATION_WORKERS)"
+    )
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker()
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, name=f"worker-{index}")
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ import {
   CreateEvaluationRequest,
   EvaluationResponse,
   EvaluationListResponse,
+  EvaluationListFilters,
+  EvaluationSearchResponse,
+  EvaluationSearchFilters,
 } from "@/types/evaluation";
 
 export async function createEvaluation(
@@ -21,12 +24,34 @@ export async function getEvaluation(
   return response.data;
 }
 
+export async function cancelEvaluation(
+  evaluationId: string
+): Promise<EvaluationResponse> {
+  const response = await apiClient.post<EvaluationResponse>(
+    `/evaluations/${evaluationId}/cancel`
+  );
+  return response.data;
+}
+
 export async function listEvaluations(
   limit: number = 20,
-  offset: number = 0
+  offset: number = 0,
+  filters: EvaluationListFilters = {}
 ): Promise<EvaluationListResponse> {
   const response = await apiClient.get<EvaluationListResponse>("/evaluations", {
-    params: { limit, offset },
+    params: { limit, offset, ...filters },
+  });
+  return response.data;
+}
+
+export async function searchEvaluations(
+  q: string,
+  limit: number = 20,
+  offset: number = 0,
+  filters: EvaluationSearchFilters = {}
+): Promise<EvaluationSearchResponse> {
+  const response = await apiClient.get<EvaluationSearchResponse>("/evaluations/search", {
+    params: { q, limit, offset, ...filters },
   });
   return response.data;
 }
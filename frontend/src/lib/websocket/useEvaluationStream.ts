@@ -34,6 +34,7 @@ export function useEvaluationStream(
 ) {
   const [isConnected, setIsConnected] = useState(false);
   const [progress, setProgress] = useState(0);
+  const [etaSeconds, setEtaSeconds] = useState<number | null>(null);
   const [currentNode, setCurrentNode] = useState<AgentNode | null>(null);
   const [agentStates, setAgentStates] = useState<AgentStates>({
     primary_evaluator: { status: "pending" },
@@ -48,6 +49,9 @@ export function useEvaluationStream(
   const maxReconnectAttempts = 5;
   const pollIntervalRef = useRef<NodeJS.Timeout | null>(null);
 
+  // Version of the last event applied; older or repeated events are skipped
+  const versionRef = useRef(0);
+
   // Refs to avoid stale closures
   const resultRef = useRef<EvaluationResult | null>(null);
   const isClosingRef = useRef(false);
@@ -73,6 +77,7 @@ export function useEvaluationStream(
         if (data.progress_percentage !== undefined) {
           setProgress(data.progress_percentage);
         }
+        setEtaSeconds(data.eta_seconds ?? null);
 
         // Check if completed
         if (data.status === "completed" && data.result) {
@@ -82,8 +87,8 @@ export function useEvaluationStream(
             clearInterval(pollIntervalRef.current);
             pollIntervalRef.current = null;
           }
-        } else if (data.status === "failed") {
-          setError(data.error || "Evaluation failed");
+        } else if (data.status === "failed" || data.status === "cancelled") {
+          setError(data.error || `Evaluation ${data.status}`);
           if (pollIntervalRef.current) {
             clearInterval(pollIntervalRef.current);
             pollIntervalRef.current = null;
@@ -95,6 +100,24 @@ export function useEvaluationStream(
     }
   }, [evaluationId]);
 
+  // The completion event only carries references to the large texts,
+  // so the full result is fetched once from the REST API
+  const fetchCompletedResult = useCallback(async () => {
+    try {
+      const response = await fetch(`http://localhost:8000/api/v1/evaluations/${evaluationId}`);
+      if (response.ok) {
+        const data = await response.json();
+        versionRef.current = Math.max(versionRef.current, data.version ?? 0);
+        if (data.result) {
+          setResult(data.result);
+          optionsRef.current.onComplete?.(data.result);
+        }
+      }
+    } catch (err) {
+      console.error("Error fetching evaluation result:", err);
+    }
+  }, [evaluationId]);
+
   const startPolling = useCallback(() => {
     if (pollIntervalRef.current) {
       clearInterval(pollIntervalRef.current);
@@ -126,6 +149,13 @@ export function useEvaluationStream(
         const data: WebSocketEvent = JSON.parse(event.data);
         console.log("WebSocket message:", data);
 
+        if (data.version !== undefined) {
+          if (data.version <= versionRef.current) {
+            return;
+          }
+          versionRef.current = data.version;
+        }
+
         // Call optional progress callback using ref
         optionsRef.current.onProgress?.(data);
 
@@ -133,6 +163,9 @@ export function useEvaluationStream(
         if ("progress_percentage" in data && typeof data.progress_percentage === "number") {
           setProgress(data.progress_percentage);
         }
+        if ("eta_seconds" in data && typeof data.eta_seconds === "number") {
+          setEtaSeconds(data.eta_seconds);
+        }
 
         // Update current node
         if ("node" in data && data.node) {
@@ -175,10 +208,8 @@ export function useEvaluationStream(
             break;
 
           case "evaluation_completed":
-            if ("result" in data && data.result) {
-              setResult(data.result);
-              optionsRef.current.onComplete?.(data.result);
-            }
+            setEtaSeconds(0);
+            fetchCompletedResult();
             break;
 
           case "error":
@@ -188,6 +219,11 @@ export function useEvaluationStream(
               optionsRef.current.onError?.(errorMsg);
             }
             break;
+
+          case "cancelled":
+            setError("Evaluation cancelled");
+            optionsRef.current.onError?.("Evaluation cancelled");
+            break;
         }
       } catch (err) {
         console.error("Error parsing WebSocket message:", err);
@@ -217,16 +253,18 @@ export function useEvaluationStream(
     };
 
     wsRef.current = ws;
-  }, [evaluationId, startPolling]); // Only evaluationId and startPolling as deps
+  }, [evaluationId, startPolling, fetchCompletedResult]);
 
   // Effect to clear state when evaluationId changes or disabled
   useEffect(() => {
     const enabled = options.enabled !== undefined ? options.enabled : true;
+    versionRef.current = 0;
 
     // Clear all state when disabled or evaluationId is empty
     if (!enabled || !evaluationId) {
       setIsConnected(false);
       setProgress(0);
+      setEtaSeconds(null);
       setCurrentNode(null);
       setAgentStates({
         primary_evaluator: { status: "pending" },
@@ -276,6 +314,7 @@ export function useEvaluationStream(
   return {
     isConnected,
     progress,
+    etaSeconds,
     currentNode,
     agentStates,
     result,
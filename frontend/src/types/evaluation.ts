@@ -50,7 +50,21 @@ export interface EvaluationResult {
   metadata: EvaluationMetadata;
 }
 
-export type EvaluationStatus = "pending" | "processing" | "completed" | "failed";
+export type EvaluationStatus =
+  | "pending"
+  | "processing"
+  | "completed"
+  | "failed"
+  | "cancelling"
+  | "cancelled";
+
+export interface TokensUsed {
+  input: number;
+  output: number;
+  calls: number;
+  estimated: boolean;
+  total: number;
+}
 
 export type AgentNode = "primary_evaluator" | "challenge_agent" | "decision_agent";
 
@@ -59,11 +73,15 @@ export interface EvaluationResponse {
   status: EvaluationStatus;
   current_step?: AgentNode;
   progress_percentage: number;
+  eta_seconds?: number;
   result?: EvaluationResult;
   error?: string;
+  tokens_used?: TokensUsed;
+  version: number;
   created_at: string;
   completed_at?: string;
   websocket_url?: string;
+  deduplicated?: boolean;
 }
 
 export interface EvaluationListItem {
@@ -76,7 +94,33 @@ export interface EvaluationListItem {
 
 export interface EvaluationListResponse {
   evaluations: EvaluationListItem[];
+  total: number | null;
+  limit: number;
+  offset: number;
+  next_cursor: string | null;
+}
+
+export interface EvaluationListFilters {
+  after?: string;
+  status?: EvaluationStatus;
+  candidate?: string;
+  created_from?: string;
+  created_to?: string;
+}
+
+export interface EvaluationSearchItem extends EvaluationListItem {
+  score: number;
+}
+
+export interface EvaluationSearchResponse {
+  results: EvaluationSearchItem[];
   total: number;
   limit: number;
   offset: number;
 }
+
+export interface EvaluationSearchFilters {
+  status?: EvaluationStatus;
+  created_from?: string;
+  created_to?: string;
+}
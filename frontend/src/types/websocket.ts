@@ -1,10 +1,12 @@
 // WebSocket event types
 
-import { AgentNode, EvaluationResult } from "./evaluation";
+import { AgentNode, TokensUsed } from "./evaluation";
 
 export interface BaseWebSocketEvent {
   type: string;
   timestamp: string;
+  // Per-evaluation event number (not set on connected/heartbeat)
+  version?: number;
 }
 
 export interface ConnectedEvent extends BaseWebSocketEvent {
@@ -21,12 +23,23 @@ export interface NodeStartedEvent extends BaseWebSocketEvent {
   type: "node_started";
   node: AgentNode;
   progress_percentage: number;
+  eta_seconds?: number;
+}
+
+// Sent (throttled) while a node streams its output
+export interface ProgressEvent extends BaseWebSocketEvent {
+  type: "progress";
+  node: AgentNode;
+  progress_percentage: number;
+  eta_seconds?: number;
+  output_tokens: number;
 }
 
 export interface NodeCompletedEvent extends BaseWebSocketEvent {
   type: "node_completed";
   node: AgentNode;
   progress_percentage: number;
+  eta_seconds?: number;
   output_preview?: string;
   tokens?: {
     input: number;
@@ -37,7 +50,7 @@ export interface NodeCompletedEvent extends BaseWebSocketEvent {
 export interface EvaluationCompletedEvent extends BaseWebSocketEvent {
   type: "evaluation_completed";
   evaluation_id: string;
-  result: EvaluationResult;
+  // The result is not included; fetch it via REST
 }
 
 export interface ErrorEvent extends BaseWebSocketEvent {
@@ -46,6 +59,13 @@ export interface ErrorEvent extends BaseWebSocketEvent {
   node?: AgentNode;
 }
 
+export interface CancelledEvent extends BaseWebSocketEvent {
+  type: "cancelled";
+  evaluation_id: string;
+  // Tokens spent before the run stopped
+  tokens?: TokensUsed;
+}
+
 export interface HeartbeatEvent extends BaseWebSocketEvent {
   type: "heartbeat";
 }
@@ -54,7 +74,9 @@ export type WebSocketEvent =
   | ConnectedEvent
   | EvaluationStartedEvent
   | NodeStartedEvent
+  | ProgressEvent
   | NodeCompletedEvent
   | EvaluationCompletedEvent
   | ErrorEvent
+  | CancelledEvent
   | HeartbeatEvent;
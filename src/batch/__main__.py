@@ -0,0 +1,47 @@
+"""
+Command-line entry point for batch evaluations.
+
+Usage:
+    python -m src.batch manifest.jsonl --output results/cycle.jsonl --concurrency 4
+"""
+
+import argparse
+import json
+
+from dotenv import load_dotenv
+
+from .runner import BatchRunner, format_summary, load_manifest
+from ..graph.pipelines import PIPELINES, DEFAULT_PIPELINE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a batch of candidate evaluations")
+    parser.add_argument("manifest", help="JSONL, JSON or YAML manifest of evaluation entries")
+    parser.add_argument("--output", "-o", required=True, help="Results file (.jsonl or .parquet)")
+    parser.add_argument("--pipeline", "-p", choices=list(PIPELINES), default=DEFAULT_PIPELINE,
+                        help="Pipeline variant (default from config.yaml)")
+    parser.add_argument("--concurrency", "-c", type=int, help="Evaluations in flight (default from config.yaml)")
+    parser.add_argument("--max-attempts", type=int, help="Attempts per entry before giving up")
+    parser.add_argument("--no-resume", action="store_true", help="Re-run entries already in the output file")
+    parser.add_argument("--summary-json", help="Also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    entries = load_manifest(args.manifest)
+    runner = BatchRunner(
+        pipeline=args.pipeline,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts
+    )
+    summary = runner.run(entries, args.output, resume=not args.no_resume)
+
+    print(format_summary(summary))
+
+    if args.summary_json:
+        with open(args.summary_json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
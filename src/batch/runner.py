@@ -0,0 +1,447 @@
+"""
+Batch evaluation runner with bounded concurrency, rate-limit backoff and resume.
+
+Runs a manifest of (candidate_info, rubric, transcript) entries through the
+evaluation graph. Results stream to a JSONL journal as each entry finishes, so
+an interrupted batch can be re-run with the same command: completed entries
+are skipped and partially evaluated ones continue from their last checkpointed
+node.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import yaml
+from openai import RateLimitError
+
+from ..graph.pipelines import PIPELINES, DEFAULT_PIPELINE
+from ..graph.checkpoint import BASE_DIR, config, create_checkpointer, thread_config
+from ..graph.nodes import pin_prompt_versions
+from ..graph.state import create_initial_state
+from ..utils.decision_parser import parse_decision
+
+
+def log_to_stderr(message: str):
+    """Log progress to stderr so stdout stays clean for piping."""
+    sys.stderr.write(f"{message}\n")
+    sys.stderr.flush()
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Load batch entries from a JSONL, JSON or YAML manifest.
+
+    Each entry needs candidate_info plus rubric/transcript given inline or as
+    rubric_file/transcript_file paths (relative to the manifest). An optional
+    "id" names the entry; it defaults to the entry's position.
+
+    Args:
+        path: Manifest file path
+
+    Returns:
+        List of entries with id, candidate_info, rubric and transcript resolved
+
+    Raises:
+        ValueError: If an entry is missing required fields or ids repeat
+    """
+    manifest_dir = os.path.dirname(os.path.abspath(path))
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            raw_entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            raw_entries = yaml.safe_load(f)
+            if isinstance(raw_entries, dict):
+                raw_entries = raw_entries.get("entries", [])
+
+    entries = []
+    seen_ids = set()
+    for index, raw in enumerate(raw_entries):
+        entry = {
+            "id": str(raw.get("id", index)),
+            "candidate_info": raw.get("candidate_info")
+        }
+
+        for field in ("rubric", "transcript"):
+            if raw.get(field):
+                entry[field] = raw[field]
+            elif raw.get(f"{field}_file"):
+                file_path = os.path.join(manifest_dir, raw[f"{field}_file"])
+                with open(file_path, "r", encoding="utf-8") as text_file:
+                    entry[field] = text_file.read()
+            else:
+                raise ValueError(f"Manifest entry {entry['id']} has no {field} or {field}_file")
+
+        if not entry["candidate_info"] or not entry["candidate_info"].get("name"):
+            raise ValueError(f"Manifest entry {entry['id']} needs candidate_info.name")
+        if entry["id"] in seen_ids:
+            raise ValueError(f"Duplicate manifest entry id: {entry['id']}")
+
+        seen_ids.add(entry["id"])
+        entries.append(entry)
+
+    return entries
+
+
+def entry_thread_id(
+    entry: Dict[str, Any],
+    pipeline: str = "full",
+    prompt_versions: Optional[Dict[str, Dict[str, str]]] = None
+) -> str:
+    """
+    Checkpoint thread for an entry.
+
+    Includes a hash of the inputs, pipeline and pinned prompts so that editing
+    an entry in the manifest or a prompt starts it fresh instead of resuming
+    (or reusing) a run made with different inputs.
+    """
+    payload = json.dumps(
+        [entry["candidate_info"], entry["rubric"], entry["transcript"], pipeline, prompt_versions or {}],
+        sort_keys=True
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    return f"batch:{entry['id']}:{digest}"
+
+
+def is_rate_limit_error(error: Optional[BaseException]) -> bool:
+    """Check whether an API failure was caused by rate limiting (HTTP 429).
+
+    Follows the exception's causes, since call_anthropic_claude re-raises
+    the last API error after its own retries.
+    """
+    while error is not None:
+        if isinstance(error, RateLimitError) or getattr(error, "status_code", None) == 429:
+            return True
+        error = error.__cause__
+    return False
+
+
+def failed_record(entry: Dict[str, Any], error: BaseException, duration_seconds: float) -> Dict[str, Any]:
+    """Journal record of an entry that could not be evaluated."""
+    return {
+        "id": entry["id"],
+        "candidate_name": entry.get("candidate_info", {}).get("name", ""),
+        "status": "failed",
+        "error": str(error),
+        "duration_seconds": round(duration_seconds, 2),
+        "finished_at": datetime.now().isoformat()
+    }
+
+
+class RateLimitGate:
+    """
+    Shared cooldown so every worker backs off together after a rate limit.
+
+    Each rate-limit failure doubles the cooldown (up to max_delay); successful
+    calls shrink it again.
+    """
+
+    def __init__(self, base_delay: float = 30.0, max_delay: float = 300.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._delay = base_delay
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.trips = 0
+
+    def wait(self):
+        """Block until any active cooldown has passed."""
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 1.0))
+
+    def trip(self) -> float:
+        """Start (or extend) a cooldown. Returns the cooldown in seconds."""
+        with self._lock:
+            delay = self._delay
+            self._resume_at = max(self._resume_at, time.time() + delay)
+            self._delay = min(self._delay * 2, self.max_delay)
+            self.trips += 1
+            return delay
+
+    def record_success(self):
+        """Shrink the cooldown after a successful call."""
+        with self._lock:
+            self._delay = max(self.base_delay, self._delay / 2)
+
+
+class JsonlResultWriter:
+    """Thread-safe JSONL journal of per-entry results."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def completed_ids(self) -> set:
+        """IDs of entries that already completed in a previous run."""
+        if not os.path.exists(self.path):
+            return set()
+
+        completed = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Partial last line from a killed run
+                    continue
+                if record.get("status") == "completed":
+                    completed.add(record["id"])
+        return completed
+
+    def write(self, record: Dict[str, Any]):
+        """Append one result and flush it to disk."""
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read_latest(self) -> List[Dict[str, Any]]:
+        """Latest record per entry ID, in first-seen order."""
+        latest = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    latest[record["id"]] = record
+        return list(latest.values())
+
+
+def write_parquet(records: List[Dict[str, Any]], path: str):
+    """
+    Write result records to Parquet (requires pyarrow).
+
+    The full graph state is stored as a JSON string column.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+
+    rows = [
+        {**{k: v for k, v in record.items() if k != "result"},
+         "result": json.dumps(record.get("result"), ensure_ascii=False)}
+        for record in records
+    ]
+    pq.write_table(pa.Table.from_pylist(rows), path)
+
+
+class BatchRunner:
+    """Runs manifest entries through the evaluation graph concurrently."""
+
+    def __init__(
+        self,
+        graph=None,
+        pipeline: str = DEFAULT_PIPELINE,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        rate_limit_gate: Optional[RateLimitGate] = None,
+        prompt_versions: Optional[Dict[str, Dict[str, str]]] = None
+    ):
+        """
+        Initialize the batch runner.
+
+        Args:
+            graph: Checkpointed graph (defaults to the pipeline backed by batch.checkpoint_path)
+            pipeline: Pipeline variant name
+            concurrency: Number of evaluations in flight (default from config.yaml)
+            max_attempts: Attempts per entry before recording a failure
+            rate_limit_gate: Shared cooldown (default from config.yaml)
+            prompt_versions: Prompt snapshot for the whole batch (defaults to
+                the active prompts when the runner is created)
+        """
+        batch_config = config["batch"]
+
+        if graph is None:
+            checkpoint_path = batch_config["checkpoint_path"]
+            if not os.path.isabs(checkpoint_path):
+                checkpoint_path = os.path.join(BASE_DIR, checkpoint_path)
+            graph = PIPELINES[pipeline]["builder"](checkpointer=create_checkpointer(checkpoint_path))
+
+        self.graph = graph
+        self.pipeline = pipeline
+        self.prompt_versions = prompt_versions or pin_prompt_versions()
+        self.concurrency = concurrency or batch_config["concurrency"]
+        self.max_attempts = max_attempts or batch_config["max_attempts"]
+        self.gate = rate_limit_gate or RateLimitGate(
+            base_delay=batch_config["rate_limit_cooldown_seconds"]
+        )
+
+    def _run_entry(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate one entry, retrying rate limits and resuming from checkpoints."""
+        graph_config = thread_config(entry_thread_id(entry, self.pipeline, self.prompt_versions))
+        started = time.time()
+        last_error = None
+
+        for attempt in range(self.max_attempts):
+            self.gate.wait()
+
+            # Continue a partial run (from this batch or an earlier one) if one exists
+            snapshot = self.graph.get_state(graph_config)
+            if snapshot.values and snapshot.next:
+                graph_input = None
+            elif snapshot.values:
+                final_state = snapshot.values
+                break
+            else:
+                graph_input = create_initial_state(
+                    rubric=entry["rubric"],
+                    transcript=entry["transcript"],
+                    candidate_info=entry["candidate_info"],
+                    pipeline=self.pipeline,
+                    prompt_versions=self.prompt_versions
+                )
+
+            try:
+                final_state = self.graph.invoke(graph_input, graph_config)
+                self.gate.record_success()
+                break
+            except Exception as e:
+                last_error = e
+                if is_rate_limit_error(e) and attempt < self.max_attempts - 1:
+                    delay = self.gate.trip()
+                    log_to_stderr(f"[BATCH] Rate limited on {entry['id']}, all workers pausing {delay:.0f}s")
+                    continue
+                if attempt < self.max_attempts - 1:
+                    log_to_stderr(f"[BATCH] {entry['id']} failed (attempt {attempt + 1}/{self.max_attempts}): {str(e)[:100]}")
+                    continue
+        else:
+            return failed_record(entry, last_error, time.time() - started)
+
+        metadata = final_state.get("metadata", {})
+        parsed = parse_decision(final_state.get("decision"))
+        return {
+            "id": entry["id"],
+            "candidate_name": entry["candidate_info"]["name"],
+            "status": "completed",
+            "decision": parsed["decision"],
+            "overall_score": parsed["overall_score"],
+            "total_tokens": metadata.get("tokens", {}).get("total", 0),
+            "cost_usd": metadata.get("total_cost_usd", 0.0),
+            "duration_seconds": round(time.time() - started, 2),
+            "finished_at": datetime.now().isoformat(),
+            "result": {
+                key: final_state.get(key)
+                for key in ("primary_evaluation", "challenges", "decision", "metadata")
+            }
+        }
+
+    def run(
+        self,
+        entries: Iterable[Dict[str, Any]],
+        output_path: str,
+        resume: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Run a batch and stream results to output_path.
+
+        Args:
+            entries: Entries as returned by load_manifest()
+            output_path: ".jsonl" journal, or ".parquet" (journal kept alongside
+                as "<output>.jsonl" and converted once the batch finishes)
+            resume: Skip entries already completed in the journal
+
+        Returns:
+            Summary with counts, elapsed time, throughput, tokens and cost
+        """
+        entries = list(entries)
+        parquet_path = output_path if output_path.endswith(".parquet") else None
+        journal_path = f"{output_path}.jsonl" if parquet_path else output_path
+        writer = JsonlResultWriter(journal_path)
+
+        done_ids = writer.completed_ids() if resume else set()
+        pending = [entry for entry in entries if entry["id"] not in done_ids]
+        skipped = len(entries) - len(pending)
+
+        log_to_stderr(
+            f"[BATCH] {len(entries)} entries, {skipped} already completed, "
+            f"{len(pending)} to run with concurrency {self.concurrency}"
+        )
+
+        summary = {
+            "total": len(entries),
+            "skipped": skipped,
+            "completed": 0,
+            "failed": 0,
+            "total_tokens": 0,
+            "total_cost_usd": 0.0,
+            "decisions": {}
+        }
+        started = time.time()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = {pool.submit(self._run_entry, entry): entry for entry in pending}
+
+            for finished, future in enumerate(as_completed(futures), start=1):
+                try:
+                    record = future.result()
+                except Exception as e:
+                    # e.g. an unreadable checkpoint; the other entries carry on
+                    # (timed from the start of the batch)
+                    record = failed_record(futures[future], e, time.time() - started)
+                writer.write(record)
+
+                summary[record["status"]] += 1
+                if record["status"] == "completed":
+                    summary["total_tokens"] += record["total_tokens"]
+                    summary["total_cost_usd"] += record["cost_usd"] or 0.0
+                    summary["decisions"][record["decision"]] = summary["decisions"].get(record["decision"], 0) + 1
+
+                elapsed = time.time() - started
+                rate = finished / elapsed * 3600 if elapsed else 0.0
+                log_to_stderr(
+                    f"[BATCH] {finished}/{len(pending)} {record['status']}: {record['id']} "
+                    f"({record['duration_seconds']:.1f}s) - {rate:.1f} evals/hour"
+                )
+
+        elapsed = time.time() - started
+        summary["elapsed_seconds"] = round(elapsed, 2)
+        summary["throughput_per_hour"] = round(len(pending) / elapsed * 3600, 2) if elapsed and pending else 0.0
+        summary["total_cost_usd"] = round(summary["total_cost_usd"], 4)
+        summary["rate_limit_pauses"] = self.gate.trips
+
+        if parquet_path:
+            write_parquet(writer.read_latest(), parquet_path)
+
+        return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Format a batch summary for the terminal."""
+    lines = [
+        "=" * 60,
+        "BATCH SUMMARY",
+        "=" * 60,
+        f"Entries:     {summary['total']} ({summary['skipped']} skipped from previous run)",
+        f"Completed:   {summary['completed']}",
+        f"Failed:      {summary['failed']}",
+        f"Elapsed:     {summary['elapsed_seconds']:.1f}s",
+        f"Throughput:  {summary['throughput_per_hour']:.1f} evals/hour",
+        f"Tokens:      {summary['total_tokens']:,}",
+        f"Cost:        ${summary['total_cost_usd']:.4f}",
+        f"Rate-limit pauses: {summary['rate_limit_pauses']}",
+    ]
+    for decision, count in sorted(summary["decisions"].items()):
+        lines.append(f"  {decision}: {count}")
+    lines.append("=" * 60)
+    return "\n".join(lines)
@@ -0,0 +1 @@
+# Experiments Module
@@ -0,0 +1,59 @@
+"""
+Command-line entry point for prompt A/B experiments.
+
+Usage:
+    python -m src.experiments decision_agent --b 5 --limit 50
+    python -m src.experiments challenge_agent --a 3 --b 4 --manifest cycle.jsonl
+"""
+
+import argparse
+import json
+
+from dotenv import load_dotenv
+
+from .runner import ExperimentRunner, STAGES, format_report, load_checkpointed_entries
+from ..batch.runner import JsonlResultWriter, load_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two prompt versions of one agent")
+    parser.add_argument("agent", choices=[stage[0] for stage in STAGES], help="Agent whose prompt is varied")
+    parser.add_argument("--b", required=True, help="Candidate prompt version")
+    parser.add_argument("--a", help="Baseline prompt version (default: active)")
+    parser.add_argument("--manifest", help="Batch manifest to run instead of stored evaluations")
+    parser.add_argument("--checkpoints", help="Checkpoint database with stored evaluations (default: the API's)")
+    parser.add_argument("--limit", type=int, help="Maximum number of entries")
+    parser.add_argument("--concurrency", "-c", type=int, help="Parallel agent calls (default from config.yaml)")
+    parser.add_argument("--output", "-o", help="Also write per-entry rows to this JSONL file")
+    parser.add_argument("--summary-json", help="Also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    if args.manifest:
+        entries = load_manifest(args.manifest)[:args.limit]
+    else:
+        entries = load_checkpointed_entries(args.checkpoints, limit=args.limit)
+
+    runner = ExperimentRunner(
+        agent=args.agent,
+        version_a=args.a,
+        version_b=args.b,
+        concurrency=args.concurrency
+    )
+    result = runner.run(entries)
+
+    print(format_report(result))
+
+    if args.output:
+        writer = JsonlResultWriter(args.output)
+        for row in result["rows"]:
+            writer.write(row)
+
+    if args.summary_json:
+        with open(args.summary_json, "w") as f:
+            json.dump(result["summary"], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
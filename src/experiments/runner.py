@@ -0,0 +1,397 @@
+"""
+Prompt A/B experiments over a corpus of evaluations.
+
+Runs two versions of one agent's prompt across many transcripts and reports
+how decisions, scores, tokens and latency change. Stages upstream of the
+changed agent are shared by both variants: they are reused from the stored
+evaluation when it has them, otherwise run once per entry.
+"""
+
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..batch.runner import RateLimitGate, is_rate_limit_error, log_to_stderr
+from ..graph import nodes
+from ..graph.checkpoint import config, create_checkpointer, list_thread_ids, thread_config
+from ..graph.pipelines import PIPELINES
+from ..graph.state import EvaluationState, create_initial_state, merge_metadata
+from ..prompts.manager import PromptManager
+from ..utils.decision_parser import parse_decision
+
+
+# (prompt type, output field, node function name) in pipeline order
+STAGES = [
+    ("primary_agent", "primary_evaluation", "primary_evaluator_node"),
+    ("challenge_agent", "challenges", "challenge_agent_node"),
+    ("decision_agent", "decision", "decision_agent_node"),
+]
+
+VARIANTS = ("a", "b")
+
+# Pipelines whose primary stage fans out over transcript chunks or rubric
+# criteria instead of running primary_evaluator_node once
+FAN_OUT_PIPELINES = ("chunked", "per-criterion")
+
+
+def pipeline_stages(pipeline: str) -> List[int]:
+    """Indexes of the STAGES a pipeline variant runs (e.g. lite skips the challenge)."""
+    if pipeline not in PIPELINES:
+        raise ValueError(f"Unknown pipeline '{pipeline}'")
+    node_functions = {f"{node}_node" for node in PIPELINES[pipeline]["nodes"]}
+    return [index for index, stage in enumerate(STAGES) if stage[2] in node_functions]
+
+
+def load_checkpointed_entries(
+    checkpoint_path: Optional[str] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Load completed evaluations from a checkpoint database as experiment entries.
+
+    Args:
+        checkpoint_path: SQLite checkpoint database (defaults to the API's)
+        limit: Maximum number of evaluations to load
+
+    Returns:
+        Entries with id, candidate_info, rubric, transcript and the stored state
+    """
+    checkpointer = create_checkpointer(checkpoint_path)
+    entries = []
+
+    for thread_id in list_thread_ids(checkpointer):
+        checkpoint_tuple = checkpointer.get_tuple(thread_config(thread_id))
+        channel_values = checkpoint_tuple.checkpoint["channel_values"] if checkpoint_tuple else {}
+        if not channel_values.get("decision"):
+            continue
+
+        state = {key: value for key, value in channel_values.items() if key in EvaluationState.__annotations__}
+        entries.append({
+            "id": thread_id,
+            "candidate_info": dict(state["candidate_info"]),
+            "rubric": state["rubric"],
+            "transcript": state["transcript"],
+            "state": state
+        })
+        if limit and len(entries) >= limit:
+            break
+
+    return entries
+
+
+def apply_update(state: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply a node's update to a state copy the way the graph's reducers would."""
+    state = dict(state)
+    for key, value in update.items():
+        if key == "metadata":
+            state["metadata"] = merge_metadata(state["metadata"], value)
+        else:
+            state[key] = value
+    return state
+
+
+def stage_tokens(update: Dict[str, Any]) -> int:
+    """Tokens spent by one node call (its per-agent token deltas)."""
+    tokens = update.get("metadata", {}).get("tokens", {})
+    return sum(value for key, value in tokens.items() if not key.startswith("total"))
+
+
+class ExperimentRunner:
+    """Compares two prompt versions of one agent across many evaluations."""
+
+    def __init__(
+        self,
+        agent: str,
+        version_b: str,
+        version_a: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        rate_limit_gate: Optional[RateLimitGate] = None,
+        prompt_manager: Optional[PromptManager] = None
+    ):
+        """
+        Initialize the experiment runner.
+
+        Args:
+            agent: Prompt type to vary ("primary_agent", "challenge_agent" or "decision_agent")
+            version_b: Candidate prompt version
+            version_a: Baseline prompt version (defaults to the active one)
+            concurrency: Parallel agent calls (default from config.yaml batch settings)
+            max_attempts: Attempts per stage while rate limited before recording a failure
+            rate_limit_gate: Shared cooldown (default from config.yaml)
+            prompt_manager: Prompt manager (defaults to the one the nodes use)
+        """
+        if agent not in [stage[0] for stage in STAGES]:
+            raise ValueError(f"Unknown agent: {agent}")
+
+        batch_config = config["batch"]
+        self.prompt_manager = prompt_manager or nodes.prompt_manager
+        self.agent = agent
+        self.stage_index = [stage[0] for stage in STAGES].index(agent)
+
+        # Prompts for the other agents are pinned once for the whole experiment
+        self.base_pins = self.prompt_manager.snapshot([stage[0] for stage in STAGES])
+        version_a = version_a or self.base_pins[agent]["version"]
+        self.pins = {
+            "a": {"version": version_a, "sha256": self.prompt_manager.get_content_hash(agent, version_a)},
+            "b": {"version": version_b, "sha256": self.prompt_manager.get_content_hash(agent, version_b)}
+        }
+
+        self.concurrency = concurrency or batch_config["concurrency"]
+        self.max_attempts = max_attempts or batch_config["max_attempts"]
+        self.gate = rate_limit_gate or RateLimitGate(
+            base_delay=batch_config["rate_limit_cooldown_seconds"]
+        )
+
+    def _run_stage(self, stage_index: int, state: Dict[str, Any]) -> Tuple[Dict[str, Any], int, float]:
+        """
+        Run one agent node, retrying after the shared cooldown when rate limited.
+
+        Other errors are raised right away: the entry is recorded as failed.
+
+        Returns:
+            (updated state, tokens spent, seconds taken)
+        """
+        node = getattr(nodes, STAGES[stage_index][2])
+
+        for attempt in range(self.max_attempts):
+            self.gate.wait()
+            started = time.time()
+            try:
+                update = node(state)
+                self.gate.record_success()
+                return apply_update(state, update), stage_tokens(update), time.time() - started
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_attempts - 1:
+                    raise
+                delay = self.gate.trip()
+                log_to_stderr(f"[EXPERIMENT] Rate limited, all workers pausing {delay:.0f}s")
+
+    def _prepare(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the state shared by both variants: everything upstream of the agent.
+
+        Stored evaluations keep the pipeline variant they ran with.
+
+        Returns:
+            Dict with the shared state, the pipeline's stages, number of shared
+            stages run and reused
+
+        Raises:
+            ValueError: If the evaluation's pipeline does not run the agent, or
+                would need its fan-out primary stage re-run
+        """
+        stored = entry.get("state")
+        if stored:
+            state = copy.deepcopy(stored)
+            pins = {**self.base_pins, **(stored["metadata"].get("prompt_versions") or {})}
+        else:
+            state = create_initial_state(
+                rubric=entry["rubric"],
+                transcript=entry["transcript"],
+                candidate_info=entry["candidate_info"]
+            )
+            pins = dict(self.base_pins)
+        state["metadata"] = {**state["metadata"], "prompt_versions": pins}
+
+        pipeline = state["metadata"].get("pipeline") or "full"
+        stages = pipeline_stages(pipeline)
+        if self.stage_index not in stages:
+            raise ValueError(f"The {pipeline} pipeline has no {self.agent} stage")
+        # Only a stored primary evaluation of a fan-out pipeline can be used as is
+        reruns_primary = self.stage_index == 0 or not (stored and stored.get(STAGES[0][1]))
+        if pipeline in FAN_OUT_PIPELINES and reruns_primary:
+            raise ValueError(f"Experiments cannot re-run the {pipeline} pipeline's fan-out primary stage")
+
+        run, reused = 0, 0
+        for index in stages[:stages.index(self.stage_index)]:
+            if stored and stored.get(STAGES[index][1]):
+                reused += 1
+                continue
+            state, _, _ = self._run_stage(index, state)
+            run += 1
+
+        return {"state": state, "stages": stages, "shared_stages_run": run, "shared_stages_reused": reused}
+
+    def _run_variant(self, entry: Dict[str, Any], shared: Dict[str, Any], variant: str) -> Dict[str, Any]:
+        """Run the agent and everything downstream with one prompt version."""
+        stored = entry.get("state")
+        pin = self.pins[variant]
+        stages = shared["stages"][shared["stages"].index(self.stage_index):]
+
+        # The stored evaluation already is this variant's result
+        stored_pin = (stored or {}).get("metadata", {}).get("prompt_versions", {}).get(self.agent)
+        if stored and stored_pin == pin and all(stored.get(STAGES[index][1]) for index in stages):
+            return {"decision_text": stored["decision"], "tokens": 0, "latency_seconds": 0.0, "reused": True}
+
+        state = dict(shared["state"])
+        state["metadata"] = {
+            **state["metadata"],
+            "prompt_versions": {**state["metadata"]["prompt_versions"], self.agent: pin}
+        }
+
+        tokens, latency = 0, 0.0
+        for index in stages:
+            state, stage_token_count, seconds = self._run_stage(index, state)
+            tokens += stage_token_count
+            latency += seconds
+
+        return {"decision_text": state["decision"], "tokens": tokens, "latency_seconds": latency, "reused": False}
+
+    def run(self, entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run the experiment.
+
+        Shared upstream stages run first (one task per entry), then both
+        variants of every entry run in parallel.
+
+        Args:
+            entries: Manifest entries (src.batch.runner.load_manifest) or
+                stored evaluations (load_checkpointed_entries)
+
+        Returns:
+            Dict with per-entry rows and a summary
+        """
+        entries = list(entries)
+        started = time.time()
+        log_to_stderr(
+            f"[EXPERIMENT] {self.agent} v{self.pins['a']['version']} vs v{self.pins['b']['version']} "
+            f"on {len(entries)} entries with concurrency {self.concurrency}"
+        )
+
+        errors: Dict[str, str] = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            prepared = {entry["id"]: pool.submit(self._prepare, entry) for entry in entries}
+            shared = {}
+            for entry_id, future in prepared.items():
+                try:
+                    shared[entry_id] = future.result()
+                except Exception as e:
+                    errors[entry_id] = str(e)
+
+            variant_futures = {
+                (entry["id"], variant): pool.submit(self._run_variant, entry, shared[entry["id"]], variant)
+                for entry in entries if entry["id"] in shared
+                for variant in VARIANTS
+            }
+            outcomes = {}
+            for key, future in variant_futures.items():
+                try:
+                    outcomes[key] = future.result()
+                except Exception as e:
+                    errors.setdefault(key[0], str(e))
+
+        rows = [self._build_row(entry, shared.get(entry["id"]), outcomes, errors) for entry in entries]
+        return {"rows": rows, "summary": self._summarize(rows, time.time() - started)}
+
+    def _build_row(
+        self,
+        entry: Dict[str, Any],
+        shared: Optional[Dict[str, Any]],
+        outcomes: Dict[Tuple[str, str], Dict[str, Any]],
+        errors: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Compare both variants for one entry."""
+        row = {"id": entry["id"], "candidate_name": entry["candidate_info"].get("name", "")}
+        if entry["id"] in errors:
+            return {**row, "status": "failed", "error": errors[entry["id"]]}
+
+        for variant in VARIANTS:
+            outcome = outcomes[(entry["id"], variant)]
+            parsed = parse_decision(outcome["decision_text"])
+            row[f"decision_{variant}"] = parsed["decision"]
+            row[f"score_{variant}"] = parsed["overall_score"]
+            row[f"tokens_{variant}"] = outcome["tokens"]
+            row[f"latency_{variant}"] = round(outcome["latency_seconds"], 2)
+            row[f"reused_{variant}"] = outcome["reused"]
+
+        row["status"] = "completed"
+        row["flipped"] = row["decision_a"] != row["decision_b"]
+        row["score_delta"] = (
+            round(row["score_b"] - row["score_a"], 2)
+            if row["score_a"] is not None and row["score_b"] is not None else None
+        )
+        row["shared_stages_run"] = shared["shared_stages_run"]
+        row["shared_stages_reused"] = shared["shared_stages_reused"]
+        return row
+
+    def _summarize(self, rows: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+        """Aggregate flips, score deltas, tokens and latency across entries."""
+        completed = [row for row in rows if row["status"] == "completed"]
+        deltas = [row["score_delta"] for row in completed if row["score_delta"] is not None]
+
+        transitions: Dict[str, int] = {}
+        for row in completed:
+            if row["flipped"]:
+                key = f"{row['decision_a']} -> {row['decision_b']}"
+                transitions[key] = transitions.get(key, 0) + 1
+
+        def mean(values):
+            return round(sum(values) / len(values), 2) if values else None
+
+        return {
+            "agent": self.agent,
+            "version_a": self.pins["a"]["version"],
+            "version_b": self.pins["b"]["version"],
+            "entries": len(rows),
+            "completed": len(completed),
+            "failed": len(rows) - len(completed),
+            "flips": sum(1 for row in completed if row["flipped"]),
+            "flip_transitions": transitions,
+            "mean_score_delta": mean(deltas),
+            "tokens_a": sum(row["tokens_a"] for row in completed),
+            "tokens_b": sum(row["tokens_b"] for row in completed),
+            "mean_latency_a": mean([row["latency_a"] for row in completed if not row["reused_a"]]),
+            "mean_latency_b": mean([row["latency_b"] for row in completed if not row["reused_b"]]),
+            "shared_stages_run": sum(row["shared_stages_run"] for row in completed),
+            "shared_stages_reused": sum(row["shared_stages_reused"] for row in completed),
+            "elapsed_seconds": round(elapsed, 2)
+        }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Format experiment rows and summary as a terminal table."""
+    summary = result["summary"]
+    header = (
+        f"{'ID':<24} {'A':<18} {'B':<18} {'FLIP':<5} {'SCORE A':>7} {'SCORE B':>7} "
+        f"{'DELTA':>6} {'TOK A':>7} {'TOK B':>7} {'LAT A':>6} {'LAT B':>6}"
+    )
+
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    lines = [
+        "=" * len(header),
+        f"PROMPT EXPERIMENT: {summary['agent']} v{summary['version_a']} (A) vs v{summary['version_b']} (B)",
+        "=" * len(header),
+        header,
+        "-" * len(header)
+    ]
+    for row in result["rows"]:
+        if row["status"] != "completed":
+            lines.append(f"{row['id'][:24]:<24} FAILED: {row['error'][:80]}")
+            continue
+        lines.append(
+            f"{row['id'][:24]:<24} {row['decision_a'][:18]:<18} {row['decision_b'][:18]:<18} "
+            f"{'*' if row['flipped'] else '':<5} {fmt(row['score_a'], '7.2f')} {fmt(row['score_b'], '7.2f')} "
+            f"{fmt(row['score_delta'], '+6.2f')} {row['tokens_a']:>7,} {row['tokens_b']:>7,} "
+            f"{row['latency_a']:>6.1f} {row['latency_b']:>6.1f}"
+        )
+
+    lines += [
+        "-" * len(header),
+        f"Completed:        {summary['completed']}/{summary['entries']} ({summary['failed']} failed)",
+        f"Decision flips:   {summary['flips']}",
+    ]
+    for transition, count in sorted(summary["flip_transitions"].items()):
+        lines.append(f"  {transition}: {count}")
+    lines += [
+        f"Mean score delta: {fmt(summary['mean_score_delta'], '+.2f')}",
+        f"Tokens:           A {summary['tokens_a']:,} / B {summary['tokens_b']:,}",
+        f"Mean latency:     A {fmt(summary['mean_latency_a'], '.1f')}s / B {fmt(summary['mean_latency_b'], '.1f')}s",
+        f"Shared stages:    {summary['shared_stages_run']} run once, {summary['shared_stages_reused']} reused from stored results",
+        f"Elapsed:          {summary['elapsed_seconds']:.1f}s",
+        "=" * len(header)
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+"""
+Persistent SQLite checkpointing for the evaluation graph.
+
+Every evaluation runs as its own LangGraph thread keyed by evaluation ID, so a
+crashed or failed run can continue from the last completed node instead of
+paying for all agent calls again.
+"""
+
+import os
+import sqlite3
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load config
+config_path = os.path.join(BASE_DIR, "config.yaml")
+with open(config_path, "r") as f:
+    config = yaml.safe_load(f)
+
+
+def get_checkpoint_path() -> str:
+    """
+    Resolve the checkpoint database path.
+
+    EVALUATION_CHECKPOINT_DB overrides config.yaml; relative paths are resolved
+    against the project root.
+
+    Returns:
+        Absolute path to the SQLite checkpoint database
+    """
+    path = os.getenv("EVALUATION_CHECKPOINT_DB") or config["checkpoint"]["path"]
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    return path
+
+
+def create_checkpointer(path: Optional[str] = None) -> SqliteSaver:
+    """
+    Create a SQLite checkpointer safe to share between graph threads.
+
+    Args:
+        path: Database path (defaults to get_checkpoint_path()); ":memory:" for tests
+
+    Returns:
+        Initialized SqliteSaver
+    """
+    path = path or get_checkpoint_path()
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # SqliteSaver serializes access with its own lock, so one connection can be
+    # shared by every evaluation thread.
+    conn = sqlite3.connect(path, check_same_thread=False)
+    checkpointer = SqliteSaver(conn)
+    checkpointer.setup()
+    return checkpointer
+
+
+def thread_config(evaluation_id: str) -> Dict[str, Any]:
+    """Build the LangGraph config that keys a run by evaluation ID."""
+    return {"configurable": {"thread_id": evaluation_id}}
+
+
+def list_thread_ids(checkpointer: SqliteSaver) -> List[str]:
+    """IDs of every evaluation thread with a checkpoint."""
+    with checkpointer.cursor(transaction=False) as cur:
+        cur.execute("SELECT DISTINCT thread_id FROM checkpoints WHERE checkpoint_ns = ''")
+        return [row[0] for row in cur.fetchall()]
+
+
+def list_incomplete_evaluations(
+    checkpointer: SqliteSaver,
+    get_graph: Callable[[str], Any],
+    include_failed: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Find checkpointed evaluations that have not reached the end of their graph.
+
+    Args:
+        checkpointer: Checkpointer shared by the durable graphs
+        get_graph: Returns the compiled graph for an evaluation ID (its pipeline)
+        include_failed: Also return runs whose last node raised an error.
+            Runs interrupted by a process restart never recorded an error.
+
+    Returns:
+        List of dicts with evaluation_id, next nodes, failed flag and state values
+    """
+    incomplete = []
+    for thread_id in list_thread_ids(checkpointer):
+        snapshot = get_graph(thread_id).get_state(thread_config(thread_id))
+        if not snapshot.next or not snapshot.values:
+            continue
+
+        failed = any(task.error for task in snapshot.tasks)
+        if failed and not include_failed:
+            continue
+
+        incomplete.append({
+            "evaluation_id": thread_id,
+            "next": list(snapshot.next),
+            "failed": failed,
+            "values": snapshot.values
+        })
+
+    return incomplete
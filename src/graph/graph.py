@@ -1,22 +1,37 @@
 """
-LangGraph workflow definition with 3-node linear flow.
+LangGraph workflow definitions.
+
+The default workflow is a 3-node linear flow; pipelines.py registers the
+lighter and fan-out variants defined here.
 """
 
-from langgraph.graph import StateGraph, END
+from typing import Optional
+
+from langgraph.graph import StateGraph, START, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
 from .state import EvaluationState
 from .nodes import (
     primary_evaluator_node,
     challenge_agent_node,
-    decision_agent_node
+    decision_agent_node,
+    primary_evaluator_part_node,
+    merge_primary_evaluations_node,
+    fan_out_transcript_chunks,
+    fan_out_rubric_criteria
 )
 
 
-def create_evaluation_graph() -> StateGraph:
+def create_evaluation_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
     """
     Create the 3-node evaluation workflow graph.
 
     Flow: primary → challenge → decision (unified) → END
 
+    Args:
+        checkpointer: Optional checkpointer; when set, runs must pass a
+            thread_id (the evaluation ID) and can be resumed node by node
+
     Returns:
         Compiled StateGraph ready for execution
     """
@@ -33,7 +48,81 @@ def create_evaluation_graph() -> StateGraph:
     workflow.add_edge("challenge_agent", "decision_agent")
     workflow.add_edge("decision_agent", END)
 
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def create_lite_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Create the 2-node "lite" workflow without the challenge agent.
+
+    Flow: primary → decision → END
+
+    Args:
+        checkpointer: Optional checkpointer (see create_evaluation_graph)
+
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    workflow = StateGraph(EvaluationState)
+
+    workflow.add_node("primary_evaluator", primary_evaluator_node)
+    workflow.add_node("decision_agent", decision_agent_node)
+
+    workflow.set_entry_point("primary_evaluator")
+    workflow.add_edge("primary_evaluator", "decision_agent")
+    workflow.add_edge("decision_agent", END)
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def _create_fan_out_graph(fan_out, checkpointer: Optional[BaseCheckpointSaver]) -> StateGraph:
+    """
+    Create a workflow whose primary evaluation is split into parallel parts.
+
+    Flow: primary parts (parallel) → primary merge → challenge → decision → END
+    """
+    workflow = StateGraph(EvaluationState)
+
+    workflow.add_node("primary_evaluator_part", primary_evaluator_part_node)
+    # The merge node takes the primary evaluator's name so downstream nodes
+    # and progress reporting are shared with the full pipeline
+    workflow.add_node("primary_evaluator", merge_primary_evaluations_node)
+    workflow.add_node("challenge_agent", challenge_agent_node)
+    workflow.add_node("decision_agent", decision_agent_node)
+
+    workflow.add_conditional_edges(START, fan_out, ["primary_evaluator_part"])
+    workflow.add_edge("primary_evaluator_part", "primary_evaluator")
+    workflow.add_edge("primary_evaluator", "challenge_agent")
+    workflow.add_edge("challenge_agent", "decision_agent")
+    workflow.add_edge("decision_agent", END)
+
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def create_chunked_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Create the "chunked" workflow: primary evaluation per transcript chunk.
+
+    Args:
+        checkpointer: Optional checkpointer (see create_evaluation_graph)
+
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    return _create_fan_out_graph(fan_out_transcript_chunks, checkpointer)
+
+
+def create_per_criterion_graph(checkpointer: Optional[BaseCheckpointSaver] = None) -> StateGraph:
+    """
+    Create the "per-criterion" workflow: primary evaluation per rubric criterion.
+
+    Args:
+        checkpointer: Optional checkpointer (see create_evaluation_graph)
+
+    Returns:
+        Compiled StateGraph ready for execution
+    """
+    return _create_fan_out_graph(fan_out_rubric_criteria, checkpointer)
 
 
 # Create singleton graph instance
@@ -5,16 +5,24 @@ LangGraph node implementations with Anthropic Claude integration.
 import os
 import yaml
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+from langchain_core.runnables import ensure_config
+from langgraph.types import Send
 
 from .state import EvaluationState
 from ..prompts.manager import PromptManager
 from ..utils.azure_client import call_anthropic_claude, calculate_cost
+from ..utils.blob_store import get_blob_store
+from ..utils.text_splitting import split_transcript, split_rubric_criteria
 
 
 # Initialize prompt manager
 prompt_manager = PromptManager()
 
+# Rubric and transcript may arrive as blob references
+blob_store = get_blob_store()
+
 # Load config
 config_path = os.path.join(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
@@ -23,55 +31,80 @@ config_path = os.path.join(
 with open(config_path, "r") as f:
     config = yaml.safe_load(f)
 
+# Prompts pinned for every evaluation
+AGENT_PROMPT_TYPES = ("primary_agent", "challenge_agent", "decision_agent")
 
-def primary_evaluator_node(state: EvaluationState) -> Dict[str, Any]:
+
+def pin_prompt_versions() -> Dict[str, Dict[str, str]]:
     """
-    Node 1: Primary evaluator conducts initial assessment.
+    Snapshot the active agent prompts (version and content hash).
+
+    Call at submission time and pass the result to create_initial_state().
+    """
+    return prompt_manager.snapshot(AGENT_PROMPT_TYPES)
+
+
+def get_system_prompt(prompt_type: str, prompt_versions: Optional[Dict[str, Dict[str, str]]]) -> str:
+    """
+    Get the prompt pinned for an evaluation, or the active one if it was not pinned.
 
     Args:
-        state: Current evaluation state
+        prompt_type: Agent type
+        prompt_versions: metadata["prompt_versions"] from the evaluation state
 
     Returns:
-        Dictionary with updates to state (primary_evaluation, metadata)
+        System prompt text
     """
-    import sys
-    import time
-
-    node_start = time.time()
-    sys.stderr.write("\n" + "="*60 + "\n")
-    sys.stderr.write("[PRIMARY EVALUATOR NODE] Starting...\n")
-    sys.stderr.flush()
+    pin = (prompt_versions or {}).get(prompt_type)
+    if pin:
+        return prompt_manager.get_pinned_prompt(prompt_type, pin)
+    return prompt_manager.get_active_prompt(prompt_type)
+
+
+def build_primary_message(
+    candidate_info: Dict[str, Any],
+    rubric: str,
+    transcript: str,
+    scope_note: str = ""
+) -> str:
+    """
+    Build the primary evaluator's user message.
 
-    # Get active prompt
-    prompt_start = time.time()
-    system_prompt = prompt_manager.get_active_prompt("primary_agent")
-    sys.stderr.write(f"[PRIMARY] Loaded prompt in {time.time() - prompt_start:.2f}s\n")
-    sys.stderr.flush()
+    Args:
+        candidate_info: Candidate information
+        rubric: Rubric text (or one criterion of it)
+        transcript: Transcript text (or one chunk of it)
+        scope_note: Optional note describing a partial rubric/transcript
 
+    Returns:
+        User message text
+    """
     # Build user message with optional level context
     level_context = ""
-    if state['candidate_info'].get('current_level') or state['candidate_info'].get('target_level'):
+    if candidate_info.get('current_level') or candidate_info.get('target_level'):
         level_context = f"""## EVALUATION CONTEXT
 
-**Current Level:** {state['candidate_info'].get('current_level', 'N/A')}
-**Target Level:** {state['candidate_info'].get('target_level', 'N/A')}
+**Current Level:** {candidate_info.get('current_level', 'N/A')}
+**Target Level:** {candidate_info.get('target_level', 'N/A')}
 """
-        if state['candidate_info'].get('level_expectations'):
+        if candidate_info.get('level_expectations'):
             level_context += f"""
 **What Distinguishes Target from Current Level:**
-{state['candidate_info']['level_expectations']}
+{candidate_info['level_expectations']}
 """
         level_context += "\n---\n\n"
 
-    user_message = f"""{level_context}## EVALUATION CRITERIA (RUBRIC)
+    scope_context = f"## SCOPE\n\n{scope_note}\n\n---\n\n" if scope_note else ""
 
-{state['rubric']}
+    return f"""{level_context}{scope_context}## EVALUATION CRITERIA (RUBRIC)
+
+{rubric}
 
 ---
 
 ## INTERVIEW TRANSCRIPT
 
-{state['transcript']}
+{transcript}
 
 ---
 
@@ -80,6 +113,37 @@ def primary_evaluator_node(state: EvaluationState) -> Dict[str, Any]:
 Evaluate this candidate using the ReAct framework. For each criterion in the rubric, follow the THOUGHT → ACTION → OBSERVATION → REFLECTION cycle, then provide final scores and recommendation.
 """
 
+
+def primary_evaluator_node(state: EvaluationState) -> Dict[str, Any]:
+    """
+    Node 1: Primary evaluator conducts initial assessment.
+
+    Args:
+        state: Current evaluation state
+
+    Returns:
+        Dictionary with updates to state (primary_evaluation, metadata)
+    """
+    import sys
+    import time
+
+    node_start = time.time()
+    sys.stderr.write("\n" + "="*60 + "\n")
+    sys.stderr.write("[PRIMARY EVALUATOR NODE] Starting...\n")
+    sys.stderr.flush()
+
+    # Get pinned prompt
+    prompt_start = time.time()
+    system_prompt = get_system_prompt("primary_agent", state['metadata'].get('prompt_versions'))
+    sys.stderr.write(f"[PRIMARY] Loaded prompt in {time.time() - prompt_start:.2f}s\n")
+    sys.stderr.flush()
+
+    user_message = build_primary_message(
+        state['candidate_info'],
+        blob_store.resolve(state['rubric']),
+        blob_store.resolve(state['transcript'])
+    )
+
     # Call Anthropic Claude
     model_config = config["models"]["primary_agent"]
     sys.stderr.write(f"[PRIMARY] Calling API with max_tokens={model_config['max_tokens']}...\n")
@@ -98,18 +162,154 @@ Evaluate this candidate using the ReAct framework. For each criterion in the rub
     sys.stderr.write("="*60 + "\n\n")
     sys.stderr.flush()
 
-    # Return updates
+    # Return updates (metadata is a delta, merged by the state reducer)
     return {
         "primary_evaluation": evaluation_text,
         "metadata": {
-            **state["metadata"],
             "tokens": {
-                **state["metadata"]["tokens"],
                 "primary_input": input_tokens,
                 "primary_output": output_tokens
             },
             "timestamps": {
-                **state["metadata"]["timestamps"],
+                "primary": datetime.now().isoformat()
+            }
+        }
+    }
+
+
+def _own_parts(refs: List[str]):
+    """Make the running graph thread (the evaluation) owner of its parts' blobs."""
+    thread_id = ensure_config().get("configurable", {}).get("thread_id")
+    if thread_id:
+        blob_store.acquire(thread_id, refs)
+
+
+def fan_out_transcript_chunks(state: EvaluationState) -> List[Send]:
+    """
+    Route for the "chunked" pipeline: one primary evaluation per transcript chunk.
+
+    Chunks are passed as blob references so pending sends stay small in
+    checkpoints.
+    """
+    chunk_config = config["pipelines"]["chunked"]
+    chunks = [
+        blob_store.put(chunk)
+        for chunk in split_transcript(
+            blob_store.resolve(state['transcript']),
+            chunk_config["chunk_chars"],
+            chunk_config["overlap_chars"]
+        )
+    ]
+    _own_parts(chunks)
+
+    return [
+        Send("primary_evaluator_part", {
+            "candidate_info": state['candidate_info'],
+            "rubric": state['rubric'],
+            "transcript": chunk,
+            "prompt_versions": state['metadata'].get('prompt_versions'),
+            "part_index": index,
+            "part_label": f"Transcript part {index + 1} of {len(chunks)}",
+            "scope_note": (
+                f"You are evaluating part {index + 1} of {len(chunks)} of a long transcript. "
+                "Assess only the evidence in this part; parts are combined afterwards."
+            ) if len(chunks) > 1 else ""
+        })
+        for index, chunk in enumerate(chunks)
+    ]
+
+
+def fan_out_rubric_criteria(state: EvaluationState) -> List[Send]:
+    """
+    Route for the "per-criterion" pipeline: one primary evaluation per rubric criterion.
+    """
+    criteria = [
+        (label, blob_store.put(criterion_text))
+        for label, criterion_text in split_rubric_criteria(blob_store.resolve(state['rubric']))
+    ]
+    _own_parts([criterion for _, criterion in criteria])
+
+    return [
+        Send("primary_evaluator_part", {
+            "candidate_info": state['candidate_info'],
+            "rubric": criterion,
+            "transcript": state['transcript'],
+            "prompt_versions": state['metadata'].get('prompt_versions'),
+            "part_index": index,
+            "part_label": label,
+            "scope_note": (
+                f"Evaluate only the criterion \"{label}\". "
+                "Other criteria are evaluated separately."
+            ) if len(criteria) > 1 else ""
+        })
+        for index, (label, criterion) in enumerate(criteria)
+    ]
+
+
+def primary_evaluator_part_node(part: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Primary evaluation of one transcript chunk or rubric criterion.
+
+    Args:
+        part: Send payload from fan_out_transcript_chunks / fan_out_rubric_criteria
+
+    Returns:
+        Dictionary with updates to state (partial_evaluations, metadata)
+    """
+    system_prompt = get_system_prompt("primary_agent", part.get('prompt_versions'))
+
+    user_message = build_primary_message(
+        part['candidate_info'],
+        blob_store.resolve(part['rubric']),
+        blob_store.resolve(part['transcript']),
+        scope_note=part['scope_note']
+    )
+
+    model_config = config["models"]["primary_agent"]
+    evaluation_text, input_tokens, output_tokens = call_anthropic_claude(
+        model_name=model_config["model_name"],
+        system_prompt=system_prompt,
+        user_message=user_message,
+        max_tokens=model_config["max_tokens"],
+        temperature=model_config["temperature"]
+    )
+
+    # Token counts from parallel parts add up in the state reducer
+    return {
+        "partial_evaluations": [{
+            "index": part['part_index'],
+            "label": part['part_label'],
+            "text": evaluation_text
+        }],
+        "metadata": {
+            "tokens": {
+                "primary_input": input_tokens,
+                "primary_output": output_tokens
+            }
+        }
+    }
+
+
+def merge_primary_evaluations_node(state: EvaluationState) -> Dict[str, Any]:
+    """
+    Combine partial primary evaluations into one primary_evaluation.
+
+    Registered as "primary_evaluator" in the fan-out pipelines so downstream
+    nodes and progress events are unchanged.
+    """
+    parts = sorted(state['partial_evaluations'], key=lambda p: p['index'])
+
+    if len(parts) == 1:
+        combined = parts[0]['text']
+    else:
+        combined = "\n\n---\n\n".join(
+            f"## {part['label']}\n\n{part['text']}" for part in parts
+        )
+
+    return {
+        "primary_evaluation": combined,
+        "metadata": {
+            "timestamps": {
                 "primary": datetime.now().isoformat()
             }
         }
@@ -135,7 +335,10 @@ def challenge_agent_node(state: EvaluationState) -> Dict[str, Any]:
     sys.stderr.flush()
 
     # Get active prompt
-    system_prompt = prompt_manager.get_active_prompt("challenge_agent")
+    system_prompt = get_system_prompt("challenge_agent", state['metadata'].get('prompt_versions'))
+
+    rubric = blob_store.resolve(state['rubric'])
+    transcript = blob_store.resolve(state['transcript'])
 
     # Build user message
     user_message = f"""## PRIMARY EVALUATOR'S ASSESSMENT TO REVIEW
@@ -146,13 +349,13 @@ def challenge_agent_node(state: EvaluationState) -> Dict[str, Any]:
 
 ## ORIGINAL TRANSCRIPT (for reference)
 
-{state['transcript']}
+{transcript}
 
 ---
 
 ## RUBRIC (to check critical criteria)
 
-{state['rubric']}
+{rubric}
 
 ---
 
@@ -185,24 +388,28 @@ Review the primary evaluation and generate challenges. Focus on:
     sys.stderr.write("="*60 + "\n\n")
     sys.stderr.flush()
 
-    # Return updates
+    # Return updates (metadata is a delta, merged by the state reducer)
     return {
         "challenges": challenges_text,
         "metadata": {
-            **state["metadata"],
             "tokens": {
-                **state["metadata"]["tokens"],
                 "challenge_input": input_tokens,
                 "challenge_output": output_tokens
             },
             "timestamps": {
-                **state["metadata"]["timestamps"],
                 "challenge": datetime.now().isoformat()
             }
         }
     }
 
 
+# Used by the "lite" pipeline, which skips the challenge agent
+NO_CHALLENGES_NOTE = (
+    "No peer review was run for this evaluation. Treat PART 1 as a self-review: "
+    "re-check each score against the transcript and revise any that the evidence does not support."
+)
+
+
 def decision_agent_node(state: EvaluationState) -> Dict[str, Any]:
     """
     Node 3: Unified decision agent - defends/calibrates AND makes final decision.
@@ -228,7 +435,10 @@ def decision_agent_node(state: EvaluationState) -> Dict[str, Any]:
     sys.stderr.flush()
 
     # Get active prompt (use updated decision_agent prompt)
-    system_prompt = prompt_manager.get_active_prompt("decision_agent")
+    system_prompt = get_system_prompt("decision_agent", state['metadata'].get('prompt_versions'))
+
+    rubric = blob_store.resolve(state['rubric'])
+    transcript = blob_store.resolve(state['transcript'])
 
     # Build user message with FULL DEBATE CONTEXT
     user_message = f"""## YOUR ORIGINAL EVALUATION (from Primary Evaluator)
@@ -237,17 +447,17 @@ def decision_agent_node(state: EvaluationState) -> Dict[str, Any]:
 ---
 
 ## CHALLENGES FROM PEER REVIEWER
-{state['challenges']}
+{state.get('challenges') or NO_CHALLENGES_NOTE}
 
 ---
 
 ## ORIGINAL TRANSCRIPT (for re-examination)
-{state['transcript']}
+{transcript}
 
 ---
 
 ## RUBRIC (for verification)
-{state['rubric']}
+{rubric}
 
 ---
 
@@ -330,13 +540,13 @@ Provide:
 
     total_input = (
         state["metadata"]["tokens"]["primary_input"] +
-        state["metadata"]["tokens"]["challenge_input"] +
+        state["metadata"]["tokens"].get("challenge_input", 0) +
         input_tokens
     )
 
     total_output = (
         state["metadata"]["tokens"]["primary_output"] +
-        state["metadata"]["tokens"]["challenge_output"] +
+        state["metadata"]["tokens"].get("challenge_output", 0) +
         output_tokens
     )
 
@@ -348,9 +558,8 @@ Provide:
         "final_evaluation": decision_text,  # Keep for backward compatibility
         "decision": decision_text,  # Full output with both parts
         "metadata": {
-            **state["metadata"],
+            # Totals are still zero at this point, so adding them sets them
             "tokens": {
-                **state["metadata"]["tokens"],
                 "decision_input": input_tokens,
                 "decision_output": output_tokens,
                 "total_input": total_input,
@@ -358,7 +567,6 @@ Provide:
                 "total": total_tokens
             },
             "timestamps": {
-                **state["metadata"]["timestamps"],
                 "decision": datetime.now().isoformat()
             },
             "total_cost_usd": total_cost,
@@ -0,0 +1,134 @@
+"""
+Registry of named pipeline variants, compiled once and cached.
+
+Each variant trades latency and cost against rigor:
+- full: primary → challenge → decision
+- lite: primary → decision (no challenge round)
+- chunked: primary per transcript chunk (parallel) → challenge → decision
+- per-criterion: primary per rubric criterion (parallel) → challenge → decision
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+from .graph import (
+    create_evaluation_graph,
+    create_lite_graph,
+    create_chunked_graph,
+    create_per_criterion_graph
+)
+from .checkpoint import config, create_checkpointer, thread_config
+
+
+PIPELINES: Dict[str, Dict[str, Any]] = {
+    "full": {
+        "description": "Primary evaluation, challenge review and calibrated decision",
+        "builder": create_evaluation_graph,
+        "nodes": ["primary_evaluator", "challenge_agent", "decision_agent"]
+    },
+    "lite": {
+        "description": "Primary evaluation and decision only - faster and cheaper, no peer challenge",
+        "builder": create_lite_graph,
+        "nodes": ["primary_evaluator", "decision_agent"]
+    },
+    "chunked": {
+        "description": "Primary evaluation per transcript chunk in parallel - for very long transcripts",
+        "builder": create_chunked_graph,
+        "nodes": ["primary_evaluator", "challenge_agent", "decision_agent"]
+    },
+    "per-criterion": {
+        "description": "Primary evaluation per rubric criterion in parallel - deeper per-criterion evidence",
+        "builder": create_per_criterion_graph,
+        "nodes": ["primary_evaluator", "challenge_agent", "decision_agent"]
+    }
+}
+
+DEFAULT_PIPELINE = config["pipelines"]["default"]
+
+_compiled: Dict[tuple, Any] = {}
+_checkpointer = None
+_lock = threading.Lock()
+
+
+def get_pipeline_graph(name: str = DEFAULT_PIPELINE, durable: bool = True):
+    """
+    Get a compiled pipeline graph, compiling it on first use.
+
+    All durable pipelines share one SQLite checkpointer, so evaluation IDs
+    are unique across variants.
+
+    Args:
+        name: Pipeline variant name
+        durable: Compile with the persistent checkpointer (backend) or without (Streamlit, scripts)
+
+    Returns:
+        Compiled graph
+
+    Raises:
+        ValueError: If the pipeline name is unknown
+    """
+    global _checkpointer
+
+    if name not in PIPELINES:
+        raise ValueError(f"Unknown pipeline '{name}'. Available: {', '.join(PIPELINES)}")
+
+    with _lock:
+        key = (name, durable)
+        if key not in _compiled:
+            checkpointer = None
+            if durable:
+                if _checkpointer is None:
+                    _checkpointer = create_checkpointer()
+                checkpointer = _checkpointer
+            _compiled[key] = PIPELINES[name]["builder"](checkpointer=checkpointer)
+        return _compiled[key]
+
+
+def precompile_pipelines(durable: bool = True):
+    """Compile every registered pipeline up front (called at startup)."""
+    for name in PIPELINES:
+        get_pipeline_graph(name, durable=durable)
+
+
+def get_thread_pipeline(evaluation_id: str) -> Optional[str]:
+    """
+    Look up which pipeline a checkpointed evaluation was started with.
+
+    Args:
+        evaluation_id: Evaluation ID (checkpoint thread)
+
+    Returns:
+        Pipeline name, or None if the evaluation has no checkpoint
+    """
+    checkpointer = get_pipeline_graph("full").checkpointer
+    checkpoint_tuple = checkpointer.get_tuple(thread_config(evaluation_id))
+    if checkpoint_tuple is None:
+        return None
+
+    metadata = checkpoint_tuple.checkpoint["channel_values"].get("metadata") or {}
+    return metadata.get("pipeline", "full")
+
+
+def get_graph_for_evaluation(evaluation_id: str):
+    """Get the durable graph matching a checkpointed evaluation's pipeline."""
+    return get_pipeline_graph(get_thread_pipeline(evaluation_id) or "full")
+
+
+def progress_map(name: str) -> Dict[str, Dict[str, int]]:
+    """
+    Progress percentages at the start and end of each reported node.
+
+    Args:
+        name: Pipeline variant name
+
+    Returns:
+        Dict of node name to {"started": pct, "completed": pct}
+    """
+    nodes = PIPELINES[name]["nodes"]
+    return {
+        node: {
+            "started": round(100 * index / len(nodes)),
+            "completed": round(100 * (index + 1) / len(nodes))
+        }
+        for index, node in enumerate(nodes)
+    }
@@ -2,7 +2,8 @@
 State definition for the evaluation graph.
 """
 
-from typing import TypedDict, Optional, Dict, Any
+import operator
+from typing import Annotated, TypedDict, Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -36,15 +37,54 @@ class TimestampMetadata(TypedDict):
     decision: str
 
 
+class PromptPin(TypedDict):
+    """Prompt version an evaluation was pinned to."""
+    version: str
+    sha256: str  # Hash of the prompt content
+
+
 class EvaluationMetadata(TypedDict):
     """Metadata about the evaluation execution."""
     tokens: TokenMetadata
     timestamps: TimestampMetadata
     model_version: str
+    pipeline: str  # Pipeline variant name (see pipelines.py)
+    prompt_versions: Dict[str, PromptPin]  # Keyed by prompt type; empty = active prompts
     cost_usd: float
     execution_time_seconds: float
 
 
+def merge_metadata(current: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reducer for metadata updates returned by nodes.
+
+    Nodes return only their deltas: token counts are added to the running
+    totals, timestamps are merged by key, and any other field is overwritten.
+
+    Args:
+        current: Accumulated metadata
+        update: Metadata delta from a node (or the full initial metadata)
+
+    Returns:
+        New merged metadata dict
+    """
+    if not current:
+        current = {"tokens": {}, "timestamps": {}}
+
+    merged = {**current}
+    for key, value in update.items():
+        if key == "tokens":
+            tokens = dict(current.get("tokens", {}))
+            for name, count in value.items():
+                tokens[name] = tokens.get(name, 0) + count
+            merged["tokens"] = tokens
+        elif key == "timestamps":
+            merged["timestamps"] = {**current.get("timestamps", {}), **value}
+        else:
+            merged[key] = value
+    return merged
+
+
 class EvaluationState(TypedDict):
     """
     Complete state passed between graph nodes.
@@ -60,14 +100,19 @@ class EvaluationState(TypedDict):
     final_evaluation: Optional[str]
     decision: Optional[str]  # NEW - Final promotion decision from decision agent
 
-    # Metadata
-    metadata: EvaluationMetadata
+    # Partial primary evaluations from fan-out pipelines (chunked, per-criterion)
+    partial_evaluations: Annotated[List[Dict[str, Any]], operator.add]
+
+    # Metadata (nodes return deltas, merged by merge_metadata)
+    metadata: Annotated[EvaluationMetadata, merge_metadata]
 
 
 def create_initial_state(
     rubric: str,
     transcript: str,
-    candidate_info: Dict[str, Any]
+    candidate_info: Dict[str, Any],
+    pipeline: str = "full",
+    prompt_versions: Optional[Dict[str, PromptPin]] = None
 ) -> EvaluationState:
     """
     Create initial state for evaluation graph.
@@ -76,6 +121,9 @@ def create_initial_state(
         rubric: Natural language rubric text describing evaluation criteria
         transcript: Interview transcript text
         candidate_info: Dictionary containing candidate information
+        pipeline: Pipeline variant the state is created for
+        prompt_versions: Prompt snapshot from nodes.pin_prompt_versions(); nodes
+            use the active prompts when it is omitted
     """
     return EvaluationState(
         rubric=rubric,
@@ -85,6 +133,7 @@ def create_initial_state(
         challenges=None,
         final_evaluation=None,
         decision=None,  # NEW - Initialize as None
+        partial_evaluations=[],
         metadata=EvaluationMetadata(
             tokens=TokenMetadata(
                 primary_input=0,
@@ -104,6 +153,8 @@ def create_initial_state(
                 decision=""
             ),
             model_version="",
+            pipeline=pipeline,
+            prompt_versions=prompt_versions or {},
             cost_usd=0.0,
             execution_time_seconds=0.0
         )
@@ -2,29 +2,100 @@
 Prompt version management - File-based system (V2)
 
 Prompts stored as separate files, versions.json only contains metadata.
+Both are cached in memory and re-read only when a file's mtime or size changes,
+so graph nodes can fetch prompts on every call without touching the disk.
+
+Writes are safe across processes (API workers, the Streamlit editor): files are
+replaced atomically, read-modify-write cycles hold an exclusive lock file, and
+every change bumps a revision counter that callers can compare-and-swap on.
+Readers never take the lock; they always see a complete old or new file.
+
+Each version's content has a SHA-256 hash. snapshot() pins the active versions
+with their hashes when an evaluation is submitted and stores the pinned texts
+in the blob store under that hash. get_pinned_prompt() returns exactly that
+text later, even if the version was edited in place meanwhile, so results are
+reproducible and can be keyed by the prompts that produced them.
 """
 
+import copy
+import hashlib
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..utils.blob_store import BLOB_REF_PREFIX, BlobStore, get_blob_store
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+META_KEY = "_meta"
+
+# Blob store owner of pinned prompt texts; never released, as any stored
+# evaluation may be rerun with its pins
+PINNED_PROMPTS_OWNER = "pinned-prompts"
+
+
+class PromptVersionConflict(Exception):
+    """Raised when versions.json changed since the caller's expected revision."""
+
+
+def _atomic_write(path: str, content: str):
+    """Write a file via a temp file and rename so readers never see partial content."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 class PromptManager:
     """Manages prompt versions with file-based storage."""
 
-    def __init__(self):
+    def __init__(self, prompts_dir: Optional[str] = None, blob_store: Optional[BlobStore] = None):
         # Use absolute path relative to this file
         self.base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.prompts_dir = os.path.join(self.base_dir, "data", "prompts")
+        self.prompts_dir = prompts_dir or os.path.join(self.base_dir, "data", "prompts")
         self.versions_file = os.path.join(self.prompts_dir, "versions.json")
+        self.lock_file = os.path.join(self.prompts_dir, ".versions.lock")
+
+        # Cached file contents keyed by path: (inode, mtime_ns, size, value[, sha256])
+        self._lock = threading.RLock()
+        self._versions_cache: Optional[Tuple[int, int, int, Dict]] = None
+        self._content_cache: Dict[str, Tuple[int, int, int, str, str]] = {}
+        self.reload_count = 0
+
+        # Pinned texts by sha256, stored in the blob store or read back from it
+        self.blob_store = blob_store or get_blob_store()
+        self._pinned: Dict[str, str] = {}
+
         self._ensure_structure()
 
     def _ensure_structure(self):
         """Create directory structure if it doesn't exist."""
         os.makedirs(self.prompts_dir, exist_ok=True)
 
-        if not os.path.exists(self.versions_file):
+        if os.path.exists(self.versions_file):
+            return
+
+        with self._file_lock():
+            if os.path.exists(self.versions_file):
+                return
+
             # Create minimal versions.json with file references
             print(f"⚠️ Creating {self.versions_file} with file-based references")
             initial_data = {
@@ -63,28 +134,129 @@ class PromptManager:
                 }
             }
 
-            with open(self.versions_file, "w") as f:
-                json.dump(initial_data, f, indent=2)
+            initial_data[META_KEY] = {"revision": 1, "updated_at": datetime.now().isoformat()}
+            _atomic_write(self.versions_file, json.dumps(initial_data, indent=2))
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive cross-process lock for a read-modify-write cycle."""
+        with open(self.lock_file, "a+") as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    @staticmethod
+    def _file_signature(path: str) -> Tuple[int, int, int]:
+        """Return (inode, mtime_ns, size) used to detect changes to a cached file."""
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _cached_versions(self) -> Dict:
+        """
+        Return the cached versions metadata, re-reading it if the file changed.
+
+        The returned dict is shared; callers that modify it must use
+        _load_versions() instead.
+        """
+        signature = self._file_signature(self.versions_file)
+
+        with self._lock:
+            if self._versions_cache is None or self._versions_cache[:3] != signature:
+                with open(self.versions_file, "r") as f:
+                    data = json.load(f)
+                self._versions_cache = (*signature, data)
+                self.reload_count += 1
+            return self._versions_cache[3]
 
     def _load_versions(self) -> Dict:
-        """Load versions metadata from file."""
-        with open(self.versions_file, "r") as f:
-            return json.load(f)
+        """Load versions metadata (a private copy that is safe to modify)."""
+        return copy.deepcopy(self._cached_versions())
 
     def _save_versions(self, data: Dict):
-        """Save versions metadata to file."""
-        with open(self.versions_file, "w") as f:
-            json.dump(data, f, indent=2)
+        """Atomically save versions metadata (callers hold the file lock)."""
+        _atomic_write(self.versions_file, json.dumps(data, indent=2))
+        with self._lock:
+            self._versions_cache = None
+
+    @contextmanager
+    def _edit_versions(self, expected_revision: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Lock, load, and yield versions metadata; save it with a bumped revision.
+
+        Nothing is saved if the body raises.
+
+        Args:
+            expected_revision: Revision the caller last read; raises
+                PromptVersionConflict if versions.json has changed since
+
+        Yields:
+            Fresh copy of the versions metadata to modify in place
+        """
+        with self._file_lock():
+            with open(self.versions_file, "r") as f:
+                data = json.load(f)
+
+            revision = data.get(META_KEY, {}).get("revision", 0)
+            if expected_revision is not None and expected_revision != revision:
+                raise PromptVersionConflict(
+                    f"Prompt versions changed (revision {revision}, expected {expected_revision})"
+                )
+
+            yield data
+
+            data[META_KEY] = {"revision": revision + 1, "updated_at": datetime.now().isoformat()}
+            self._save_versions(data)
+
+    def get_revision(self) -> int:
+        """Current revision of versions.json, for compare-and-swap writes."""
+        return self._cached_versions().get(META_KEY, {}).get("revision", 0)
 
     def _load_prompt_content(self, file_path: str) -> str:
-        """Load prompt content from file."""
+        """Load prompt content from file (cached until the file changes)."""
+        return self._load_prompt_entry(file_path)[0]
+
+    def _load_prompt_entry(self, file_path: str) -> Tuple[str, str]:
+        """Load (content, sha256) for a prompt file (cached until the file changes)."""
         full_path = os.path.join(self.prompts_dir, file_path)
 
         if not os.path.exists(full_path):
             raise FileNotFoundError(f"Prompt file not found: {full_path}")
 
-        with open(full_path, "r", encoding="utf-8") as f:
-            return f.read()
+        signature = self._file_signature(full_path)
+
+        with self._lock:
+            cached = self._content_cache.get(full_path)
+            if cached is None or cached[:3] != signature:
+                with open(full_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+                cached = (*signature, content, hashlib.sha256(content.encode("utf-8")).hexdigest())
+                self._content_cache[full_path] = cached
+                self.reload_count += 1
+            return cached[3], cached[4]
+
+    def _write_prompt_content(self, file_path: str, content: str):
+        """Atomically write a prompt file and drop its cached content."""
+        full_path = os.path.join(self.prompts_dir, file_path)
+
+        _atomic_write(full_path, content)
+        with self._lock:
+            self._content_cache.pop(full_path, None)
+
+    def invalidate_cache(self):
+        """Drop all cached metadata and prompt content."""
+        with self._lock:
+            self._versions_cache = None
+            self._content_cache.clear()
 
     def get_active_prompt(self, prompt_type: str) -> str:
         """
@@ -96,7 +268,7 @@ class PromptManager:
         Returns:
             Active prompt text
         """
-        data = self._load_versions()
+        data = self._cached_versions()
         active_version = data[prompt_type]["active_version"]
 
         for version in data[prompt_type]["versions"]:
@@ -106,22 +278,110 @@ class PromptManager:
 
         raise ValueError(f"Active version {active_version} not found")
 
+    def _find_version(self, data: Dict, prompt_type: str, version: str) -> Dict:
+        """Find a version entry in versions metadata."""
+        for v in data[prompt_type]["versions"]:
+            if v["version"] == version:
+                return v
+        raise ValueError(f"Version {version} not found")
+
+    def get_content_hash(self, prompt_type: str, version: str) -> str:
+        """SHA-256 of a version's current content."""
+        entry = self._find_version(self._cached_versions(), prompt_type, version)
+        return self._load_prompt_entry(entry["file"])[1]
+
+    def snapshot(self, prompt_types: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, str]]:
+        """
+        Pin the active version of each prompt with its content hash.
+
+        All versions are resolved from a single read of versions.json, so the
+        snapshot is consistent even while prompts are being edited.
+
+        Args:
+            prompt_types: Prompts to pin (defaults to every prompt in versions.json)
+
+        Returns:
+            {prompt_type: {"version": ..., "sha256": ...}}
+        """
+        data = self._cached_versions()
+        if prompt_types is None:
+            prompt_types = [key for key in data if key != META_KEY]
+
+        pins = {}
+        for prompt_type in prompt_types:
+            active_version = data[prompt_type]["active_version"]
+            entry = self._find_version(data, prompt_type, active_version)
+            content, sha256 = self._load_prompt_entry(entry["file"])
+            self._store_pinned(content, sha256)
+            pins[prompt_type] = {"version": active_version, "sha256": sha256}
+        return pins
+
+    def _store_pinned(self, content: str, sha256: str):
+        """Keep a pinned text in the blob store under its hash (once per process)."""
+        with self._lock:
+            if sha256 in self._pinned:
+                return
+        ref = self.blob_store.put(content, min_size_bytes=0)
+        self.blob_store.acquire(PINNED_PROMPTS_OWNER, [ref])
+        with self._lock:
+            self._pinned[sha256] = content
+
+    def get_pinned_prompt(self, prompt_type: str, pin: Dict[str, str]) -> str:
+        """
+        Get the prompt text a snapshot pinned, regardless of the active version.
+
+        The text is read from the blob store by its hash, so later edits or
+        deletions of the version do not change it. Pins whose text is not in
+        the blob store (taken before texts were stored) fall back to the
+        version file while it still has the pinned hash.
+
+        Args:
+            prompt_type: Agent type
+            pin: {"version": ..., "sha256": ...} from snapshot()
+
+        Returns:
+            Prompt text
+
+        Raises:
+            ValueError: If the pinned text is neither in the blob store nor in
+                the version file
+        """
+        sha256 = pin["sha256"]
+        with self._lock:
+            content = self._pinned.get(sha256)
+        if content is not None:
+            return content
+
+        try:
+            content = self.blob_store.get(BLOB_REF_PREFIX + sha256)
+        except KeyError:
+            try:
+                entry = self._find_version(self._cached_versions(), prompt_type, pin["version"])
+                content, found = self._load_prompt_entry(entry["file"])
+            except (ValueError, FileNotFoundError):
+                content, found = None, None
+            if found != sha256:
+                raise ValueError(
+                    f"Text of {prompt_type} v{pin['version']} as pinned (sha256 {sha256[:12]}) "
+                    "is no longer available: it was edited or deleted and is not in the blob store"
+                )
+            self._store_pinned(content, sha256)
+            return content
+
+        with self._lock:
+            self._pinned[sha256] = content
+        return content
+
     def get_all_versions(self, prompt_type: str) -> List[Dict]:
         """Get all versions metadata (without content) for a prompt."""
         data = self._load_versions()
         return data[prompt_type]["versions"]
 
     def get_version(self, prompt_type: str, version: str) -> Dict:
-        """Get a specific version with content."""
-        data = self._load_versions()
-
-        for v in data[prompt_type]["versions"]:
-            if v["version"] == version:
-                # Load content from file
-                content = self._load_prompt_content(v["file"])
-                return {**v, "content": content}
-
-        raise ValueError(f"Version {version} not found")
+        """Get a specific version with content and its hash."""
+        v = self._find_version(self._cached_versions(), prompt_type, version)
+        content, sha256 = self._load_prompt_entry(v["file"])
+        return {**v, "content": content, "sha256": sha256}
 
     def save_new_version(
         self,
@@ -129,7 +389,8 @@ class PromptManager:
         content: str,
         notes: str,
         set_active: bool = False,
-        filename: Optional[str] = None
+        filename: Optional[str] = None,
+        expected_revision: Optional[int] = None
     ) -> str:
         """
         Save a new prompt version.
@@ -140,55 +401,57 @@ class PromptManager:
             notes: Version notes
             set_active: Whether to set as active version
             filename: Optional custom filename (defaults to {prompt_type}_v{N}.txt)
+            expected_revision: Fail with PromptVersionConflict if versions.json
+                is no longer at this revision
 
         Returns:
             New version number (integer as string)
         """
-        data = self._load_versions()
-
-        # Generate new version number
-        existing_versions = [int(v["version"]) for v in data[prompt_type]["versions"]]
-        new_version = str(max(existing_versions) + 1)
-
-        # Generate filename if not provided
-        if filename is None:
-            filename = f"{prompt_type}_v{new_version}.txt"
-
-        # Save content to file
-        file_path = os.path.join(self.prompts_dir, filename)
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(content)
-
-        # Create new version entry (metadata only)
-        new_entry = {
-            "version": new_version,
-            "created_at": datetime.now().isoformat(),
-            "notes": notes,
-            "file": filename
-        }
+        with self._edit_versions(expected_revision) as data:
+            # Generate new version number
+            existing_versions = [int(v["version"]) for v in data[prompt_type]["versions"]]
+            new_version = str(max(existing_versions) + 1)
+
+            # Generate filename if not provided
+            if filename is None:
+                filename = f"{prompt_type}_v{new_version}.txt"
+
+            # Save content to file
+            self._write_prompt_content(filename, content)
+
+            # Create new version entry (metadata only)
+            new_entry = {
+                "version": new_version,
+                "created_at": datetime.now().isoformat(),
+                "notes": notes,
+                "file": filename
+            }
 
-        # Add to versions list
-        data[prompt_type]["versions"].append(new_entry)
+            # Add to versions list
+            data[prompt_type]["versions"].append(new_entry)
 
-        # Set as active if requested
-        if set_active:
-            data[prompt_type]["active_version"] = new_version
+            # Set as active if requested
+            if set_active:
+                data[prompt_type]["active_version"] = new_version
 
-        self._save_versions(data)
         return new_version
 
-    def set_active_version(self, prompt_type: str, version: str):
+    def set_active_version(self, prompt_type: str, version: str, expected_revision: Optional[int] = None):
         """Set a version as active."""
-        data = self._load_versions()
-
-        # Verify version exists
-        if not any(v["version"] == version for v in data[prompt_type]["versions"]):
-            raise ValueError(f"Version {version} not found")
+        with self._edit_versions(expected_revision) as data:
+            # Verify version exists
+            if not any(v["version"] == version for v in data[prompt_type]["versions"]):
+                raise ValueError(f"Version {version} not found")
 
-        data[prompt_type]["active_version"] = version
-        self._save_versions(data)
+            data[prompt_type]["active_version"] = version
 
-    def delete_version(self, prompt_type: str, version: str, delete_file: bool = False):
+    def delete_version(
+        self,
+        prompt_type: str,
+        version: str,
+        delete_file: bool = False,
+        expected_revision: Optional[int] = None
+    ):
         """
         Delete a version (cannot delete active).
 
@@ -196,60 +459,68 @@ class PromptManager:
             prompt_type: Agent type
             version: Version to delete
             delete_file: If True, also delete the prompt file from disk
+            expected_revision: Fail with PromptVersionConflict if versions.json
+                is no longer at this revision
         """
-        data = self._load_versions()
-
-        if version == data[prompt_type]["active_version"]:
-            raise ValueError("Cannot delete active version")
-
-        # Find the version to get filename
-        version_entry = None
-        for v in data[prompt_type]["versions"]:
-            if v["version"] == version:
-                version_entry = v
-                break
-
-        if not version_entry:
-            raise ValueError(f"Version {version} not found")
-
-        # Delete file if requested
+        with self._edit_versions(expected_revision) as data:
+            if version == data[prompt_type]["active_version"]:
+                raise ValueError("Cannot delete active version")
+
+            # Find the version to get filename
+            version_entry = None
+            for v in data[prompt_type]["versions"]:
+                if v["version"] == version:
+                    version_entry = v
+                    break
+
+            if not version_entry:
+                raise ValueError(f"Version {version} not found")
+
+            # Remove from versions list
+            data[prompt_type]["versions"] = [
+                v for v in data[prompt_type]["versions"]
+                if v["version"] != version
+            ]
+
+        # Delete file if requested (after the metadata no longer references it)
         if delete_file and "file" in version_entry:
             file_path = os.path.join(self.prompts_dir, version_entry["file"])
             if os.path.exists(file_path):
                 os.remove(file_path)
+            with self._lock:
+                self._content_cache.pop(file_path, None)
 
-        # Remove from versions list
-        data[prompt_type]["versions"] = [
-            v for v in data[prompt_type]["versions"]
-            if v["version"] != version
-        ]
-
-        self._save_versions(data)
-
-    def update_prompt_content(self, prompt_type: str, version: str, new_content: str):
+    def update_prompt_content(
+        self,
+        prompt_type: str,
+        version: str,
+        new_content: str,
+        expected_revision: Optional[int] = None
+    ):
         """
         Update the content of an existing prompt version.
 
+        Bumps the revision so concurrent editors see the change.
+
         Args:
             prompt_type: Agent type
             version: Version to update
             new_content: New prompt content
+            expected_revision: Fail with PromptVersionConflict if versions.json
+                is no longer at this revision
         """
-        data = self._load_versions()
-
-        # Find version
-        version_entry = None
-        for v in data[prompt_type]["versions"]:
-            if v["version"] == version:
-                version_entry = v
-                break
-
-        if not version_entry:
-            raise ValueError(f"Version {version} not found")
-
-        # Update file content
-        file_path = os.path.join(self.prompts_dir, version_entry["file"])
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
+        with self._edit_versions(expected_revision) as data:
+            # Find version
+            version_entry = None
+            for v in data[prompt_type]["versions"]:
+                if v["version"] == version:
+                    version_entry = v
+                    break
+
+            if not version_entry:
+                raise ValueError(f"Version {version} not found")
+
+            # Update file content
+            self._write_prompt_content(version_entry["file"], new_content)
 
         print(f"✓ Updated {prompt_type} v{version} ({version_entry['file']})")
@@ -6,10 +6,14 @@ import os
 import yaml
 import time
 import sys
-from typing import Tuple
+from contextlib import nullcontext
+from typing import Optional, Tuple
 from openai import AzureOpenAI
 from dotenv import load_dotenv
 
+from .cancellation import CancelToken, EvaluationCancelled, current_cancel_token
+from .token_stream import TokenListener, current_token_listener
+
 # Load environment variables
 load_dotenv()
 
@@ -59,6 +63,11 @@ def call_anthropic_claude(
     """
     Call Azure OpenAI with retry logic.
 
+    Under a CancelToken (see src.utils.cancellation) or a token listener (see
+    src.utils.token_stream) the completion is streamed: cancelling the token
+    aborts the HTTP request and the tokens spent are recorded on it, and the
+    listener is told about each output token as it arrives.
+
     Args:
         model_name: Deployment name (e.g., "gpt-4o")
         system_prompt: System prompt text
@@ -70,8 +79,11 @@ def call_anthropic_claude(
         Tuple of (response_text, input_tokens, output_tokens)
 
     Raises:
+        EvaluationCancelled: If the run was cancelled
         Exception: If API call fails after all retries
     """
+    cancel_token = current_cancel_token()
+    token_listener = current_token_listener()
     client = get_azure_openai_client()
     # Support both naming conventions
     deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME") or os.getenv("AZURE_OPENAI_DEPLOYMENT")
@@ -80,6 +92,8 @@ def call_anthropic_claude(
     backoff = config["retry"]["backoff_factor"]
 
     for attempt in range(max_retries):
+        if cancel_token:
+            cancel_token.raise_if_cancelled()
         try:
             api_start = time.time()
             log_to_stderr(f"[API CALL START] Deployment: {deployment}, max_tokens: {max_tokens}, attempt: {attempt + 1}/{max_retries}")
@@ -99,29 +113,99 @@ def call_anthropic_claude(
             if temperature != 0.0:
                 params["temperature"] = temperature
 
-            response = client.chat.completions.create(**params)
+            if cancel_token or token_listener:
+                text, input_tokens, output_tokens = _stream_completion(
+                    client, params, cancel_token, token_listener
+                )
+            else:
+                response = client.chat.completions.create(**params)
 
-            api_duration = time.time() - api_start
-            log_to_stderr(f"[API CALL SUCCESS] Duration: {api_duration:.2f}s")
+                # Extract response text
+                text = response.choices[0].message.content
 
-            # Extract response text
-            text = response.choices[0].message.content
+                # Extract token counts
+                input_tokens = response.usage.prompt_tokens
+                output_tokens = response.usage.completion_tokens
 
-            # Extract token counts
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
+            api_duration = time.time() - api_start
+            log_to_stderr(f"[API CALL SUCCESS] Duration: {api_duration:.2f}s")
 
             log_to_stderr(f"[TOKENS] Input: {input_tokens:,}, Output: {output_tokens:,}")
 
             return text, input_tokens, output_tokens
 
+        except EvaluationCancelled:
+            log_to_stderr("[API CALL CANCELLED]")
+            raise
+
         except Exception as e:
             if attempt < max_retries - 1:
                 wait_time = backoff ** attempt
                 log_to_stderr(f"API error (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s: {str(e)[:100]}")
-                time.sleep(wait_time)
+                if cancel_token:
+                    cancel_token.wait(wait_time)
+                else:
+                    time.sleep(wait_time)
             else:
-                raise Exception(f"Azure OpenAI API call failed after {max_retries} attempts: {str(e)}")
+                raise Exception(f"Azure OpenAI API call failed after {max_retries} attempts: {str(e)}") from e
+
+
+def _stream_completion(
+    client: AzureOpenAI,
+    params: dict,
+    cancel_token: Optional[CancelToken],
+    token_listener: Optional[TokenListener] = None
+) -> Tuple[str, int, int]:
+    """
+    Stream a completion, aborting the request if the token is cancelled.
+
+    Args:
+        client: Azure OpenAI client
+        params: chat.completions.create parameters
+        cancel_token: Token of the running evaluation, if any
+        token_listener: Called with 1 for every streamed output chunk (~1 token)
+
+    Returns:
+        Tuple of (response_text, input_tokens, output_tokens)
+
+    Raises:
+        EvaluationCancelled: If the token was cancelled before the stream finished
+    """
+    stream = client.chat.completions.create(
+        **params, stream=True, stream_options={"include_usage": True}
+    )
+    parts = []
+    usage = None
+
+    # Closing the stream from the cancelling thread drops the HTTP connection,
+    # which also unblocks a read waiting for the next chunk
+    with cancel_token.on_cancel(stream.close) if cancel_token else nullcontext():
+        try:
+            for chunk in stream:
+                if chunk.usage:
+                    usage = chunk.usage
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    if token_listener:
+                        token_listener(1)
+        except Exception:
+            if not (cancel_token and cancel_token.cancelled):
+                raise
+        finally:
+            stream.close()
+
+    if usage is None:
+        # Usage is only reported at the end of a stream; estimate the prompt at
+        # ~4 characters per token and count one token per streamed chunk
+        prompt_chars = sum(len(message["content"]) for message in params["messages"])
+        if cancel_token:
+            cancel_token.record_usage(prompt_chars // 4, len(parts), estimated=True)
+            cancel_token.raise_if_cancelled()
+        return "".join(parts), prompt_chars // 4, len(parts)
+
+    if cancel_token:
+        cancel_token.record_usage(usage.prompt_tokens, usage.completion_tokens)
+    return "".join(parts), usage.prompt_tokens, usage.completion_tokens
 
 
 def calculate_cost(input_tokens: int, output_tokens: int) -> float:
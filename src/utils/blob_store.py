@@ -0,0 +1,455 @@
+"""
+Content-addressed store for large texts (transcripts, rubrics, agent outputs).
+
+Texts are stored once under their SHA-256 and passed around as short
+"blob:sha256:<hex>" references, so storage records and WebSocket events don't
+each carry their own copy. Graph state and checkpoints reference transcripts,
+rubrics and fan-out parts, but hold agent outputs in full as the nodes return
+them; those are put here when the result is recorded. Large texts are kept
+zlib-compressed, in memory and on disk, and only decompressed when read.
+
+Blobs are owned by the evaluations (graph threads) referencing them:
+acquire() records an owner's references and release() drops them, deleting
+every blob no other owner still holds.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+import yaml
+
+
+BLOB_REF_PREFIX = "blob:sha256:"
+
+# Load config
+config_path = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "config.yaml"
+)
+with open(config_path, "r") as f:
+    config = yaml.safe_load(f)
+
+
+OWNERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blob_owners (
+    digest TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    PRIMARY KEY (digest, owner)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_blob_owners_owner ON blob_owners (owner, digest);
+"""
+
+
+class BlobStoreFullError(Exception):
+    """Raised when a memory-only store cannot fit a text without dropping owned blobs."""
+
+    def __init__(self, memory_limit_bytes: int):
+        self.memory_limit_bytes = memory_limit_bytes
+        super().__init__(f"Blob store memory budget ({memory_limit_bytes} bytes) is held by owned blobs")
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a blob reference."""
+    return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX)
+
+
+def find_refs(value: Any) -> Set[str]:
+    """Every blob reference in a value, searching nested dicts and lists."""
+    if is_blob_ref(value):
+        return {value}
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return set()
+    refs: Set[str] = set()
+    for item in value:
+        refs |= find_refs(item)
+    return refs
+
+
+class BlobStore:
+    """
+    In-memory LRU of texts keyed by content hash, with optional disk spill.
+
+    With a spill directory every blob is also written to disk, so references
+    stay valid across restarts (checkpointed graph state holds references),
+    and least recently used texts over the memory budget are evicted from
+    memory only. Without one, blobs are memory-only: over the budget the
+    least recently used blobs without an owner are dropped (their references
+    stop resolving), and put() fails once owned blobs fill the budget.
+
+    Texts of at least compress_min_bytes are held as zlib data (a ".z" file
+    on disk) when that is smaller; get() decompresses them on each access.
+
+    Owners are kept in an "owners.sqlite" database in the spill directory,
+    shared by every process using it (in memory without one).
+    """
+
+    def __init__(
+        self,
+        spill_dir: Optional[str] = None,
+        memory_limit_bytes: int = 64 * 1024 * 1024,
+        min_size_bytes: int = 2048,
+        compress_min_bytes: Optional[int] = 4096,
+        compression_level: int = 6
+    ):
+        """
+        Initialize the blob store.
+
+        Args:
+            spill_dir: Directory for on-disk copies, or None for memory only
+            memory_limit_bytes: In-memory budget (UTF-8 or compressed bytes) before evicting
+            min_size_bytes: Texts smaller than this (UTF-8) are returned unchanged by put()
+            compress_min_bytes: Texts at least this large (UTF-8) are compressed,
+                None disables compression
+            compression_level: zlib level (1 fastest .. 9 smallest)
+        """
+        self.spill_dir = spill_dir
+        self.memory_limit_bytes = memory_limit_bytes
+        self.min_size_bytes = min_size_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self.compression_level = compression_level
+        # Values are (text or zlib-compressed UTF-8 bytes, size in bytes)
+        self._blobs: "OrderedDict[str, Tuple[Union[str, bytes], int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "puts": 0, "dedup_hits": 0, "disk_reads": 0, "evictions": 0, "dropped": 0,
+            "deleted": 0, "compressed_blobs": 0, "decompressions": 0,
+            "compress_seconds": 0.0, "decompress_seconds": 0.0
+        }
+        # Digests with an owner, which a memory-only store must not drop
+        self._owned: Set[str] = set()
+        # UTF-8 size of the texts stored by this process, before and after compression
+        self._raw_bytes = 0
+        self._stored_bytes = 0
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        self._owners = sqlite3.connect(
+            os.path.join(spill_dir, "owners.sqlite") if spill_dir else ":memory:",
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30
+        )
+        if spill_dir:
+            self._owners.execute("PRAGMA journal_mode=WAL")
+        self._owners.executescript(OWNERS_SCHEMA)
+        self._owners_lock = threading.Lock()
+
+    def _blob_path(self, digest: str, compressed: bool = False) -> str:
+        return os.path.join(self.spill_dir, digest[:2], digest + (".z" if compressed else ""))
+
+    def _on_disk(self, digest: str) -> bool:
+        return any(os.path.exists(self._blob_path(digest, compressed)) for compressed in (True, False))
+
+    def _spill(self, digest: str, stored: Union[str, bytes]):
+        """Write a blob value to the spill directory (atomically, if not there yet)."""
+        compressed = isinstance(stored, bytes)
+        path = self._blob_path(digest, compressed)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(stored if compressed else stored.encode("utf-8"))
+        os.replace(tmp_path, path)
+
+    def _compress(self, data: bytes) -> Union[str, bytes]:
+        """Value to keep for a new blob: zlib data if large and smaller, else the text."""
+        stored: Union[str, bytes] = data.decode("utf-8")
+        if self.compress_min_bytes is not None and len(data) >= self.compress_min_bytes:
+            started = time.perf_counter()
+            packed = zlib.compress(data, self.compression_level)
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._stats["compress_seconds"] += elapsed
+                if len(packed) < len(data):
+                    self._stats["compressed_blobs"] += 1
+                    stored = packed
+        with self._lock:
+            self._raw_bytes += len(data)
+            self._stored_bytes += len(stored) if isinstance(stored, bytes) else len(data)
+        return stored
+
+    def _decompress(self, stored: Union[str, bytes]) -> str:
+        """Text of a stored blob value."""
+        if isinstance(stored, str):
+            return stored
+        started = time.perf_counter()
+        text = zlib.decompress(stored).decode("utf-8")
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats["decompressions"] += 1
+            self._stats["decompress_seconds"] += elapsed
+        return text
+
+    def put(self, text: Optional[str], min_size_bytes: Optional[int] = None) -> Optional[str]:
+        """
+        Store a text and return its reference.
+
+        Small texts, None and existing references are returned unchanged.
+
+        Args:
+            text: Text to store
+            min_size_bytes: Overrides the store's min_size_bytes (0 stores any text)
+
+        Returns:
+            Blob reference (or the original value if not stored)
+
+        Raises:
+            BlobStoreFullError: If a memory-only store's budget is held by owned blobs
+        """
+        if not isinstance(text, str) or is_blob_ref(text):
+            return text
+        min_size_bytes = self.min_size_bytes if min_size_bytes is None else min_size_bytes
+        # A character is at most 4 UTF-8 bytes: no need to encode texts that are surely small
+        if len(text) * 4 < min_size_bytes:
+            return text
+
+        data = text.encode("utf-8")
+        if len(data) < min_size_bytes:
+            return text
+        digest = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            self._stats["puts"] += 1
+            if digest in self._blobs:
+                self._stats["dedup_hits"] += 1
+                self._blobs.move_to_end(digest)
+                return BLOB_REF_PREFIX + digest
+
+        stored = self._compress(data)
+
+        if self.spill_dir:
+            self._spill(digest, stored)
+
+        with self._lock:
+            self._cache(digest, stored, len(stored) if isinstance(stored, bytes) else len(data))
+
+        return BLOB_REF_PREFIX + digest
+
+    def _cache(self, digest: str, stored: Union[str, bytes], size: int):
+        """Add a blob value of size bytes to the LRU (lock held), evicting blobs over budget.
+
+        Spilled blobs are only evicted from memory; memory-only blobs are
+        dropped unless they have an owner.
+
+        Raises:
+            BlobStoreFullError: If a memory-only blob does not fit beside the owned ones
+        """
+        if digest not in self._blobs:
+            self._blobs[digest] = (stored, size)
+            self._memory_bytes += size
+        self._blobs.move_to_end(digest)
+
+        while self._memory_bytes > self.memory_limit_bytes:
+            victim = next(
+                (cached for cached in self._blobs
+                 if cached != digest and (self.spill_dir or cached not in self._owned)),
+                None
+            )
+            if victim is None:
+                break
+            _, evicted_size = self._blobs.pop(victim)
+            self._memory_bytes -= evicted_size
+            self._stats["evictions" if self.spill_dir else "dropped"] += 1
+
+        if not self.spill_dir and self._memory_bytes > self.memory_limit_bytes and len(self._blobs) > 1:
+            if digest not in self._owned:
+                self._memory_bytes -= self._blobs.pop(digest)[1]
+                raise BlobStoreFullError(self.memory_limit_bytes)
+
+    def get(self, ref: str) -> str:
+        """
+        Load the text for a reference.
+
+        Args:
+            ref: Blob reference
+
+        Returns:
+            Stored text
+
+        Raises:
+            KeyError: If the blob is unknown
+        """
+        digest = ref[len(BLOB_REF_PREFIX):]
+
+        with self._lock:
+            cached = self._blobs.get(digest)
+            if cached is not None:
+                self._blobs.move_to_end(digest)
+        if cached is not None:
+            return self._decompress(cached[0])
+
+        if self.spill_dir:
+            for compressed in (True, False):
+                path = self._blob_path(digest, compressed)
+                if not os.path.exists(path):
+                    continue
+                with open(path, "rb") as f:
+                    data = f.read()
+                stored = data if compressed else data.decode("utf-8")
+                with self._lock:
+                    self._stats["disk_reads"] += 1
+                    self._cache(digest, stored, len(data))
+                return self._decompress(stored)
+
+        raise KeyError(f"Blob not found: {ref}")
+
+    def resolve(self, value: Any) -> Any:
+        """Return the text for a reference; any other value is returned unchanged."""
+        if is_blob_ref(value):
+            return self.get(value)
+        return value
+
+    def resolve_fields(self, data: Optional[Dict[str, Any]], fields) -> Optional[Dict[str, Any]]:
+        """Copy of data with the given fields resolved (data itself is not modified)."""
+        if not data:
+            return data
+        return {
+            key: self.resolve(value) if key in fields else value
+            for key, value in data.items()
+        }
+
+    def put_fields(self, data: Optional[Dict[str, Any]], fields) -> Optional[Dict[str, Any]]:
+        """Copy of data with the given text fields replaced by references."""
+        if not data:
+            return data
+        return {
+            key: self.put(value) if key in fields else value
+            for key, value in data.items()
+        }
+
+    @contextmanager
+    def _owners_transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction on the owners database, serialized across processes."""
+        with self._owners_lock:
+            self._owners.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._owners
+            except BaseException:
+                self._owners.execute("ROLLBACK")
+                raise
+            self._owners.execute("COMMIT")
+
+    def acquire(self, owner: str, refs: Iterable[str]):
+        """
+        Record that an owner holds references, keeping their blobs until it is released.
+
+        A blob deleted by another process's release() since it was put is
+        written back from memory.
+
+        Args:
+            owner: Owner ID (an evaluation ID / graph thread ID)
+            refs: Blob references; other values are ignored
+        """
+        digests = {ref[len(BLOB_REF_PREFIX):] for ref in refs if is_blob_ref(ref)}
+        if not digests:
+            return
+
+        with self._owners_transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO blob_owners (digest, owner) VALUES (?, ?)",
+                [(digest, owner) for digest in digests]
+            )
+            if not self.spill_dir:
+                with self._lock:
+                    self._owned.update(digests)
+            else:
+                for digest in digests:
+                    if self._on_disk(digest):
+                        continue
+                    with self._lock:
+                        cached = self._blobs.get(digest)
+                    if cached is not None:
+                        self._spill(digest, cached[0])
+
+    def release(self, owner: str) -> int:
+        """
+        Drop an owner's references, deleting the blobs no other owner holds.
+
+        Args:
+            owner: Owner ID passed to acquire()
+
+        Returns:
+            Number of blobs deleted
+        """
+        with self._owners_transaction() as conn:
+            digests = [row[0] for row in conn.execute(
+                "SELECT digest FROM blob_owners WHERE owner = ?", (owner,)
+            )]
+            if not digests:
+                return 0
+            conn.execute("DELETE FROM blob_owners WHERE owner = ?", (owner,))
+            orphans = [
+                digest for digest in digests
+                if conn.execute("SELECT 1 FROM blob_owners WHERE digest = ? LIMIT 1", (digest,)).fetchone() is None
+            ]
+
+            # Deleted while the transaction holds the owners' write lock, so a
+            # concurrent acquire() sees either the file or its absence
+            for digest in orphans:
+                if self.spill_dir:
+                    for compressed in (True, False):
+                        try:
+                            os.remove(self._blob_path(digest, compressed))
+                        except FileNotFoundError:
+                            pass
+                with self._lock:
+                    self._owned.discard(digest)
+                    cached = self._blobs.pop(digest, None)
+                    if cached is not None:
+                        self._memory_bytes -= cached[1]
+                    self._stats["deleted"] += 1
+        return len(orphans)
+
+    def stats(self) -> Dict[str, Any]:
+        """Blob store statistics, including the compression ratio and CPU time."""
+        with self._lock:
+            return {
+                **self._stats,
+                "blobs_in_memory": len(self._blobs),
+                "bytes_in_memory": self._memory_bytes,
+                "bytes_raw": self._raw_bytes,
+                "bytes_stored": self._stored_bytes,
+                "compression_ratio": round(self._raw_bytes / self._stored_bytes, 2) if self._stored_bytes else None,
+                "spill_enabled": bool(self.spill_dir)
+            }
+
+
+_blob_store: Optional[BlobStore] = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Get the process-wide blob store configured from config.yaml.
+
+    BLOB_STORE_DIR overrides blob_store.spill_dir; set it to an empty string
+    for a memory-only store.
+    """
+    global _blob_store
+    with _blob_store_lock:
+        if _blob_store is None:
+            store_config = config["blob_store"]
+            spill_dir = os.getenv("BLOB_STORE_DIR", store_config.get("spill_dir") or "")
+            if spill_dir and not os.path.isabs(spill_dir):
+                spill_dir = os.path.join(os.path.dirname(config_path), spill_dir)
+
+            compression = store_config.get("compression", {})
+            _blob_store = BlobStore(
+                spill_dir=spill_dir or None,
+                memory_limit_bytes=int(store_config["memory_limit_mb"] * 1024 * 1024),
+                min_size_bytes=store_config["min_size_bytes"],
+                compress_min_bytes=compression.get("min_size_bytes", 4096) if compression.get("enabled", True) else None,
+                compression_level=compression.get("level", 6)
+            )
+        return _blob_store
@@ -0,0 +1,115 @@
+"""
+Cooperative cancellation of evaluation runs.
+
+A CancelToken is made current for the thread that runs the graph (LangGraph
+copies the context into the threads running its nodes). LLM calls made under
+it abort their in-flight HTTP request when the token is cancelled and record
+the tokens they spent, so a cancelled run can report its cost.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class EvaluationCancelled(Exception):
+    """Raised inside a run whose CancelToken was cancelled."""
+
+
+class CancelToken:
+    """Thread-safe cancellation flag with token accounting for one run."""
+
+    def __init__(self):
+        """Initialize an uncancelled token."""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self._usage = {"input": 0, "output": 0, "calls": 0, "estimated": False}
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancel the run and abort in-flight requests."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+
+    def raise_if_cancelled(self):
+        """Raise EvaluationCancelled if the token was cancelled."""
+        if self._event.is_set():
+            raise EvaluationCancelled("Evaluation was cancelled")
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, waking early on cancellation.
+
+        Returns:
+            True if the token was cancelled
+        """
+        return self._event.wait(timeout)
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], None]) -> Iterator[None]:
+        """Call callback (from the cancelling thread) if cancelled within the block."""
+        with self._lock:
+            self._callbacks.append(callback)
+            already_cancelled = self._event.is_set()
+        if already_cancelled:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.remove(callback)
+
+    def record_usage(self, input_tokens: int, output_tokens: int, estimated: bool = False):
+        """Add the tokens spent by one LLM call.
+
+        Args:
+            input_tokens: Prompt tokens
+            output_tokens: Completion tokens
+            estimated: The counts are estimates (the call was aborted before
+                the API reported usage)
+        """
+        with self._lock:
+            self._usage["input"] += input_tokens
+            self._usage["output"] += output_tokens
+            self._usage["calls"] += 1
+            self._usage["estimated"] = self._usage["estimated"] or estimated
+
+    def usage(self) -> Dict[str, int]:
+        """Tokens spent by the LLM calls made under this token."""
+        with self._lock:
+            return {
+                **self._usage,
+                "total": self._usage["input"] + self._usage["output"]
+            }
+
+
+_current_token: ContextVar[Optional[CancelToken]] = ContextVar("cancel_token", default=None)
+
+
+def current_cancel_token() -> Optional[CancelToken]:
+    """The CancelToken of the run executing in this context, if any."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(token: Optional[CancelToken]) -> Iterator[None]:
+    """Make token current for the code (and graph nodes) run within the block."""
+    reset = _current_token.set(token)
+    try:
+        yield
+    finally:
+        _current_token.reset(reset)
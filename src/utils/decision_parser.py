@@ -0,0 +1,92 @@
+"""
+Extract the decision label and overall score from decision agent output.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+
+# Checked in order - "DO NOT RECOMMEND" and "STRONG RECOMMEND" both contain "RECOMMEND"
+DECISION_LABELS = ["STRONG RECOMMEND", "DO NOT RECOMMEND", "BORDERLINE", "RECOMMEND"]
+
+# A "Final Recommendation:" / "Final Decision:" header, after any markdown markers
+_HEADER_PATTERN = re.compile(r"^[\s#*>-]*Final\s+(?:Recommendation|Decision)[\s*]*:", re.IGNORECASE)
+_SCORE_PATTERN = re.compile(r"Overall Score[^0-9\n]*([0-9]+(?:\.[0-9]+)?)", re.IGNORECASE)
+_CALIBRATED_HEADING = re.compile(r"^#+\s*Calibrated Scores", re.IGNORECASE)
+_SCORE_CELL = re.compile(r"^([0-9]+(?:\.[0-9]+)?)\s*/\s*[0-9]+(?:\.[0-9]+)?$")
+
+
+def _find_label(text: str) -> Optional[str]:
+    upper = text.upper()
+    for label in DECISION_LABELS:
+        if label in upper:
+            return label
+    return None
+
+
+def parse_decision(decision_text: Optional[str]) -> Dict[str, Any]:
+    """
+    Parse the final recommendation and overall score from decision text.
+
+    The "Final Recommendation:" (or "Final Decision:") header line is checked
+    first, falling back to the first label found anywhere in the text.
+
+    Args:
+        decision_text: Full decision agent output
+
+    Returns:
+        Dict with "decision" (label or "UNKNOWN") and "overall_score" (float or None)
+    """
+    if not decision_text:
+        return {"decision": "UNKNOWN", "overall_score": None}
+
+    label = None
+    for line in decision_text.split("\n"):
+        if _HEADER_PATTERN.match(line):
+            label = _find_label(line)
+            if label:
+                break
+
+    if label is None:
+        label = _find_label(decision_text)
+
+    score = None
+    match = _SCORE_PATTERN.search(decision_text)
+    if match:
+        score = float(match.group(1))
+
+    return {"decision": label or "UNKNOWN", "overall_score": score}
+
+
+def parse_criterion_scores(decision_text: Optional[str]) -> Dict[str, float]:
+    """
+    Parse the calibrated score of each criterion from decision text.
+
+    Reads the table under the "Calibrated Scores" heading, taking the last
+    "X/max" cell of each row (the calibrated score); the Overall row is left
+    out.
+
+    Args:
+        decision_text: Full decision agent output
+
+    Returns:
+        Dict of criterion name to calibrated score (empty without the table)
+    """
+    scores: Dict[str, float] = {}
+    in_section = in_table = False
+    for line in (decision_text or "").split("\n"):
+        line = line.strip()
+        if not in_section:
+            in_section = bool(_CALIBRATED_HEADING.match(line))
+            continue
+        if not line.startswith("|"):
+            if in_table or line.startswith("#"):
+                break
+            continue
+        in_table = True
+
+        cells = [cell.strip().strip("*").strip() for cell in line.strip("|").split("|")]
+        values = [match.group(1) for match in map(_SCORE_CELL.match, cells[1:]) if match]
+        if values and cells[0] and cells[0].lower() != "overall":
+            scores[cells[0]] = float(values[-1])
+    return scores
@@ -0,0 +1,91 @@
+"""
+Split transcripts into overlapping chunks and rubrics into criteria.
+"""
+
+import re
+from typing import List, Tuple
+
+
+_HEADING = re.compile(r"^#{1,4}\s+(.+?)\s*#*\s*$")
+_BOLD_BULLET = re.compile(r"^[-*]\s+\*\*(.+?)\*\*")
+
+
+def split_transcript(transcript: str, max_chars: int, overlap_chars: int = 0) -> List[str]:
+    """
+    Split a transcript into chunks of at most max_chars at line boundaries.
+
+    Each chunk after the first repeats up to overlap_chars of trailing lines
+    from the previous chunk so answers split across a boundary keep their
+    question. A single line longer than max_chars becomes its own chunk.
+
+    Args:
+        transcript: Full transcript text
+        max_chars: Maximum characters per chunk
+        overlap_chars: Characters of context carried into the next chunk
+
+    Returns:
+        List of chunk texts (the whole transcript if it already fits)
+    """
+    if len(transcript) <= max_chars:
+        return [transcript]
+
+    chunks = []
+    current: List[str] = []
+    current_len = 0
+
+    for line in transcript.splitlines(keepends=True):
+        if current and current_len + len(line) > max_chars:
+            chunks.append("".join(current))
+
+            # Carry trailing lines into the next chunk as overlap
+            overlap: List[str] = []
+            overlap_len = 0
+            for previous in reversed(current):
+                if overlap_len + len(previous) > overlap_chars:
+                    break
+                overlap.insert(0, previous)
+                overlap_len += len(previous)
+
+            current, current_len = overlap, overlap_len
+
+        current.append(line)
+        current_len += len(line)
+
+    if current:
+        chunks.append("".join(current))
+
+    return chunks
+
+
+def split_rubric_criteria(rubric: str) -> List[Tuple[str, str]]:
+    """
+    Split a natural language rubric into individual criteria.
+
+    Markdown headings delimit criteria; if there are fewer than two, top-level
+    bullets starting with a bold label ("- **Execution**: ...") are used.
+    Text before the first criterion (instructions, level context) is kept
+    with every criterion.
+
+    Args:
+        rubric: Rubric text
+
+    Returns:
+        List of (label, criterion text) pairs; a single ("Full rubric", rubric)
+        pair when no structure is found
+    """
+    for pattern in (_HEADING, _BOLD_BULLET):
+        lines = rubric.splitlines()
+        starts = [(i, pattern.match(line).group(1)) for i, line in enumerate(lines) if pattern.match(line)]
+        if len(starts) < 2:
+            continue
+
+        preamble = "\n".join(lines[:starts[0][0]]).strip()
+        criteria = []
+        for position, (line_index, label) in enumerate(starts):
+            end = starts[position + 1][0] if position + 1 < len(starts) else len(lines)
+            body = "\n".join(lines[line_index:end]).strip()
+            text = f"{preamble}\n\n{body}" if preamble else body
+            criteria.append((label.strip(" :*"), text))
+        return criteria
+
+    return [("Full rubric", rubric)]
@@ -0,0 +1,31 @@
+"""
+Observation of output tokens as LLM responses stream in.
+
+A listener made current for a run (LangGraph copies the context into the
+threads running its nodes) makes LLM calls stream their completions and report
+each output token as it arrives, so progress can follow long agent calls.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+
+TokenListener = Callable[[int], None]
+
+_current_listener: ContextVar[Optional[TokenListener]] = ContextVar("token_listener", default=None)
+
+
+def current_token_listener() -> Optional[TokenListener]:
+    """The output-token listener of the run executing in this context, if any."""
+    return _current_listener.get()
+
+
+@contextmanager
+def token_listener_scope(listener: Optional[TokenListener]) -> Iterator[None]:
+    """Report output tokens streamed within the block to listener (called from node threads)."""
+    reset = _current_listener.set(listener)
+    try:
+        yield
+    finally:
+        _current_listener.reset(reset)
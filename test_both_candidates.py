@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.graph.graph import evaluation_graph
 from src.graph.state import create_initial_state
+from src.utils.decision_parser import parse_decision
 
 # Load rubric (same for both)
 with open('sample_data/sample_rubric.txt', 'r', encoding='utf-8') as f:
@@ -89,25 +90,14 @@ def run_evaluation(candidate_name, transcript_file, expected_outcome):
         f.write(decision)
 
     # Parse decision
-    actual_decision = "UNKNOWN"
-    overall_score = "UNKNOWN"
+    parsed = parse_decision(decision)
+    actual_decision = parsed["decision"]
+    overall_score = parsed["overall_score"] if parsed["overall_score"] is not None else "UNKNOWN"
     critical_passed = "UNKNOWN"
 
-    if 'Final Recommendation:' in decision:
-        for line in decision.split('\n'):
-            if 'Final Recommendation:' in line:
-                if 'STRONG RECOMMEND' in line:
-                    actual_decision = 'STRONG RECOMMEND'
-                elif 'DO NOT RECOMMEND' in line:
-                    actual_decision = 'DO NOT RECOMMEND'
-                elif 'BORDERLINE' in line:
-                    actual_decision = 'BORDERLINE'
-                elif 'RECOMMEND' in line:
-                    actual_decision = 'RECOMMEND'
-            elif 'Overall Score:' in line:
-                overall_score = line.split('Overall Score:')[1].strip().split()[0]
-            elif 'Critical Criteria:' in line:
-                critical_passed = line.split('Critical Criteria:')[1].strip()
+    for line in decision.split('\n'):
+        if 'Critical Criteria:' in line:
+            critical_passed = line.split('Critical Criteria:')[1].strip()
 
     # Print summary
     print("\n" + "-"*80)
@@ -0,0 +1,142 @@
+"""
+Analytics rollup tests (criterion parsing, facts, idempotent recording, grouping).
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.analytics import AnalyticsRollups, evaluation_facts
+from src.utils.blob_store import get_blob_store
+from src.utils.decision_parser import parse_criterion_scores
+
+
+def decision_text(label, overall, product, execution):
+    return f"""## Final Recommendation: {label}
+
+## Calibrated Scores
+
+| Criterion | Primary Score | Calibrated Score | Rationale |
+|-----------|---------------|------------------|-----------|
+| Product Strategy | 4/5 | {product}/5 | Strong vision |
+| **Execution** | 3/5 | **{execution}/5** | Shipped twice |
+| Overall | 3.5/5 | {overall}/5 | |
+
+## Overall Score: {overall}/5
+"""
+
+
+PROMPTS = {
+    "primary_agent": {"version": "3"},
+    "decision_agent": {"version": "4"},
+    "challenge_agent": {"version": "3"}
+}
+
+
+def evaluation(evaluation_id, completed_at, level, label, overall, product, execution, prompts=PROMPTS):
+    return {
+        "evaluation_id": evaluation_id,
+        "status": "completed",
+        "created_at": completed_at,
+        "completed_at": completed_at,
+        "input": {"candidate_info": {"name": "Jane Doe", "target_level": level}},
+        "result": {
+            # Stored results reference their texts in the blob store
+            "decision": get_blob_store().put(decision_text(label, overall, product, execution)),
+            "metadata": {
+                "prompt_versions": prompts,
+                "total_cost_usd": 0.12,
+                "execution_time_seconds": 90.0,
+                "tokens": {
+                    "total_input": 3000, "total_output": 900,
+                    "primary_input": 1000, "primary_output": 400,
+                    "challenge_input": 1000, "challenge_output": 200,
+                    "decision_input": 1000, "decision_output": 300
+                },
+                "timestamps": {
+                    "start": f"{completed_at[:10]}T10:00:00",
+                    "primary": f"{completed_at[:10]}T10:00:40",
+                    "challenge": f"{completed_at[:10]}T10:01:00",
+                    "decision": f"{completed_at[:10]}T10:01:30"
+                }
+            }
+        }
+    }
+
+
+EVALUATIONS = [
+    evaluation("e1", "2026-01-01T10:01:30", "L6", "RECOMMEND", 4.0, 4, 4),
+    evaluation("e2", "2026-01-01T12:01:30", "L6", "DO NOT RECOMMEND", 2.0, 2, 2),
+    evaluation("e3", "2026-01-02T10:01:30", "L5", "RECOMMEND", 3.5, 4, 3, prompts=None),
+]
+
+
+@pytest.fixture
+def rollups():
+    rollups = AnalyticsRollups(":memory:")
+    for data in EVALUATIONS:
+        assert rollups.record(evaluation_facts(data))
+    yield rollups
+    rollups.close()
+
+
+def test_parse_criterion_scores():
+    assert parse_criterion_scores(decision_text("RECOMMEND", 3.5, 4, 3.5)) == {
+        "Product Strategy": 4.0, "Execution": 3.5
+    }
+    assert parse_criterion_scores("Final Recommendation: RECOMMEND\nOverall Score: 4/5") == {}
+    assert parse_criterion_scores(None) == {}
+
+
+def test_evaluation_facts():
+    facts = evaluation_facts(EVALUATIONS[0])
+    assert facts["bucket"] == ("2026-01-01", "challenge_agent:3,decision_agent:4,primary_agent:3", "L6")
+    assert (facts["decision"], facts["overall_score"]) == ("RECOMMEND", 4.0)
+    assert facts["criteria"] == {"Product Strategy": 4.0, "Execution": 4.0}
+    assert facts["agents"]["primary_evaluator"] == {"seconds": 40.0, "input_tokens": 1000, "output_tokens": 400}
+    assert facts["agents"]["decision_agent"]["seconds"] == 30.0
+
+    assert evaluation_facts(EVALUATIONS[2])["bucket"][1] == "unspecified"
+    assert evaluation_facts({**EVALUATIONS[0], "status": "failed"}) is None
+
+
+def test_evaluations_are_recorded_once(rollups):
+    assert not rollups.record(evaluation_facts(EVALUATIONS[0]))
+    assert [bucket["evaluations"] for bucket in rollups.cost()] == [2, 1]
+
+    rollups.clear()
+    assert rollups.cost() == []
+    assert rollups.record(evaluation_facts(EVALUATIONS[0]))
+
+
+def test_decisions_and_scores_by_day(rollups):
+    first, second = rollups.decisions()
+    assert first == {
+        "key": "2026-01-01", "evaluations": 2, "average_score": 3.0,
+        "decisions": {"DO NOT RECOMMEND": 1, "RECOMMEND": 1}
+    }
+    assert second["key"] == "2026-01-02" and second["decisions"] == {"RECOMMEND": 1}
+
+    scores = rollups.scores(group_by="target_level")
+    assert [bucket["key"] for bucket in scores] == ["L5", "L6"]
+    assert scores[1]["criteria"]["Execution"] == {"average_score": 3.0, "scored": 2}
+
+
+def test_cost_and_latency_with_filters(rollups):
+    (cost,) = rollups.cost(group_by="prompt_version", day_from="2026-01-01", day_to="2026-01-01")
+    assert cost["evaluations"] == 2
+    assert (cost["cost_usd"], cost["cost_per_evaluation_usd"], cost["tokens_per_evaluation"]) == (0.24, 0.12, 3900)
+
+    (latency,) = rollups.latency(group_by="target_level", prompt_version="unspecified")
+    assert (latency["key"], latency["average_seconds"]) == ("L5", 90.0)
+    assert latency["agents"]["challenge_agent"] == {
+        "runs": 1, "average_seconds": 20.0, "average_input_tokens": 1000, "average_output_tokens": 200
+    }
+
+    with pytest.raises(ValueError):
+        rollups.cost(group_by="candidate")
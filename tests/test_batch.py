@@ -0,0 +1,126 @@
+"""
+Batch runner tests (LLM calls are faked).
+"""
+
+import json
+import os
+import sys
+
+import httpx
+from openai import RateLimitError
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.graph import nodes
+from src.graph.graph import create_evaluation_graph
+from src.graph.checkpoint import create_checkpointer
+from src.batch.runner import BatchRunner, RateLimitGate, is_rate_limit_error, load_manifest
+from src.utils.decision_parser import parse_decision
+
+
+def rate_limited_call_error():
+    """A 429 from the API, wrapped like call_anthropic_claude does after its retries."""
+    response = httpx.Response(429, request=httpx.Request("POST", "https://example.openai.azure.com"))
+    try:
+        raise RateLimitError("Too many requests", response=response, body=None)
+    except RateLimitError as e:
+        try:
+            raise Exception(f"Azure OpenAI API call failed after 3 attempts: {e}") from e
+        except Exception as wrapped:
+            return wrapped
+
+
+def write_manifest(tmp_path, count):
+    """Write a JSONL manifest with transcripts in separate files."""
+    (tmp_path / "transcript.txt").write_text("Interviewer: Tell me about a launch.\nCandidate: I led it.")
+    with open(tmp_path / "manifest.jsonl", "w") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "id": f"cand-{i}",
+                "candidate_info": {"name": f"Candidate {i}"},
+                "rubric": f"Rubric for candidate {i}",
+                "transcript_file": "transcript.txt"
+            }) + "\n")
+    return str(tmp_path / "manifest.jsonl")
+
+
+def test_batch_run_resume_and_rate_limits(monkeypatch, tmp_path):
+    """Entries run concurrently, rate limits are retried and reruns skip finished work."""
+    calls = []
+    rate_limited = {"done": False}
+
+    def fake_call(model_name, system_prompt, user_message, max_tokens, temperature=0.0, **kwargs):
+        calls.append(user_message)
+        if "Rubric for candidate 1" in user_message and not rate_limited["done"]:
+            rate_limited["done"] = True
+            raise rate_limited_call_error()
+        return "**Final Recommendation:** RECOMMEND\nOverall Score: 3.5", 100, 10
+
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_call)
+
+    entries = load_manifest(write_manifest(tmp_path, 3))
+    assert entries[0]["transcript"].startswith("Interviewer:")
+
+    runner = BatchRunner(
+        graph=create_evaluation_graph(checkpointer=create_checkpointer(":memory:")),
+        concurrency=2,
+        max_attempts=3,
+        rate_limit_gate=RateLimitGate(base_delay=0.01)
+    )
+    output = str(tmp_path / "results.jsonl")
+    summary = runner.run(entries, output)
+
+    assert summary["completed"] == 3
+    assert summary["failed"] == 0
+    assert summary["rate_limit_pauses"] == 1
+    assert summary["decisions"] == {"RECOMMEND": 3}
+
+    with open(output) as f:
+        records = [json.loads(line) for line in f]
+    assert sorted(r["id"] for r in records) == ["cand-0", "cand-1", "cand-2"]
+    assert records[0]["overall_score"] == 3.5
+
+    # Re-running the same batch does no new work
+    calls_before = len(calls)
+    summary = runner.run(entries, output)
+    assert summary["skipped"] == 3
+    assert len(calls) == calls_before
+
+
+def test_rate_limits_are_recognized_by_status_not_message():
+    assert is_rate_limit_error(rate_limited_call_error())
+    # Request IDs and token counts can contain "429"
+    assert not is_rate_limit_error(Exception("Request req_4291 failed after 1429 tokens"))
+    assert not is_rate_limit_error(None)
+
+
+def test_entries_that_raise_are_recorded_as_failed(tmp_path):
+    runner = BatchRunner(graph=create_evaluation_graph(checkpointer=create_checkpointer(":memory:")),
+                         concurrency=2, prompt_versions={})
+
+    def broken_entry(entry):
+        raise RuntimeError(f"unreadable checkpoint for {entry['id']}")
+
+    runner._run_entry = broken_entry
+    output = str(tmp_path / "results.jsonl")
+    summary = runner.run(load_manifest(write_manifest(tmp_path, 2)), output)
+
+    assert (summary["completed"], summary["failed"]) == (0, 2)
+    with open(output) as f:
+        records = sorted((json.loads(line) for line in f), key=lambda record: record["id"])
+    assert [record["error"] for record in records] == [
+        "unreadable checkpoint for cand-0", "unreadable checkpoint for cand-1"
+    ]
+
+
+def test_decision_is_read_from_the_recommendation_header():
+    text = (
+        "## Challenge Responses\n"
+        "**Decision:** REVISE - the primary RECOMMEND was too generous\n"
+        "## Final Recommendation: BORDERLINE\n"
+        "Overall Score: 3.0"
+    )
+    assert parse_decision(text) == {"decision": "BORDERLINE", "overall_score": 3.0}
+    assert parse_decision("**Final Recommendation:** DO NOT RECOMMEND")["decision"] == "DO NOT RECOMMEND"
+    assert parse_decision("No header, but STRONG RECOMMEND overall")["decision"] == "STRONG RECOMMEND"
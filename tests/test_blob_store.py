@@ -0,0 +1,153 @@
+"""
+Content-addressed blob store tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.blob_store import BlobStore, BlobStoreFullError, is_blob_ref
+
+
+def test_put_deduplicates_and_skips_small_texts():
+    """Identical texts share one reference; small texts stay inline."""
+    store = BlobStore(min_size_bytes=10)
+
+    ref = store.put("transcript " * 10)
+    assert is_blob_ref(ref)
+    assert store.put("transcript " * 10) == ref
+    assert store.get(ref) == "transcript " * 10
+    assert store.stats()["blobs_in_memory"] == 1
+    assert store.stats()["dedup_hits"] == 1
+
+    assert store.put("short") == "short"
+    assert store.put(None) is None
+    assert store.put(ref) == ref
+    assert store.resolve("short") == "short"
+
+
+def test_spill_evicts_to_disk_and_reloads(tmp_path):
+    """Over the memory budget, old blobs are evicted and read back from disk."""
+    store = BlobStore(spill_dir=str(tmp_path), memory_limit_bytes=250, min_size_bytes=10)
+
+    refs = [store.put(str(i) * 100) for i in range(5)]
+    assert store.stats()["bytes_in_memory"] <= 250
+    assert store.stats()["evictions"] >= 3
+
+    assert store.get(refs[0]) == "0" * 100
+    assert store.stats()["disk_reads"] == 1
+
+    # References survive a restart when spilled to disk
+    restarted = BlobStore(spill_dir=str(tmp_path), min_size_bytes=10)
+    assert restarted.get(refs[4]) == "4" * 100
+
+    with pytest.raises(KeyError):
+        BlobStore().get(refs[0])
+
+
+def test_resolve_fields_returns_copy():
+    """Resolving fields does not modify the stored record."""
+    store = BlobStore(min_size_bytes=10)
+    record = store.put_fields({"decision": "RECOMMEND " * 5, "metadata": {}}, ["decision"])
+
+    assert is_blob_ref(record["decision"])
+    resolved = store.resolve_fields(record, ["decision"])
+    assert resolved["decision"] == "RECOMMEND " * 5
+    assert is_blob_ref(record["decision"])
+
+
+def test_large_texts_are_compressed_in_memory_and_on_disk(tmp_path):
+    """Compressed blobs read back unchanged, also after a restart."""
+    store = BlobStore(spill_dir=str(tmp_path), min_size_bytes=10, compress_min_bytes=1000)
+    transcript = "Interviewer: Tell me about yourself.\nCandidate: I build data pipelines.\n" * 100
+
+    ref = store.put(transcript)
+    small_ref = store.put("answer " * 20)
+    stats = store.stats()
+    assert stats["compressed_blobs"] == 1
+    assert stats["bytes_in_memory"] < len(transcript) // 10
+    assert stats["compression_ratio"] > 5
+    assert store.get(ref) == transcript
+    assert store.stats()["decompressions"] == 1
+
+    digest = ref.split(":")[-1]
+    assert os.path.exists(tmp_path / digest[:2] / f"{digest}.z")
+    restarted = BlobStore(spill_dir=str(tmp_path), min_size_bytes=10)
+    assert restarted.get(ref) == transcript
+    assert restarted.get(small_ref) == "answer " * 20
+
+
+def test_release_deletes_blobs_no_other_owner_holds(tmp_path):
+    """Blobs live until the last evaluation referencing them is released."""
+    store = BlobStore(spill_dir=str(tmp_path), min_size_bytes=10)
+    rubric, transcript = store.put("rubric " * 10), store.put("transcript " * 10)
+    store.acquire("e1", [rubric, transcript, "inline text"])
+    store.acquire("e2", [rubric])
+
+    assert store.release("e1") == 1
+    with pytest.raises(KeyError):
+        store.get(transcript)
+    assert not os.listdir(tmp_path / transcript.split(":")[-1][:2])
+    assert store.get(rubric) == "rubric " * 10
+
+    assert store.release("e2") == 1
+    assert store.release("e2") == 0
+    assert store.stats()["deleted"] == 2 and store.stats()["bytes_in_memory"] == 0
+    with pytest.raises(KeyError):
+        BlobStore(spill_dir=str(tmp_path)).get(rubric)
+
+
+def test_acquire_restores_a_blob_another_process_deleted(tmp_path):
+    """A process still caching a text writes it back when a new owner acquires it."""
+    api, worker = (BlobStore(spill_dir=str(tmp_path), min_size_bytes=10) for _ in range(2))
+    ref = api.put("decision " * 10)
+    api.acquire("e1", [ref])
+    assert worker.put("decision " * 10) == ref
+
+    api.release("e1")
+    worker.acquire("e2", [ref])
+    assert BlobStore(spill_dir=str(tmp_path)).get(ref) == "decision " * 10
+
+
+def test_memory_budget_counts_utf8_bytes_and_caps_memory_only_stores():
+    """Without a spill directory, blobs over the budget are dropped."""
+    store = BlobStore(memory_limit_bytes=200, min_size_bytes=10, compress_min_bytes=None)
+    refs = [store.put(str(i) + "é" * 40) for i in range(3)]
+
+    # 81 UTF-8 bytes each, although only 41 characters
+    assert store.stats()["bytes_in_memory"] == 162
+    assert store.stats()["dropped"] == 1
+    with pytest.raises(KeyError):
+        store.get(refs[0])
+    assert store.get(refs[2]) == "2" + "é" * 40
+
+    # Sizes are compared in bytes: 6 characters, 12 bytes
+    assert is_blob_ref(store.put("éééééé"))
+
+
+def test_memory_only_stores_never_drop_owned_blobs():
+    """Owned blobs stay readable; a put that only fits by dropping them fails."""
+    store = BlobStore(memory_limit_bytes=200, min_size_bytes=10, compress_min_bytes=None)
+    owned = store.put("a" * 90)
+    store.acquire("e1", [owned])
+    unowned = store.put("b" * 90)
+
+    # The unowned blob is dropped, although the owned one is older
+    store.put("c" * 90)
+    assert store.get(owned) == "a" * 90
+    with pytest.raises(KeyError):
+        store.get(unowned)
+
+    store.acquire("e2", [store.put("d" * 90)])
+    with pytest.raises(BlobStoreFullError):
+        store.put("e" * 90)
+    assert store.get(owned) == "a" * 90
+    assert store.stats()["bytes_in_memory"] == 180
+
+    # Released blobs can be dropped again
+    store.release("e1")
+    assert is_blob_ref(store.put("e" * 90))
@@ -0,0 +1,95 @@
+"""
+Cancellation tests (the LLM client is faked at the HTTP stream level).
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import azure_client
+from src.utils.cancellation import CancelToken, EvaluationCancelled, cancellation_scope
+
+
+class FakeStream:
+    """Streams one token per delay seconds; close() drops the connection."""
+
+    def __init__(self, chunks, delay):
+        self.chunks = chunks
+        self.delay = delay
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        for _ in range(self.chunks):
+            if self.closed.wait(self.delay):
+                raise ConnectionError("connection closed")
+            yield SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content="x"))])
+        yield SimpleNamespace(usage=SimpleNamespace(prompt_tokens=100, completion_tokens=self.chunks), choices=[])
+
+    def close(self):
+        self.closed.set()
+
+
+@pytest.fixture
+def fake_stream(monkeypatch):
+    streams = []
+
+    def create(**params):
+        assert params["stream"]
+        streams.append(FakeStream(5, 0.02))
+        return streams[-1]
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(azure_client, "get_azure_openai_client", lambda: client)
+    return streams
+
+
+def call():
+    return azure_client.call_anthropic_claude("model", "s" * 40, "u" * 360, max_tokens=100)
+
+
+def test_call_under_token_records_usage(fake_stream):
+    token = CancelToken()
+    with cancellation_scope(token):
+        text, input_tokens, output_tokens = call()
+
+    assert (text, input_tokens, output_tokens) == ("xxxxx", 100, 5)
+    assert token.usage() == {"input": 100, "output": 5, "calls": 1, "estimated": False, "total": 105}
+
+
+def test_cancel_aborts_in_flight_request(fake_stream, monkeypatch):
+    def create(**params):
+        fake_stream.append(FakeStream(1000, 0.02))
+        return fake_stream[-1]
+
+    monkeypatch.setattr(azure_client, "get_azure_openai_client", lambda: SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    started = time.time()
+    with cancellation_scope(token), pytest.raises(EvaluationCancelled):
+        call()
+
+    # Aborted well before the 20s stream would have finished, without retries
+    assert time.time() - started < 2
+    assert len(fake_stream) == 1 and fake_stream[0].closed.is_set()
+
+    usage = token.usage()
+    assert usage["estimated"] and usage["calls"] == 1
+    assert usage["input"] == 100  # 400 prompt characters / 4
+    assert 0 < usage["output"] < 1000
+
+
+def test_cancelled_token_makes_no_call(fake_stream):
+    token = CancelToken()
+    token.cancel()
+    with cancellation_scope(token), pytest.raises(EvaluationCancelled):
+        call()
+    assert fake_stream == []
@@ -0,0 +1,156 @@
+"""
+Submission deduplication tests (fingerprint, storage indexes, submissions).
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.api.routes import evaluations as evaluation_routes
+from app.models.requests import CreateEvaluationRequest
+from app.services import evaluation_service as evaluation_service_module
+from app.services.evaluation_service import EvaluationService, IdempotencyKeyConflict, submission_fingerprint
+from app.services.job_queue import JobQueue
+from app.services.storage_service import StorageService
+from src.utils.blob_store import BlobStore
+
+
+def make_request(**overrides):
+    fields = {
+        "candidate_info": {"name": "Ada Lovelace", "target_level": "L6"},
+        "rubric": "Evaluate system design depth and communication. " * 2,
+        "transcript": "Interviewer: Walk me through a design. Candidate: I would start with... " * 3
+    }
+    fields.update(overrides)
+    return CreateEvaluationRequest(**fields)
+
+
+def test_fingerprint_covers_inputs_prompts_and_pipeline():
+    versions = {"primary_evaluator": "v1"}
+    fingerprint = submission_fingerprint(make_request(), versions)
+
+    assert fingerprint == submission_fingerprint(make_request(), dict(versions))
+    # Scheduling fields don't change what is evaluated
+    assert fingerprint == submission_fingerprint(make_request(priority="batch", tenant="t"), versions)
+
+    assert fingerprint != submission_fingerprint(make_request(transcript="Other transcript " * 10), versions)
+    assert fingerprint != submission_fingerprint(make_request(rubric="Other rubric text " * 5), versions)
+    assert fingerprint != submission_fingerprint(make_request(), {"primary_evaluator": "v2"})
+
+
+def test_storage_indexes_follow_saves_and_deletes():
+    async def run():
+        storage = StorageService()
+        await storage.save("e1", {"status": "pending", "fingerprint": "f", "idempotency_key": "t:k"})
+        assert (await storage.find_by_fingerprint("f"))["status"] == "pending"
+        assert await storage.find_by_idempotency_key("t:k") is not None
+
+        # The latest submission owns the fingerprint
+        await storage.save("e2", {"status": "pending", "fingerprint": "f"})
+        await storage.delete("e1")
+        assert await storage.find_by_idempotency_key("t:k") is None
+        assert (await storage.find_by_fingerprint("f")) is await storage.get("e2")
+
+        await storage.delete("e2")
+        assert await storage.find_by_fingerprint("f") is None
+
+    asyncio.run(run())
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Evaluation service over fresh in-memory storage, blob store and queue."""
+    pins = {"primary_agent": {"version": "1", "sha256": "0" * 64}}
+    monkeypatch.setattr(evaluation_service_module, "pin_prompt_versions", lambda: pins)
+    service = EvaluationService()
+    service.storage = StorageService()
+    service.blob_store = BlobStore()
+    service.job_queue = JobQueue(workers=1)
+    return service
+
+
+def test_resubmission_attaches_while_in_flight(service):
+    async def run():
+        first = await service.create_evaluation(make_request())
+        again = await service.create_evaluation(make_request())
+        assert (again.evaluation_id, again.deduplicated) == (first.evaluation_id, True)
+
+        await service.storage.update(first.evaluation_id, {"status": "processing"})
+        assert (await service.create_evaluation(make_request())).evaluation_id == first.evaluation_id
+
+        # force=true always starts a new evaluation
+        forced = await service.create_evaluation(make_request(), force=True)
+        assert forced.evaluation_id != first.evaluation_id and not forced.deduplicated
+        return service.job_queue.stats()["submitted"]
+
+    assert asyncio.run(run()) == 2
+
+
+def test_resubmission_attaches_within_the_completed_window(service):
+    async def run():
+        first = await service.create_evaluation(make_request())
+        await service.storage.update(first.evaluation_id, {
+            "status": "completed", "completed_at": datetime.now().isoformat()
+        })
+        assert (await service.create_evaluation(make_request())).deduplicated
+
+        await service.storage.update(first.evaluation_id, {
+            "completed_at": (datetime.now() - timedelta(days=1)).isoformat()
+        })
+        later = await service.create_evaluation(make_request())
+        assert later.evaluation_id != first.evaluation_id and not later.deduplicated
+
+    asyncio.run(run())
+
+
+def test_deduplication_is_scoped_by_tenant_and_priority(service):
+    async def run():
+        first = await service.create_evaluation(make_request(tenant="a"))
+        other_tenant = await service.create_evaluation(make_request(tenant="b"))
+        other_priority = await service.create_evaluation(make_request(tenant="a", priority="batch"))
+
+        ids = {first.evaluation_id, other_tenant.evaluation_id, other_priority.evaluation_id}
+        assert len(ids) == 3
+        assert not other_tenant.deduplicated and not other_priority.deduplicated
+        assert (await service.create_evaluation(make_request(tenant="b"))).evaluation_id == other_tenant.evaluation_id
+
+    asyncio.run(run())
+
+
+def test_idempotency_key_reuse_for_other_inputs_is_rejected(service, monkeypatch):
+    service.blob_store = BlobStore(min_size_bytes=0)
+
+    async def run():
+        first = await service.create_evaluation(make_request(), idempotency_key="k1")
+        again = await service.create_evaluation(make_request(), idempotency_key="k1", force=True)
+        assert (again.evaluation_id, again.deduplicated) == (first.evaluation_id, True)
+
+        with pytest.raises(IdempotencyKeyConflict):
+            await service.create_evaluation(make_request(transcript="Other transcript " * 10), idempotency_key="k1")
+
+    asyncio.run(run())
+    # Attached and rejected submissions store no texts of their own
+    assert service.blob_store.stats()["blobs_in_memory"] == 2
+
+    # The API answers a conflicting key with 422
+    monkeypatch.setattr(evaluation_routes, "evaluation_service", service)
+    app = FastAPI()
+    app.include_router(evaluation_routes.router)
+    client = TestClient(app)
+
+    body = make_request(rubric="Another rubric for the API. " * 3).model_dump()
+    assert client.post("/evaluations/", json=body, headers={"Idempotency-Key": "k2"}).status_code == 202
+    assert client.post("/evaluations/", json=body, headers={"Idempotency-Key": "k2"}).status_code == 200
+    conflict = client.post("/evaluations/", json={**body, "transcript": "Changed transcript " * 10},
+                           headers={"Idempotency-Key": "k2"})
+    assert conflict.status_code == 422
+    assert "different submission" in conflict.json()["detail"]
@@ -0,0 +1,175 @@
+"""
+Prompt experiment tests (LLM calls are faked).
+"""
+
+import os
+import sys
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.graph import nodes
+from src.graph.graph import create_evaluation_graph, create_lite_graph
+from src.graph.checkpoint import create_checkpointer, thread_config
+from src.graph.state import create_initial_state
+from src.prompts.manager import PromptManager
+from src.batch.runner import RateLimitGate
+from src.experiments.runner import ExperimentRunner, format_report, load_checkpointed_entries
+
+
+def make_manager(tmp_path):
+    """Prompt manager with a second decision prompt that rejects everyone."""
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    for prompt_type in ("primary_agent", "challenge_agent", "decision_agent"):
+        (prompts_dir / f"{prompt_type}_v1.txt").write_text(f"{prompt_type} v1")
+    pm = PromptManager(prompts_dir=str(prompts_dir))
+    pm.save_new_version("decision_agent", "strict decision prompt", "stricter")
+    return pm
+
+
+def rate_limit_error():
+    response = httpx.Response(429, request=httpx.Request("POST", "https://example.openai.azure.com"))
+    return RateLimitError("Too many requests", response=response, body=None)
+
+
+def fake_llm(calls):
+    def fake_call(model_name, system_prompt, user_message, max_tokens, temperature=0.0, **kwargs):
+        calls.append(system_prompt)
+        if system_prompt == "strict decision prompt":
+            return "**Final Recommendation:** DO NOT RECOMMEND\nOverall Score: 2.0", 100, 20
+        return "**Final Recommendation:** RECOMMEND\nOverall Score: 3.5", 100, 10
+    return fake_call
+
+
+def test_experiment_reuses_stored_upstream_stages(monkeypatch, tmp_path):
+    """Only the varied agent runs for stored evaluations; the stored baseline is reused."""
+    pm = make_manager(tmp_path)
+    monkeypatch.setattr(nodes, "prompt_manager", pm)
+    calls = []
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_llm(calls))
+
+    # Store two evaluations made with the active prompts
+    db_path = str(tmp_path / "checkpoints.sqlite")
+    graph = create_evaluation_graph(checkpointer=create_checkpointer(db_path))
+    for i in range(2):
+        state = create_initial_state(f"rubric {i}", "transcript", {"name": f"Candidate {i}"},
+                                     prompt_versions=nodes.pin_prompt_versions())
+        graph.invoke(state, thread_config(f"eval-{i}"))
+    calls.clear()
+
+    entries = load_checkpointed_entries(db_path)
+    assert sorted(entry["id"] for entry in entries) == ["eval-0", "eval-1"]
+
+    runner = ExperimentRunner("decision_agent", version_b="2", concurrency=4,
+                              rate_limit_gate=RateLimitGate(base_delay=0.01))
+    result = runner.run(entries)
+
+    # One decision call per entry for variant B; nothing else re-runs
+    assert calls == ["strict decision prompt"] * 2
+    row = result["rows"][0]
+    assert row["reused_a"] and not row["reused_b"]
+    assert row["flipped"] and row["score_delta"] == -1.5
+    assert row["tokens_b"] == 120
+    assert result["summary"]["flips"] == 2
+    assert result["summary"]["flip_transitions"] == {"RECOMMEND -> DO NOT RECOMMEND": 2}
+    assert result["summary"]["shared_stages_reused"] == 4
+    assert "DO NOT RECOMMEND" in format_report(result)
+
+
+def test_experiment_runs_shared_stages_once(monkeypatch, tmp_path):
+    """Manifest entries run upstream stages once and only the varied stage per variant."""
+    pm = make_manager(tmp_path)
+    monkeypatch.setattr(nodes, "prompt_manager", pm)
+    calls = []
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_llm(calls))
+
+    entries = [{"id": "cand-0", "candidate_info": {"name": "Candidate"}, "rubric": "rubric", "transcript": "transcript"}]
+    result = ExperimentRunner("decision_agent", version_a="1", version_b="2", concurrency=2).run(entries)
+
+    assert sorted(calls) == sorted([
+        "primary_agent v1", "challenge_agent v1", "decision_agent v1", "strict decision prompt"
+    ])
+    assert result["rows"][0]["shared_stages_run"] == 2
+    assert result["rows"][0]["decision_b"] == "DO NOT RECOMMEND"
+
+
+def test_experiment_keeps_the_stored_pipeline(monkeypatch, tmp_path):
+    """A lite evaluation is re-run without a challenge stage, and cannot vary the challenge prompt."""
+    pm = make_manager(tmp_path)
+    monkeypatch.setattr(nodes, "prompt_manager", pm)
+    calls = []
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_llm(calls))
+
+    db_path = str(tmp_path / "checkpoints.sqlite")
+    graph = create_lite_graph(checkpointer=create_checkpointer(db_path))
+    state = create_initial_state("rubric", "transcript", {"name": "Candidate"}, pipeline="lite",
+                                 prompt_versions=nodes.pin_prompt_versions())
+    graph.invoke(state, thread_config("eval-lite"))
+    calls.clear()
+    entries = load_checkpointed_entries(db_path)
+
+    result = ExperimentRunner("decision_agent", version_b="2", concurrency=2).run(entries)
+    # No challenge is run upstream of the decision
+    assert calls == ["strict decision prompt"]
+    row = result["rows"][0]
+    assert (row["status"], row["shared_stages_reused"], row["shared_stages_run"]) == ("completed", 1, 0)
+
+    result = ExperimentRunner("challenge_agent", version_b="1", concurrency=2).run(entries)
+    assert result["rows"][0]["status"] == "failed"
+    assert "lite pipeline has no challenge_agent stage" in result["rows"][0]["error"]
+
+
+def test_experiment_refuses_to_rerun_a_fan_out_primary_stage(monkeypatch, tmp_path):
+    """Chunked evaluations can vary downstream prompts but not the primary one."""
+    pm = make_manager(tmp_path)
+    monkeypatch.setattr(nodes, "prompt_manager", pm)
+    calls = []
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_llm(calls))
+
+    state = create_initial_state("rubric", "transcript", {"name": "Candidate"}, pipeline="chunked",
+                                 prompt_versions=nodes.pin_prompt_versions())
+    state.update(primary_evaluation="merged chunk evaluations", challenges="challenges",
+                 decision="**Final Recommendation:** RECOMMEND\nOverall Score: 3.5")
+    stored = {"id": "eval-chunked", "candidate_info": {"name": "Candidate"}, "state": state}
+    fresh = {"id": "cand-0", "candidate_info": {"name": "Candidate"}, "rubric": "rubric",
+             "transcript": "transcript", "state": {**state, "primary_evaluation": None}}
+
+    result = ExperimentRunner("primary_agent", version_b="1", concurrency=2).run([stored])
+    assert result["rows"][0]["status"] == "failed"
+    assert "chunked pipeline's fan-out primary stage" in result["rows"][0]["error"]
+    result = ExperimentRunner("decision_agent", version_b="2", concurrency=2).run([fresh])
+    assert result["rows"][0]["status"] == "failed"
+    assert calls == []
+
+    result = ExperimentRunner("decision_agent", version_b="2", concurrency=2).run([stored])
+    assert result["rows"][0]["status"] == "completed"
+    assert calls == ["strict decision prompt"]
+
+
+@pytest.mark.parametrize("error, attempts", [
+    (rate_limit_error(), 3),
+    (RuntimeError("invalid request"), 1),
+    (RuntimeError("request req_429 failed"), 1)
+])
+def test_experiment_retries_only_rate_limits(monkeypatch, tmp_path, error, attempts):
+    """Rate-limited calls are retried after the cooldown; other failures are recorded at once."""
+    monkeypatch.setattr(nodes, "prompt_manager", make_manager(tmp_path))
+    calls = []
+
+    def failing_call(*args, **kwargs):
+        calls.append(args)
+        raise error
+
+    monkeypatch.setattr(nodes, "call_anthropic_claude", failing_call)
+
+    entries = [{"id": "cand-0", "candidate_info": {"name": "Candidate"}, "rubric": "rubric", "transcript": "transcript"}]
+    result = ExperimentRunner("decision_agent", version_a="1", version_b="2", concurrency=1, max_attempts=3,
+                              rate_limit_gate=RateLimitGate(base_delay=0.01)).run(entries)
+
+    assert len(calls) == attempts
+    assert result["rows"][0] == {"id": "cand-0", "candidate_name": "Candidate", "status": "failed", "error": str(error)}
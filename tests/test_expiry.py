@@ -0,0 +1,123 @@
+"""
+Evaluation expiry tests (per-status TTLs, batched eviction, releasing resources).
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services import storage_service
+from app.services.expiry import ExpiryTask
+from app.services.sqlite_storage import SqliteStorageService
+from app.services.storage_service import StorageService, release_evaluations
+from src.graph.checkpoint import create_checkpointer, thread_config
+from src.graph.state import EvaluationState
+from src.utils.blob_store import BlobStore
+
+
+# Completed evaluations expire at once, failed ones after a day, pending never
+TTLS = {"ttl_hours": 0, "ttl_hours_by_status": {"pending": None, "failed": 24}}
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        yield StorageService(**TTLS)
+        return
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.services.redis_storage import RedisStorageService
+        yield RedisStorageService(fakeredis.FakeAsyncRedis(decode_responses=True), **TTLS)
+        return
+    storage = SqliteStorageService(str(tmp_path / "evaluations.sqlite"), read_connections=2, **TTLS)
+    yield storage
+    storage.close()
+
+
+def save_all(storage, count):
+    async def run():
+        for index in range(count):
+            await storage.save(f"e{index}", {
+                "evaluation_id": f"e{index}",
+                "status": "pending",
+                "created_at": f"2026-01-01T10:00:0{index}",
+                "input": {"candidate_info": {"name": "Jane Doe"}},
+                "result": None
+            })
+
+    asyncio.run(run())
+
+
+def test_ttl_counts_from_the_status_change(storage):
+    save_all(storage, 6)
+
+    async def run():
+        assert await storage.cleanup_expired() == {}
+        for evaluation_id in ("e0", "e1", "e2"):
+            await storage.update(evaluation_id, {"status": "completed"})
+        await storage.update("e3", {"status": "failed"})
+        # Progress updates do not restart the TTL of a status
+        await storage.update("e0", {"progress_percentage": 100})
+
+        assert await storage.cleanup_expired(limit=2) == {"completed": ["e0", "e1"]}
+        assert await storage.cleanup_expired(limit=2) == {"completed": ["e2"]}
+        assert await storage.cleanup_expired(limit=2) == {}
+
+        assert await storage.get("e0") is None
+        assert (await storage.get("e3"))["status"] == "failed"
+        items, has_more = await storage.list_page(10, candidate="jane doe")
+        assert [item["evaluation_id"] for item in items] == ["e5", "e4", "e3"]
+        assert (await storage.get_stats())["evicted"] == {"completed": 3}
+
+    asyncio.run(run())
+
+
+def test_sweep_evicts_in_batches(storage):
+    save_all(storage, 5)
+
+    async def run():
+        for index in range(5):
+            await storage.update(f"e{index}", {"status": "cancelled"})
+        # Back to pending (resumed) before the sweep: no longer expiring
+        await storage.update("e4", {"status": "pending"})
+        return await ExpiryTask(storage, batch_size=2, release=released.append).sweep(), await storage.count()
+
+    released = []
+    assert asyncio.run(run()) == ({"cancelled": 4}, 1)
+    assert released == [["e0", "e1"], ["e2", "e3"]]
+
+
+def test_evicted_evaluations_release_checkpoints_and_blobs(monkeypatch, tmp_path):
+    graph = StateGraph(EvaluationState)
+    graph.add_node("decision_agent", lambda state: {"decision": "decision output"})
+    graph.add_edge(START, "decision_agent")
+    graph.add_edge("decision_agent", END)
+    checkpointer = create_checkpointer(str(tmp_path / "checkpoints.sqlite"))
+    compiled = graph.compile(checkpointer=checkpointer)
+    for evaluation_id in ("e0", "e1"):
+        compiled.invoke({"rubric": "rubric"}, thread_config(evaluation_id))
+
+    blob_store = BlobStore(spill_dir=str(tmp_path / "blobs"), min_size_bytes=0)
+    shared_ref = blob_store.put("transcript")
+    own_ref = blob_store.put("rubric")
+    blob_store.acquire("e0", [shared_ref, own_ref])
+    blob_store.acquire("e1", [shared_ref])
+
+    monkeypatch.setattr(storage_service, "get_pipeline_graph", lambda name: SimpleNamespace(checkpointer=checkpointer))
+    monkeypatch.setattr(storage_service, "get_blob_store", lambda: blob_store)
+    release_evaluations(["e0"])
+
+    assert checkpointer.get_tuple(thread_config("e0")) is None
+    assert checkpointer.get_tuple(thread_config("e1")) is not None
+    # The transcript is still owned by e1
+    assert blob_store.get(shared_ref) == "transcript"
+    with pytest.raises(KeyError):
+        blob_store.get(own_ref)
@@ -9,7 +9,8 @@ import yaml
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.graph.state import create_initial_state, EvaluationState
+from src.graph import nodes
+from src.graph.state import create_initial_state, EvaluationState, merge_metadata
 from src.graph.graph import create_evaluation_graph
 
 
@@ -65,6 +66,52 @@ def test_graph_structure():
     print("Graph structure test passed")
 
 
+def test_metadata_reducer():
+    """Test that node metadata deltas add tokens and merge timestamps."""
+    current = {
+        "tokens": {"primary_input": 100, "primary_output": 10},
+        "timestamps": {"start": "t0", "primary": "t1"},
+        "model_version": ""
+    }
+    merged = merge_metadata(current, {
+        "tokens": {"challenge_input": 50, "primary_output": 5},
+        "timestamps": {"challenge": "t2"}
+    })
+
+    assert merged["tokens"] == {"primary_input": 100, "primary_output": 15, "challenge_input": 50}
+    assert merged["timestamps"] == {"start": "t0", "primary": "t1", "challenge": "t2"}
+    assert merged["model_version"] == ""
+    # Reducer must not mutate the previous state
+    assert current["tokens"]["primary_output"] == 10
+
+    print("Metadata reducer test passed")
+
+
+def test_graph_accumulates_node_deltas(monkeypatch):
+    """Test that a full run accumulates every node's tokens and timestamps."""
+    def fake_call(model_name, system_prompt, user_message, max_tokens, temperature=0.0, **kwargs):
+        return "output", 100, 10
+
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_call)
+
+    state = create_initial_state(
+        rubric="rubric",
+        transcript="transcript",
+        candidate_info={'name': 'Test Candidate', 'current_level': 'PM', 'target_level': 'Senior PM',
+                        'years_experience': 3, 'level_expectations': ''}
+    )
+    final_state = create_evaluation_graph().invoke(state)
+
+    tokens = final_state['metadata']['tokens']
+    assert tokens['primary_input'] == tokens['challenge_input'] == tokens['decision_input'] == 100
+    assert tokens['total_input'] == 300
+    assert tokens['total_output'] == 30
+    assert tokens['total'] == 330
+    assert all(final_state['metadata']['timestamps'][k] for k in ('start', 'primary', 'challenge', 'decision'))
+
+    print("Graph delta accumulation test passed")
+
+
 if __name__ == "__main__":
     print("Running basic tests...")
     test_state_creation()
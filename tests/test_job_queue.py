@@ -0,0 +1,391 @@
+"""
+Job queue tests (leases, redelivery, admission, positions and ETAs).
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.api.routes import evaluations as evaluation_routes
+from app.models.requests import CreateEvaluationRequest
+from app.services import evaluation_service as evaluation_service_module
+from app.services.evaluation_service import EvaluationService
+from app.services.job_queue import FairShare, JobQueue, QueueFullError
+from app.services import persistent_queue
+from app.services.persistent_queue import SqliteJobQueue
+from app.services.storage_service import StorageService
+from src.utils.blob_store import BlobStore
+import worker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SqliteJobQueue(str(tmp_path / "jobs.sqlite"), workers=1, max_depth=2,
+                          lease_seconds=60, max_attempts=2)
+
+
+def expire_leases(queue):
+    queue._conn.execute("UPDATE jobs SET lease_expires_at = 0 WHERE status = 'leased'")
+
+
+def test_jobs_are_leased_in_order_once(queue):
+    asyncio.run(queue.submit("a", {"resume": False}))
+    asyncio.run(queue.submit("b"))
+    assert queue.position("b") == 2
+
+    job = queue.lease("w1")
+    assert job["evaluation_id"] == "a"
+    assert job["payload"] == {"resume": False}
+    assert job["attempts"] == 1
+    assert queue.position("a") is None
+    assert queue.position("b") == 1
+
+    assert queue.lease("w2")["evaluation_id"] == "b"
+    assert queue.lease("w3") is None
+
+
+def test_admission_is_bounded(queue):
+    asyncio.run(queue.submit("a"))
+    asyncio.run(queue.submit("b"))
+    with pytest.raises(QueueFullError):
+        queue.check_capacity()
+    with pytest.raises(QueueFullError):
+        asyncio.run(queue.submit("c"))
+    assert asyncio.run(queue.submit("c", enforce_limit=False)) == 3
+
+
+def test_memory_queue_rejects_at_max_depth():
+    async def run():
+        queue = JobQueue(workers=2, max_depth=2, default_job_seconds=90)
+        await queue.submit("a")
+        await queue.submit("b")
+        with pytest.raises(QueueFullError) as full:
+            await queue.submit("c")
+        # Internal resubmissions are never rejected
+        assert await queue.submit("c", enforce_limit=False) == 3
+        return queue, full.value
+
+    queue, error = asyncio.run(run())
+    assert error.retry_after == 45.0  # one average job per worker
+    assert "2 waiting" in str(error)
+    assert queue.stats()["rejected"] == 1
+    assert queue.stats()["waiting"] == 3
+
+
+def test_memory_queue_positions_and_etas():
+    async def run():
+        queue = JobQueue(workers=2, default_job_seconds=100)
+        for job_id in ("a", "b", "c"):
+            await queue.submit(job_id)
+        idle = [queue.eta_seconds(job_id) for job_id in ("a", "b", "c")]
+
+        # Both workers busy: the first wave waits for the job closest to finishing
+        now = time.time()
+        queue._running = {"r1": (now - 30, "default"), "r2": (now - 80, "default")}
+        busy = [queue.eta_seconds(job_id) for job_id in ("a", "b", "c")]
+        return queue, idle, busy
+
+    queue, idle, busy = asyncio.run(run())
+    assert [queue.position(job_id) for job_id in ("a", "b", "c")] == [1, 2, 3]
+    assert idle == [0.0, 0.0, 100.0]
+    assert busy == pytest.approx([20.0, 20.0, 120.0], abs=0.5)
+    assert queue.position("r1") is None and queue.eta_seconds("r1") is None
+
+
+def test_sqlite_queue_etas_follow_leased_jobs(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite"), workers=1, default_job_seconds=60)
+    for job_id in ("a", "b", "c"):
+        asyncio.run(queue.submit(job_id))
+    assert queue.eta_seconds("a") == 0.0
+
+    queue.lease("w1")
+    assert queue.eta_seconds("a") is None
+    assert queue.eta_seconds("b") == pytest.approx(60.0, abs=0.5)
+    assert queue.eta_seconds("c") == pytest.approx(120.0, abs=0.5)
+    assert queue.retry_after() == 60.0
+
+
+def make_request():
+    return CreateEvaluationRequest(
+        candidate_info={"name": "Ada Lovelace", "target_level": "L6"},
+        rubric="Evaluate system design depth and communication. " * 2,
+        transcript="Interviewer: Walk me through a design. Candidate: I would start with... " * 3
+    )
+
+
+def test_full_queue_maps_to_429_with_retry_after(monkeypatch):
+    async def full(request, idempotency_key=None, force=False):
+        raise QueueFullError(100, 12.2)
+
+    monkeypatch.setattr(evaluation_routes.evaluation_service, "create_evaluation", full)
+    app = FastAPI()
+    app.include_router(evaluation_routes.router)
+
+    response = TestClient(app).post("/evaluations/", json=make_request().model_dump())
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "13"
+    assert response.json()["detail"] == "Evaluation queue is full (100 waiting)"
+
+
+def test_failed_submit_rolls_back_the_evaluation(monkeypatch):
+    monkeypatch.setattr(evaluation_service_module, "pin_prompt_versions", lambda: {})
+    service = EvaluationService()
+    service.storage = StorageService()
+    service.blob_store = BlobStore(min_size_bytes=0)
+    service.job_queue = JobQueue(workers=1, max_depth=1)
+
+    async def filled_meanwhile(*args, **kwargs):
+        raise QueueFullError(1, 60)
+
+    monkeypatch.setattr(service.job_queue, "submit", filled_meanwhile)
+
+    with pytest.raises(QueueFullError):
+        asyncio.run(service.create_evaluation(make_request()))
+
+    # Neither the stored evaluation nor its texts are left behind
+    assert asyncio.run(service.storage.count()) == 0
+    assert service.blob_store.stats()["deleted"] == 2
+    assert service.blob_store.stats()["blobs_in_memory"] == 0
+
+
+def test_expired_lease_is_redelivered(queue):
+    asyncio.run(queue.submit("a"))
+    job = queue.lease("w1")
+    assert queue.heartbeat(job["id"], "w1")
+
+    expire_leases(queue)
+    redelivered = queue.lease("w2")
+    assert redelivered["id"] == job["id"]
+    assert redelivered["attempts"] == 2
+
+    # The first worker lost its lease and cannot finish the job
+    assert not queue.heartbeat(job["id"], "w1")
+    queue.complete(job["id"], "w1")
+    assert queue.stats()["completed"] == 0
+    queue.complete(job["id"], "w2")
+    assert queue.stats()["completed"] == 1
+
+
+def test_worker_that_lost_its_lease_stops_and_drops_its_writes(monkeypatch, tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite"), lease_seconds=0.06)
+    asyncio.run(queue.submit("a"))
+    job = queue.lease("w1")
+
+    async def fake_job(evaluation_id, payload, emit_event, update_evaluation, cancel_token):
+        await emit_event(evaluation_id, {"type": "node_started"})
+        # The lease expires and the job is redelivered while this run goes on
+        expire_leases(queue)
+        assert queue.lease("w2")["id"] == job["id"]
+        for _ in range(100):
+            if cancel_token.cancelled:
+                break
+            await asyncio.sleep(0.01)
+        await update_evaluation(evaluation_id, {"status": "cancelled"})
+        return ("cancelled" if cancel_token.cancelled else "completed"), None
+
+    monkeypatch.setattr(worker, "run_evaluation_job", fake_job)
+    asyncio.run(worker.process_job(queue, job, "w1"))
+
+    relayed = [tuple(row) for row in queue._query("SELECT kind, data FROM relay_events")]
+    assert relayed == [("event", '{"type": "node_started"}')]
+    # The job still belongs to the second worker
+    assert tuple(queue._query("SELECT status, leased_by FROM jobs")[0]) == ("leased", "w2")
+    assert queue.publish("a", "event", {}, job["id"], "w2")
+
+
+def test_job_fails_after_max_attempts(queue):
+    asyncio.run(queue.submit("a"))
+    queue.lease("w1")
+    expire_leases(queue)
+    queue.lease("w2")
+    expire_leases(queue)
+
+    assert queue.lease("w3") is None
+    assert queue.stats()["failed"] == 1
+
+    # The failure is relayed to the API process
+    applied = []
+
+    async def apply(evaluation_id, kind, data):
+        applied.append((evaluation_id, kind, data["status"]))
+
+    async def relay_once():
+        await queue.start_relay(apply)
+        await asyncio.sleep(0.05)
+        await queue.stop()
+
+    asyncio.run(relay_once())
+    assert applied == [("a", "update", "failed")]
+    assert queue._query("SELECT COUNT(*) FROM relay_events")[0][0] == 0
+
+
+def test_cancel_waiting_and_running_jobs(queue):
+    asyncio.run(queue.submit("a"))
+    asyncio.run(queue.submit("b"))
+    job = queue.lease("w1")
+
+    assert queue.cancel("b") == "cancelled"
+    assert queue.lease("w2") is None
+
+    assert not queue.cancel_requested(job["id"])
+    assert queue.cancel("a") == "cancelling"
+    assert queue.cancel_requested(job["id"])
+    # The worker keeps its lease until it has stopped the run
+    assert queue.heartbeat(job["id"], "w1")
+    queue.cancelled(job["id"], "w1")
+
+    assert queue.cancel("a") is None
+    assert queue.stats()["cancelled"] == 2
+
+
+SUBMISSIONS = [("a1", "a", "interactive"), ("a2", "a", "interactive"), ("a3", "a", "interactive"),
+               ("a4", "a", "interactive"), ("c1", "c", "batch"), ("b1", "b", "interactive"),
+               ("b2", "b", "interactive")]
+FAIR_ORDER = ["a1", "b1", "a2", "b2", "a3", "a4", "c1"]
+
+
+def test_memory_queue_is_fair_across_tenants_and_strict_across_priorities():
+    order = []
+
+    async def run():
+        queue = JobQueue(workers=1)
+        for job_id, tenant, priority in SUBMISSIONS:
+            await queue.submit(job_id, priority=priority, tenant=tenant)
+        assert queue.position("b1") == 2
+        assert queue.stats()["tenants"]["a"]["waiting"] == {"interactive": 4}
+
+        async def handler(job_id, payload, cancel_token):
+            order.append(job_id)
+
+        await queue.start(handler)
+        while len(order) < len(SUBMISSIONS):
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        assert queue.stats()["tenants"]["c"]["completed"] == 1
+
+    asyncio.run(run())
+    assert order == FAIR_ORDER
+
+
+def test_sqlite_queue_is_fair_across_tenants_and_strict_across_priorities(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite"), workers=1)
+    for job_id, tenant, priority in SUBMISSIONS:
+        asyncio.run(queue.submit(job_id, priority=priority, tenant=tenant))
+    assert queue.position("b1") == 2
+
+    order = [queue.lease("w")["evaluation_id"] for _ in SUBMISSIONS]
+    assert order == FAIR_ORDER
+    assert queue.stats()["tenants"]["a"]["running"] == 4
+
+
+def test_stats_count_the_final_status_of_running_jobs(monkeypatch):
+    async def fake_job(evaluation_id, payload, emit_event, update_evaluation, cancel_token):
+        if evaluation_id == "cancelled":
+            while not cancel_token.cancelled:
+                await asyncio.sleep(0.01)
+            return "cancelled", None
+        if evaluation_id == "failed":
+            return "failed", "simulated API failure"
+        return "completed", None
+
+    monkeypatch.setattr(evaluation_service_module, "run_evaluation_job", fake_job)
+    service = EvaluationService()
+
+    async def run():
+        queue = JobQueue(workers=3)
+        await queue.submit("cancelled", tenant="a")
+        await queue.submit("failed", tenant="a")
+        await queue.submit("completed", tenant="b")
+        await queue.start(service._run_job)
+        while queue.stats()["waiting"]:
+            await asyncio.sleep(0.01)
+        assert queue.cancel("cancelled") == "cancelling"
+        while queue.stats()["running"] or queue.stats()["waiting"]:
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return queue.stats()
+
+    stats = asyncio.run(run())
+    assert (stats["completed"], stats["failed"], stats["cancelled"]) == (1, 1, 1)
+    assert {key: stats["tenants"]["a"][key] for key in ("completed", "failed", "cancelled")} == {
+        "completed": 0, "failed": 1, "cancelled": 1
+    }
+    assert stats["tenants"]["b"]["completed"] == 1
+
+
+def test_tenant_weights_set_the_share():
+    async def run():
+        queue = JobQueue(workers=1, fair_share=FairShare({"a": 2}))
+        for index in range(4):
+            await queue.submit(f"a{index}", tenant="a")
+        for index in range(2):
+            await queue.submit(f"b{index}", tenant="b")
+        return sorted(queue._waiting)
+
+    order = [entry[4] for entry in asyncio.run(run())]
+    assert order == ["a0", "a1", "b0", "a2", "a3", "b1"]
+
+
+def test_one_api_worker_drains_the_relay(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    first, second = SqliteJobQueue(path), SqliteJobQueue(path)
+
+    assert first._claim_relay()
+    assert not second._claim_relay()
+    assert first._claim_relay()  # renewal
+
+    first._release_relay()
+    assert second._claim_relay()
+    assert not first._claim_relay()
+
+
+def test_relay_renews_its_lease_during_a_slow_batch(monkeypatch, tmp_path):
+    monkeypatch.setattr(persistent_queue, "RELAY_LEASE_SECONDS", 0.2)
+    path = str(tmp_path / "jobs.sqlite")
+    first, second = SqliteJobQueue(path, poll_seconds=0.01), SqliteJobQueue(path, poll_seconds=0.01)
+    for index in range(10):
+        first.publish("e1", "event", {"index": index})
+    applied = []
+
+    async def slow_apply(evaluation_id, kind, data):
+        applied.append(data["index"])
+        await asyncio.sleep(0.05)
+
+    async def run():
+        await first.start_relay(slow_apply)
+        await asyncio.sleep(0.02)
+        await second.start_relay(slow_apply)
+        for _ in range(200):
+            if not first._query("SELECT COUNT(*) FROM relay_events")[0][0]:
+                break
+            await asyncio.sleep(0.02)
+        await first.stop()
+        await second.stop()
+
+    # The batch outlasts the lease, but the other API worker never takes over
+    asyncio.run(run())
+    assert applied == list(range(10))
+
+
+def test_finished_jobs_are_purged(tmp_path):
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite"), finished_job_hours=0)
+    for job_id in ("a", "b", "c"):
+        asyncio.run(queue.submit(job_id))
+    job = queue.lease("w1")
+    queue.complete(job["id"], "w1")
+    assert queue.cancel("b") == "cancelled"
+
+    assert queue.purge_finished() == 2
+    assert [row[0] for row in queue._query("SELECT evaluation_id FROM jobs")] == ["c"]
+
+    queue.finished_job_hours = None
+    assert queue.purge_finished() == 0
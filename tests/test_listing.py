@@ -0,0 +1,129 @@
+"""
+Evaluation listing tests (ordered indexes, keyset pagination, filters).
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.evaluation_service import InvalidCursorError, decode_cursor, encode_cursor
+from app.services.sqlite_storage import SqliteStorageService
+from app.services.storage_service import StorageService
+
+
+def evaluation(evaluation_id, created_at, status, candidate):
+    return {
+        "evaluation_id": evaluation_id,
+        "status": status,
+        "created_at": created_at,
+        "input": {"candidate_info": {"name": candidate}},
+        "result": None
+    }
+
+
+# e0 (oldest) .. e9 (newest); e4 and e5 share a creation time
+EVALUATIONS = [
+    evaluation(
+        f"e{index}",
+        f"2026-01-0{min(index, 4) if index < 5 else index - 1}T10:00:00",
+        "completed" if index % 2 else "pending",
+        "Jane Doe" if index % 3 == 0 else "John Roe"
+    )
+    for index in range(10)
+]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        yield StorageService()
+        return
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.services.redis_storage import RedisStorageService
+        yield RedisStorageService(fakeredis.FakeAsyncRedis(decode_responses=True))
+        return
+    storage = SqliteStorageService(str(tmp_path / "evaluations.sqlite"), read_connections=2)
+    yield storage
+    storage.close()
+
+
+def pages(storage, limit, **filters):
+    """Evaluation ids of every page, following the listing cursor."""
+    async def run():
+        result, after = [], None
+        while True:
+            items, has_more = await storage.list_page(limit, after=after, **filters)
+            result.append([item["evaluation_id"] for item in items])
+            if not has_more:
+                return result
+            after = (items[-1]["created_at"], items[-1]["evaluation_id"])
+
+    return asyncio.run(run())
+
+
+def save_all(storage):
+    async def run():
+        for data in EVALUATIONS:
+            await storage.save(data["evaluation_id"], dict(data))
+
+    asyncio.run(run())
+
+
+def test_pages_follow_creation_order(storage):
+    save_all(storage)
+    assert pages(storage, 4) == [["e9", "e8", "e7", "e6"], ["e5", "e4", "e3", "e2"], ["e1", "e0"]]
+    assert pages(storage, 5) == [["e9", "e8", "e7", "e6", "e5"], ["e4", "e3", "e2", "e1", "e0"]]
+
+    items, total = asyncio.run(storage.list_all(limit=3, offset=4))
+    assert total == 10
+    assert [item["evaluation_id"] for item in items] == ["e5", "e4", "e3"]
+    assert asyncio.run(storage.count()) == 10
+
+
+def test_filters_combine(storage):
+    save_all(storage)
+    assert pages(storage, 2, status="completed") == [["e9", "e7"], ["e5", "e3"], ["e1"]]
+    assert pages(storage, 10, candidate="jane doe") == [["e9", "e6", "e3", "e0"]]
+    assert pages(storage, 10, status="pending", candidate="Jane Doe") == [["e6", "e0"]]
+    assert pages(storage, 10, created_from="2026-01-04", created_to="2026-01-06") == [["e6", "e5", "e4"]]
+    assert pages(storage, 10, status="failed") == [[]]
+
+
+def test_updates_move_evaluations_between_indexes(storage):
+    save_all(storage)
+
+    async def run():
+        await storage.update("e6", {"status": "completed"})
+        await storage.delete("e9")
+
+    asyncio.run(run())
+    assert pages(storage, 10, status="completed") == [["e7", "e6", "e5", "e3", "e1"]]
+    assert pages(storage, 10, candidate="Jane Doe") == [["e6", "e3", "e0"]]
+
+
+def test_cursors_round_trip():
+    cursor = encode_cursor("2026-01-04T10:00:00", "e5")
+    assert decode_cursor(cursor) == ("2026-01-04T10:00:00", "e5")
+    for invalid in ("not a cursor", encode_cursor("x", "y")[:-3], "WzFd"):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(invalid)
+
+
+def test_reads_are_snapshots(storage):
+    save_all(storage)
+
+    async def run():
+        before = await storage.get_status("e6")
+        await storage.update("e6", {"status": "failed"}, increment="version")
+        return before, await storage.get_status("e6")
+
+    before, after = asyncio.run(run())
+    assert (before["status"], before.get("version")) == ("pending", None)
+    assert (after["status"], after["version"]) == ("failed", 1)
@@ -0,0 +1,132 @@
+"""
+Pipeline variant tests (LLM calls are faked).
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.graph import nodes
+from src.graph.state import create_initial_state
+from src.graph.pipelines import PIPELINES, get_pipeline_graph, progress_map
+from src.utils.blob_store import BlobStore
+from src.utils.text_splitting import split_transcript, split_rubric_criteria
+
+
+CANDIDATE_INFO = {'name': 'Test Candidate', 'current_level': 'PM', 'target_level': 'Senior PM',
+                  'years_experience': 3, 'level_expectations': ''}
+
+RUBRIC = """Evaluate for Senior PM.
+
+## Strategic Thinking
+- Defines a 12-18 month vision
+
+## Execution
+- Ships multi-quarter initiatives
+"""
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Record every LLM call's user message."""
+    calls = []
+
+    def fake_call(model_name, system_prompt, user_message, max_tokens, temperature=0.0, **kwargs):
+        calls.append(user_message)
+        return f"output {len(calls)}", 100, 10
+
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_call)
+    return calls
+
+
+def test_split_transcript_overlaps_chunks():
+    """Chunks respect the size limit and repeat trailing lines as overlap."""
+    transcript = "".join(f"line {i}\n" for i in range(20))
+    chunks = split_transcript(transcript, max_chars=40, overlap_chars=7)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert chunks[1].startswith(chunks[0].splitlines(keepends=True)[-1])
+    assert split_transcript("short", max_chars=40) == ["short"]
+
+
+def test_split_rubric_criteria_keeps_preamble():
+    """Each criterion gets the rubric's preamble as context."""
+    criteria = split_rubric_criteria(RUBRIC)
+
+    assert [label for label, _ in criteria] == ["Strategic Thinking", "Execution"]
+    assert criteria[1][1].startswith("Evaluate for Senior PM.")
+    assert "Ships multi-quarter" in criteria[1][1]
+    assert split_rubric_criteria("no structure") == [("Full rubric", "no structure")]
+
+
+def test_lite_pipeline_skips_challenge(fake_llm):
+    """The lite pipeline runs primary and decision only."""
+    state = create_initial_state(RUBRIC, "transcript", CANDIDATE_INFO, pipeline="lite")
+    final_state = get_pipeline_graph("lite", durable=False).invoke(state)
+
+    assert len(fake_llm) == 2
+    assert final_state['challenges'] is None
+    assert nodes.NO_CHALLENGES_NOTE in fake_llm[1]
+    assert final_state['metadata']['tokens']['total'] == 220
+    assert progress_map("lite") == {
+        "primary_evaluator": {"started": 0, "completed": 50},
+        "decision_agent": {"started": 50, "completed": 100}
+    }
+
+
+def test_per_criterion_pipeline_fans_out(fake_llm):
+    """One primary call per criterion, merged before the challenge agent."""
+    state = create_initial_state(RUBRIC, "transcript", CANDIDATE_INFO, pipeline="per-criterion")
+    final_state = get_pipeline_graph("per-criterion", durable=False).invoke(state)
+
+    # 2 criteria + challenge + decision
+    assert len(fake_llm) == 4
+    assert "## Strategic Thinking" in final_state['primary_evaluation']
+    assert "## Execution" in final_state['primary_evaluation']
+    # Parallel parts' tokens add up
+    assert final_state['metadata']['tokens']['primary_input'] == 200
+    assert final_state['metadata']['tokens']['total_input'] == 400
+
+
+def test_chunked_pipeline_splits_transcript(fake_llm, monkeypatch):
+    """Long transcripts get one primary call per chunk."""
+    monkeypatch.setitem(nodes.config["pipelines"]["chunked"], "chunk_chars", 60)
+    monkeypatch.setitem(nodes.config["pipelines"]["chunked"], "overlap_chars", 0)
+
+    transcript = "".join(f"Q{i}: question\nA{i}: answer\n" for i in range(6))
+    state = create_initial_state(RUBRIC, transcript, CANDIDATE_INFO, pipeline="chunked")
+    final_state = get_pipeline_graph("chunked", durable=False).invoke(state)
+
+    chunk_count = len(split_transcript(transcript, 60, 0))
+    assert chunk_count > 1
+    assert len(fake_llm) == chunk_count + 2
+    assert f"Transcript part {chunk_count} of {chunk_count}" in final_state['primary_evaluation']
+
+
+def test_chunks_are_owned_by_the_evaluation_thread(fake_llm, monkeypatch):
+    """Chunks stored by the fan-out are deleted when the evaluation is released."""
+    store = BlobStore(min_size_bytes=10)
+    monkeypatch.setattr(nodes, "blob_store", store)
+    monkeypatch.setitem(nodes.config["pipelines"]["chunked"], "chunk_chars", 60)
+    monkeypatch.setitem(nodes.config["pipelines"]["chunked"], "overlap_chars", 0)
+
+    transcript = "".join(f"Q{i}: question\nA{i}: answer\n" for i in range(6))
+    state = create_initial_state(RUBRIC, transcript, CANDIDATE_INFO, pipeline="chunked")
+    get_pipeline_graph("chunked", durable=False).invoke(state, {"configurable": {"thread_id": "e1"}})
+
+    assert store.release("e1") == len(split_transcript(transcript, 60, 0))
+    assert store.stats()["blobs_in_memory"] == 0
+
+
+def test_pipelines_are_cached():
+    """Each variant is compiled once and reused."""
+    for name in PIPELINES:
+        assert get_pipeline_graph(name, durable=False) is get_pipeline_graph(name, durable=False)
+
+    with pytest.raises(ValueError):
+        get_pipeline_graph("unknown", durable=False)
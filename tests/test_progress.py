@@ -0,0 +1,131 @@
+"""
+Token-driven progress tests (agent averages, progress/ETA, token streaming).
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+from app.utils import graph_executor
+from app.utils.graph_executor import GraphExecutor
+from app.utils.progress import AgentStats, RunProgress
+from src.graph.pipelines import progress_map
+from src.graph.state import EvaluationState
+from src.utils import azure_client
+from src.utils.token_stream import token_listener_scope
+
+
+def test_agent_stats_keep_moving_averages(tmp_path):
+    stats = AgentStats(str(tmp_path / "stats.sqlite"), history_weight=0.5,
+                       default_output_tokens=1000, default_seconds=30)
+    assert stats.expected(["decision_agent"]) == {"decision_agent": (1000, 30)}
+
+    stats.record("decision_agent", 400, 20)
+    stats.record("decision_agent", 800, 40)
+    assert stats.expected(["decision_agent"]) == {"decision_agent": (600, 30)}
+
+
+def test_progress_follows_streamed_tokens():
+    nodes = progress_map("full")
+    expected = {node: (100, 10.0) for node in nodes}
+    progress = RunProgress(nodes, expected, min_report_interval=0)
+
+    assert progress.report()["eta_seconds"] == 30.0
+
+    progress.start_node("primary_evaluator")
+    progress.add_tokens(50)
+    report = progress.report()
+    assert report["node"] == "primary_evaluator"
+    assert report["progress_percentage"] == 16  # half of the first third
+    assert report["output_tokens"] == 50
+
+    # Streaming past the expected size stays short of the node's end
+    progress.add_tokens(500)
+    assert progress.report()["progress_percentage"] == 31
+
+    tokens, seconds = progress.complete_node("primary_evaluator")
+    assert tokens == 550 and seconds >= 0
+    report = progress.report()
+    assert report["progress_percentage"] == 33
+    assert report["eta_seconds"] == 20.0
+
+
+def test_resumed_nodes_count_as_completed():
+    nodes = progress_map("lite")
+    progress = RunProgress(nodes, {node: (100, 10.0) for node in nodes})
+    assert progress.complete_node("primary_evaluator") is None
+    assert progress.report() == {
+        "node": None, "progress_percentage": 50, "eta_seconds": 10.0, "output_tokens": 0
+    }
+
+
+def test_reports_are_throttled():
+    nodes = progress_map("full")
+    progress = RunProgress(nodes, {node: (100, 10.0) for node in nodes}, min_report_interval=60)
+    assert not progress.add_tokens(1)  # no node running
+
+    progress.start_node("primary_evaluator")
+    assert progress.add_tokens(1)
+    assert not progress.add_tokens(1)
+
+
+def test_listener_streams_calls_without_cancel_token(monkeypatch):
+    chunks = [SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content="x"))])] * 3
+    chunks.append(SimpleNamespace(usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3), choices=[]))
+
+    class Stream(list):
+        def close(self):
+            pass
+
+    def create(**params):
+        assert params["stream"]
+        return Stream(chunks)
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(azure_client, "get_azure_openai_client", lambda: client)
+
+    received = []
+    with token_listener_scope(received.append):
+        result = azure_client.call_anthropic_claude("model", "system", "user", max_tokens=10)
+
+    assert result == ("xxx", 7, 3)
+    assert received == [1, 1, 1]
+
+
+def test_node_started_precedes_node_completed(monkeypatch, tmp_path):
+    """Each node's start (from the "tasks" stream) is emitted before its completion."""
+    graph = StateGraph(EvaluationState)
+    graph.add_node("primary_evaluator", lambda state: {"primary_evaluation": "primary output"})
+    graph.add_node("decision_agent", lambda state: {"decision": "decision output"})
+    graph.add_edge(START, "primary_evaluator")
+    graph.add_edge("primary_evaluator", "decision_agent")
+    graph.add_edge("decision_agent", END)
+    stub = graph.compile(checkpointer=MemorySaver())
+
+    monkeypatch.setattr(graph_executor, "get_pipeline_graph", lambda pipeline: stub)
+    monkeypatch.setattr(graph_executor, "get_agent_stats", lambda: AgentStats(str(tmp_path / "stats.sqlite")))
+
+    events = []
+
+    async def record(evaluation_id, event):
+        events.append((event["type"], event.get("node")))
+
+    final_state = asyncio.run(GraphExecutor(record).execute_graph(
+        "eval-1", "rubric", "transcript", {"name": "Test"}, pipeline="lite"
+    ))
+
+    assert [event for event in events if event[0].startswith("node_")] == [
+        ("node_started", "primary_evaluator"),
+        ("node_completed", "primary_evaluator"),
+        ("node_started", "decision_agent"),
+        ("node_completed", "decision_agent"),
+    ]
+    assert final_state["decision"] == "decision output"
@@ -0,0 +1,168 @@
+"""
+Prompt cache tests.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prompts.manager import PromptManager, PromptVersionConflict
+from src.utils.blob_store import BlobStore
+
+
+def make_manager(tmp_path, blob_store=None):
+    """PromptManager over a temp directory with v1 prompt files."""
+    for prompt_type in ("primary_agent", "challenge_agent", "decision_agent"):
+        (tmp_path / f"{prompt_type}_v1.txt").write_text(f"{prompt_type} v1")
+    return PromptManager(prompts_dir=str(tmp_path), blob_store=blob_store or BlobStore())
+
+
+def test_active_prompt_is_cached(tmp_path):
+    """Repeated reads come from memory."""
+    pm = make_manager(tmp_path)
+
+    assert pm.get_active_prompt("primary_agent") == "primary_agent v1"
+    reloads = pm.reload_count
+    for _ in range(5):
+        assert pm.get_active_prompt("primary_agent") == "primary_agent v1"
+
+    assert pm.reload_count == reloads
+
+
+def test_edits_take_effect_immediately(tmp_path):
+    """Edits through another instance (e.g. the prompt editor) are picked up."""
+    pm = make_manager(tmp_path)
+    editor = PromptManager(prompts_dir=str(tmp_path))
+    pm.get_active_prompt("challenge_agent")
+
+    editor.update_prompt_content("challenge_agent", "1", "edited challenge prompt")
+    assert pm.get_active_prompt("challenge_agent") == "edited challenge prompt"
+
+    editor.save_new_version("challenge_agent", "challenge v2", "notes", set_active=True)
+    assert pm.get_active_prompt("challenge_agent") == "challenge v2"
+
+    # Writes through the same instance invalidate its cache directly
+    pm.set_active_version("challenge_agent", "1")
+    assert pm.get_active_prompt("challenge_agent") == "edited challenge prompt"
+
+
+def test_stale_revision_is_rejected(tmp_path):
+    """Compare-and-swap writes fail if another writer got there first."""
+    pm = make_manager(tmp_path)
+    other = PromptManager(prompts_dir=str(tmp_path))
+    revision = pm.get_revision()
+
+    other.save_new_version("decision_agent", "decision v2", "notes")
+
+    with pytest.raises(PromptVersionConflict):
+        pm.set_active_version("decision_agent", "2", expected_revision=revision)
+
+    pm.set_active_version("decision_agent", "2", expected_revision=pm.get_revision())
+    assert pm.get_active_prompt("decision_agent") == "decision v2"
+
+
+def test_concurrent_saves_keep_every_version(tmp_path):
+    """Parallel writers never lose versions or corrupt versions.json."""
+    make_manager(tmp_path)
+
+    def save(i):
+        PromptManager(prompts_dir=str(tmp_path)).save_new_version("primary_agent", f"prompt {i}", f"v{i}")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(save, range(20)))
+
+    pm = PromptManager(prompts_dir=str(tmp_path))
+    versions = [v["version"] for v in pm.get_all_versions("primary_agent")]
+    assert sorted(versions, key=int) == [str(i) for i in range(1, 22)]
+    assert pm.get_revision() == 21
+
+
+def test_snapshot_pins_versions_and_hashes(tmp_path):
+    """Pinned prompts ignore later activations and in-place edits."""
+    pm = make_manager(tmp_path)
+    pins = pm.snapshot(["primary_agent"])
+
+    assert pins["primary_agent"]["version"] == "1"
+    assert pins["primary_agent"]["sha256"] == pm.get_version("primary_agent", "1")["sha256"]
+
+    pm.save_new_version("primary_agent", "primary v2", "notes", set_active=True)
+    assert pm.get_pinned_prompt("primary_agent", pins["primary_agent"]) == "primary_agent v1"
+
+    pm.update_prompt_content("primary_agent", "1", "edited in place")
+    assert pm.get_pinned_prompt("primary_agent", pins["primary_agent"]) == "primary_agent v1"
+
+    # Another process resolves the pin from the shared blob store
+    other = PromptManager(prompts_dir=str(tmp_path), blob_store=pm.blob_store)
+    assert other.get_pinned_prompt("primary_agent", pins["primary_agent"]) == "primary_agent v1"
+
+    # Without the stored text, only an unedited version file can serve the pin
+    unshared = PromptManager(prompts_dir=str(tmp_path), blob_store=BlobStore())
+    with pytest.raises(ValueError, match="no longer available"):
+        unshared.get_pinned_prompt("primary_agent", pins["primary_agent"])
+
+
+def test_nodes_use_pinned_prompts(tmp_path, monkeypatch):
+    """A pinned evaluation keeps its prompts when another version is activated mid-run."""
+    from src.graph import nodes
+    from src.graph.pipelines import get_pipeline_graph
+    from src.graph.state import create_initial_state
+
+    pm = make_manager(tmp_path)
+    monkeypatch.setattr(nodes, "prompt_manager", pm)
+    system_prompts = []
+
+    def fake_call(model_name, system_prompt, user_message, max_tokens, temperature=0.0, **kwargs):
+        system_prompts.append(system_prompt)
+        # Activate a new decision prompt while the evaluation is running
+        if len(system_prompts) == 1:
+            pm.save_new_version("decision_agent", "decision v2", "notes", set_active=True)
+        return "output", 10, 1
+
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_call)
+
+    candidate_info = {'name': 'Test', 'current_level': 'PM', 'target_level': 'Senior PM',
+                      'years_experience': 3, 'level_expectations': ''}
+    state = create_initial_state("rubric", "transcript", candidate_info, pipeline="lite",
+                                 prompt_versions=nodes.pin_prompt_versions())
+    final_state = get_pipeline_graph("lite", durable=False).invoke(state)
+
+    assert system_prompts == ["primary_agent v1", "decision_agent v1"]
+    assert final_state['metadata']['prompt_versions']['decision_agent']['version'] == "1"
+
+
+def test_graph_runs_pinned_prompts_edited_in_place(tmp_path, monkeypatch):
+    """Editing a pinned version's file does not change or fail queued evaluations."""
+    from src.graph import nodes
+    from src.graph.pipelines import get_pipeline_graph
+    from src.graph.state import create_initial_state
+
+    blob_store = BlobStore(spill_dir=str(tmp_path / "blobs"))
+    monkeypatch.setattr(nodes, "prompt_manager", make_manager(tmp_path, blob_store))
+    system_prompts = []
+
+    def fake_call(model_name, system_prompt, user_message, max_tokens, temperature=0.0, **kwargs):
+        system_prompts.append(system_prompt)
+        return "output", 10, 1
+
+    monkeypatch.setattr(nodes, "call_anthropic_claude", fake_call)
+
+    candidate_info = {'name': 'Test', 'current_level': 'PM', 'target_level': 'Senior PM',
+                      'years_experience': 3, 'level_expectations': ''}
+    state = create_initial_state("rubric", "transcript", candidate_info, pipeline="lite",
+                                 prompt_versions=nodes.pin_prompt_versions())
+
+    # Edit both pinned versions in the prompt editor, then run in a fresh process
+    editor = PromptManager(prompts_dir=str(tmp_path), blob_store=BlobStore())
+    editor.update_prompt_content("primary_agent", "1", "primary edited")
+    editor.update_prompt_content("decision_agent", "1", "decision edited")
+    monkeypatch.setattr(nodes, "prompt_manager",
+                        PromptManager(prompts_dir=str(tmp_path), blob_store=BlobStore(spill_dir=str(tmp_path / "blobs"))))
+
+    get_pipeline_graph("lite", durable=False).invoke(state)
+
+    assert system_prompts == ["primary_agent v1", "decision_agent v1"]
@@ -0,0 +1,176 @@
+"""
+Redis-protocol backend tests (state shared across API workers), run against fakeredis.
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.api.websocket.manager import WebSocketManager
+from app.models.requests import CreateEvaluationRequest
+from app.services import evaluation_service as evaluation_service_module
+from app.services.evaluation_service import EvaluationService
+from app.services.event_bus import RedisEventBus
+from app.services.job_queue import JobQueue
+from app.services.persistent_queue import SqliteJobQueue
+from app.services.redis_storage import RedisStorageService
+from src.utils.blob_store import BlobStore
+
+
+def worker_client(server):
+    """A worker's own connection to the shared server."""
+    return fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+
+def test_workers_share_evaluations_and_never_lose_updates():
+    server = fakeredis.FakeServer()
+    first, second = (RedisStorageService(worker_client(server)) for _ in range(2))
+
+    async def run():
+        await first.save("e1", {
+            "evaluation_id": "e1",
+            "status": "pending",
+            "created_at": "2026-01-01T10:00:00",
+            "input": {"candidate_info": {"name": "Jane Doe"}},
+            "result": None,
+            "fingerprint": "f1"
+        })
+        versions = await asyncio.gather(*(
+            worker.update("e1", {"progress_percentage": 50}, increment="version")
+            for worker in (first, second) * 10
+        ))
+        await second.update("e1", {"status": "completed", "result": {"decision": "HIRE"}})
+        return versions, await first.get("e1"), await second.find_by_fingerprint("f1")
+
+    versions, full, summary = asyncio.run(run())
+    assert sorted(item["version"] for item in versions) == list(range(1, 21))
+    assert full["result"] == {"decision": "HIRE"}
+    assert full["input"]["candidate_info"]["name"] == "Jane Doe"
+    assert summary["status"] == "completed" and "result" not in summary
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+
+def test_events_reach_clients_of_other_workers():
+    server = fakeredis.FakeServer()
+    publisher, subscriber = (WebSocketManager(RedisEventBus(worker_client(server))) for _ in range(2))
+    websocket = FakeWebSocket()
+
+    async def run():
+        await subscriber.start()
+        await subscriber.connect(websocket, "e1")
+        await publisher.broadcast("e1", {"type": "progress", "evaluation_id": "e1", "version": 3})
+        await publisher.broadcast("e2", {"type": "progress", "evaluation_id": "e2", "version": 1})
+        for _ in range(100):
+            if len(websocket.messages) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await subscriber.stop()
+
+    asyncio.run(run())
+    assert [message["type"] for message in websocket.messages] == ["connected", "progress"]
+    assert websocket.messages[1]["version"] == 3
+
+
+class StubbornPubSub:
+    """Pub/sub whose message wait swallows cancellation, like redis-py's can."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def psubscribe(self, pattern):
+        pass
+
+    async def get_message(self, timeout):
+        while not self.closed:
+            try:
+                await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                pass
+        raise ConnectionError("Connection closed")
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_event_bus_stops_when_the_subscription_ignores_cancellation():
+    pubsub = StubbornPubSub()
+    bus = RedisEventBus(SimpleNamespace(pubsub=lambda **kwargs: pubsub))
+
+    async def run():
+        async def deliver(evaluation_id, message):
+            pass
+
+        await bus.start(deliver)
+        await asyncio.sleep(0.05)
+        task = bus._task
+        await asyncio.wait_for(bus.stop(), timeout=2)
+        return task
+
+    task = asyncio.run(run())
+    assert pubsub.closed and task.done() and not task.cancelled()
+
+
+def test_shared_storage_requires_out_of_process_workers(monkeypatch, tmp_path):
+    shared = RedisStorageService(worker_client(fakeredis.FakeServer()))
+    monkeypatch.setattr(evaluation_service_module, "storage", shared)
+
+    # Every API worker would re-queue the same pending evaluations on startup
+    monkeypatch.setattr(evaluation_service_module, "create_job_queue", lambda: JobQueue(workers=1))
+    with pytest.raises(ValueError, match="job_queue.backend 'sqlite'"):
+        EvaluationService()
+
+    queue = SqliteJobQueue(str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(evaluation_service_module, "create_job_queue", lambda: queue)
+    assert EvaluationService().storage is shared
+
+
+def test_identical_submissions_to_different_workers_create_one_evaluation(monkeypatch, tmp_path):
+    monkeypatch.setattr(evaluation_service_module, "pin_prompt_versions", lambda: {})
+    server = fakeredis.FakeServer()
+    queue_path = str(tmp_path / "jobs.sqlite")
+    blob_store = BlobStore()
+    workers = []
+    for _ in range(2):
+        service = EvaluationService()
+        service.storage = RedisStorageService(worker_client(server))
+        service.blob_store = blob_store
+        service.job_queue = SqliteJobQueue(queue_path)
+        workers.append(service)
+
+    request = CreateEvaluationRequest(
+        candidate_info={"name": "Ada Lovelace", "target_level": "L6"},
+        rubric="Evaluate system design depth and communication. " * 2,
+        transcript="Interviewer: Walk me through a design. Candidate: I would start with... " * 3
+    )
+
+    async def run():
+        responses = await asyncio.gather(*(
+            service.create_evaluation(request, idempotency_key="k1") for service in workers * 3
+        ))
+        return responses, await workers[0].storage.count()
+
+    responses, count = asyncio.run(run())
+    assert count == 1
+    assert len({response.evaluation_id for response in responses}) == 1
+    assert sum(not response.deduplicated for response in responses) == 1
+    # Claims are given back once the submissions are done
+    assert not asyncio.run(worker_client(server).keys("interview:claim:*"))
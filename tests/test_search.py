@@ -0,0 +1,157 @@
+"""
+Full-text search tests (query parsing, ranking, filters, index maintenance).
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.search_index import InvalidSearchQueryError, parse_query
+from app.services.sqlite_storage import MIGRATIONS, SqliteStorageService
+from app.services.storage_service import StorageService
+from src.utils.blob_store import get_blob_store
+
+
+def evaluation(evaluation_id, created_at, name, level, decision=None):
+    result = None
+    if decision is not None:
+        # Stored results reference their texts in the blob store
+        result = {"decision": get_blob_store().put(decision), "final_evaluation": get_blob_store().put(decision)}
+    return {
+        "evaluation_id": evaluation_id,
+        "status": "completed" if decision is not None else "pending",
+        "created_at": created_at,
+        "input": {"candidate_info": {"name": name, "current_level": level, "target_level": None}},
+        "result": result
+    }
+
+
+EVALUATIONS = [
+    evaluation("e1", "2026-01-01T10:00:00", "José Álvarez", "L5 PM",
+               "Final Recommendation: STRONG RECOMMEND\nClear product sense and strong execution."),
+    evaluation("e2", "2026-01-02T10:00:00", "Jane Doe", "L6 Senior PM",
+               "Final Recommendation: DO NOT RECOMMEND\nExecution was strong but product sense was weak."),
+    evaluation("e3", "2026-01-03T10:00:00", "Priya Strong", "L5 PM",
+               "Final Recommendation: BORDERLINE\nSolid execution."),
+    evaluation("e4", "2026-01-04T10:00:00", "Jane Roe", "L6 Senior PM"),
+]
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        yield StorageService()
+        return
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        from app.services.redis_storage import RedisStorageService
+        yield RedisStorageService(fakeredis.FakeAsyncRedis(decode_responses=True))
+        return
+    storage = SqliteStorageService(str(tmp_path / "evaluations.sqlite"), read_connections=2)
+    yield storage
+    storage.close()
+
+
+def save_all(storage):
+    async def run():
+        for data in EVALUATIONS:
+            await storage.save(data["evaluation_id"], dict(data))
+
+    asyncio.run(run())
+
+
+def search(storage, q, limit=10, offset=0, **filters):
+    matches, total = asyncio.run(storage.search(parse_query(q), limit, offset, **filters))
+    return [summary["evaluation_id"] for summary, _ in matches], total
+
+
+def test_parse_query():
+    query = parse_query('José  "strong  RECOMMEND" "L6" senior "')
+    assert query.terms == ("jose", "senior", "l6")
+    assert query.phrases == (("strong", "recommend"),)
+    assert query.fts5() == '"jose" "senior" "l6" "strong recommend"'
+    for invalid in ("", '""', " - ! "):
+        with pytest.raises(InvalidSearchQueryError):
+            parse_query(invalid)
+
+
+def test_every_word_must_match(storage):
+    save_all(storage)
+    assert search(storage, "jose") == (["e1"], 1)
+    assert search(storage, "jane senior") == (["e4", "e2"], 2)
+    assert search(storage, "jane pm L6")[1] == 2
+    assert search(storage, "jane jose") == ([], 0)
+    assert search(storage, "nobody") == ([], 0)
+
+
+def test_phrases_match_adjacent_words(storage):
+    save_all(storage)
+    assert sorted(search(storage, "execution product")[0]) == ["e1", "e2"]
+    assert search(storage, '"strong execution"') == (["e1"], 1)
+    assert search(storage, '"do not recommend"') == (["e2"], 1)
+    assert search(storage, '"senior pm" jane')[1] == 2
+
+
+def test_name_matches_rank_first(storage):
+    save_all(storage)
+    # "strong" is Priya's name, e1's decision label (and twice in its rationale)
+    # and once in e2's rationale
+    ranked, total = search(storage, "strong")
+    assert sorted(ranked) == ["e1", "e2", "e3"] and total == 3
+    assert ranked.index("e3") < ranked.index("e2")
+    assert search(storage, "strong", limit=1, offset=1) == (ranked[1:2], 3)
+
+
+def test_filters_and_pagination(storage):
+    save_all(storage)
+    assert search(storage, "jane", status="pending") == (["e4"], 1)
+    assert search(storage, "pm", created_from="2026-01-02", created_to="2026-01-04")[1] == 2
+    first, total = search(storage, "pm", limit=2)
+    second, _ = search(storage, "pm", limit=2, offset=2)
+    assert total == 4 and len(first) == 2 and len(second) == 2
+    assert set(first + second) == {"e1", "e2", "e3", "e4"}
+
+
+def test_index_follows_updates_and_deletes(storage):
+    save_all(storage)
+
+    async def run():
+        await storage.update("e4", {
+            "status": "completed",
+            "result": {"decision": "Final Recommendation: RECOMMEND\nGreat stakeholder management."}
+        })
+        await storage.update("e4", {"progress_percentage": 100})
+        await storage.delete("e1")
+
+    asyncio.run(run())
+    assert search(storage, "stakeholder") == (["e4"], 1)
+    assert search(storage, "jane stakeholder") == (["e4"], 1)
+    assert search(storage, "jose") == ([], 0)
+
+
+def test_existing_sqlite_databases_are_indexed(tmp_path):
+    path = str(tmp_path / "evaluations.sqlite")
+    storage = SqliteStorageService(path, read_connections=1)
+    save_all(storage)
+    storage.close()
+
+    # Roll the database back to the schema before the search index
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "DROP TABLE evaluation_search; DROP TABLE evaluation_search_ids; "
+        f"PRAGMA user_version = {len(MIGRATIONS) - 1};"
+    )
+    conn.close()
+
+    storage = SqliteStorageService(path, read_connections=1)
+    try:
+        assert search(storage, '"product sense"')[1] == 2
+    finally:
+        storage.close()
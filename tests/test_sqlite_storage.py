@@ -0,0 +1,90 @@
+"""
+SQLite evaluation storage tests (summaries, atomic updates, migrations).
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add project root and backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.sqlite_storage import MIGRATIONS, SqliteStorageService
+
+
+def evaluation(evaluation_id, created_at, status="pending", **fields):
+    return {
+        "evaluation_id": evaluation_id,
+        "status": status,
+        "created_at": created_at,
+        "input": {"candidate_info": {"name": f"Candidate {evaluation_id}"}, "transcript": "blob:sha256:abc"},
+        "result": None,
+        **fields
+    }
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SqliteStorageService(str(tmp_path / "evaluations.sqlite"), read_connections=2)
+    yield storage
+    storage.close()
+
+
+def test_summaries_leave_out_large_fields(storage):
+    async def run():
+        await storage.save("e1", evaluation("e1", "2026-01-01T10:00:00", fingerprint="f"))
+        await storage.update("e1", {"status": "completed", "result": {"decision": "HIRE"}})
+
+        full = await storage.get("e1")
+        assert full["status"] == "completed"
+        assert full["result"] == {"decision": "HIRE"}
+        assert full["input"]["candidate_info"]["name"] == "Candidate e1"
+
+        summary = await storage.get_status("e1")
+        assert "input" not in summary and "result" not in summary
+        assert summary["candidate_name"] == "Candidate e1"
+        assert (await storage.find_by_fingerprint("f"))["evaluation_id"] == "e1"
+
+    asyncio.run(run())
+
+
+def test_updates_are_atomic_and_listing_is_indexed_by_creation(storage):
+    async def run():
+        for index in range(3):
+            await storage.save(f"e{index}", evaluation(f"e{index}", f"2026-01-0{index + 1}T10:00:00"))
+
+        versions = await asyncio.gather(*(
+            storage.update("e0", {"progress_percentage": 10}, increment="version") for _ in range(20)
+        ))
+        assert sorted(summary["version"] for summary in versions) == list(range(1, 21))
+        assert await storage.update("missing", {"status": "failed"}) is None
+
+        items, total = await storage.list_all(limit=2)
+        assert total == 3
+        assert [item["evaluation_id"] for item in items] == ["e2", "e1"]
+
+        await storage.update("e1", {"status": "processing"})
+        assert [item["evaluation_id"] for item in await storage.list_by_status(["pending"])] == ["e0", "e2"]
+        assert (await storage.get_stats())["status_counts"] == {"pending": 2, "processing": 1}
+
+        assert await storage.delete("e1")
+        assert await storage.get("e1") is None
+        # TTLs count from the last status change, which was just now
+        assert await storage.cleanup_expired() == {}
+
+    asyncio.run(run())
+
+
+def test_schema_is_versioned(tmp_path):
+    path = str(tmp_path / "evaluations.sqlite")
+    SqliteStorageService(path).close()
+    SqliteStorageService(path).close()  # reopening applies nothing twice
+
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_evaluations_created", "idx_evaluations_status", "idx_evaluations_candidate"} <= indexes